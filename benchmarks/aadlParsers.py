@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# (C) Semantix Information Technologies.
+#
+# Semantix Information Technologies is licensing the code of the
+# Data Modelling Tools (DMT) in the following dual-license mode:
+#
+# Commercial Developer License:
+#       The DMT Commercial Developer License is the appropriate version
+# to use for the development of proprietary and/or commercial software.
+# This version is for developers/companies who do not want to share
+# the source code they develop with others or otherwise comply with the
+# terms of the GNU Lesser General Public License version 3.
+#
+# GNU LGPL v. 2.1:
+#       This version of DMT is the one to use for the development of
+# non-commercial applications, when you are willing to comply
+# with the terms of the GNU Lesser General Public License version 3.
+#
+# The features of the two licenses are summarized below:
+#
+#                       Commercial
+#                       Developer               LGPL
+#                       License
+#
+# License cost          License fee charged     No license fee
+#
+# Must provide source
+# code changes to DMT   No, modifications can   Yes, all source code
+#                       be closed               must be provided back
+#
+# Can create            Yes, that is,           No, applications are subject
+# proprietary           no source code needs    to the LGPL and all source code
+# applications          to be disclosed         must be made available
+#
+# Support               Yes, 12 months of       No, but available separately
+#                       premium technical       for purchase
+#                       support
+#
+# Charge for Runtimes   None                    None
+#
+'''
+Compares the AADL parser of the tools with the ANTLR2-generated one
+
+commonPy/aadlParser.py (in-process, Python 3) replaced the parser that
+ANTLR 2.7.7 generated from commonPy2/aadl.g (run by parse_aadl.py under
+Python 2). Both parse the given AADL files and resolve the data of the
+parameters, the best of -repeat runs of each is reported, with whether
+the models they leave in aadlAST are the same - or the first differences.
+The old parser runs in a python2 child, that needs the Python runtime of
+ANTLR 2.7.7 (antlr.py) on its path:
+
+    ./aadlParsers.py [-python2 cmd] [-repeat N] file.aadl [file2.aadl ...]
+'''
+import os
+import sys
+import json
+import time
+import subprocess
+
+from typing import Any, Dict, List  # NOQA pylint: disable=unused-import
+
+g_benchDir = os.path.abspath(os.path.dirname(__file__))
+g_repoDir = os.path.dirname(g_benchDir)
+sys.path.insert(0, g_repoDir)
+
+from dmt.commonPy import aadlAST, aadlParser  # NOQA pylint: disable=wrong-import-position
+
+# Shared by both sides (so, Python 2 and 3): the contents of aadlAST as
+# JSON - instances as their class name and attributes, the references
+# back to an instance being walked as '<cycle>'. ApLevelContainer._calls
+# only exists in the old AST, and is never filled.
+g_canonical = '''
+def Canonical(o, path=()):
+    if isinstance(o, dict):
+        return dict((str(k), Canonical(v, path)) for k, v in o.items())
+    if isinstance(o, (list, tuple)):
+        return [Canonical(x, path) for x in o]
+    if hasattr(o, '__dict__'):
+        if id(o) in path:
+            return '<cycle>'
+        d = dict((k, Canonical(v, path + (id(o),))) for k, v in vars(o).items() if not (k == '_calls' and v == []))
+        d['__class__'] = o.__class__.__name__
+        return d
+    return o
+
+g_keys = ['g_signals', 'g_apLevelContainers', 'g_subProgramImplementations',
+          'g_processImplementations', 'g_threadImplementations', 'g_systems']
+'''
+
+# What parse_aadl.py did, timed - run with python2
+g_antlrParser = g_canonical + '''
+import sys, json, time
+sys.path.insert(0, sys.argv[1])
+import commonPy2.aadlAST
+from commonPy2 import AadlLexer, AadlParser
+
+best = None
+for _ in range(int(sys.argv[2])):
+    for k in g_keys:
+        container = getattr(commonPy2.aadlAST, k)
+        if isinstance(container, dict):
+            container.clear()
+        else:
+            del container[:]
+    startTime = time.time()
+    for aadlFilename in sys.argv[3:]:
+        L = AadlLexer.Lexer(aadlFilename)
+        P = AadlParser.Parser(L)
+        L.setFilename(aadlFilename)
+        P.setFilename(L.getFilename())
+        P.aadl_specification()
+    for subProgramName, subProgram in commonPy2.aadlAST.g_apLevelContainers.items():
+        for param in subProgram._params:
+            if not isinstance(param._signal, commonPy2.aadlAST.Signal):
+                param._signal = commonPy2.aadlAST.g_signals[param._signal]
+    elapsed = time.time() - startTime
+    best = elapsed if best is None else min(best, elapsed)
+print(json.dumps([best, dict((k, Canonical(getattr(commonPy2.aadlAST, k))) for k in g_keys)]))
+'''
+
+
+def Differences(old: Any, new: Any, path: str, results: List[str]) -> None:  # pylint: disable=invalid-sequence-index
+    '''Appends the paths where the (JSON) models differ to results.'''
+    if isinstance(old, dict) and isinstance(new, dict):
+        for k in sorted(set(old) | set(new)):
+            if k not in new or k not in old:
+                results.append("%s/%s: only in the %s parser" % (path, k, "old" if k in old else "new"))
+            else:
+                Differences(old[k], new[k], path + "/" + k, results)
+    elif isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        for i, (o, n) in enumerate(zip(old, new)):
+            Differences(o, n, "%s/%d" % (path, i), results)
+    elif old != new:
+        results.append("%s: %r (old) vs %r (new)" % (path, old, new))
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    python2, repeat = "python2", 5
+    while args and args[0] in ['-python2', '-repeat'] and len(args) > 1:
+        if args[0] == '-python2':
+            python2 = args[1]
+        else:
+            repeat = int(args[1])
+        args = args[2:]
+    if not args or not all(os.path.isfile(f) for f in args):
+        print('Usage:', os.path.basename(sys.argv[0]), '[-python2 cmd] [-repeat N] file.aadl [file2.aadl ...]')
+        sys.exit(1)
+
+    proc = subprocess.Popen(
+        python2.split() + ['-c', g_antlrParser, os.path.join(g_repoDir, 'dmt'), str(repeat)] + args,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    output, errors = proc.communicate()
+    if proc.returncode != 0:
+        print("The ANTLR2 parser failed:\n" + errors.decode('utf-8', 'replace').strip())
+        sys.exit(1)
+    oldTime, oldModel = json.loads(output.decode('utf-8'))
+
+    namespace = {}  # type: Dict[str, Any]
+    exec(g_canonical, namespace)  # pylint: disable=exec-used
+    newTime = float('inf')
+    for _ in range(repeat):
+        aadlParser.g_memory.clear()
+        startTime = time.time()
+        aadlParser.ParseAADLfiles(args)
+        elapsed = time.time() - startTime
+        newTime = min(newTime, elapsed)
+    # Through JSON, as the old model, for the same (str) keys and lists
+    newModel = json.loads(json.dumps({k: namespace['Canonical'](getattr(aadlAST, k)) for k in namespace['g_keys']}))
+
+    print("%-24s %10s" % ("parser", "best (ms)"))
+    print("%-24s %10.1f" % ("ANTLR2 (python2)", 1000 * oldTime))
+    print("%-24s %10.1f" % ("aadlParser (python3)", 1000 * newTime))
+    differences = []  # type: List[str]
+    Differences(oldModel, newModel, "", differences)
+    if differences:
+        print("The models differ:\n    " + "\n    ".join(differences[:20]))
+        sys.exit(1)
+    print("Same model")
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
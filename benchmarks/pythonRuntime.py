@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# (C) Semantix Information Technologies.
+#
+# Semantix Information Technologies is licensing the code of the
+# Data Modelling Tools (DMT) in the following dual-license mode:
+#
+# Commercial Developer License:
+#       The DMT Commercial Developer License is the appropriate version
+# to use for the development of proprietary and/or commercial software.
+# This version is for developers/companies who do not want to share
+# the source code they develop with others or otherwise comply with the
+# terms of the GNU Lesser General Public License version 3.
+#
+# GNU LGPL v. 2.1:
+#       This version of DMT is the one to use for the development of
+# non-commercial applications, when you are willing to comply
+# with the terms of the GNU Lesser General Public License version 3.
+#
+# The features of the two licenses are summarized below:
+#
+#                       Commercial
+#                       Developer               LGPL
+#                       License
+#
+# License cost          License fee charged     No license fee
+#
+# Must provide source
+# code changes to DMT   No, modifications can   Yes, all source code
+#                       be closed               must be provided back
+#
+# Can create            Yes, that is,           No, applications are subject
+# proprietary           no source code needs    to the LGPL and all source code
+# applications          to be disclosed         must be made available
+#
+# Support               Yes, 12 months of       No, but available separately
+#                       premium technical       for purchase
+#                       support
+#
+# Charge for Runtimes   None                    None
+#
+'''
+Measures the run-time speed of the Python mapping (asn2dataModel -toPython)
+
+The mapping of a small grammar - a message carrying an OCTET STRING of
+up to 4 KB, a SEQUENCE OF up to 4096 REALs and a few nested fields, and
+a tree of SEQUENCEs, CHOICEs and SEQUENCE OFs nested 7 levels deep - is
+built in a scratch folder with Makefile.python (this needs ASN1SCC, mono
+and gcc; the stand-ins of runBenchmarks.py are not enough here), and the
+messages per second of the paths that the python and pyside backends go
+through are reported:
+
+    python  data   msg.data.SetFromPyString(...) and msg.data.GetPyString()
+    python  get    msg.hk.samples[3].value.Get()
+    python  set    msg.hk.samples[3].raw.Set(...)
+    array   set    msg.trace.SetFromArray(...)
+    array   get    msg.trace.GetArray(), copied out
+    loop    set    msg.trace[i].Set(...) for all the elements
+    loop    get    msg.trace[i].Get() for all the elements
+    pyside  encode encode_uPER: Encode into a new DataStream, GetPyString
+    pyside  decode decode_uPER: SetFromPyString into a new DataStream, Decode
+    gser    write  tree.GSER() - the text that the pyside expect() compares
+    gser    read   tree.SetFromGSER(...)
+
+With -dir, an already built folder is measured instead - e.g. the same
+folder with the Stubs.py of another version of the tools. With -structs,
+the mapping is built with asn2dataModel -pythonStructs (the data are
+accessed through ctypes structs, instead of C getters and setters).
+'''
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+
+from typing import Any, Callable, Dict, List  # NOQA pylint: disable=unused-import
+
+g_benchDir = os.path.abspath(os.path.dirname(__file__))
+g_repoDir = os.path.dirname(g_benchDir)
+
+g_grammar = '''\
+BENCH DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+Payload ::= OCTET STRING (SIZE(0 .. 4096))
+Sample ::= SEQUENCE {raw INTEGER (0 .. 4095), value REAL (-1000 .. 1000)}
+Housekeeping ::= SEQUENCE {samples SEQUENCE (SIZE(8)) OF Sample}
+Waveform ::= SEQUENCE (SIZE(0 .. 4096)) OF REAL (-1000 .. 1000)
+Msg ::= SEQUENCE {id INTEGER (0 .. 65535), hk Housekeeping, data Payload, trace Waveform}
+Switch ::= ENUMERATED {off, on}
+Leaf ::= SEQUENCE {armed BOOLEAN, power Switch, pos SEQUENCE (SIZE(4)) OF INTEGER (-100 .. 100)}
+Twig ::= CHOICE {tip Leaf, level REAL (0 .. 1)}
+Branch ::= SEQUENCE {items SEQUENCE (SIZE(0 .. 8)) OF Twig, tag OCTET STRING (SIZE(0 .. 16))}
+Tree ::= SEQUENCE {id INTEGER (0 .. 65535), branches SEQUENCE (SIZE(0 .. 4)) OF Branch}
+
+END
+'''
+
+
+def Build(workDir: str, structs: bool) -> None:
+    '''Generates and builds the Python mapping of the grammar in workDir.'''
+    with open(os.path.join(workDir, 'bench.asn'), 'w') as f:
+        f.write(g_grammar)
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [g_repoDir] + [x for x in env.get('PYTHONPATH', '').split(os.pathsep) if x])
+    for cmd in [
+            [sys.executable, '-m', 'dmt.asn2dataModel', '-toPython'] +
+            (['-pythonStructs'] if structs else []) + ['-o', '.', 'bench.asn'],
+            ['make', '-f', 'Makefile.python']]:
+        if subprocess.call(cmd, cwd=workDir, env=env) != 0:
+            print('Failed:', ' '.join(cmd))
+            sys.exit(1)
+
+
+def Rate(work: Callable[[], Any], count: int, repeat: int) -> float:
+    '''The calls of work per second (the best of repeat runs of count calls).'''
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            work()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return count / best
+
+
+def Measure(workDir: str, size: int, count: int, repeat: int) -> None:
+    sys.path.insert(0, workDir)
+    import DV  # pylint: disable=import-error
+    import bench_asn  # pylint: disable=import-error
+
+    payload = ''.join(chr(i % 256) for i in range(size))
+    msg = bench_asn.Msg()
+    msg.id.Set(42)
+
+    def Data() -> None:
+        msg.data.SetFromPyString(payload)
+        if msg.data.GetPyString() != payload:
+            raise Exception('The OCTET STRING was not copied back intact')
+
+    def Get() -> float:
+        return msg.hk.samples[3].value.Get()
+
+    def Set() -> None:
+        msg.hk.samples[3].raw.Set(7)
+
+    samples = [float(i % 1000) for i in range(size)]
+    try:
+        import numpy
+        source = numpy.array(samples)  # type: Any
+    except ImportError:
+        source = samples
+
+    def ArraySet() -> None:
+        msg.trace.SetFromArray(source)
+
+    def ArrayGet() -> Any:
+        values = msg.trace.GetArray()
+        # A NumPy array, or (without NumPy) a ctypes array
+        return values.copy() if hasattr(values, 'copy') else values[:]
+
+    def LoopSet() -> None:
+        msg.trace.SetLength(size)
+        for i, value in enumerate(samples):
+            msg.trace[i].Set(value)
+
+    def LoopGet() -> List[float]:
+        return [msg.trace[i].Get() for i in range(msg.trace.GetLength())]
+
+    def Encode() -> str:
+        stream = bench_asn.DataStream(DV.Msg_REQUIRED_BYTES_FOR_ENCODING)
+        msg.Encode(stream)
+        return stream.GetPyString()
+
+    Data()
+    encoded = Encode()
+
+    def Decode() -> None:
+        stream = bench_asn.DataStream(DV.Msg_REQUIRED_BYTES_FOR_ENCODING)
+        stream.SetFromPyString(encoded)
+        decoded = bench_asn.Msg()
+        decoded.Decode(stream)
+
+    # A deeply nested message, in the GSER text format of the pyside backend
+    twigs = 'tip: { armed TRUE, power on, pos { -100, 0, 7, 100 } }, level: 0.25'
+    branch = '{ items { %s }, tag "0123456789abcdef" }' % ', '.join([twigs] * 4)
+    text = '{ id 42, branches { %s } }' % ', '.join([branch] * 4)
+    tree = bench_asn.Tree()
+
+    def GSERRead() -> None:
+        tree.SetFromGSER(text)
+
+    def GSERWrite() -> str:
+        return tree.GSER()
+
+    GSERRead()
+    if GSERWrite() != text:
+        raise Exception('The GSER text was not read back intact')
+
+    Decode()
+    ArraySet()
+    if list(ArrayGet()) != samples or LoopGet() != samples:
+        raise Exception('The SEQUENCE OF was not copied back intact')
+    print('%d-byte payload, %d-REAL trace, %d-byte uPER message, %d-char GSER tree' % (
+        size, size, len(encoded), len(text)))
+    for backend, label, work in [
+            ('python', 'data', Data), ('python', 'get', Get), ('python', 'set', Set),
+            ('array', 'set', ArraySet), ('array', 'get', ArrayGet),
+            ('pyside', 'encode', Encode), ('pyside', 'decode', Decode),
+            ('gser', 'write', GSERWrite), ('gser', 'read', GSERRead)]:
+        print('%-8s %-8s %12.0f msg/s' % (backend, label, Rate(work, count, repeat)))
+    # One element at a time is much slower - fewer calls are enough
+    for backend, label, work in [('loop', 'set', LoopSet), ('loop', 'get', LoopGet)]:
+        print('%-8s %-8s %12.0f msg/s' % (backend, label, Rate(work, max(1, count // 100), repeat)))
+
+
+def usage() -> None:
+    print('Usage:', os.path.basename(sys.argv[0]), '[-dir builtDir] [-size N] [-n COUNT] [-repeat N] [-structs] [-keep]')
+    sys.exit(1)
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    options = {'-dir': None, '-size': '4096', '-n': '1000', '-repeat': '3'}  # type: Dict[str, Any]
+    for opt in list(options.keys()):
+        if opt in args:
+            idx = args.index(opt)
+            if idx + 1 >= len(args):
+                usage()
+            options[opt] = args[idx + 1]
+            del args[idx:idx + 2]
+    keep = '-keep' in args
+    if keep:
+        args.remove('-keep')
+    structs = '-structs' in args
+    if structs:
+        args.remove('-structs')
+    if args:
+        usage()
+    try:
+        size, count, repeat = int(options['-size']), int(options['-n']), int(options['-repeat'])
+    except ValueError:
+        usage()
+    if not 0 <= size <= 4096:
+        usage()
+
+    workDir = options['-dir']
+    if workDir is None:
+        workDir = tempfile.mkdtemp(prefix='dmt_bench_python_')
+        Build(workDir, structs)
+    try:
+        Measure(os.path.abspath(workDir), size, max(1, count), max(1, repeat))
+    finally:
+        if options['-dir'] is None:
+            if keep:
+                print('(files kept in %s)' % workDir)
+            else:
+                shutil.rmtree(workDir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
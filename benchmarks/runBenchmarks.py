@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# (C) Semantix Information Technologies.
+#
+# Semantix Information Technologies is licensing the code of the
+# Data Modelling Tools (DMT) in the following dual-license mode:
+#
+# Commercial Developer License:
+#       The DMT Commercial Developer License is the appropriate version
+# to use for the development of proprietary and/or commercial software.
+# This version is for developers/companies who do not want to share
+# the source code they develop with others or otherwise comply with the
+# terms of the GNU Lesser General Public License version 3.
+#
+# GNU LGPL v. 2.1:
+#       This version of DMT is the one to use for the development of
+# non-commercial applications, when you are willing to comply
+# with the terms of the GNU Lesser General Public License version 3.
+#
+# The features of the two licenses are summarized below:
+#
+#                       Commercial
+#                       Developer               LGPL
+#                       License
+#
+# License cost          License fee charged     No license fee
+#
+# Must provide source
+# code changes to DMT   No, modifications can   Yes, all source code
+#                       be closed               must be provided back
+#
+# Can create            Yes, that is,           No, applications are subject
+# proprietary           no source code needs    to the LGPL and all source code
+# applications          to be disclosed         must be made available
+#
+# Support               Yes, 12 months of       No, but available separately
+#                       premium technical       for purchase
+#                       support
+#
+# Charge for Runtimes   None                    None
+#
+'''
+Runs the DMT tools over the synthetic grammars of synthetic.py, and
+stores (or compares) the results
+
+For each scenario, the grammar and AADL system are generated in a
+scratch folder, and each of the tools below is run over them with
+--profile; the stand-ins in stand-in/ replace ASN1SCC and mono, so
+nothing but Python 3 is needed.
+
+The results (total wall/CPU time and peak memory of each run, plus the
+per-phase breakdown of the --profile reports) are stored in a JSON file
+under results/ - so that runs of different versions of the tools can be
+compared with:
+
+    runBenchmarks.py -compare results/old.json results/new.json
+'''
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import subprocess
+
+from typing import Any, Dict, List  # NOQA pylint: disable=unused-import
+
+import synthetic
+
+g_benchDir = os.path.abspath(os.path.dirname(__file__))
+g_repoDir = os.path.dirname(g_benchDir)
+
+# The tool runs of each scenario: (label, module, options) - the input
+# files are appended to the options. The asn2dataModel backends are run
+# separately: some of them modify the AST in ways that others don't
+# expect (e.g. -toSIMULINK followed by -toSQL).
+g_backends = [
+    'toC', 'toAda', 'toOG', 'toSIMULINK', 'toSCADE6', 'toRTDS', 'toPython',
+    'toQGenC', 'toSQL', 'toSqlalchemy']
+g_runs = [
+    ('asn2dataModel -' + backend, 'dmt.asn2dataModel', ['-o', 'out/dataModel', '-' + backend])
+    for backend in g_backends
+] + [
+    ('aadl2glueC', 'dmt.aadl2glueC', ['-o', 'out/glue']),
+    ('msgPrinter', 'dmt.msgPrinter', ['-o', 'out/msgPrinter']),
+    ('msgPrinterASN1', 'dmt.msgPrinterASN1', ['-o', 'out/msgPrinterASN1']),
+]
+
+
+def RunTool(workDir: str, module: str, args: List[str], inputs: List[str]) -> Dict[str, Any]:  # pylint: disable=invalid-sequence-index
+    '''Runs one tool in workDir, and returns its --profile report.'''
+    outputDir = os.path.join(workDir, args[args.index('-o') + 1])
+    shutil.rmtree(outputDir, ignore_errors=True)
+    os.makedirs(outputDir)
+    env = dict(os.environ)
+    env['PATH'] = os.path.join(g_benchDir, 'stand-in') + os.pathsep + env.get('PATH', '')
+    env['PYTHONPATH'] = os.pathsep.join(
+        [g_repoDir] + [x for x in env.get('PYTHONPATH', '').split(os.pathsep) if x])
+    # Start every run with an empty cache of parsed ASTs
+    env['DMT_CACHE_DIR'] = os.path.join(workDir, 'cache')
+    shutil.rmtree(env['DMT_CACHE_DIR'], ignore_errors=True)
+    report = os.path.join(workDir, 'profile.json')
+    cmd = [sys.executable, '-m', module] + args + ['--profile', report] + inputs
+    with open(os.path.join(workDir, 'log.txt'), 'w') as log:
+        status = subprocess.call(cmd, cwd=workDir, env=env, stdout=log, stderr=subprocess.STDOUT)
+    if status != 0 or not os.path.isfile(report):
+        print('Failed:', ' '.join(cmd))
+        print('(see %s)' % os.path.join(workDir, 'log.txt'))
+        sys.exit(1)
+    with open(report) as f:
+        return json.load(f)
+
+
+def GitRevision() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=g_repoDir,
+            stderr=subprocess.DEVNULL).decode('utf-8').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def RunBenchmarks(scenarios: List[str], repeat: int, seed: int, keep: bool) -> Dict[str, Any]:  # pylint: disable=invalid-sequence-index
+    results = {
+        'revision': GitRevision(),
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'host': platform.node(),
+        'seed': seed,
+        'repeat': repeat,
+        'runs': [],
+    }  # type: Dict[str, Any]
+    for scenario in scenarios:
+        workDir = tempfile.mkdtemp(prefix='dmt_bench_' + scenario + '_')
+        files = synthetic.Generate(scenario, workDir, seed)
+        for label, module, args in g_runs:
+            inputs = files['aadl'] if module == 'dmt.aadl2glueC' else files['asn']
+            samples = []
+            for _ in range(repeat):
+                samples.append(RunTool(workDir, module, args, inputs))
+            best = min(samples, key=lambda r: r['total']['wall'])
+            print('%-12s %-28s wall %8.3fs  cpu %8.3fs  maxRSS %7d KB' % (
+                scenario, label, best['total']['wall'], best['total']['cpu'],
+                best['total']['maxRSS_KB']))
+            results['runs'].append({
+                'scenario': scenario,
+                'tool': label,
+                'params': synthetic.Scenario(scenario),
+                'wall': [r['total']['wall'] for r in samples],
+                'total': best['total'],
+                'phases': best['phases'],
+            })
+        if keep:
+            print('(files of scenario %s kept in %s)' % (scenario, workDir))
+        else:
+            shutil.rmtree(workDir, ignore_errors=True)
+    return results
+
+
+def Ratio(old: float, new: float) -> str:
+    return '%7.2fx' % (new / old) if old > 0 else '      -'
+
+
+def Compare(oldFile: str, newFile: str, threshold: float = 0.05) -> None:
+    '''Prints the new/old ratio of the totals of each run, and of the phases
+that take at least `threshold` of the total wall time of either run.'''
+    with open(oldFile) as f:
+        old = json.load(f)
+    with open(newFile) as f:
+        new = json.load(f)
+    print('old: %s (%s)  new: %s (%s)' % (old['revision'], old['date'], new['revision'], new['date']))
+    oldRuns = {(r['scenario'], r['tool']): r for r in old['runs']}
+    print('%-12s %-28s %-40s %10s %10s %8s' % ('scenario', 'tool', 'phase', 'old', 'new', 'new/old'))
+    for run in new['runs']:
+        key = (run['scenario'], run['tool'])
+        if key not in oldRuns:
+            continue
+        oldRun = oldRuns[key]
+        if oldRun['params'] != run['params']:
+            print('%-12s %-28s (scenario parameters differ, skipped)' % key)
+            continue
+        for what in ('wall', 'cpu', 'maxRSS_KB'):
+            print('%-12s %-28s %-40s %10.3f %10.3f %s' % (
+                key[0], key[1], 'total ' + what,
+                oldRun['total'][what], run['total'][what],
+                Ratio(oldRun['total'][what], run['total'][what])))
+        oldPhases = {p['phase']: p for p in oldRun['phases']}
+        newPhases = {p['phase']: p for p in run['phases']}
+        for phase in sorted(set(oldPhases) | set(newPhases)):
+            o = oldPhases.get(phase, {}).get('wall', 0.0)
+            n = newPhases.get(phase, {}).get('wall', 0.0)
+            if max(o / max(oldRun['total']['wall'], 1e-9), n / max(run['total']['wall'], 1e-9)) < threshold:
+                continue
+            print('%-12s %-28s %-40s %10.3f %10.3f %s' % (key[0], key[1], '  ' + phase, o, n, Ratio(o, n)))
+
+
+def usage() -> None:
+    print('Usage:', os.path.basename(sys.argv[0]), '[-o results.json] [-repeat N] [-seed N] [-keep] [scenario ...]')
+    print('      ', os.path.basename(sys.argv[0]), '-compare old.json new.json')
+    print('Scenarios:', ', '.join(sorted(synthetic.g_scenarios)), '(default: all)')
+    sys.exit(1)
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    if args and args[0] == '-compare':
+        if len(args) != 3:
+            usage()
+        Compare(args[1], args[2])
+        return
+    options = {'-o': None, '-repeat': '1', '-seed': '0'}  # type: Dict[str, Any]
+    for opt in list(options.keys()):
+        if opt in args:
+            idx = args.index(opt)
+            if idx + 1 >= len(args):
+                usage()
+            options[opt] = args[idx + 1]
+            del args[idx:idx + 2]
+    keep = '-keep' in args
+    if keep:
+        args.remove('-keep')
+    try:
+        repeat, seed = int(options['-repeat']), int(options['-seed'])
+    except ValueError:
+        usage()
+    if any(x.startswith('-') or x not in synthetic.g_scenarios for x in args):
+        usage()
+    scenarios = args or sorted(synthetic.g_scenarios)
+
+    results = RunBenchmarks(scenarios, max(1, repeat), seed, keep)
+    resultsFile = options['-o']
+    if resultsFile is None:
+        resultsDir = os.path.join(g_benchDir, 'results')
+        if not os.path.isdir(resultsDir):
+            os.makedirs(resultsDir)
+        resultsFile = os.path.join(
+            resultsDir, time.strftime('%Y%m%d-%H%M%S') + '-' + results['revision'] + '.json')
+    with open(resultsFile, 'w') as f:
+        json.dump(results, f, indent=1)
+    print('Results stored in', resultsFile)
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# (C) Semantix Information Technologies.
+#
+# Semantix Information Technologies is licensing the code of the
+# Data Modelling Tools (DMT) in the following dual-license mode:
+#
+# Commercial Developer License:
+#       The DMT Commercial Developer License is the appropriate version
+# to use for the development of proprietary and/or commercial software.
+# This version is for developers/companies who do not want to share
+# the source code they develop with others or otherwise comply with the
+# terms of the GNU Lesser General Public License version 3.
+#
+# GNU LGPL v. 2.1:
+#       This version of DMT is the one to use for the development of
+# non-commercial applications, when you are willing to comply
+# with the terms of the GNU Lesser General Public License version 3.
+#
+# The features of the two licenses are summarized below:
+#
+#                       Commercial
+#                       Developer               LGPL
+#                       License
+#
+# License cost          License fee charged     No license fee
+#
+# Must provide source
+# code changes to DMT   No, modifications can   Yes, all source code
+#                       be closed               must be provided back
+#
+# Can create            Yes, that is,           No, applications are subject
+# proprietary           no source code needs    to the LGPL and all source code
+# applications          to be disclosed         must be made available
+#
+# Support               Yes, 12 months of       No, but available separately
+#                       premium technical       for purchase
+#                       support
+#
+# Charge for Runtimes   None                    None
+#
+'''
+Measures the merge of SMP2 catalogues into an ASN.1 grammar (smp2asn)
+
+Synthetic grammars of thousands of random types (BOOLEANs, INTEGERs,
+REALs, OCTET STRINGs, ENUMERATEDs, SEQUENCEs, CHOICEs and SEQUENCE OFs)
+are merged with synthetic SMP2 catalogues - half of whose types already
+exist in the grammar. MergeASN1_AST (that only compares the types that
+share a canonical form) is timed against a pairwise scan of all the
+types, and both must find the same identical types:
+
+    ./smp2Merge.py [count ...]
+'''
+import os
+import sys
+import time
+import random
+
+from typing import Any, Dict, List  # NOQA pylint: disable=unused-import
+
+g_benchDir = os.path.abspath(os.path.dirname(__file__))
+g_repoDir = os.path.dirname(g_benchDir)
+sys.path.insert(0, g_repoDir)
+
+# pylint: disable=wrong-import-position
+from dmt import smp2asn  # NOQA
+from dmt.commonPy import asnParser  # NOQA
+from dmt.commonPy.asnParser import AST_Lookup  # NOQA pylint: disable=unused-import
+from dmt.commonPy.asnAST import (  # NOQA
+    AsnNode, AsnBool, AsnInt, AsnReal, AsnOctetString, AsnEnumerated,
+    AsnSequence, AsnChoice, AsnSequenceOf, AsnMetaMember)
+
+
+def SyntheticTypes(
+        prefix: str, count: int, seed: int,
+        names: AST_Lookup, bResolvedReferences: bool) -> None:
+    '''Adds 'count' random types to 'names'. Using the same seed creates
+    structurally identical types (under a different prefix); references to
+    other types are either AsnMetaMembers/typenames (as in parsed ASN.1
+    grammars) or the nodes themselves (as in converted SMP2 catalogues).'''
+    rnd = random.Random(seed)
+    typenames = []  # type: List[str]
+    for i in range(count):
+        choice = rnd.random()
+        if len(typenames) < 10 or choice < 0.4:
+            node = rnd.choice([
+                lambda: AsnBool(asnFilename=prefix),
+                lambda: AsnInt(asnFilename=prefix, range=[0, rnd.choice([10, 100, 1000, 10000])]),
+                lambda: AsnReal(asnFilename=prefix, range=[-1.0, rnd.choice([1.0, 100.0, 1e6])]),
+                lambda: AsnOctetString(asnFilename=prefix, range=[rnd.choice([1, 8, 64]), 64]),
+                lambda: AsnEnumerated(asnFilename=prefix, members=[
+                    ('e%d' % j, str(j)) for j in range(rnd.randint(2, 5))])])()  # type: AsnNode
+        elif choice < 0.8:
+            members = []  # type: List[Any]
+            for j in range(rnd.randint(1, 6)):
+                ref = rnd.choice(typenames)
+                members.append((
+                    'f%d' % j,
+                    names[ref] if bResolvedReferences else AsnMetaMember(asnFilename=prefix, containedType=ref)))
+            node = (AsnSequence if rnd.random() < 0.7 else AsnChoice)(asnFilename=prefix, members=members)
+        else:
+            ref = rnd.choice(typenames)
+            node = AsnSequenceOf(
+                asnFilename=prefix, range=[1, rnd.choice([4, 16, 256])],
+                containedType=names[ref] if bResolvedReferences else ref)
+        typename = prefix + str(i)
+        names[typename] = node
+        typenames.append(typename)
+
+
+def Measure(count: int) -> None:
+    '''Times MergeASN1_AST against a pairwise scan of the existing types,
+    for an SMP2 catalogue of count types.'''
+    asnParser.g_names = asnParser.TypeNames()
+    SyntheticTypes("Asn", count, 1, asnParser.g_names, False)
+    smp2AsnAST = {}  # type: AST_Lookup
+    SyntheticTypes("Smp", count // 2, 1, smp2AsnAST, True)
+    moreTypes = {}  # type: AST_Lookup
+    SyntheticTypes("Smp2_", count - count // 2, 2, moreTypes, True)
+    smp2AsnAST.update(moreTypes)
+
+    startTime = time.time()
+    expected = {}  # type: Dict[str, str]
+    for k, v in smp2AsnAST.items():
+        for k2, v2 in asnParser.g_names.items():
+            if v2.IdenticalPerSMP2(v, asnParser.g_names, smp2AsnAST):
+                expected[k] = k2
+                break
+    pairwise = time.time() - startTime
+
+    startTime = time.time()
+    identicals = smp2asn.MergeASN1_AST(smp2AsnAST)
+    indexed = time.time() - startTime
+    print("%5d types: pairwise scan %8.3fs, indexed merge %6.3fs, %d identical types (%s)" % (
+        count, pairwise, indexed, len(identicals),
+        "same" if identicals == expected else "MISMATCH"))
+
+
+def main() -> None:
+    try:
+        counts = [int(x) for x in sys.argv[1:]] or [1000, 2000, 4000]
+    except ValueError:
+        print('Usage:', os.path.basename(sys.argv[0]), '[count ...]')
+        sys.exit(1)
+    for count in counts:
+        Measure(count)
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
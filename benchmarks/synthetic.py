@@ -0,0 +1,407 @@
+# (C) Semantix Information Technologies.
+#
+# Semantix Information Technologies is licensing the code of the
+# Data Modelling Tools (DMT) in the following dual-license mode:
+#
+# Commercial Developer License:
+#       The DMT Commercial Developer License is the appropriate version
+# to use for the development of proprietary and/or commercial software.
+# This version is for developers/companies who do not want to share
+# the source code they develop with others or otherwise comply with the
+# terms of the GNU Lesser General Public License version 3.
+#
+# GNU LGPL v. 2.1:
+#       This version of DMT is the one to use for the development of
+# non-commercial applications, when you are willing to comply
+# with the terms of the GNU Lesser General Public License version 3.
+#
+# The features of the two licenses are summarized below:
+#
+#                       Commercial
+#                       Developer               LGPL
+#                       License
+#
+# License cost          License fee charged     No license fee
+#
+# Must provide source
+# code changes to DMT   No, modifications can   Yes, all source code
+#                       be closed               must be provided back
+#
+# Can create            Yes, that is,           No, applications are subject
+# proprietary           no source code needs    to the LGPL and all source code
+# applications          to be disclosed         must be made available
+#
+# Support               Yes, 12 months of       No, but available separately
+#                       premium technical       for purchase
+#                       support
+#
+# Charge for Runtimes   None                    None
+#
+'''
+Parametric generator of large ASN.1 grammars and AADL systems
+
+Each scenario describes the shape of a synthetic grammar (how many types,
+how deeply nested, how wide the SEQUENCEs and CHOICEs are, how often
+SEQUENCE OFs and references to other types show up) and of the AADL
+system that uses it. For every ASN.1 file, the generator writes:
+
+    benchN.asn          the grammar itself
+    benchN.asn.xml      the ASN1SCC XML AST of the grammar (used by the
+                        stand-in asn1.exe, see stand-in/asn1.exe)
+
+...and for the AADL side:
+
+    DataView.aadl       the DATA definitions of all the types
+    functions.aadl      the SUBPROGRAMs that use them as parameters
+
+Generation is driven by a seeded random.Random, so the same scenario
+always produces the same files.
+
+Usage: synthetic.py [-seed N] scenario outputDir
+'''
+import os
+import sys
+import random
+
+from typing import Any, Dict, List, Tuple  # NOQA pylint: disable=unused-import
+
+
+# Each scenario stresses one dimension of the grammar:
+#
+#   types     number of type assignments in each ASN.1 file
+#   files     number of ASN.1 files (modules)
+#   depth     maximum nesting of inline (anonymous) constructed types
+#   nesting   probability that a field is an inline constructed type
+#   width     maximum number of fields in a SEQUENCE
+#   choices   maximum number of alternatives in a CHOICE
+#   seqof     probability that a constructed type is a SEQUENCE OF
+#   seqofmax  maximum size of a SEQUENCE OF
+#   refs      probability that a field references an earlier type
+#   refnodes  only types of at most this many nodes (once all references
+#             and SEQUENCE OFs are expanded) are referenced - some backends
+#             (e.g. the Simulink glue) unroll them, so the output would
+#             otherwise grow exponentially
+#   functions number of SUBPROGRAMs in functions.aadl
+#   params    number of parameters of each SUBPROGRAM
+g_defaults = {
+    'types': 200, 'files': 1, 'depth': 2, 'nesting': 0.2, 'width': 6,
+    'choices': 4, 'seqof': 0.15, 'seqofmax': 8, 'refs': 0.3, 'refnodes': 60,
+    'functions': 20, 'params': 4,
+}
+
+g_scenarios = {
+    'deep': {'depth': 8, 'nesting': 0.7, 'width': 2, 'choices': 2, 'seqof': 0.03},
+    'wide': {'depth': 1, 'width': 96},
+    'choices': {'choices': 64, 'depth': 1, 'seqof': 0.05},
+    'seqofs': {'seqof': 0.6, 'depth': 3, 'nesting': 0.4, 'seqofmax': 4},
+    'manyfiles': {'files': 20, 'types': 100},
+    'large': {'files': 4, 'types': 1000, 'functions': 100},
+}  # type: Dict[str, Dict[str, Any]]
+
+# The implementation languages of the SUBPROGRAMs are picked round-robin
+# from these - they cover both the synchronous and asynchronous backends
+# of aadl2glueC, without requiring any tool but ASN1SCC.
+g_languages = ['C', 'Simulink', 'OG', 'SCADE6', 'QGenC', 'Ada']
+
+
+def Scenario(name: str) -> Dict[str, Any]:
+    '''Returns the full set of parameters of a named scenario.'''
+    if name not in g_scenarios:
+        raise KeyError(
+            "Unknown scenario '%s' (available: %s)" % (name, ', '.join(sorted(g_scenarios))))
+    params = dict(g_defaults)
+    params.update(g_scenarios[name])
+    return params
+
+
+class Grammar:
+    '''Generates the types of one ASN.1 module.
+
+Types are kept as nested tuples:
+
+    ('INTEGER', min, max)        ('REAL', min, max)       ('BOOLEAN',)
+    ('OCTET STRING', min, max)   ('ENUMERATED', [names])  ('REF', typeName)
+    ('SEQUENCE', [(field, type), ...])  ('CHOICE', [(field, type), ...])
+    ('SEQUENCE OF', min, max, type)
+    ('OPTIONAL', type)           (only as the type of a SEQUENCE field)
+'''
+    def __init__(self, rand: random.Random, params: Dict[str, Any], index: int) -> None:
+        self._rand = rand
+        self._params = params
+        self._module = 'Bench-Grammar-%d' % index
+        self._prefix = 'B%d' % index
+        self._enumerants = 0
+        self._types = []  # type: List[Tuple[str, Any]]
+        self._sizes = {}  # type: Dict[str, int]
+        self._nodes = {}  # type: Dict[str, int]
+        self._referable = []  # type: List[str]
+        for i in range(params['types']):
+            name = '%s-T%d' % (self._prefix, i)
+            if i % 10 == 0:
+                # Keep a supply of simple types to reference
+                typ = self.Primitive()
+            else:
+                typ = self.Constructed(0)
+            self._sizes[name] = self.NativeSize(typ)
+            self._nodes[name] = self.Nodes(typ)
+            if self._nodes[name] <= params['refnodes']:
+                self._referable.append(name)
+            self._types.append((name, typ))
+
+    def Primitive(self) -> Any:
+        r = self._rand
+        k = r.randrange(5)
+        if k == 0:
+            lo = r.randrange(-1000, 1)
+            return ('INTEGER', lo, lo + r.randrange(1, 100000))
+        if k == 1:
+            return ('REAL', -r.randrange(1, 1000), r.randrange(1, 1000))
+        if k == 2:
+            return ('BOOLEAN',)
+        if k == 3:
+            lo = r.randrange(0, 4)
+            return ('OCTET STRING', lo, lo + r.randrange(1, 64))
+        names = []
+        for _ in range(r.randrange(2, 8)):
+            self._enumerants += 1
+            names.append('%s-e%d' % (self._prefix.lower(), self._enumerants))
+        return ('ENUMERATED', names)
+
+    def Field(self, depth: int) -> Any:
+        r = self._rand
+        if depth < self._params['depth'] and r.random() < self._params['nesting']:
+            return self.Constructed(depth + 1)
+        if self._referable and r.random() < self._params['refs']:
+            return ('REF', r.choice(self._referable))
+        return self.Primitive()
+
+    def Constructed(self, depth: int) -> Any:
+        r = self._rand
+        if r.random() < self._params['seqof']:
+            lo = r.randrange(0, 3)
+            return ('SEQUENCE OF', lo, lo + r.randrange(1, self._params['seqofmax']), self.Field(depth))
+        if r.random() < 0.3:
+            count = r.randint(2, max(2, self._params['choices']))
+            return ('CHOICE', [('c%d' % i, self.Field(depth)) for i in range(count)])
+        count = r.randint(1, self._params['width'])
+        return ('SEQUENCE', [('f%d' % i, self.Field(depth)) for i in range(count)])
+
+    def Nodes(self, typ: Any) -> int:
+        '''The number of nodes of the type, once all references and
+SEQUENCE OFs are expanded.'''
+        kind = typ[0]
+        if kind == 'REF':
+            return self._nodes[typ[1]]
+        if kind == 'OPTIONAL':
+            return self.Nodes(typ[1])
+        if kind in ('SEQUENCE', 'CHOICE'):
+            return 1 + sum(self.Nodes(t) for _, t in typ[1])
+        if kind == 'SEQUENCE OF':
+            return 1 + typ[2] * self.Nodes(typ[3])
+        return 1
+
+    def NativeSize(self, typ: Any) -> int:
+        '''A rough upper bound of the size of the type in memory (wordSize 8),
+used for the Source_Data_Size property of the AADL DATA definitions.'''
+        kind = typ[0]
+        if kind in ('INTEGER', 'REAL', 'BOOLEAN', 'ENUMERATED'):
+            return 8
+        if kind == 'OCTET STRING':
+            return 8 + (typ[2] + 7) // 8 * 8
+        if kind == 'REF':
+            return self._sizes[typ[1]]
+        if kind == 'OPTIONAL':
+            return self.NativeSize(typ[1])
+        if kind == 'SEQUENCE':
+            return sum(self.NativeSize(t) for _, t in typ[1]) + 8
+        if kind == 'CHOICE':
+            return max(self.NativeSize(t) for _, t in typ[1]) + 8
+        return 8 + typ[2] * self.NativeSize(typ[3])
+
+    def ASN(self, typ: Any) -> str:
+        kind = typ[0]
+        if kind in ('INTEGER', 'REAL'):
+            return '%s (%s .. %s)' % (kind, typ[1], typ[2])
+        if kind == 'BOOLEAN':
+            return kind
+        if kind == 'OCTET STRING':
+            return 'OCTET STRING (SIZE(%d .. %d))' % (typ[1], typ[2])
+        if kind == 'ENUMERATED':
+            return 'ENUMERATED {%s}' % ', '.join(typ[1])
+        if kind == 'REF':
+            return typ[1]
+        if kind == 'SEQUENCE OF':
+            return 'SEQUENCE (SIZE(%d .. %d)) OF %s' % (typ[1], typ[2], self.ASN(typ[3]))
+        if kind == 'OPTIONAL':
+            return self.ASN(typ[1]) + ' OPTIONAL'
+        return '%s {%s}' % (kind, ', '.join(f + ' ' + self.ASN(t) for f, t in typ[1]))
+
+    def XML(self, typ: Any, line: int, out: List[str]) -> None:  # pylint: disable=invalid-sequence-index
+        kind = typ[0]
+        out.append('<Type Line="%d" CharPositionInLine="0">' % line)
+        if kind == 'INTEGER':
+            out.append('<IntegerType Min="%d" Max="%d"/>' % (typ[1], typ[2]))
+        elif kind == 'REAL':
+            out.append('<RealType Min="%d" Max="%d"/>' % (typ[1], typ[2]))
+        elif kind == 'BOOLEAN':
+            out.append('<BooleanType />')
+        elif kind == 'OCTET STRING':
+            out.append('<OctetStringType Min="%d" Max="%d"/>' % (typ[1], typ[2]))
+        elif kind == 'ENUMERATED':
+            out.append('<EnumeratedType Extensible="False" ValuesAutoCalculated="False"><EnumValues>')
+            for i, name in enumerate(typ[1]):
+                out.append(
+                    '<EnumValue StringValue="%s" IntValue="%d" Line="%d" CharPositionInLine="0" EnumID ="%s" />' % (
+                        name, i, line, name.replace('-', '_')))
+            out.append('</EnumValues></EnumeratedType>')
+        elif kind == 'REF':
+            out.append('<ReferenceType ReferencedTypeName="%s"/>' % typ[1])
+        elif kind == 'SEQUENCE OF':
+            out.append('<SequenceOfType Min="%d" Max="%d">' % (typ[1], typ[2]))
+            self.XML(typ[3], line, out)
+            out.append('</SequenceOfType>')
+        elif kind == 'SEQUENCE':
+            out.append('<SequenceType>')
+            for field, child in typ[1]:
+                optional = child[0] == 'OPTIONAL'
+                out.append(
+                    '<SequenceOrSetChild VarName="%s" CName="%s" AdaName="%s" Optional="%s" '
+                    'Line="%d" CharPositionInLine="0">' % (field, field, field, optional, line))
+                self.XML(child[1] if optional else child, line, out)
+                out.append('</SequenceOrSetChild>')
+            out.append('</SequenceType>')
+        else:
+            out.append('<ChoiceType>')
+            for field, child in typ[1]:
+                out.append(
+                    '<ChoiceChild VarName="%s" CName="%s" AdaName="%s" Line="%d" '
+                    'CharPositionInLine="0" EnumID ="%s_PRESENT">' % (field, field, field, line, field))
+                self.XML(child, line, out)
+                out.append('</ChoiceChild>')
+            out.append('</ChoiceType>')
+        out.append('</Type>')
+
+    def WriteASN(self, asnFile: str) -> None:
+        '''Writes the grammar (one type assignment per line, starting
+at line 3 - the XML AST refers to these line numbers).'''
+        with open(asnFile, 'w') as f:
+            f.write('%s DEFINITIONS AUTOMATIC TAGS ::= BEGIN\n\n' % self._module)
+            for name, typ in self._types:
+                f.write('%s ::= %s\n' % (name, self.ASN(typ)))
+            f.write('\nEND\n')
+
+    def WriteXML(self, xmlFile: str) -> None:
+        '''Writes the <Asn1Module> of the grammar, as ASN1SCC's xml.stg does.'''
+        out = ['<Asn1Module ID="%s">' % self._module, '<ExportedTypes>']
+        out.extend('<ExportedType Name="%s" />' % name for name, _ in self._types)
+        out.extend([
+            '</ExportedTypes>', '<ExportedVariables>', '</ExportedVariables>',
+            '<ImportedModules>', '</ImportedModules>', '<ExportedVariables>',
+            '</ExportedVariables>', '<TypeAssignments>'])
+        for line, (name, typ) in enumerate(self._types, 3):
+            out.append(
+                '<TypeAssignment Name="%s" Line="%d" CharPositionInLine="0">' % (name, line))
+            self.XML(typ, line, out)
+            out.append('</TypeAssignment>')
+        out.extend([
+            '</TypeAssignments>', '<VariablesAssignments>', '</VariablesAssignments>',
+            '</Asn1Module>'])
+        with open(xmlFile, 'w') as f:
+            f.write('\n'.join(out) + '\n')
+
+    def WriteAADL(self, f: Any, asnFile: str) -> None:
+        '''Writes the DATA definitions of the types, as asn2aadlPlus does.'''
+        for name, _ in self._types:
+            aadlName = name.replace('-', '_')
+            f.write('DATA %s\n' % aadlName)
+            f.write('PROPERTIES\n')
+            f.write('    -- name of the ASN.1 source file:\n')
+            f.write('    Source_Text => ("%s");\n' % asnFile)
+            f.write('    Source_Language => ASN1;\n')
+            f.write('    Deployment::ASN1_Module_Name => "%s";\n' % self._module)
+            f.write('    Source_Data_Size => %d B;\n' % self._sizes[name])
+            f.write('    -- name of the corresponding data type in the source file:\n')
+            f.write('    Type_Source_Name => "%s";\n' % name)
+            f.write('END %s;\n\n' % aadlName)
+
+
+def WriteFunctions(rand: random.Random, params: Dict[str, Any], grammars: List[Tuple[str, Grammar]], outputDir: str) -> None:  # pylint: disable=invalid-sequence-index
+    '''Writes the SUBPROGRAMs of the AADL system.'''
+    allTypes = [name for _, g in grammars for name, _ in g._types]
+    with open(os.path.join(outputDir, 'functions.aadl'), 'w') as f:
+        for i in range(params['functions']):
+            name = 'bench_fn%d' % i
+            language = g_languages[i % len(g_languages)]
+            fvName = '%s_fv' % name
+            f.write('SUBPROGRAM %s\n' % name)
+            if params['params']:
+                f.write('FEATURES\n')
+            for j in range(params['params']):
+                typeName = rand.choice(allTypes)
+                direction = 'OUT' if j == params['params'] - 1 else 'IN'
+                encoding = rand.choice(['UPER', 'NATIVE'])
+                f.write('\tp%d:%s PARAMETER DataView::%s {encoding=>%s;};\n' % (
+                    j, direction, typeName.replace('-', '_'), encoding))
+            f.write('END %s;\n\n' % name)
+            f.write('SUBPROGRAM IMPLEMENTATION %s.%s\n' % (name, language))
+            f.write('PROPERTIES\n')
+            f.write('\tFV_Name => "%s";\n' % fvName)
+            f.write('\tSource_Language => %s;\n' % language)
+            f.write('END %s.%s;\n\n' % (name, language))
+
+
+def Generate(scenario: str, outputDir: str, seed: int = 0) -> Dict[str, List[str]]:  # pylint: disable=invalid-sequence-index
+    '''Writes the files of a scenario in outputDir, and returns their names
+(relative to outputDir): {'asn': [...], 'aadl': [...]}.'''
+    params = Scenario(scenario)
+    rand = random.Random('%s/%d' % (scenario, seed))
+    if not os.path.isdir(outputDir):
+        os.makedirs(outputDir)
+    grammars = []  # type: List[Tuple[str, Grammar]]
+    for i in range(params['files']):
+        asnFile = 'bench%d.asn' % i
+        g = Grammar(rand, params, i)
+        g.WriteASN(os.path.join(outputDir, asnFile))
+        g.WriteXML(os.path.join(outputDir, asnFile + '.xml'))
+        grammars.append((asnFile, g))
+    with open(os.path.join(outputDir, 'DataView.aadl'), 'w') as f:
+        f.write('---------------------------------------------------\n')
+        f.write('--! File generated by synthetic.py: DO NOT EDIT !--\n')
+        f.write('---------------------------------------------------\n\n')
+        f.write('package DataView\n\npublic\n\n')
+        for asnFile, g in grammars:
+            g.WriteAADL(f, asnFile)
+        f.write('end DataView;\n')
+    WriteFunctions(rand, params, grammars, outputDir)
+    return {
+        'asn': [asnFile for asnFile, _ in grammars],
+        'aadl': ['functions.aadl', 'DataView.aadl'],
+    }
+
+
+def usage() -> None:
+    print('Usage:', os.path.basename(sys.argv[0]), '[-seed N] scenario outputDir')
+    print('Scenarios:', ', '.join(sorted(g_scenarios)))
+    sys.exit(1)
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    seed = 0
+    if '-seed' in args:
+        idx = args.index('-seed')
+        try:
+            seed = int(args[idx + 1])
+        except (IndexError, ValueError):
+            usage()
+        del args[idx:idx + 2]
+    if len(args) != 2 or args[0] not in g_scenarios:
+        usage()
+    files = Generate(args[0], args[1], seed)
+    print('Generated', ', '.join(files['asn'] + files['aadl']), 'in', args[1])
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
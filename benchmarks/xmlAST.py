@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# (C) Semantix Information Technologies.
+#
+# Semantix Information Technologies is licensing the code of the
+# Data Modelling Tools (DMT) in the following dual-license mode:
+#
+# Commercial Developer License:
+#       The DMT Commercial Developer License is the appropriate version
+# to use for the development of proprietary and/or commercial software.
+# This version is for developers/companies who do not want to share
+# the source code they develop with others or otherwise comply with the
+# terms of the GNU Lesser General Public License version 3.
+#
+# GNU LGPL v. 2.1:
+#       This version of DMT is the one to use for the development of
+# non-commercial applications, when you are willing to comply
+# with the terms of the GNU Lesser General Public License version 3.
+#
+# The features of the two licenses are summarized below:
+#
+#                       Commercial
+#                       Developer               LGPL
+#                       License
+#
+# License cost          License fee charged     No license fee
+#
+# Must provide source
+# code changes to DMT   No, modifications can   Yes, all source code
+#                       be closed               must be provided back
+#
+# Can create            Yes, that is,           No, applications are subject
+# proprietary           no source code needs    to the LGPL and all source code
+# applications          to be disclosed         must be made available
+#
+# Support               Yes, 12 months of       No, but available separately
+#                       premium technical       for purchase
+#                       support
+#
+# Charge for Runtimes   None                    None
+#
+'''
+Compares the two builders of the ASN.1 AST of asnParser
+
+The XML AST that ASN1SCC dumps (e.g. with the stand-in/asn1.exe of
+runBenchmarks.py, over a grammar of synthetic.py) is parsed with the
+Element tree builder and with the streaming (SAX) one, each in a forked
+child - so that their peak RSS are not mixed up. The wall time, the peak
+RSS and its growth during the parsing are reported, with a digest of the
+AST built, that must be the same for both:
+
+    ./xmlAST.py ast.xml
+'''
+import os
+import sys
+import time
+import hashlib
+import resource
+
+g_benchDir = os.path.abspath(os.path.dirname(__file__))
+g_repoDir = os.path.dirname(g_benchDir)
+sys.path.insert(0, g_repoDir)
+
+from dmt.commonPy import asnParser  # NOQA pylint: disable=wrong-import-position
+
+
+def Digest() -> str:
+    '''The digest of the types (and leaf types) of the AST just built.'''
+    names = asnParser.g_names
+    return hashlib.md5("\n".join(
+        "%s %s %s %s" % (k, names[k], asnParser.g_leafTypeDict[k], names[k]._isArtificial)
+        for k in sorted(names)).encode('utf-8')).hexdigest()
+
+
+def Measure(label: str, filename: str, bStreaming: bool) -> None:
+    readFd, writeFd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(readFd)
+        rssBefore = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        startTime = time.time()
+        asnParser.ParseASN1SCC_AST(filename, bStreaming)
+        elapsed = time.time() - startTime
+        rssPeak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        os.write(writeFd, ("%-14s %10.3f %16d %16d  %s\n" % (
+            label, elapsed, rssPeak, rssPeak - rssBefore, Digest())).encode('utf-8'))
+        os._exit(0)  # pylint: disable=protected-access
+    os.close(writeFd)
+    with os.fdopen(readFd) as f:
+        sys.stdout.write(f.read())
+    os.waitpid(pid, 0)
+
+
+def main() -> None:
+    if len(sys.argv) != 2 or not os.path.isfile(sys.argv[1]):
+        print('Usage:', os.path.basename(sys.argv[0]), 'ast.xml')
+        sys.exit(1)
+    print("%-14s %10s %16s %16s  %s" % ("builder", "wall (s)", "peak RSS (KB)", "RSS growth (KB)", "AST digest"))
+    for label, bStreaming in [("Element tree", False), ("streaming", True)]:
+        Measure(label, sys.argv[1], bStreaming)
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -20,13 +20,21 @@
 #
 import os
 import re
+import sys
 import copy
 import DV_Types  # pylint: disable=import-error
 from ctypes import (
     cdll, c_void_p, c_ubyte, c_double, c_uint,
-    c_longlong, c_bool, c_int, c_long
+    c_longlong, c_bool, c_int, c_long, c_size_t, c_char_p,
+    memmove, string_at, addressof, sizeof,
+    Structure, Union, Array
 )
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 # load the *getset.so in this folder
 script_path = os.path.dirname(os.path.realpath(__file__))
 soFileNames = [
@@ -53,11 +61,6 @@ GetStreamCurrentLength.restype = c_uint
 # Access BitStream buffer
 GetBitstreamBuffer = JMP.GetBitstreamBuffer
 GetBitstreamBuffer.restype = c_void_p
-# Read from buffer
-GetBufferByte = JMP.GetBufferByte
-GetBufferByte.restype = c_ubyte
-# Write to buffer
-SetBufferByte = JMP.SetBufferByte
 
 # Create pErr space for Encoders - i.e. sizeof(int)
 CreateInstanceOf_int = JMP.CreateInstanceOf_int
@@ -82,6 +85,279 @@ def myassert(b):
         raise AsnCoderError("Assertion failed...")
 
 
+def AsBytes(data):
+    """The strings of GetPyString hold one byte per char - accept them, as well as bytes"""
+    if isinstance(data, str):
+        return data.encode('latin-1')
+    return bytes(data)
+
+
+class IntFlag(c_int):
+    """The flag of ASN1SCC versions where it is an int - read back as a bool"""
+    pass
+
+
+# The ctypes result types of the getters, per C type (see DV_Types.funcTypeLookup)
+g_cTypesResultTypes = {
+    'asn1SccSint': c_longlong,
+    'byte': c_ubyte,
+    'double': c_double,
+    'flag': c_bool,
+    'int': c_int,
+    'long': c_long
+}
+
+
+def ArrayView(elementType, pData, count, owner):
+    """A view (no copy) of the count elements at pData: a NumPy array if NumPy
+is installed, the ctypes array otherwise (they both index and slice as lists
+do). The view keeps the owner of the data alive."""
+    view = (elementType * count).from_address(pData)
+    view._owner = owner
+    return view if numpy is None else numpy.ctypeslib.as_array(view)
+
+
+def AsArray(values, elementType):
+    """The values to copy with CopyArray"""
+    if numpy is not None:
+        return numpy.ascontiguousarray(values, dtype=elementType)
+    return values if isinstance(values, (list, tuple)) else list(values)
+
+
+def CopyArray(elementType, pData, values):
+    """Copies the values (from AsArray) to the elements at pData"""
+    if numpy is not None:
+        memmove(pData, values.ctypes.data, values.nbytes)
+    else:
+        (elementType * len(values)).from_address(pData)[:] = values
+
+
+# GSER (ASN.1 value notation) - for the GSER/SetFromGSER methods of the types
+
+def GSERString(data):
+    """The GSER of the bytes of an OCTET STRING (a " is written as "")"""
+    return '"' + bytes(data).decode('latin-1').replace('"', '""') + '"'
+
+
+def GSERNumbers(values):
+    """The GSER of the elements of a SEQUENCE OF INTEGER/REAL"""
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        values = values.tolist()
+    if not len(values):
+        return "{ }"
+    return "{ " + ", ".join(map(str, values)) + " }"
+
+
+class GSERReader(object):
+    """The tokens of a GSER text, read in order by the SetFromGSER methods"""
+
+    # Identifiers, punctuation and numbers first: they are the most frequent
+    tokenizer = re.compile(
+        r'''\s*([A-Za-z][-\w]*|[{},:]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|"(?:[^"]|"")*"|'[^']*'[HB]|\S)''')
+
+    def __init__(self, text):
+        self.tokens = tuple(GSERReader.tokenizer.findall(text))
+        self.pos = 0
+
+    def Fail(self, message):
+        if 0 < self.pos <= len(self.tokens):
+            where = "'%s' (token %d)" % (self.tokens[self.pos - 1], self.pos)
+        else:
+            where = "the end of the text"
+        raise AsnCoderError("Invalid GSER value: %s, at %s" % (message, where))
+
+    def Next(self):
+        self.pos += 1
+        if self.pos > len(self.tokens):
+            self.Fail("the text is incomplete")
+        return self.tokens[self.pos - 1]
+
+    def Expect(self, *tokens):
+        """Reads the constant parts of the text (braces, commas, field names)"""
+        start = self.pos
+        self.pos += len(tokens)
+        if self.tokens[start:self.pos] != tokens:
+            self.pos = start
+            for token in tokens:
+                if self.Next() != token:
+                    self.Fail("expected '%s'" % token)
+
+    def End(self):
+        if self.pos != len(self.tokens):
+            self.pos += 1
+            self.Fail("unexpected text after the value")
+
+    def Int(self):
+        try:
+            return int(self.Next())
+        except ValueError:
+            self.Fail("expected an INTEGER")
+
+    def Real(self):
+        try:
+            return float(self.Next())
+        except ValueError:
+            self.Fail("expected a REAL")
+
+    def Bool(self):
+        token = self.Next()
+        if token == "TRUE":
+            return True
+        if token != "FALSE":
+            self.Fail("expected TRUE or FALSE")
+        return False
+
+    def Enum(self, values):
+        try:
+            return values[self.Next()]
+        except KeyError:
+            self.Fail("unknown enumerant")
+
+    def String(self, minLength, maxLength):
+        """The bytes of a "text", 'hex'H or 'bits'B"""
+        token = self.Next()
+        try:
+            if token.startswith('"'):
+                data = bytearray(token[1:-1].replace('""', '"').encode('latin-1'))
+            elif token.endswith("'H"):
+                digits = "".join(token[1:-2].split())
+                data = bytearray.fromhex(digits + "0" * (len(digits) % 2))
+            elif token.endswith("'B"):
+                bits = "".join(token[1:-2].split())
+                bits += "0" * (-len(bits) % 8)
+                data = bytearray(int(bits[i:i + 8], 2) for i in range(0, len(bits), 8))
+            else:
+                raise ValueError()
+        except ValueError:
+            self.Fail("expected an OCTET STRING")
+        if not minLength <= len(data) <= maxLength:
+            self.Fail("%d bytes, instead of %d to %d" % (len(data), minLength, maxLength))
+        return data
+
+    def Alternative(self):
+        """The name of the alternative of a CHOICE ('name: value')"""
+        name = self.Next()
+        self.Expect(":")
+        return name
+
+    def More(self, count, maxLength):
+        """Whether another element of a SEQUENCE OF follows the first count ones
+(the '}' after the last one is consumed)"""
+        token = self.Next()
+        if token == "}":
+            return False
+        if count == 0:
+            self.pos -= 1
+        elif token != ",":
+            self.Fail("expected ',' or '}'")
+        if count >= maxLength:
+            self.Fail("more than %d elements" % maxLength)
+        return True
+
+    def Numbers(self, convert, minLength, maxLength):
+        """The elements of a SEQUENCE OF INTEGER/REAL, as a list"""
+        self.Expect("{")
+        start = self.pos
+        try:
+            # All at once, if the text is valid
+            end = self.tokens.index("}", start)
+            elements = self.tokens[start:end:2]
+            commas = self.tokens[start + 1:end:2]
+            if len(commas) == max(len(elements) - 1, 0) and commas.count(",") == len(commas) \
+                    and minLength <= len(elements) <= maxLength:
+                values = list(map(convert, elements))
+                self.pos = end + 1
+                return values
+        except ValueError:
+            pass
+        # One by one, to report where the text is invalid
+        values = []
+        while self.More(len(values), maxLength):
+            try:
+                values.append(convert(self.Next()))
+            except ValueError:
+                self.Fail("expected a number")
+        if len(values) < minLength:
+            self.Fail("%d elements, instead of at least %d" % (len(values), minLength))
+        return values
+
+
+class AccessPath(object):
+    """One node of the tree of access paths into a type, e.g. the ".x.y[]"
+of a.x.y[2] - the indexes are not part of it, they are passed as params.
+
+It keeps the name of the C getter/setter functions of the path, the nodes
+that extend it, and the bridge functions resolved so far; all these are
+formed once, and shared by all the instances of the type."""
+    __slots__ = ["_parent", "_name", "_Caccessor", "_children", "_functions"]
+
+    def __init__(self, Caccessor, parent=None, name=None):
+        self._parent = parent
+        self._name = name  # None for the [idx] steps
+        self._Caccessor = Caccessor
+        self._children = {}
+        self._functions = {}
+
+    def Child(self, name):
+        child = self._children.get(name)
+        if child is None:
+            Caccessor = self._Caccessor + ("_iDx" if name is None else "_" + Clean(name))
+            child = self._children[name] = AccessPath(Caccessor, self, name)
+        return child
+
+    def Describe(self, params):
+        """The access path as the script wrote it, e.g. '.x.y[2]'"""
+        names = []
+        node = self
+        while node._parent is not None:
+            names.append(node._name)
+            node = node._parent
+        indexes = iter(params)
+        return "".join(
+            "." + name if name is not None else "[" + str(next(indexes, "?")) + "]"
+            for name in reversed(names))
+
+    def Getter(self, postfix):
+        bridgeFunc = self._functions.get("_Get" + postfix)
+        if bridgeFunc is None:
+            bridgeFuncName = self._Caccessor + "_Get" + postfix
+            if bridgeFuncName not in DV_Types.funcTypeLookup:
+                raise AsnCoderError("Function %s not found in lookup - contact support." % bridgeFuncName)
+            resType = DV_Types.funcTypeLookup[bridgeFuncName]
+            if resType.endswith('*'):
+                cTypesResultType = c_void_p
+            else:
+                cTypesResultType = g_cTypesResultTypes.get(resType, None)
+                if cTypesResultType is None:
+                    raise AsnCoderError("Result type of %s not yet supported in the Python mapper - contact support." % resType)
+            # A function object of our own, so that its restype stays as set here
+            bridgeFunc = JMP[bridgeFuncName]
+            bridgeFunc.restype = cTypesResultType
+            self._functions["_Get" + postfix] = bridgeFunc
+        return bridgeFunc
+
+    def Array(self):
+        """The ctypes type of the elements of the SEQUENCE OF (or OCTET STRING)
+of the path, the maximum number of elements, and whether it is variable-size"""
+        bridgeFuncName = self._Caccessor + "_GetBuffer"
+        if bridgeFuncName not in DV_Types.arraySizes:
+            raise AsnCoderError("The access path you used (%s) is not a SEQUENCE OF BOOLEAN/INTEGER/REAL/ENUMERATED." % (
+                self.Describe([])))
+        elementType = DV_Types.funcTypeLookup[bridgeFuncName][:-1]
+        if elementType == 'flag':
+            elementType = c_bool if JMP.SizeOf_flag() == 1 else c_int
+        else:
+            elementType = g_cTypesResultTypes[elementType]
+        capacity, isVariable = DV_Types.arraySizes[bridgeFuncName]
+        return elementType, capacity, isVariable
+
+    def Setter(self, postfix):
+        bridgeFunc = self._functions.get("_Set" + postfix)
+        if bridgeFunc is None:
+            bridgeFunc = self._functions["_Set" + postfix] = getattr(JMP, self._Caccessor + "_Set" + postfix)
+        return bridgeFunc
+
+
 class DataStream(object):
     """ASN1SCC BitStream equivalent"""
     def __init__(self, bufferSize):
@@ -99,27 +375,17 @@ class DataStream(object):
         ResetStream(self._bs)
 
     def GetPyString(self):
-        # print "Reading",
-        msg = ""
-        pData = c_void_p(GetBitstreamBuffer(self._bs))
-        for i in range(0, GetStreamCurrentLength(self._bs)):
-            b = GetBufferByte(pData, i)
-            msg += chr(b)
-            # print b, ",",
-        # print "EOF"
-        return msg
+        # One copy of the whole encoded data (one char per byte, as before)
+        pData = GetBitstreamBuffer(self._bs)
+        return string_at(pData, GetStreamCurrentLength(self._bs)).decode('latin-1')
 
     def SetFromPyString(self, data):
+        data = AsBytes(data)
         strLength = len(data)
         assert self._bufferSize >= strLength
         self._bs.count = strLength
-        pData = c_void_p(GetBitstreamBuffer(self._bs))
-        # print "Writing",
-        for i in range(0, strLength):
-            b = ord(data[i])
-            # print b, ",",
-            SetBufferByte(pData, i, b)
-        # print "EOF"
+        pData = GetBitstreamBuffer(self._bs)
+        memmove(pData, data, strLength)
 
 
 class COMMON(object):
@@ -136,8 +402,9 @@ considers "unexpected". Therefore, when the script does this...
 ... __getattr__ is called to ask us how to provide a ".x" member.
 We do two things to cope:
 
-(1) we form the equivalent path to the C getter/setter function
-    (in self._Caccessor)
+(1) we move to the equivalent path to the C getter/setter function
+    (in self._path - an AccessPath, shared by all the instances of
+    the type, that keeps the bridge functions once they are resolved)
 (2) we form a list of params, which is basically the indexes of
     whatever arrays we meet in the access path
 
@@ -154,12 +421,17 @@ call), we have to reset the "paths" we have formed, so that the
 next chain will restart from the beginning. That's what the Reset
 method does.
 However, we also have some helper functions for OCTET STRINGs:
-GetPyString and SetFromPyString. These have to do a per-byte loop,
-and if they used the "Get" and "Set" as they originally were,
-the path would be reset after accessing the [0] element...
+GetPyString and SetFromPyString. These read the length first, and
+if they used the "Get" and "Set" as they originally were, the path
+would be reset before accessing the data...
 So we added a keyword boolean param called "reset", which disables
 this Reset when it is used from within GetPyString and
-SetFromPyString.
+SetFromPyString. The data themselves are copied in one go, from/to
+the address returned by the path's GetBuffer.
+The SEQUENCE OFs of BOOLEAN/INTEGER/REAL/ENUMERATED have a GetBuffer
+too: GetArray returns their elements as a NumPy array (or, without
+NumPy, a ctypes array) over the data themselves, and SetFromArray
+sets them all in one copy.
     Another keyword param is postfix: it is simply used to allow
 re-use of the Get and Set code for the GetLength and SetLength
 members of SEQUENCEOF/SETOFs and OCTETSTRINGs:
@@ -176,8 +448,11 @@ An example for SetLength:
     a.y[3].Set(16)
 """
 
-    allowed = ["_nodeTypeName", "_ptr", "_pErr", "_Caccessor", "_accessPath",
-               "_params", "_new_ptr"]
+    allowed = frozenset(["_nodeTypeName", "_ptr", "_pErr", "_root", "_path",
+                         "_params", "_new_ptr"])
+
+    # The root AccessPath of each type
+    roots = {}
 # , "Get", "GetLength", "Set", "SetLength", "Reset", "Encode", "Decode", "SetFromPyString", "GetPyString", "allowed"]
 
     def __init__(self, nodeTypeName, ptr=None):
@@ -189,20 +464,23 @@ An example for SetLength:
         self._ptr = ptr or constructor()
         self._ptr = c_void_p(self._ptr)
         self._pErr = c_void_p(CreateInstanceOf_int())
-        self._Caccessor = ""
+        root = COMMON.roots.get(nodeTypeName)
+        if root is None:
+            root = COMMON.roots[nodeTypeName] = AccessPath(Clean(nodeTypeName) + "_")
+        self._root = root
+        self._path = root
         self._params = []
-        self._accessPath = ""
 
     def Reset(self, state=None):
         if state is None:
-            self._Caccessor = ""
-            self._params = []
-            self._accessPath = ""
+            object.__setattr__(self, "_path", self._root)
+            object.__setattr__(self, "_params", [])
         else:
-            self._Caccessor, self._params, self._accessPath = state[0][:], copy.deepcopy(state[1]), state[2][:]
+            object.__setattr__(self, "_path", state[0])
+            object.__setattr__(self, "_params", copy.deepcopy(state[1]))
 
     def GetState(self):
-        return self._Caccessor[:], copy.deepcopy(self._params), self._accessPath[:]
+        return self._path, copy.deepcopy(self._params)
 
     def SetData(self, src):
         bridgeFct = getattr(JMP, "SetDataFor_" + Clean(self._nodeTypeName))
@@ -219,8 +497,7 @@ An example for SetLength:
         return "Choose the information you want - whole-structure or sequence dump not supported."
 
     def __getattr__(self, x):
-        self._Caccessor += "_" + Clean(x)
-        self._accessPath += "." + x
+        object.__setattr__(self, "_path", self._path.Child(x))
         return self
 
     def __setattr__(self, name, value):
@@ -230,35 +507,15 @@ An example for SetLength:
         object.__setattr__(self, name, value)
 
     def __getitem__(self, idx):
-        self._Caccessor += "_iDx"
+        object.__setattr__(self, "_path", self._path.Child(None))
         self._params.append(idx)
-        self._accessPath += "[" + str(idx) + "]"
         return self
 
     def Get(self, **args):  # postfix="", reset=True
         try:
-            bridgeFuncName = Clean(self._nodeTypeName) + "_" + self._Caccessor + "_Get" + args.get("postfix", "")
-            if bridgeFuncName not in DV_Types.funcTypeLookup:
-                raise AsnCoderError("Function %s not found in lookup - contact support." % bridgeFuncName)
-            resType = DV_Types.funcTypeLookup[bridgeFuncName]
-            if resType.endswith('*'):
-                cTypesResultType = c_void_p
-            else:
-                cTypesResultType = {
-                    'asn1SccSint': c_longlong,
-                    'byte': c_ubyte,
-                    'double': c_double,
-                    'flag': c_bool,
-                    'int': c_int,
-                    'long': c_long
-                }.get(resType, None)
-                if cTypesResultType is None:
-                    raise AsnCoderError("Result type of %s not yet supported in the Python mapper - contact support." % resType)
-            bridgeFunc = getattr(JMP, bridgeFuncName)
-            bridgeFunc.restype = cTypesResultType
-            retVal = bridgeFunc(self._ptr, *self._params)
+            retVal = self._path.Getter(args.get("postfix", ""))(self._ptr, *self._params)
         except:
-            oldAP = self._accessPath
+            oldAP = self._path.Describe(self._params)
             if args.get("reset", True):
                 self.Reset()
             raise AsnCoderError("The access path you used (%s) is not valid." % oldAP)
@@ -268,19 +525,16 @@ An example for SetLength:
 
     def Set(self, value, **args):  # postfix="", reset=True
         try:
-            # print Clean(self._nodeTypeName) + "_" + self._Caccessor + "_Set"+postfix
-            bridgeFunc = getattr(JMP, Clean(self._nodeTypeName) + "_" + self._Caccessor + "_Set" + args.get("postfix", ""))
+            bridgeFunc = self._path.Setter(args.get("postfix", ""))
             if isinstance(value, float):
                 ctypesValue = c_double(value)
             elif isinstance(value, int):
                 ctypesValue = c_longlong(value)
             else:
                 ctypesValue = value
-            self._params.append(ctypesValue)
-            bridgeFunc(self._ptr, *self._params)
-            self._params.pop()
+            bridgeFunc(self._ptr, *self._params, ctypesValue)
         except Exception as e:
-            oldAP = self._accessPath
+            oldAP = self._path.Describe(self._params)
             if args.get("reset", True):
                 self.Reset()
             raise AsnCoderError(
@@ -297,10 +551,7 @@ An example for SetLength:
 
     @staticmethod
     def getErrCode(pErr):
-        errCode = 0
-        for i in range(4):
-            errCode = (errCode << 8) | GetBufferByte(pErr, (3 - i))
-        return errCode
+        return c_uint.from_address(pErr.value).value
 
     def Encode(self, bitstream, bACN=False):
         """Returns (booleanSuccess, ASN1SCC iErrorCode)
@@ -347,26 +598,298 @@ grep for the errorcode value inside ASN1SCC generated headers."""
 # OCTET STRING
 
     def SetFromPyString(self, src):
+        src = AsBytes(src)
         strLength = len(src)
         self.SetLength(strLength, False)
-        self._Caccessor += "_iDx"
-        accessPath = self._accessPath
-        for idx in range(0, strLength):
-            self._params.append(idx)
-            self._accessPath = accessPath + "[" + str(idx) + "]"
-            self.Set(ord(src[idx]), reset=False)
-            self._params.pop()
-        self.Reset()
+        memmove(self.Get(postfix="Buffer"), src, strLength)
 
     def GetPyString(self):
-        retval = ""
         strLength = self.GetLength(False)
-        self._Caccessor += "_iDx"
-        accessPath = self._accessPath
-        for idx in range(0, strLength):
-            self._params.append(idx)
-            self._accessPath = accessPath + "[" + str(idx) + "]"
-            retval += chr(self.Get(reset=False))
-            self._params.pop()
+        return string_at(self.Get(postfix="Buffer"), strLength).decode('latin-1')
+
+# SEQUENCE OF BOOLEAN/INTEGER/REAL/ENUMERATED (and OCTET STRING)
+
+    def GetArray(self):
+        """All the elements at once, without copying them - see ArrayView"""
+        try:
+            elementType, _, _ = self._path.Array()
+        except AsnCoderError:
+            self.Reset()
+            raise
+        count = self.GetLength(False)
+        return ArrayView(elementType, self.Get(postfix="Buffer"), count, self)
+
+    def SetFromArray(self, values):
+        """Sets the length (if it is variable) and all the elements at once"""
+        try:
+            elementType, capacity, isVariable = self._path.Array()
+            values = AsArray(values, elementType)
+            if len(values) > capacity:
+                raise AsnCoderError("%d elements don't fit in an array of up to %d" % (len(values), capacity))
+        except Exception:
+            self.Reset()
+            raise
+        if isVariable:
+            self.SetLength(len(values), False)
+        CopyArray(elementType, self.Get(postfix="Buffer"), values)
+
+
+# The struct layouts of asn2dataModel -toPython -pythonStructs (see DV_Layout.py)
+
+class ChoiceLayout(Structure):
+    """Base of the layouts of CHOICEs, whose fields are in .u"""
+    pass
+
+
+def SEQUENCE(*fields):
+    """The layout of a C struct with these (name, ctype) fields"""
+    return type("SEQUENCE", (Structure,), {"_fields_": list(fields)})
+
+
+def CHOICE(*fields):
+    """The layout of an ASN1SCC CHOICE: the kind, and a union of these fields"""
+    union = type("CHOICE_u", (Union,), {"_fields_": list(fields)})
+    return type("CHOICE", (ChoiceLayout,), {"_fields_": [("kind", c_int), ("u", union)]})
+
+
+def LayoutOffsets(layout, path="", base=0, offsets=None):
+    """The offsets of the fields of a layout (and of their own fields, down
+to the first element of the arrays), by their C access path - as the
+FieldOf_/OffsetOf_ functions of the .so list them. The bits of the exist
+fields have none."""
+    if offsets is None:
+        offsets = {}
+    if not issubclass(layout, (Structure, Union)):
+        return offsets
+    for field in layout._fields_:
+        if len(field) > 2:
+            continue
+        name, ctype = field
+        fieldPath = path + name
+        offset = base + getattr(layout, name).offset
+        offsets[fieldPath] = offset
+        while issubclass(ctype, Array):
+            ctype = ctype._type_
+            fieldPath += "[0]"
+        LayoutOffsets(ctype, fieldPath + ".", offset, offsets)
+    return offsets
+
+
+class STRUCT(COMMON):
+    """The Python "proxy" classes of asn2dataModel -toPython -pythonStructs.
+
+They offer the same interface as COMMON, but instead of calling a C
+getter/setter for each access path, they read and write the fields in
+place, through a ctypes description of the ASN1SCC struct of the type
+(generated in DV_Layout.py). The .so then only carries the codecs
+and a few functions per type.
+
+The steps of the access path (field names and array indexes) are only
+collected by __getattr__ and __getitem__; Get and Set walk them over
+the ctypes objects.
+"""
+
+    # The types whose layout has been checked against their ASN1SCC struct
+    checked = set()
+
+    def __init__(self, nodeTypeName, layout, ptr=None):
+        # First, so that __getattr__ works even if the rest fails
+        object.__setattr__(self, "_steps", [])
+        super(STRUCT, self).__init__(nodeTypeName, ptr)
+        if nodeTypeName not in STRUCT.checked:
+            cSize = getattr(JMP, "SizeOf_" + Clean(nodeTypeName))()
+            if sizeof(layout) != cSize:
+                raise AsnCoderError(
+                    "The layout of %s in DV_Layout.py (%d bytes) does not match its ASN1SCC struct (%d bytes)"
+                    " - use the Python mapping with C getters and setters instead." % (
+                        nodeTypeName, sizeof(layout), cSize))
+            fieldOf = getattr(JMP, "FieldOf_" + Clean(nodeTypeName))
+            fieldOf.restype = c_char_p
+            offsetOf = getattr(JMP, "OffsetOf_" + Clean(nodeTypeName))
+            offsetOf.restype = c_size_t
+            cOffsets = {}
+            field = fieldOf(0)
+            while field is not None:
+                cOffsets[field.decode("ascii")] = offsetOf(len(cOffsets))
+                field = fieldOf(len(cOffsets))
+            offsets = LayoutOffsets(layout)
+            for field in sorted(set(cOffsets) | set(offsets)):
+                if cOffsets.get(field) != offsets.get(field):
+                    raise AsnCoderError(
+                        "The layout of %s in DV_Layout.py does not match its ASN1SCC struct (at its field %s)"
+                        " - use the Python mapping with C getters and setters instead." % (nodeTypeName, field))
+            STRUCT.checked.add(nodeTypeName)
+        object.__setattr__(self, "_data", layout.from_address(self._ptr.value))
+
+    def __del__(self):
+        # Nothing was allocated if the construction failed early
+        if "_pErr" in self.__dict__:
+            super(STRUCT, self).__del__()
+
+    def Reset(self, state=None):
+        object.__setattr__(self, "_steps", [] if state is None else list(state))
+
+    def GetState(self):
+        return list(self._steps)
+
+    def __getattr__(self, x):
+        # Only reached for the members that are not set (yet): ASN.1 field
+        # names never start with an underscore
+        if x.startswith("_"):
+            raise AttributeError(x)
+        self._steps.append(x)
+        return self
+
+    def __getitem__(self, idx):
+        self._steps.append(int(idx))
+        return self
+
+    def Describe(self):
+        return "".join(
+            "." + step if isinstance(step, str) else "[" + str(step) + "]"
+            for step in self._steps)
+
+    @staticmethod
+    def Step(obj, step):
+        if isinstance(step, str):
+            if step != "kind" and isinstance(obj, ChoiceLayout):
+                obj = obj.u
+            return obj, step
+        return obj.arr, step
+
+    def Walk(self):
+        """Returns the ctypes object holding the last step, and the last step"""
+        steps = self._steps
+        obj = self._data
+        for step in steps[:-1]:
+            obj, key = STRUCT.Step(obj, step)
+            obj = getattr(obj, key) if isinstance(key, str) else obj[key]
+        return STRUCT.Step(obj, steps[-1])
+
+    def Target(self):
+        """The ctypes object at the end of the access path"""
+        if not self._steps:
+            return self._data
+        obj, key = self.Walk()
+        return getattr(obj, key) if isinstance(key, str) else obj[key]
+
+    def Get(self, **args):  # postfix="", reset=True
+        try:
+            if not self._steps:
+                retVal = self._data
+            else:
+                obj, key = self.Walk()
+                retVal = getattr(obj, key) if isinstance(key, str) else obj[key]
+            if isinstance(retVal, (Structure, Union)):
+                # As the C getters of the fields that are SEQUENCEs etc.
+                retVal = addressof(retVal)
+            elif isinstance(retVal, IntFlag):
+                retVal = retVal.value != 0
+            elif not isinstance(retVal, (int, float, bool)):
+                retVal = retVal.value
+        except:
+            oldAP = self.Describe()
+            if args.get("reset", True):
+                self.Reset()
+            raise AsnCoderError("The access path you used (%s) is not valid." % oldAP)
+        if args.get("reset", True):
+            self.Reset()
+        return retVal
+
+    def Set(self, value, **args):  # postfix="", reset=True
+        try:
+            if not self._steps:
+                self._data.value = value
+            else:
+                obj, key = self.Walk()
+                if isinstance(key, str):
+                    # ctypes would just add any other attribute to the struct
+                    if key not in [field[0] for field in obj._fields_]:
+                        raise AttributeError("no field '%s'" % key)
+                    setattr(obj, key, value)
+                else:
+                    obj[key] = value
+        except Exception as e:
+            oldAP = self.Describe()
+            if args.get("reset", True):
+                self.Reset()
+            raise AsnCoderError(
+                "The access path you used (%s) or the value you tried to assign (%s) is not valid. %s" % (
+                    oldAP, str(value), str(e)))
+        if args.get("reset", True):
+            self.Reset()
+
+    def GetLength(self, reset=True):
+        try:
+            obj = self.Target()
+            retVal = obj.nCount if hasattr(obj, "nCount") else len(obj.arr)
+        except:
+            oldAP = self.Describe()
+            self.Reset()
+            raise AsnCoderError("The access path you used (%s) is not valid." % oldAP)
+        if reset:
+            self.Reset()
+        return retVal
+
+    def SetLength(self, value, reset=True):
+        try:
+            obj = self.Target()
+            if hasattr(obj, "nCount"):
+                obj.nCount = value
+            else:
+                sys.stderr.write("WARNING: setting length of fixed-length sequence\n")
+        except Exception as e:
+            oldAP = self.Describe()
+            self.Reset()
+            raise AsnCoderError(
+                "The access path you used (%s) or the value you tried to assign (%s) is not valid. %s" % (
+                    oldAP, str(value), str(e)))
+        if reset:
+            self.Reset()
+
+    def SetFromPyString(self, src):
+        src = AsBytes(src)
+        strLength = len(src)
+        obj = self.Target()
+        if strLength > len(obj.arr):
+            self.Reset()
+            raise AsnCoderError("%d bytes don't fit in an OCTET STRING of up to %d" % (strLength, len(obj.arr)))
+        self.SetLength(strLength)
+        memmove(addressof(obj.arr), src, strLength)
+
+    def GetPyString(self):
+        obj = self.Target()
+        strLength = obj.nCount if hasattr(obj, "nCount") else len(obj.arr)
+        self.Reset()
+        return string_at(addressof(obj.arr), strLength).decode('latin-1')
+
+    def Array(self):
+        """The .arr of the SEQUENCE OF (or OCTET STRING) of the path, and the
+ctypes type of its elements"""
+        try:
+            obj = self.Target()
+            elements = obj.arr
+            elementType = elements._type_
+        except:
+            elementType = None
+        if elementType is None or issubclass(elementType, (Structure, Union, Array)):
+            oldAP = self.Describe()
+            self.Reset()
+            raise AsnCoderError("The access path you used (%s) is not a SEQUENCE OF BOOLEAN/INTEGER/REAL/ENUMERATED." % oldAP)
         self.Reset()
-        return retval
+        # The elements of the arrays are values, not IntFlag objects
+        return obj, elements, c_int if elementType is IntFlag else elementType
+
+    def GetArray(self):
+        obj, elements, elementType = self.Array()
+        count = obj.nCount if hasattr(obj, "nCount") else len(elements)
+        return ArrayView(elementType, addressof(elements), count, self)
+
+    def SetFromArray(self, values):
+        obj, elements, elementType = self.Array()
+        values = AsArray(values, elementType)
+        if len(values) > len(elements):
+            raise AsnCoderError("%d elements don't fit in an array of up to %d" % (len(values), len(elements)))
+        if hasattr(obj, "nCount"):
+            obj.nCount = len(values)
+        CopyArray(elementType, addressof(elements), values)
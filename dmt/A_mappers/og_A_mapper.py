@@ -27,6 +27,7 @@ from ..commonPy import asnParser
 from ..commonPy.cleanupNodes import SetOfBadTypenames
 from ..commonPy.asnAST import AsnBasicNode, AsnSequenceOrSet, AsnSequenceOrSetOf, AsnEnumerated, AsnChoice
 from ..commonPy.asnParser import AST_Leaftypes
+from ..commonPy.outputFile import OutputFile
 
 g_outputDir = ""
 g_asnFile = ""
@@ -91,7 +92,7 @@ def OnShutdown(unused_badTypes: SetOfBadTypenames) -> None:
     # text = open(g_asnFile, 'r').read()
     # text = re.sub(r'^.*BEGIN', 'Datamodel DEFINITIONS ::= BEGIN', text)
     # text = re.sub(r'--.*', '', text)
-    outputFile = open(g_outputDir + "DataView.pr", 'w')
+    outputFile = OutputFile(g_outputDir + "DataView.pr")
     outputFile.write('Datamodel DEFINITIONS ::= BEGIN\n\n')
     asnParser.PrintGrammarFromAST(outputFile)
     outputFile.write('END\n')
@@ -21,14 +21,15 @@
 import re
 import os
 
-from typing import Union, List  # NOQA pylint: disable=unused-import
+from typing import Union, List, Set, Optional, Dict, Tuple  # NOQA pylint: disable=unused-import
 
-from ..commonPy import asnParser
+from ..commonPy import asnParser, configMT
 from ..commonPy.utility import panic, inform
+from ..commonPy.outputFile import OutputFile
 from ..commonPy.asnAST import (
     AsnBool, AsnInt, AsnReal, AsnString, isSequenceVariable, AsnEnumerated,
     AsnSequence, AsnSet, AsnChoice, AsnMetaMember, AsnSequenceOf, AsnSetOf,
-    AsnBasicNode, AsnNode, AsnSequenceOrSet, AsnSequenceOrSetOf)
+    AsnBasicNode, AsnNode, AsnSequenceOrSet, AsnSequenceOrSetOf, isOptional)
 from ..commonPy.asnParser import AST_Lookup, AST_Leaftypes
 from ..commonPy.cleanupNodes import SetOfBadTypenames
 
@@ -41,6 +42,15 @@ g_outputGetSetC = None
 
 g_bHasStartupRunOnce = False
 
+# The maximum number of elements in the arrays (.arr) of the SEQUENCE OFs and
+# OCTET STRINGs, and whether their length is variable, per _GetBuffer function
+# - for GetArray/SetFromArray (see Stubs.py)
+g_arraySizes = {}  # type: Dict[str, Tuple[int, bool]]
+
+# The enumerations met while generating GSER/SetFromGSER: the name of the
+# tables (of names per value, and of values per name) of each set of enumerants
+g_gserEnumTables = {}  # type: Dict[Tuple[Tuple[str, int], ...], str]
+
 
 def Version() -> None:
     print("Code generator: " +
@@ -74,30 +84,38 @@ def OnStartup(unused_modelingLanguage: str, asnFile: str, outputDir: str, badTyp
     base = re.sub(r'[^a-zA-Z0-9_-]', '_', origGrammarBase)
     inform("Python_A_mapper: Creating file '%s'...", outputFilename)
     global g_outputFile
-    g_outputFile = open(outputDir + outputFilename, 'w')
-    g_outputFile.write("from functools import partial\n\n")
-    g_outputFile.write("import DV\n\n")
-    g_outputFile.write("from Stubs import (\n")
+    g_outputFile = OutputFile(outputDir + outputFilename)
+    g_outputFile.write("import DV\n")
+    if configMT.g_bPythonStructs:
+        g_outputFile.write("import DV_Layout\n")
+        g_outputFile.write("\nfrom ctypes import string_at, addressof\n")
+    g_outputFile.write("\nfrom Stubs import (\n")
     g_outputFile.write(
-        "    myassert, Clean, DataStream, COMMON)\n\n")
+        "    myassert, Clean, DataStream, COMMON%s,\n" % (", STRUCT" if configMT.g_bPythonStructs else ""))
+    g_outputFile.write("    GSERReader, GSERString, GSERNumbers)\n\n")
     global g_outputGetSetH
-    g_outputGetSetH = open(outputDir + base + "_getset.h", "w")
+    g_outputGetSetH = OutputFile(outputDir + base + "_getset.h")
     g_outputGetSetH.write('#ifndef __GETSET_H__\n#define __GETSET_H__\n\n')
     g_outputGetSetH.write('#include "%s.h"\n\n' % origGrammarBase)
     g_outputGetSetH.write('size_t GetStreamCurrentLength(BitStream *pBitStrm);\n')
     g_outputGetSetH.write('byte *GetBitstreamBuffer(BitStream *pBitStrm);\n')
     g_outputGetSetH.write('byte GetBufferByte(byte *p, size_t off);\n')
     g_outputGetSetH.write('void SetBufferByte(byte *p, size_t off, byte b);\n')
+    g_outputGetSetH.write('size_t SizeOf_flag(void);\n')
     g_outputGetSetH.write('void ResetStream(BitStream *pStrm);\n')
     g_outputGetSetH.write('BitStream *CreateStream(size_t bufferSize);\n')
     g_outputGetSetH.write('void DestroyStream(BitStream *pBitStrm);\n\n')
     global g_outputGetSetC
-    g_outputGetSetC = open(outputDir + "%s_getset.c" % base, "w")
+    g_outputGetSetC = OutputFile(outputDir + "%s_getset.c" % base)
     g_outputGetSetC.write('#include <stdio.h>\n')
     g_outputGetSetC.write('#include <stdlib.h>\n')
     g_outputGetSetC.write('#include <assert.h>\n')
     g_outputGetSetC.write('#include <string.h>\n')
+    if configMT.g_bPythonStructs:
+        g_outputGetSetC.write('#include <stddef.h>\n')
     g_outputGetSetC.write('#include "%s_getset.h"\n\n' % base)
+    if configMT.g_bPythonStructs:
+        g_outputGetSetC.write('typedef struct { const char *field; size_t offset; } FieldOffset;\n\n')
     g_outputGetSetC.write('size_t GetStreamCurrentLength(BitStream *pBitStrm) {\n')
     g_outputGetSetC.write('    return pBitStrm->currentByte + ((pBitStrm->currentBit+7)/8);\n')
     g_outputGetSetC.write('}\n\n')
@@ -112,6 +130,9 @@ def OnStartup(unused_modelingLanguage: str, asnFile: str, outputDir: str, badTyp
     g_outputGetSetC.write('    assert(p);\n')
     g_outputGetSetC.write('    p[off] = b;\n')
     g_outputGetSetC.write('}\n\n')
+    g_outputGetSetC.write('size_t SizeOf_flag(void) {\n')
+    g_outputGetSetC.write('    return sizeof(flag);\n')
+    g_outputGetSetC.write('}\n\n')
     g_outputGetSetC.write('void ResetStream(BitStream *pStrm) {\n')
     g_outputGetSetC.write('    assert(pStrm);\n')
     g_outputGetSetC.write('    assert(pStrm->count > 0);\n')
@@ -134,7 +155,7 @@ def OnStartup(unused_modelingLanguage: str, asnFile: str, outputDir: str, badTyp
     g_outputGetSetC.write('    free(pBitStrm->buf);\n')
     g_outputGetSetC.write('    free(pBitStrm);\n')
     g_outputGetSetC.write('}\n\n')
-    makefile = open(outputDir + "Makefile.python", 'w')
+    makefile = OutputFile(outputDir + "Makefile.python")
 
     # Note that this Makefile will use a custom ASN1SCC invocation
     # where "-equal" is passed - the _Equal functions will be generated
@@ -154,7 +175,7 @@ all:    $(BDIR)/$(BASEGRAMMAR)_getset.so $(BDIR)/DV.py
 
 $(BDIR)/$(GRAMMAR)_getset.c:       $(GRAMMAR).asn
 %(tab)smkdir -p $(BDIR)
-%(tab)s$(ASN2DATAMODEL) -toPython -o $(BDIR) $<
+%(tab)s$(ASN2DATAMODEL) -toPython%(structs)s -o $(BDIR) $<
 
 $(BDIR)/asn1crt.c $(BDIR)/$(GRAMMAR).c $(BDIR)/real.c $(BDIR)/acn.c $(BDIR)/$(GRAMMAR).h $(BDIR)/asn1crt.h:       $(GRAMMAR).asn
 %(tab)sif [ ! -f "$(GRAMMAR).acn" ] ; then %(mono)s$(ASN1SCC) -ACND -o $(BDIR) $< ; fi
@@ -173,9 +194,10 @@ $(BDIR)/$(BASEGRAMMAR)_getset.so:	${OBJ}
 clean:
 %(tab)srm -f $(BDIR)/asn1crt.?  $(BDIR)/real.?  $(BDIR)/$(GRAMMAR).?  $(BDIR)/acn.?
 %(tab)srm -f $(BDIR)/DV.py $(BDIR)/*.pyc $(BDIR)/$(BASEGRAMMAR)_getset.? $(BDIR)/$(BASEGRAMMAR)_getset.so
-%(tab)srm -f $(BDIR)/$(GRAMMAR)_asn.py
+%(tab)srm -f $(BDIR)/$(GRAMMAR)_asn.py $(BDIR)/DV_Layout.py
 '''
-    makefile.write(makefile_text % {'tab': '\t', 'base': base, 'origGrammarBase': origGrammarBase, 'mono': mono_exe})
+    structs = " -pythonStructs" if configMT.g_bPythonStructs else ""
+    makefile.write(makefile_text % {'tab': '\t', 'base': base, 'origGrammarBase': origGrammarBase, 'mono': mono_exe, 'structs': structs})
     makefile.close()
     CreateDeclarationsForAllTypes(asnParser.g_names, asnParser.g_leafTypeDict, badTypes)
     g_outputGetSetH.write('\n/* Helper functions for NATIVE encodings */\n\n')
@@ -206,23 +228,32 @@ clean:
         g_outputGetSetC.write("void DestroyInstanceOf_%s(byte *pData) {\n" % typ)
         g_outputGetSetC.write('    free(pData);\n')
         g_outputGetSetC.write('}\n\n')
+        if configMT.g_bPythonStructs:
+            # For the check of the layouts in DV_Layout.py
+            g_outputGetSetH.write("size_t SizeOf_%s(void);\n\n" % typ)
+            g_outputGetSetC.write("size_t SizeOf_%s(void) {\n" % typ)
+            g_outputGetSetC.write('    return sizeof(%s);\n' % typ)
+            g_outputGetSetC.write('}\n\n')
     for nodeTypename, node in asnParser.g_names.items():
         if node._isArtificial:
             continue
         WorkOnType(nodeTypename)
     WorkOnType("int")
+    if configMT.g_bPythonStructs:
+        CreateLayouts(outputDir, asnParser.g_names, asnParser.g_leafTypeDict, badTypes)
     g_outputGetSetH.write('\n#endif\n')
     g_outputGetSetH.close()
     g_outputGetSetC.close()
 
     retTypes = {}
     for line in open(outputDir + "%s_getset.c" % base):
-        if any(x in line for x in ['_Get(', '_GetLength']):
+        if any(x in line for x in ['_Get(', '_GetLength', '_GetBuffer']):
             retType, funcName = line.split()[0:2]
             funcName = funcName.split('(')[0]
             retTypes[funcName] = retType
-    g_outputGetSetC = open(outputDir + "DV_Types.py", 'w')
+    g_outputGetSetC = OutputFile(outputDir + "DV_Types.py")
     g_outputGetSetC.write('funcTypeLookup = ' + repr(retTypes))
+    g_outputGetSetC.write('\narraySizes = ' + repr(g_arraySizes))
     g_outputGetSetC.close()
 
 
@@ -374,6 +405,9 @@ def CreateGettersAndSetters(
             CommonBaseImpl("OCTETSTRING", "long", path, params, accessPathInC + ".nCount", "Length")
         else:
             CommonBaseImplSequenceFixed("OCTETSTRING", "long", path, params, accessPathInC + ".nCount", node, "Length")
+        # The address of the data, for GetPyString/SetFromPyString to copy them in one go
+        CommonBaseImpl("OCTETSTRING_buffer", "byte*", path, params, accessPathInC + ".arr[0]", "Buffer", returnPointer=True)
+        g_arraySizes[path + "_GetBuffer"] = (node._range[-1], isSequenceVariable(node))
         params.AddParam('int', "iDx", leafTypeDict)
         CommonBaseImpl("OCTETSTRING_bytes", "byte", path + "_iDx", params, accessPathInC + (".arr[" + params._vars[-1] + "]"), "")
         params.Pop()
@@ -395,6 +429,10 @@ def CreateGettersAndSetters(
                     useStar = '' if baseTypeOfChild.endswith('OF') else '*'
                     CommonBaseImpl("Field " + childVarname + " selector", CleanNameAsPythonWants(childNode._containedType) + useStar, path + "_" + childVarname, params, accessPathInC + union + "." + childVarname, returnPointer=not baseTypeOfChild.endswith('OF'))
             CreateGettersAndSetters(path + "_" + childVarname, params, accessPathInC + union + "." + childVarname, child[1], names, leafTypeDict)
+        for child in node._members:
+            if isOptional(child):
+                childVarname = CleanNameAsPythonWants(child[0])
+                CommonBaseImpl("OPTIONAL field " + childVarname + " present", "int", path + "_exist_" + childVarname, params, accessPathInC + ".exist." + childVarname)
     elif isinstance(node, (AsnSequenceOf, AsnSetOf)):
         containedNode = node._containedType
         if isinstance(containedNode, str):
@@ -403,101 +441,470 @@ def CreateGettersAndSetters(
             CommonBaseImpl("SEQUENCEOF/SETOF", "long", path, params, accessPathInC + ".nCount", "Length")
         else:
             CommonBaseImplSequenceFixed("SEQUENCEOF/SETOF", "long", path, params, accessPathInC + ".nCount", node, "Length")
+        # The address of the elements of primitive type, for GetArray/SetFromArray
+        elementCType = {AsnBool: "flag", AsnInt: "asn1SccSint", AsnReal: "double", AsnEnumerated: "int"}.get(
+            type(containedNode), None)
+        if elementCType is not None:
+            CommonBaseImpl("SEQUENCEOF/SETOF_buffer", elementCType + "*", path, params, accessPathInC + ".arr[0]", "Buffer", returnPointer=True)
+            g_arraySizes[path + "_GetBuffer"] = (node._range[-1], isSequenceVariable(node))
         params.AddParam('int', "iDx", leafTypeDict)
         CreateGettersAndSetters(path + "_iDx", params, accessPathInC + (".arr[" + params._vars[-1] + "]"), node._containedType, names, leafTypeDict)
         params.Pop()
 
 
-def DumpTypeDumper(
-        codeIndent: str,
-        outputIndent: str,
-        lines: List[str],  # pylint: disable=invalid-sequence-index
-        variableName: str,
-        node: AsnNode,
-        names: AST_Lookup) -> None:
-    ''' Return the lines of code needed to display the value of a variable
-        of a given type, in the ASN.1 Value Notation format (aka GSER) '''
+def FindVariableSize(node: Union[str, AsnNode], names: AST_Lookup, accessPathInC: str, visited: Set[str]) -> Optional[str]:  # pylint: disable=invalid-sequence-index
+    ''' The C access path of the first nCount in the type (if there is one) '''
+    if isinstance(node, (str, AsnMetaMember)):
+        typename = node if isinstance(node, str) else node._containedType
+        if typename in visited:
+            return None
+        visited.add(typename)
+        node = names[typename]
+    if isinstance(node, (AsnString, AsnSequenceOf, AsnSetOf)) and isSequenceVariable(node):
+        return accessPathInC + ".nCount"
+    if isinstance(node, (AsnSequence, AsnSet, AsnChoice)):
+        union = ".u" if isinstance(node, AsnChoice) else ""
+        for child in node._members:
+            path = FindVariableSize(child[1], names, accessPathInC + union + "." + CleanNameAsPythonWants(child[0]), visited)
+            if path is not None:
+                return path
+    elif isinstance(node, (AsnSequenceOf, AsnSetOf)):
+        return FindVariableSize(node._containedType, names, accessPathInC + ".arr[0]", visited)
+    return None
+
+
+def LayoutOf(node: Union[str, AsnNode], names: AST_Lookup, indent: str, emitted: List[str], lines: List[str]) -> str:  # pylint: disable=invalid-sequence-index
+    ''' The ctypes description of the ASN1SCC struct of a node, for DV_Layout.py;
+        the named types it refers to are appended to the lines first '''
+    if isinstance(node, (str, AsnMetaMember)):
+        typename = node if isinstance(node, str) else node._containedType
+        EmitLayout(typename, names, emitted, lines)
+        return CleanNameAsPythonWants(typename)
     if isinstance(node, AsnBool):
-        lines.append(
-            codeIndent +
-            'lines.append("%s"+str(%s.Get()!=0).upper())' % (outputIndent, variableName))
-        if variableName.startswith("path[i]"):
-            lines.append(codeIndent + 'self.Reset(state)')
+        return "flag"
     elif isinstance(node, AsnInt):
-        lines.append(
-            codeIndent + 'lines.append("%s"+str(%s.Get()))' % (outputIndent, variableName))
-        if variableName.startswith("path[i]"):
-            lines.append(codeIndent + 'self.Reset(state)')
+        return "asn1SccSint"
     elif isinstance(node, AsnReal):
-        lines.append(
-            codeIndent + 'lines.append("%s"+str(%s.Get()))' % (outputIndent, variableName))
-        if variableName.startswith("path[i]"):
-            lines.append(codeIndent + 'self.Reset(state)')
+        return "c_double"
+    elif isinstance(node, AsnEnumerated):
+        return "c_int"
+    elif isinstance(node, (AsnString, AsnSequenceOf, AsnSetOf)):
+        if not node._range:
+            panic("Python_A_mapper: %s must have a SIZE constraint!\n" % node.Location())  # pragma: no cover
+        if isinstance(node, AsnString):
+            elem = "c_ubyte"
+        else:
+            elem = LayoutOf(node._containedType, names, indent + "    ", emitted, lines)
+        fields = ['("arr", %s * %d)' % (elem, node._range[-1])]
+        if isSequenceVariable(node):
+            fields.insert(0, '("nCount", nCount)')
+        return "SEQUENCE(" + ", ".join(fields) + ")"
+    elif isinstance(node, (AsnSequence, AsnSet, AsnChoice)):
+        fields = [
+            '\n%s    ("%s", %s)' % (
+                indent,
+                CleanNameAsPythonWants(child[0]),
+                LayoutOf(child[1], names, indent + "    ", emitted, lines))
+            for child in node._members]
+        optional = [CleanNameAsPythonWants(child[0]) for child in node._members if isOptional(child)]
+        if optional:
+            # ASN1SCC's bitfield of the OPTIONAL fields that are present
+            fields.append('\n%s    ("exist", SEQUENCE(%s))' % (indent, ", ".join('("%s", c_uint, 1)' % x for x in optional)))
+        return ("CHOICE(" if isinstance(node, AsnChoice) else "SEQUENCE(") + ",".join(fields) + ")"
+    else:  # pragma: no cover
+        panic("Python_A_mapper: Unexpected ASN.1 type (%s)" % node.Location())  # pragma: no cover
+    return ""  # pragma: no cover
+
+
+def FieldPaths(node: Union[str, AsnNode], names: AST_Lookup, accessPathInC: str, paths: List[str]) -> None:  # pylint: disable=invalid-sequence-index
+    ''' The C access paths of the fields of the ASN1SCC struct of a node (and of
+        their own fields), in the order of the fields of its layout (LayoutOf) '''
+    if isinstance(node, (str, AsnMetaMember)):
+        node = names[node if isinstance(node, str) else node._containedType]
+    if isinstance(node, (AsnString, AsnSequenceOf, AsnSetOf)):
+        if isSequenceVariable(node):
+            paths.append(accessPathInC + ".nCount")
+        paths.append(accessPathInC + ".arr")
+        if not isinstance(node, AsnString):
+            FieldPaths(node._containedType, names, accessPathInC + ".arr[0]", paths)
+    elif isinstance(node, AsnChoice):
+        paths.append(accessPathInC + ".kind")
+        paths.append(accessPathInC + ".u")
+        for child in node._members:
+            path = accessPathInC + ".u." + CleanNameAsPythonWants(child[0])
+            paths.append(path)
+            FieldPaths(child[1], names, path, paths)
+    elif isinstance(node, (AsnSequence, AsnSet)):
+        for child in node._members:
+            path = accessPathInC + "." + CleanNameAsPythonWants(child[0])
+            paths.append(path)
+            FieldPaths(child[1], names, path, paths)
+        if any(isOptional(child) for child in node._members):
+            paths.append(accessPathInC + ".exist")
+
+
+def EmitLayout(nodeTypename: str, names: AST_Lookup, emitted: List[str], lines: List[str]) -> None:  # pylint: disable=invalid-sequence-index
+    if nodeTypename in emitted:
+        return
+    emitted.append(nodeTypename)
+    layout = LayoutOf(names[nodeTypename], names, "", emitted, lines)
+    lines.append("%s = %s\n" % (CleanNameAsPythonWants(nodeTypename), layout))
+
+
+def CreateLayouts(outputDir: str, names: AST_Lookup, unused_leafTypeDict: AST_Leaftypes, badTypes: SetOfBadTypenames) -> None:
+    ''' Write DV_Layout.py, with the ctypes descriptions of the ASN1SCC structs
+        that the STRUCT classes (asn2dataModel -pythonStructs) work on '''
+    # The size of the nCount depends on the ASN1SCC version (that of the flag, too)
+    nCountPath = None  # type: Optional[str]
+    for nodeTypename in sorted(names):
+        if names[nodeTypename]._isArtificial or nodeTypename in badTypes:
+            continue
+        nCountPath = FindVariableSize(nodeTypename, names, "", set())
+        if nCountPath is not None:
+            g_outputGetSetH.write("size_t SizeOf_nCount(void);\n")
+            g_outputGetSetC.write("size_t SizeOf_nCount(void) {\n")
+            g_outputGetSetC.write('    return sizeof(((%s*)0)->%s);\n' % (CleanNameAsPythonWants(nodeTypename), nCountPath[1:]))
+            g_outputGetSetC.write('}\n\n')
+            break
+    inform("Python_A_mapper: Creating file 'DV_Layout.py'...")
+    layoutFile = OutputFile(outputDir + "DV_Layout.py")
+    layoutFile.write("from ctypes import c_bool, c_ubyte, c_int, c_uint, c_long, c_longlong, c_double\n\n")
+    layoutFile.write("from Stubs import JMP, SEQUENCE, CHOICE, IntFlag\n\n")
+    layoutFile.write("flag = c_bool if JMP.SizeOf_flag() == 1 else IntFlag\n")
+    if nCountPath is not None:
+        layoutFile.write("nCount = c_int if JMP.SizeOf_nCount() == 4 else c_long\n")
+    layoutFile.write("asn1SccSint = c_longlong\n\n")
+    emitted = []  # type: List[str]
+    lines = []  # type: List[str]
+    for nodeTypename in sorted(names):
+        if not names[nodeTypename]._isArtificial and nodeTypename not in badTypes:
+            EmitLayout(nodeTypename, names, emitted, lines)
+            # The offsets of the fields by their access path, that the STRUCT classes compare with the layout
+            typ = CleanNameAsPythonWants(nodeTypename)
+            paths = []  # type: List[str]
+            FieldPaths(nodeTypename, names, "", paths)
+            g_outputGetSetH.write("const char *FieldOf_%s(int i);\n" % typ)
+            g_outputGetSetH.write("size_t OffsetOf_%s(int i);\n" % typ)
+            g_outputGetSetC.write("static const FieldOffset g_offsets_%s[] = {\n" % typ)
+            for path in paths:
+                g_outputGetSetC.write('    {"%s", offsetof(%s, %s)},\n' % (path[1:], typ, path[1:]))
+            g_outputGetSetC.write("    {NULL, 0}\n")
+            g_outputGetSetC.write("};\n\n")
+            g_outputGetSetC.write("const char *FieldOf_%s(int i) {\n" % typ)
+            g_outputGetSetC.write("    return g_offsets_%s[i].field;\n" % typ)
+            g_outputGetSetC.write("}\n\n")
+            g_outputGetSetC.write("size_t OffsetOf_%s(int i) {\n" % typ)
+            g_outputGetSetC.write("    return g_offsets_%s[i].offset;\n" % typ)
+            g_outputGetSetC.write("}\n\n")
+    layoutFile.write("\n".join(lines))
+    layoutFile.close()
+
+
+class GSERCode(object):
+    ''' The lines of a generated GSER or SetFromGSER method. Consecutive
+        constant parts of the text are appended to the output (read from
+        the tokens, in SetFromGSER) in one go. '''
+    def __init__(self, indent: str) -> None:
+        self.lines = []  # type: List[str]
+        self.indent = indent
+        self.pending = ""
+        self.pendingTokens = []  # type: List[str]
+        self.counter = 0
+
+    def Flush(self) -> None:
+        if self.pending:
+            self.lines.append(self.indent + "append(%s)" % repr(self.pending))
+            self.pending = ""
+        if self.pendingTokens:
+            self.lines.append(self.indent + "r.Expect(%s)" % ", ".join('"%s"' % x for x in self.pendingTokens))
+            self.pendingTokens = []
+
+    def Line(self, line: str) -> None:
+        self.Flush()
+        self.lines.append(self.indent + line)
+
+    def Text(self, text: str) -> None:
+        self.pending += text
+
+    def Tokens(self, *tokens: str) -> None:
+        self.pendingTokens.extend(tokens)
+
+    def Expr(self, expr: str) -> None:
+        self.Line("append(%s)" % expr)
+
+    def Indent(self) -> None:
+        self.Flush()
+        self.indent += "    "
+
+    def Dedent(self) -> None:
+        self.Flush()
+        self.indent = self.indent[:-4]
+
+    def Var(self, prefix: str) -> str:
+        self.counter += 1
+        return prefix + str(self.counter)
+
+
+class ProxyPath(object):
+    ''' Reaches a value through the proxy classes (e.g. self.x[i0].y.Get()) '''
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def Bind(self, unused_code: GSERCode) -> 'ProxyPath':
+        # The access paths of the proxies always start from self
+        return self
+
+    def Child(self, name: str, unused_inChoice: bool) -> 'ProxyPath':
+        return ProxyPath(self.path + "." + CleanNameAsPythonWants(name))
+
+    def Element(self, index: str) -> 'ProxyPath':
+        return ProxyPath(self.path + "[" + index + "]")
+
+    def Get(self) -> str:
+        return self.path + ".Get()"
+
+    def Set(self, value: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        # The value is read before the access path is formed: if the text
+        # is invalid, no half-formed path is left behind (see COMMON.Reset)
+        return ["value = " + value, self.path + ".Set(value)"]
+
+    def Kind(self) -> str:
+        return self.path + ".kind.Get()"
+
+    def SetKind(self, value: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return [self.path + ".kind.Set(" + value + ")"]
+
+    def Length(self, unused_node: Union[AsnSequenceOf, AsnSetOf, AsnString]) -> str:
+        return self.path + ".GetLength()"
+
+    def SetLength(self, value: str, node: Union[AsnSequenceOf, AsnSetOf, AsnString]) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return [self.path + ".SetLength(" + value + ")"] if isSequenceVariable(node) else []
+
+    def Array(self, unused_node: Union[AsnSequenceOf, AsnSetOf, AsnString]) -> str:
+        return self.path + ".GetArray()"
+
+    def Bytes(self, node: AsnString) -> str:
+        return self.Array(node)
+
+    def SetArray(self, value: str, unused_node: Union[AsnSequenceOf, AsnSetOf, AsnString]) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return [self.path + ".SetFromArray(" + value + ")"]
+
+
+class StructPath(ProxyPath):
+    ''' Reaches a value through the ctypes layout (-pythonStructs), e.g. d.x.arr[i0].y '''
+    def Bind(self, code: GSERCode) -> 'ProxyPath':
+        # Each SEQUENCE, CHOICE or SEQUENCE OF is looked up once
+        var = code.Var("v")
+        code.Line(var + " = " + self.path)
+        return StructPath(var)
+
+    def Child(self, name: str, inChoice: bool) -> 'ProxyPath':
+        return StructPath(self.path + (".u." if inChoice else ".") + CleanNameAsPythonWants(name))
+
+    def Element(self, index: str) -> 'ProxyPath':
+        return StructPath(self.path + ".arr[" + index + "]")
+
+    def Get(self) -> str:
+        return self.path
+
+    def Set(self, value: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return [self.path + " = " + value]
+
+    def Kind(self) -> str:
+        return self.path + ".kind"
+
+    def SetKind(self, value: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return [self.path + ".kind = " + value]
+
+    def Length(self, node: Union[AsnSequenceOf, AsnSetOf, AsnString]) -> str:
+        return self.path + ".nCount" if isSequenceVariable(node) else str(node._range[-1])
+
+    def SetLength(self, value: str, node: Union[AsnSequenceOf, AsnSetOf, AsnString]) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return [self.path + ".nCount = " + value] if isSequenceVariable(node) else []
+
+    def Array(self, node: Union[AsnSequenceOf, AsnSetOf, AsnString]) -> str:
+        return self.path + ".arr[:" + self.Length(node) + "]"
+
+    def Bytes(self, node: AsnString) -> str:
+        return "string_at(addressof(" + self.path + ".arr), " + self.Length(node) + ")"
+
+    def SetArray(self, value: str, node: Union[AsnSequenceOf, AsnSetOf, AsnString]) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return [self.path + ".arr[:len(" + value + ")] = " + value] + self.SetLength("len(" + value + ")", node)
+
+
+def ResolveNode(node: Union[str, AsnNode], names: AST_Lookup) -> AsnNode:
+    while isinstance(node, (str, AsnMetaMember)):
+        node = names[node if isinstance(node, str) else node._containedType]
+    return node
+
+
+def EnumTable(node: AsnEnumerated) -> str:
+    ''' The name of the module-level tables of the enumerants of the node '''
+    members = tuple((name, int(value)) for name, value in node._members)
+    if members not in g_gserEnumTables:
+        g_gserEnumTables[members] = "GSER_ENUM_%d" % len(g_gserEnumTables)
+    return g_gserEnumTables[members]
+
+
+def HasNumbers(node: Union[AsnSequenceOf, AsnSetOf], names: AST_Lookup) -> bool:
+    ''' Whether the SEQUENCE OF is one of INTEGERs or REALs, with a _GetBuffer
+        for GetArray/SetFromArray (see CreateGettersAndSetters) '''
+    containedNode = node._containedType
+    if isinstance(containedNode, str):
+        containedNode = names[containedNode]
+    return isinstance(containedNode, (AsnInt, AsnReal))
+
+
+def EmitGSERWriter(code: GSERCode, path: ProxyPath, node: Union[str, AsnNode], names: AST_Lookup, depth: int) -> None:
+    ''' The code that appends the GSER text of a value to the output '''
+    node = ResolveNode(node, names)
+    if isinstance(node, AsnBool):
+        code.Expr('"TRUE" if %s else "FALSE"' % path.Get())
+    elif isinstance(node, (AsnInt, AsnReal)):
+        code.Expr("str(%s)" % path.Get())
+    elif isinstance(node, AsnEnumerated):
+        value = code.Var("e")
+        code.Line("%s = %s" % (value, path.Get()))
+        code.Expr("%s.get(%s) or str(%s)" % (EnumTable(node), value, value))
     elif isinstance(node, AsnString):
-        lines.append(
-            codeIndent +
-            'lines.append("%s\\\""+str(%s.GetPyString()) + "\\\"")' % (outputIndent, variableName))
-        if variableName.startswith("path[i]"):
-            lines.append(codeIndent + 'self.Reset(state)')
+        code.Expr("GSERString(%s)" % path.Bytes(node))
+    elif isinstance(node, (AsnSequence, AsnSet)):
+        path = path.Bind(code)
+        for idx, child in enumerate(node._members):
+            code.Text(("{ " if idx == 0 else ", ") + child[0] + " ")
+            EmitGSERWriter(code, path.Child(child[0], False), child[1], names, depth)
+        code.Text(" }" if node._members else "{ }")
+    elif isinstance(node, AsnChoice):
+        path = path.Bind(code)
+        kind = code.Var("k")
+        code.Line("%s = %s" % (kind, path.Kind()))
+        for idx, child in enumerate(node._members):
+            code.Line("%s %s == DV.%s:" % ("if" if idx == 0 else "elif", kind, CleanNameAsPythonWants(child[2])))
+            code.Indent()
+            code.Text(child[0] + ": ")
+            EmitGSERWriter(code, path.Child(child[0], True), child[1], names, depth)
+            code.Dedent()
+    elif isinstance(node, (AsnSequenceOf, AsnSetOf)):
+        if HasNumbers(node, names):
+            # All the elements in one go
+            code.Expr("GSERNumbers(%s)" % path.Array(node))
+            return
+        path = path.Bind(code)
+        loop = "i%d" % depth
+        code.Text("{")
+        code.Line("for %s in range(%s):" % (loop, path.Length(node)))
+        code.Indent()
+        code.Expr('", " if %s else " "' % loop)
+        EmitGSERWriter(code, path.Element(loop), node._containedType, names, depth + 1)
+        code.Dedent()
+        code.Text(" }")
+    else:  # pragma: no cover
+        panic("Python_A_mapper: Unexpected ASN.1 type (%s)" % node.Location())  # pragma: no cover
+
+
+def EmitGSERReader(code: GSERCode, path: ProxyPath, node: Union[str, AsnNode], names: AST_Lookup, depth: int) -> None:
+    ''' The code that sets a value from the GSER tokens of reader r '''
+    node = ResolveNode(node, names)
+    if isinstance(node, AsnBool):
+        for line in path.Set("r.Bool()"):
+            code.Line(line)
+    elif isinstance(node, AsnInt):
+        for line in path.Set("r.Int()"):
+            code.Line(line)
+    elif isinstance(node, AsnReal):
+        for line in path.Set("r.Real()"):
+            code.Line(line)
     elif isinstance(node, AsnEnumerated):
-        mapping = str({val: name for name, val in node._members})
-        lines.append(
-            codeIndent +
-            'lines.append("%s"+%s[str(%s.Get())])' % (outputIndent, mapping, variableName))
-        if variableName.startswith("path[i]"):
-            lines.append(codeIndent + 'self.Reset(state)')
-    elif isinstance(node, (AsnChoice, AsnSet, AsnSequence)):
-        if not isinstance(node, AsnChoice):
-            lines.append(codeIndent + 'lines.append("{")')
-        extraIndent = ""
-        sep = " "
-        if isinstance(node, AsnChoice):
-            extraIndent = " "
+        for line in path.Set("r.Enum(%s_VALUES)" % EnumTable(node)):
+            code.Line(line)
+    elif isinstance(node, AsnString):
+        data = code.Var("s")
+        code.Line("%s = r.String(%d, %d)" % (data, node._range[0], node._range[-1]))
+        for line in path.SetArray(data, node):
+            code.Line(line)
+    elif isinstance(node, (AsnSequence, AsnSet)):
+        path = path.Bind(code)
         for idx, child in enumerate(node._members):
-            if isinstance(node, AsnChoice):
-                lines.append(
-                    codeIndent + 'if %s.kind.Get() == DV.%s:' % (
-                        variableName,
-                        CleanNameAsPythonWants(child[2])))
-                sep = ": "
-            elif idx > 0:
-                # Separate fields with comas:
-                #
-                # - only when we are past the 1st field
-                # - and when we are NOT a CHOICE
-                lines.append(codeIndent + extraIndent + "lines.append(', ')")
-            lines.append(
-                codeIndent + extraIndent +
-                'lines.append("%s%s%s")' % (outputIndent, child[0], sep))
-            childNode = child[1]
-            if isinstance(childNode, AsnMetaMember):
-                childNode = names[childNode._containedType]
-            DumpTypeDumper(
-                codeIndent + extraIndent, outputIndent + " ", lines,
-                variableName + "." + CleanNameAsPythonWants(child[0]), childNode, names)
-        if not isinstance(node, AsnChoice):
-            lines.append(codeIndent + 'lines.append("}")')
-    elif isinstance(node, (AsnSetOf, AsnSequenceOf)):
-        lines.append(codeIndent + 'lines.append("{")')
-        containedNode = node._containedType
-        if isinstance(containedNode, str):
-            containedNode = names[containedNode]
-        lines.append(codeIndent + 'def emitElem(path, i):')
-        lines.append(codeIndent + '    state = self.GetState()')
-        lines.append(codeIndent + '    if i > 0:')
-        lines.append(codeIndent + '        lines.append(",")')
-        DumpTypeDumper(codeIndent + "    ",
-                       outputIndent + " ",
-                       lines,
-                       'path[i]',
-                       containedNode,
-                       names)
-        lines.append(codeIndent + "state = self.GetState()")
-        lines.append(codeIndent + "length = %s.GetLength()" % variableName)
-        lines.append(codeIndent + "self.Reset(state)")
-        lines.append(codeIndent + "map(partial(emitElem, %s), xrange(length))" % variableName)
-        lines.append(codeIndent + 'self.Reset(state)')
-        lines.append(codeIndent + 'lines.append("}")')
+            code.Tokens("{" if idx == 0 else ",", child[0])
+            EmitGSERReader(code, path.Child(child[0], False), child[1], names, depth)
+        if not node._members:
+            code.Tokens("{")
+        code.Tokens("}")
+    elif isinstance(node, AsnChoice):
+        path = path.Bind(code)
+        alternative = code.Var("a")
+        code.Line("%s = r.Alternative()" % alternative)
+        for idx, child in enumerate(node._members):
+            code.Line('%s %s == "%s":' % ("if" if idx == 0 else "elif", alternative, child[0]))
+            code.Indent()
+            for line in path.SetKind("DV." + CleanNameAsPythonWants(child[2])):
+                code.Line(line)
+            EmitGSERReader(code, path.Child(child[0], True), child[1], names, depth)
+            code.Dedent()
+        code.Line("else:")
+        code.Line('    r.Fail("unknown alternative")')
+    elif isinstance(node, (AsnSequenceOf, AsnSetOf)):
+        if HasNumbers(node, names):
+            containedNode = ResolveNode(node._containedType, names)
+            # All the elements in one go
+            values = code.Var("n")
+            code.Line("%s = r.Numbers(%s, %d, %d)" % (
+                values, "int" if isinstance(containedNode, AsnInt) else "float", node._range[0], node._range[-1]))
+            for line in path.SetArray(values, node):
+                code.Line(line)
+            return
+        path = path.Bind(code)
+        loop = "i%d" % depth
+        code.Tokens("{")
+        code.Line("%s = 0" % loop)
+        code.Line("while r.More(%s, %d):" % (loop, node._range[-1]))
+        code.Indent()
+        EmitGSERReader(code, path.Element(loop), node._containedType, names, depth + 1)
+        code.Line("%s += 1" % loop)
+        code.Dedent()
+        if node._range[0] > 0:
+            code.Line("if %s < %d:" % (loop, node._range[0]))
+            code.Line('    r.Fail("too few elements")')
+        for line in path.SetLength(loop, node):
+            code.Line(line)
+    else:  # pragma: no cover
+        panic("Python_A_mapper: Unexpected ASN.1 type (%s)" % node.Location())  # pragma: no cover
+
+
+def CreateGSERMethods(nodeTypename: str, names: AST_Lookup) -> None:
+    ''' The GSER and SetFromGSER methods of the class of a type: they visit
+        each field once - through the ctypes layout with -pythonStructs,
+        through the proxy otherwise '''
+    if configMT.g_bPythonStructs:
+        # The types that are not structs are ctypes simple types (c_double etc)
+        simple = isinstance(ResolveNode(nodeTypename, names), (AsnBool, AsnInt, AsnReal, AsnEnumerated))
+        root = StructPath("self._data.value" if simple else "self._data")  # type: ProxyPath
+    else:
+        root = ProxyPath("self")
+    code = GSERCode("        ")
+    EmitGSERWriter(code, root, names[nodeTypename], names, 0)
+    code.Flush()
+    g_outputFile.write("\n    def GSER(self):\n")
+    g_outputFile.write("        ''' Return the GSER representation of the value '''\n")
+    g_outputFile.write("        text = []\n")
+    g_outputFile.write("        append = text.append\n")
+    g_outputFile.write("\n".join(code.lines) + "\n")
+    g_outputFile.write("        return ''.join(text)\n")
+    code = GSERCode("        ")
+    EmitGSERReader(code, root, names[nodeTypename], names, 0)
+    code.Flush()
+    g_outputFile.write("\n    def SetFromGSER(self, gser):\n")
+    g_outputFile.write("        ''' Set the value from its GSER representation '''\n")
+    g_outputFile.write("        r = GSERReader(gser)\n")
+    g_outputFile.write("\n".join(code.lines) + "\n")
+    g_outputFile.write("        r.End()\n")
+
+
+def CreateGSEREnumTables() -> None:
+    ''' The tables of the enumerants used by the GSER/SetFromGSER methods '''
+    for members, table in g_gserEnumTables.items():
+        g_outputFile.write("%s = {%s}\n" % (table, ", ".join("%d: %s" % (value, repr(name)) for name, value in members)))
+        g_outputFile.write("%s_VALUES = {%s}\n" % (table, ", ".join("%s: %d" % (repr(name), value) for name, value in members)))
 
 
 def CreateDeclarationForType(nodeTypename: str, names: AST_Lookup, leafTypeDict: AST_Leaftypes) -> None:
@@ -505,7 +912,7 @@ def CreateDeclarationForType(nodeTypename: str, names: AST_Lookup, leafTypeDict:
     name = CleanNameAsPythonWants(nodeTypename)
     if isinstance(node, (AsnBasicNode, AsnEnumerated, AsnSequence, AsnSet,
                          AsnChoice, AsnSequenceOf, AsnSetOf)):
-        g_outputFile.write("class " + name + "(COMMON):\n")
+        g_outputFile.write("class " + name + ("(STRUCT):\n" if configMT.g_bPythonStructs else "(COMMON):\n"))
         if isinstance(node, AsnEnumerated):
             g_outputFile.write("    # Allowed enumerants:\n")
             allowed = []
@@ -523,18 +930,16 @@ def CreateDeclarationForType(nodeTypename: str, names: AST_Lookup, leafTypeDict:
             g_outputFile.write("    children_ordered = ['{}']\n\n"
                                .format("', '".join(children)))
         g_outputFile.write("    def __init__(self, ptr=None):\n")
-        g_outputFile.write("        super(" + name + ", self).__init__(\"" + name + "\", ptr)\n")
-        if isinstance(node, AsnString):
-            g_outputFile.write('''#\n''')
-        CreateGettersAndSetters(name + "_", Params(nodeTypename), "", node, names, leafTypeDict)
-        g_outputFile.write("\n    def GSER(self):\n")
-        g_outputFile.write("        ''' Return the GSER representation of the value '''\n")
-        g_outputFile.write("        lines = []\n")
-        lines = []  # type: List[str]
-        DumpTypeDumper("        ", "", lines, "self", names[nodeTypename], names)
-        g_outputFile.write("\n".join(lines) + "\n\n")
-        g_outputFile.write("        return ' '.join(lines)")
-        g_outputFile.write("\n\n    def PrintAll(self):\n")
+        if configMT.g_bPythonStructs:
+            # The data are accessed in place (see STRUCT) - no C getters/setters
+            g_outputFile.write("        super(" + name + ", self).__init__(\"" + name + "\", DV_Layout." + name + ", ptr)\n")
+        else:
+            g_outputFile.write("        super(" + name + ", self).__init__(\"" + name + "\", ptr)\n")
+            if isinstance(node, AsnString):
+                g_outputFile.write('''#\n''')
+            CreateGettersAndSetters(name + "_", Params(nodeTypename), "", node, names, leafTypeDict)
+        CreateGSERMethods(nodeTypename, names)
+        g_outputFile.write("\n    def PrintAll(self):\n")
         g_outputFile.write("        ''' Display a variable of this type '''\n")
         g_outputFile.write("        print(self.GSER() + '\\n')\n\n\n")
 
@@ -546,5 +951,6 @@ def CreateDeclarationsForAllTypes(names: AST_Lookup, leafTypeDict: AST_Leaftypes
     for nodeTypename in names:
         if not names[nodeTypename]._isArtificial and nodeTypename not in badTypes:
             CreateDeclarationForType(nodeTypename, names, leafTypeDict)
+    CreateGSEREnumTables()
 
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -34,6 +34,7 @@ from typing import List, Union
 
 from ..commonPy import asnParser
 from ..commonPy.utility import panic, inform
+from ..commonPy.outputFile import OutputFile
 from ..commonPy.createInternalTypes import ScanChildren
 from ..commonPy.cleanupNodes import SetOfBadTypenames
 from ..commonPy.asnAST import (
@@ -89,7 +90,7 @@ def OnStartup(unused_modelingLanguage: str, asnFiles: List[str], outputDir: str,
     inform("QGenAda_A_mapper: Creating file '%s'...", outputFilename)
     global g_outputFile
     outputDir += "../"
-    g_outputFile = open(outputDir + outputFilename, 'w')
+    g_outputFile = OutputFile(outputDir + outputFilename)
     g_definedTypes.clear()
     global g_octetStrings
     g_octetStrings = 0
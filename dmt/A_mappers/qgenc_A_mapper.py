@@ -26,6 +26,7 @@ import re
 from typing import Union, Set, List  # NOQA pylint: disable=unused-import
 
 from ..commonPy.utility import panic, inform
+from ..commonPy.outputFile import OutputFile
 from ..commonPy import asnParser
 from ..commonPy.asnAST import (
     AsnBool, AsnInt, AsnReal, AsnString, AsnEnumerated, AsnSequence,
@@ -68,7 +69,7 @@ def OnStartup(unused_modelingLanguage: str, unused_asnFiles: List[str], outputDi
     outputFilename = "Simulink_DataView_asn.m"
     inform("QGenC_A_mapper: Creating file '%s'...", outputFilename)
     global g_outputFile
-    g_outputFile = open(outputDir + outputFilename, 'w')
+    g_outputFile = OutputFile(outputDir + outputFilename)
     g_definedTypes.clear()
     global g_octetStrings
     g_octetStrings = 0
@@ -26,6 +26,7 @@ import re
 from ..commonPy.cleanupNodes import SetOfBadTypenames
 from ..commonPy.asnParser import AST_Leaftypes, AsnNode
 from ..commonPy.asnAST import AsnSequenceOrSet, AsnSequenceOrSetOf, AsnEnumerated, AsnChoice
+from ..commonPy.outputFile import OutputFile
 
 g_outputDir = ""
 g_asnFile = ""
@@ -97,6 +98,6 @@ def OnShutdown(unused_badTypes: SetOfBadTypenames) -> None:
     # outputFile.write('END\n')
     # outputFile.close()
 
-    outputFile = open(g_outputDir + "RTDSdataView.asn", 'w')
+    outputFile = OutputFile(g_outputDir + "RTDSdataView.asn")
     outputFile.write(re.sub(r'^.*BEGIN', 'RTDSdataView DEFINITIONS ::= BEGIN', open(g_asnFile, 'r').read()))
     outputFile.close()
@@ -23,6 +23,7 @@ import re
 from typing import Union, Set  # NOQA pylint: disable=unused-import
 
 from ..commonPy.utility import panic, inform
+from ..commonPy.outputFile import OutputFile
 from ..commonPy import asnParser
 from ..commonPy.asnAST import (
     AsnBool, AsnInt, AsnReal, AsnString, AsnEnumerated, AsnSequence,
@@ -66,7 +67,7 @@ def OnStartup(unused_modelingLanguage: str, unused_asnFile: str, outputDir: str,
     outputFilename = "Simulink_DataView_asn.m"
     inform("Simulink_A_mapper: Creating file '%s'...", outputFilename)
     global g_outputFile
-    g_outputFile = open(outputDir + outputFilename, 'w')
+    g_outputFile = OutputFile(outputDir + outputFilename)
     g_definedTypes.clear()
     global g_octetStrings
     g_octetStrings = 0
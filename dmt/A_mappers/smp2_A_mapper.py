@@ -30,6 +30,7 @@ from typing import Dict, List, Set, IO, Any  # NOQA pylint: disable=unused-impor
 from ..commonPy.asnAST import AsnMetaMember, AsnChoice, AsnSet, AsnSequence, AsnSequenceOf, AsnSetOf, AsnBool, AsnInt, AsnReal, AsnOctetString
 from ..commonPy.asnParser import g_names, g_leafTypeDict, CleanNameForAST
 from ..commonPy.utility import panic, warn
+from ..commonPy.outputFile import OutputFile
 from ..commonPy.cleanupNodes import SetOfBadTypenames
 from ..commonPy.asnAST import AsnBasicNode, AsnSequenceOrSet, AsnSequenceOrSetOf, AsnEnumerated
 from ..commonPy.asnParser import AST_Leaftypes
@@ -309,7 +310,7 @@ def OnShutdown(badTypes: SetOfBadTypenames) -> None:
     g_bShutdownRun = True
 
     global g_catalogueXML
-    g_catalogueXML = open(g_outputDir + os.sep + g_uniqueStringOfASN1files + ".cat", 'w')
+    g_catalogueXML = OutputFile(g_outputDir + os.sep + g_uniqueStringOfASN1files + ".cat")
     g_catalogueXML.write('''\
 <?xml version="1.0" encoding="UTF-8"?>
 <Catalogue:Catalogue xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:Catalogue="http://www.esa.int/2005/10/Smdl/Catalogue" xmlns:Types="http://www.esa.int/2005/10/Core/Types" xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:xsd="http://www.w3.org/2001/XMLSchema" xsi:schemaLocation="http://www.esa.int/2005/10/Smdl/Catalogue Catalogue.xsd" Id="%(uniqid)s" Name="%(uniqid)s" Creator="taste" Date="2012-02-02T09:26:40.909Z" Version="1.0">
@@ -370,7 +371,7 @@ def OnShutdown(badTypes: SetOfBadTypenames) -> None:
     g_catalogueXML.write("</Catalogue:Catalogue>\n")
     g_catalogueXML.close()
 
-    pkgFile = open(g_uniqueStringOfASN1files + '.pkg', 'w')
+    pkgFile = OutputFile(g_uniqueStringOfASN1files + '.pkg')
     pkgFile.write('''<?xml version="1.0" encoding="UTF-8"?>
 <Package:Package xmlns:Package="http://www.esa.int/2005/10/Smdl/Package" xmlns:xlink="http://www.w3.org/1999/xlink" Id="%(uniqid)s" Name="%(uniqid)s" Creator="TASTE" Date="2012-06-27T00:00:00.000Z" Version="1.0">\n''' % {'uniqid': g_uniqueStringOfASN1files})
 
@@ -32,6 +32,7 @@ from ..commonPy.asnAST import (
     AsnOctetString, AsnInt, AsnReal)
 from ..commonPy.asnParser import g_names, g_leafTypeDict, CleanNameForAST
 from ..commonPy.utility import panic, warn
+from ..commonPy.outputFile import OutputFile
 from ..commonPy.cleanupNodes import SetOfBadTypenames
 from ..commonPy.asnParser import AST_Leaftypes
 
@@ -299,8 +300,8 @@ def OnShutdown(badTypes: SetOfBadTypenames) -> None:
     g_bShutdownRun = True
 
     global g_sqlOutput
-    g_sqlOutput = open(
-        g_outputDir + os.sep + g_uniqueStringOfASN1files + ".sql", 'w')
+    g_sqlOutput = OutputFile(
+        g_outputDir + os.sep + g_uniqueStringOfASN1files + ".sql")
     d = g_asnFiles if isinstance(g_asnFiles, str) else '","'.join(g_asnFiles)
     g_sqlOutput.write('--  SQL statements for types used in "%s"\n' % d)
     typenameList = []  # type: List[str]
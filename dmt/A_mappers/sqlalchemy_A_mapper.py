@@ -32,6 +32,7 @@ from ..commonPy.asnAST import (
     AsnSequenceOrSetOf, AsnEnumerated, AsnInt, AsnReal, AsnString)
 from ..commonPy.asnParser import g_names, g_leafTypeDict, CleanNameForAST, AST_Leaftypes
 from ..commonPy.utility import panic, warn
+from ..commonPy.outputFile import OutputFile
 from ..commonPy.cleanupNodes import SetOfBadTypenames
 
 g_sqlalchemyOutput = None  # type: IO[Any]
@@ -532,8 +533,8 @@ def OnShutdown(badTypes: SetOfBadTypenames) -> None:
     g_bShutdownRun = True
 
     global g_sqlalchemyOutput
-    g_sqlalchemyOutput = open(
-        g_outputDir + os.sep + g_uniqueStringOfASN1files + "_model.py", 'w')
+    g_sqlalchemyOutput = OutputFile(
+        g_outputDir + os.sep + g_uniqueStringOfASN1files + "_model.py")
     d = g_asnFiles if isinstance(g_asnFiles, str) else '","'.join(g_asnFiles)  # type: str
     typenameList = []  # type: List[str]
     for nodeTypename in sorted(list(g_innerTypes.keys()) + list(g_names.keys())):
@@ -25,11 +25,23 @@ Base class for all asynchronous tools
 import re
 import os
 
-from typing import Tuple, IO, Any  # NOQA pylint: disable=unused-import
+from typing import Tuple, IO, Any, Dict, List, Set  # NOQA pylint: disable=unused-import
 
+from ..commonPy import configMT
 from ..commonPy.utility import inform, panicWithCallStack
+from ..commonPy.outputFile import OutputFile
 from ..commonPy.asnParser import Typename, AsnNode, AST_Lookup, AST_Leaftypes  # NOQA pylint: disable=unused-import
 
+# The encodings used by the parameters of the asynchronous subprograms, for each
+# ASN.1 type - recorded by aadl2glueC (see UseEncoding). It is shared by all the
+# asynchronous backends, since several of them (C, Ada, RTDS) write the same
+# C_ASN1_Types.[ch], and they must all write the same thing in them.
+g_usedEncodings = {}  # type: Dict[str, Set[str]]
+
+
+def UseEncoding(nodeTypename: str, encoding: str) -> None:
+    g_usedEncodings.setdefault(nodeTypename, set()).add(encoding.lower())
+
 
 class ASynchronousToolGlueGenerator:
 
@@ -68,6 +80,24 @@ class ASynchronousToolGlueGenerator:
     def CleanNameAsToolWants(self, name: str) -> str:  # pylint: disable=no-self-use
         return re.sub(r'[^a-zA-Z0-9_]', '_', name)
 
+    # The tools that can, generate entry points that encode (decode) an array
+    # of messages into (out of) a single buffer - see C_GlueGenerator
+    def BatchEncoder(self,  # pylint: disable=no-self-use
+                     unused_nodeTypename: str,
+                     unused_node: AsnNode,
+                     unused_leafTypeDict: AST_Leaftypes,
+                     unused_names: AST_Lookup,
+                     unused_encoding: str) -> None:
+        pass
+
+    def BatchDecoder(self,  # pylint: disable=no-self-use
+                     unused_nodeTypename: str,
+                     unused_node: AsnNode,
+                     unused_leafTypeDict: AST_Leaftypes,
+                     unused_names: AST_Lookup,
+                     unused_encoding: str) -> None:
+        pass
+
     ##########################################
     # Common parts for all asynchronous tools
 
@@ -89,10 +119,10 @@ class ASynchronousToolGlueGenerator:
         outputCsourceFilename = self.CleanNameAsToolWants(prefix) + "_ASN1_Types.c"
 
         inform(str(self.__class__) + ": Creating file '%s'...", outputCheaderFilename)
-        self.C_HeaderFile = open(outputDir + outputCheaderFilename, 'w')
+        self.C_HeaderFile = OutputFile(outputDir + outputCheaderFilename)
 
         inform(str(self.__class__) + ": Creating file '%s'...", outputCsourceFilename)
-        self.C_SourceFile = open(outputDir + outputCsourceFilename, 'w')
+        self.C_SourceFile = OutputFile(outputDir + outputCsourceFilename)
 
         self.asn_name = os.path.basename(os.path.splitext(asnFile)[0])
 
@@ -126,12 +156,24 @@ class ASynchronousToolGlueGenerator:
         # employ a common scheme for all asynchronous tools where we generate functions
         # in the context of this method... Instead, we have to delegate all work to members
         # defined in the derived classes...
-        self.Encoder(nodeTypename, node, leafTypeDict, names, 'uper')
-        self.Encoder(nodeTypename, node, leafTypeDict, names, 'acn')
-        self.Encoder(nodeTypename, node, leafTypeDict, names, 'native')
-        self.Decoder(nodeTypename, node, leafTypeDict, names, 'uper')
-        self.Decoder(nodeTypename, node, leafTypeDict, names, 'acn')
-        self.Decoder(nodeTypename, node, leafTypeDict, names, 'native')
+        encodings = self.EncodingsOf(nodeTypename)
+        for encoding in encodings:
+            self.Encoder(nodeTypename, node, leafTypeDict, names, encoding)
+        for encoding in encodings:
+            self.Decoder(nodeTypename, node, leafTypeDict, names, encoding)
+        for encoding in encodings:
+            self.BatchEncoder(nodeTypename, node, leafTypeDict, names, encoding)
+            self.BatchDecoder(nodeTypename, node, leafTypeDict, names, encoding)
+
+    def EncodingsOf(self, nodeTypename: str) -> List[str]:  # pylint: disable=no-self-use,invalid-sequence-index
+        # Only the encodings that the AADL parameters of this type use are
+        # reachable - the rest would only grow the output (and its build time).
+        # Without any recorded usage (or with -allEncodings), generate them all.
+        allEncodings = ['uper', 'acn', 'native']
+        if configMT.g_bAllEncodings or not g_usedEncodings:
+            return allEncodings
+        used = g_usedEncodings.get(nodeTypename, set())
+        return [x for x in allEncodings if x in used]
 
     def OnBasic(self, nodeTypename: str, node: AsnNode, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
         realLeafType = leafTypeDict[nodeTypename]
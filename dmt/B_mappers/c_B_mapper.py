@@ -424,6 +424,105 @@ class C_GlueGenerator(ASynchronousToolGlueGenerator):
             self.C_SourceFile.write("}\n")
             self.C_SourceFile.write("#endif\n\n")
 
+    def BatchSizeCheck(self, nodeTypename: str, bufferSize: str) -> None:
+        # Divided rather than multiplied, so that a huge count can't overflow the check
+        self.C_SourceFile.write("    if (count > %s / sizeof(asn1Scc%s)) {\n" %
+                                (bufferSize, self.CleanNameAsToolWants(nodeTypename)))
+        self.C_SourceFile.write(
+            '        fprintf(stderr, "%%lu %s do not fit in %%lu bytes (at %%s, %%d)\\n",\n'
+            '                (unsigned long) count, (unsigned long) %s, __FILE__, __LINE__);\n' % (nodeTypename, bufferSize))
+        self.C_SourceFile.write("        return -1;\n")
+        self.C_SourceFile.write("    }\n")
+
+    def BatchEncoder(self, nodeTypename: str, unused_node: AsnNode, unused_leafTypeDict: AST_Leaftypes, unused_names: AST_Lookup, encoding: str) -> None:
+        # Encodes count messages back to back, in a single (bit)stream,
+        # and returns its length in *pLength (the int result is 0, or -1
+        # on errors). Not for OSS, whose encodings are not meant to be
+        # concatenated.
+        if self.useOSS and encoding.lower() == "uper":
+            return
+        tmpSpName = "EncodeBatch_%s_%s" % \
+            ({"uper": "UPER", "native": "NATIVE", "acn": "ACN"}[encoding.lower()],
+             self.CleanNameAsToolWants(nodeTypename))
+        signature = "int %s(void *pBuffer, size_t iMaxBufferSize, %sasn1Scc%s *pSrc, size_t count, size_t *pLength)" % \
+            (tmpSpName, "" if encoding.lower() == "acn" else "const ",
+             self.CleanNameAsToolWants(nodeTypename))
+
+        needDefine = "#ifdef __NEED_%s_%s\n" % (
+            self.CleanNameAsToolWants(nodeTypename),
+            encoding.upper())
+        self.C_HeaderFile.write(needDefine)
+        self.C_HeaderFile.write(signature + ";\n")
+        self.C_HeaderFile.write("#endif\n\n")
+        self.C_SourceFile.write(needDefine)
+        self.C_SourceFile.write(signature + "\n{\n")
+
+        if encoding.lower() in ["uper", "acn"]:
+            self.C_SourceFile.write("    int errorCode;\n")
+            self.C_SourceFile.write("    BitStream strm;\n")
+            self.C_SourceFile.write("    size_t i;\n\n")
+            self.C_SourceFile.write("    BitStream_Init(&strm, pBuffer, iMaxBufferSize);\n")
+            self.C_SourceFile.write("    for (i = 0; i < count; i++) {\n")
+            self.C_SourceFile.write("        if (asn1Scc%s_%sEncode(&pSrc[i], &strm, &errorCode, TRUE) == FALSE) {\n" %
+                                    (self.CleanNameAsToolWants(nodeTypename),
+                                     ("ACN_" if encoding.lower() == "acn" else "")))
+            self.C_SourceFile.write(
+                '            fprintf(stderr, "Could not encode %s #%%lu (at %%s, %%d), errorCode was %%d\\n", (unsigned long) i, __FILE__, __LINE__, errorCode);\n' % nodeTypename)
+            self.C_SourceFile.write("            return -1;\n")
+            self.C_SourceFile.write("        }\n")
+            self.C_SourceFile.write("    }\n")
+            self.C_SourceFile.write("    *pLength = (size_t) BitStream_GetLength(&strm);\n")
+        else:
+            self.BatchSizeCheck(nodeTypename, "iMaxBufferSize")
+            self.C_SourceFile.write("    memcpy(pBuffer, pSrc, count * sizeof(asn1Scc%s));\n" %
+                                    self.CleanNameAsToolWants(nodeTypename))
+            self.C_SourceFile.write("    *pLength = count * sizeof(asn1Scc%s);\n" %
+                                    self.CleanNameAsToolWants(nodeTypename))
+        self.C_SourceFile.write("    return 0;\n")
+        self.C_SourceFile.write("}\n")
+        self.C_SourceFile.write("#endif\n\n")
+
+    def BatchDecoder(self, nodeTypename: str, unused_node: AsnNode, unused_leafTypeDict: AST_Leaftypes, unused_names: AST_Lookup, encoding: str) -> None:
+        # Decodes the count messages written by the BatchEncoder
+        if self.useOSS and encoding.lower() == "uper":
+            return
+        tmpSpName = "DecodeBatch_%s_%s" % \
+            ({"uper": "UPER", "native": "NATIVE", "acn": "ACN"}[encoding.lower()],
+             self.CleanNameAsToolWants(nodeTypename))
+        signature = "int %s(asn1Scc%s *pDst, void *pBuffer, size_t iBufferSize, size_t count)" % \
+            (tmpSpName, self.CleanNameAsToolWants(nodeTypename))
+
+        needDefine = "#ifdef __NEED_%s_%s\n" % (
+            self.CleanNameAsToolWants(nodeTypename),
+            encoding.upper())
+        self.C_HeaderFile.write(needDefine)
+        self.C_HeaderFile.write(signature + ";\n")
+        self.C_HeaderFile.write("#endif\n\n")
+        self.C_SourceFile.write(needDefine)
+        self.C_SourceFile.write(signature + "\n{\n")
+
+        if encoding.lower() in ["uper", "acn"]:
+            self.C_SourceFile.write("    int errorCode;\n")
+            self.C_SourceFile.write("    BitStream strm;\n")
+            self.C_SourceFile.write("    size_t i;\n\n")
+            self.C_SourceFile.write("    BitStream_AttachBuffer(&strm, pBuffer, iBufferSize);\n")
+            self.C_SourceFile.write("    for (i = 0; i < count; i++) {\n")
+            self.C_SourceFile.write("        if (!asn1Scc%s_%sDecode(&pDst[i], &strm, &errorCode)) {\n" %
+                                    (self.CleanNameAsToolWants(nodeTypename),
+                                     "ACN_" if encoding.lower() == "acn" else ""))
+            self.C_SourceFile.write(
+                '            fprintf(stderr, "Could not decode %s #%%lu (at %%s, %%d), error code was %%d\\n", (unsigned long) i, __FILE__, __LINE__, errorCode);\n' % nodeTypename)
+            self.C_SourceFile.write("            return -1;\n")
+            self.C_SourceFile.write("        }\n")
+            self.C_SourceFile.write("    }\n")
+        else:
+            self.BatchSizeCheck(nodeTypename, "iBufferSize")
+            self.C_SourceFile.write("    memcpy(pDst, pBuffer, count * sizeof(asn1Scc%s));\n" %
+                                    self.CleanNameAsToolWants(nodeTypename))
+        self.C_SourceFile.write("    return 0;\n")
+        self.C_SourceFile.write("}\n")
+        self.C_SourceFile.write("#endif\n\n")
+
 
 def OnStartup(modelingLanguage: str, asnFile: str, outputDir: str, maybeFVname: str, useOSS: bool) -> None:
     global cBackend
@@ -31,6 +31,7 @@ from ..commonPy.asnAST import (
     AsnSequenceOf, AsnSetOf, AsnMetaMember, AsnInt, AsnReal, AsnOctetString,
     AsnNode, AsnBool, isSequenceVariable, sourceSequenceLimit)
 from ..commonPy.utility import panic, panicWithCallStack
+from ..commonPy.outputFile import OutputFile
 from ..commonPy import asnParser
 from ..commonPy.asnParser import AST_Lookup, AST_Leaftypes
 from ..commonPy.aadlAST import ApLevelContainer, Param
@@ -220,9 +221,9 @@ def OneTimeOnly(
     global g_maybeFVname
     g_maybeFVname = maybeFVname
     global g_HeaderFile
-    g_HeaderFile = open(outputDir + 'telecmds.h', 'w')
+    g_HeaderFile = OutputFile(outputDir + 'telecmds.h')
     global g_GnuplotFile
-    g_GnuplotFile = open(outputDir + 'gnuplot', 'w')
+    g_GnuplotFile = OutputFile(outputDir + 'gnuplot')
     g_HeaderFile.write('''#ifndef __TELECMDS_H__
 #define __TELECMDS_H__
 
@@ -274,25 +275,25 @@ public:
 };
 ''')
     global g_MyEvents
-    g_MyEvents = open(outputDir + "MyEvents.inc", "w")
+    g_MyEvents = OutputFile(outputDir + "MyEvents.inc")
     global g_MyCreation
-    g_MyCreation = open(outputDir + "MyCreation.inc", "w")
+    g_MyCreation = OutputFile(outputDir + "MyCreation.inc")
     global g_MyClickPrototypes
-    g_MyClickPrototypes = open(outputDir + "MyClickPrototypes.inc", "w")
+    g_MyClickPrototypes = OutputFile(outputDir + "MyClickPrototypes.inc")
     global g_MyControls
-    g_MyControls = open(outputDir + "MyControls.inc", "w")
+    g_MyControls = OutputFile(outputDir + "MyControls.inc")
     global g_MyLoad
-    g_MyLoad = open(g_outputDir + 'MyLoad.inc', 'w')
+    g_MyLoad = OutputFile(g_outputDir + 'MyLoad.inc')
     global g_MySave
-    g_MySave = open(g_outputDir + 'MySave.inc', 'w')
+    g_MySave = OutputFile(g_outputDir + 'MySave.inc')
     global g_MyThreadsInc
-    g_MyThreadsInc = open(g_outputDir + 'MyThreads.inc', 'w')
+    g_MyThreadsInc = OutputFile(g_outputDir + 'MyThreads.inc')
     global g_MyThreadsH
-    g_MyThreadsH = open(g_outputDir + 'MyThreads.h', 'w')
+    g_MyThreadsH = OutputFile(g_outputDir + 'MyThreads.h')
     global g_MyTelemetryActions
-    g_MyTelemetryActions = open(g_outputDir + "MyTelemetryActions.inc", 'w')
+    g_MyTelemetryActions = OutputFile(g_outputDir + "MyTelemetryActions.inc")
     global g_SourceFile
-    g_SourceFile = open(outputDir + 'telecmds.cpp', 'w')
+    g_SourceFile = OutputFile(outputDir + 'telecmds.cpp')
     global g_asn_name
     g_asn_name = os.path.basename(os.path.splitext(asnFile)[0])
     g_SourceFile.write("#include \"%s.h\"\n\n" % g_asn_name)
@@ -345,7 +346,7 @@ public:
 
     # Instructions for actions per RI
     global g_MyAction
-    g_MyAction = open(outputDir + "MyActions.inc", "w")
+    g_MyAction = OutputFile(outputDir + "MyActions.inc")
 
     g_MyThreadsH.write("#ifndef __MYTHREADSH__\n")
     g_MyThreadsH.write("#define __MYTHREADSH__\n\n")
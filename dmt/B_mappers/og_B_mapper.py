@@ -110,6 +110,8 @@ def Version() -> None:
 # noinspection PyListCreation
 # pylint: disable=no-self-use
 class FromObjectGeodeToASN1SCC(RecursiveMapper):
+    memoize = True
+
     def __init__(self) -> None:
         self.uniqueID = 0
 
@@ -120,6 +122,9 @@ class FromObjectGeodeToASN1SCC(RecursiveMapper):
     def DecreaseUniqueID(self) -> None:
         self.uniqueID -= 1
 
+    def MemoState(self) -> int:
+        return self.uniqueID
+
     def MapInteger(self, srcSDLVariable: str, destVar: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = (asn1SccSint) %s;\n" % (destVar, srcSDLVariable)]
 
@@ -216,6 +221,8 @@ class FromObjectGeodeToASN1SCC(RecursiveMapper):
 # noinspection PyListCreation
 # pylint: disable=no-self-use
 class FromObjectGeodeToOSS(RecursiveMapper):
+    memoize = True
+
     def __init__(self) -> None:
         self.uniqueID = 0
 
@@ -226,6 +233,9 @@ class FromObjectGeodeToOSS(RecursiveMapper):
     def DecreaseUniqueID(self) -> None:
         self.uniqueID -= 1
 
+    def MemoState(self) -> int:
+        return self.uniqueID
+
     def MapInteger(self, srcSDLVariable: str, destVar: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = %s;\n" % (destVar, srcSDLVariable)]
 
@@ -320,6 +330,8 @@ class FromObjectGeodeToOSS(RecursiveMapper):
 # noinspection PyListCreation
 # pylint: disable=no-self-use
 class FromASN1SCCtoObjectGeode(RecursiveMapper):
+    memoize = True
+
     def __init__(self) -> None:
         self.uniqueID = 0
 
@@ -330,6 +342,9 @@ class FromASN1SCCtoObjectGeode(RecursiveMapper):
     def DecreaseUniqueID(self) -> None:
         self.uniqueID -= 1
 
+    def MemoState(self) -> int:
+        return self.uniqueID
+
     def MapInteger(self, srcVar: str, dstSDLVariable: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = %s;\n" % (dstSDLVariable, srcVar)]
 
@@ -439,6 +454,8 @@ class FromASN1SCCtoObjectGeode(RecursiveMapper):
 # noinspection PyListCreation
 # pylint: disable=no-self-use
 class FromOSStoObjectGeode(RecursiveMapper):
+    memoize = True
+
     def __init__(self) -> None:
         self.uniqueID = 0
 
@@ -449,6 +466,9 @@ class FromOSStoObjectGeode(RecursiveMapper):
     def DecreaseUniqueID(self) -> None:
         self.uniqueID -= 1
 
+    def MemoState(self) -> int:
+        return self.uniqueID
+
     def MapInteger(self, srcVar: str, dstSDLVariable: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = %s;\n" % (dstSDLVariable, srcVar)]
 
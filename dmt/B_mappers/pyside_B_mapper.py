@@ -11,6 +11,7 @@ from ..commonPy.asnAST import (
     AsnSequenceOf, AsnSetOf, AsnMetaMember, AsnNode)
 
 from ..commonPy.utility import panic
+from ..commonPy.outputFile import OutputFile
 from ..commonPy.asnParser import AST_Lookup, AST_Leaftypes
 from ..commonPy.aadlAST import ApLevelContainer, Param
 
@@ -41,7 +42,7 @@ def OneTimeOnly(
         FVname: str,
         unused_useOSS: bool) -> None:
     global g_PyDataModel
-    g_PyDataModel = open(outputDir + 'datamodel.py', 'w')
+    g_PyDataModel = OutputFile(outputDir + 'datamodel.py')
     g_PyDataModel.write('''#!/usr/bin/python
 
 import DV
@@ -54,7 +55,7 @@ errCodes = {{}}
 '''.format(fvname=FVname))
 
     global g_QUiFile
-    g_QUiFile = open(outputDir + 'guilayout.ui', 'w')
+    g_QUiFile = OutputFile(outputDir + 'guilayout.ui')
     g_QUiFile.write('''<?xml version="1.0" encoding="UTF-8"?>
 <ui version="4.0">
  <class>MainWindow</class>
@@ -151,7 +152,7 @@ def OnStartup(
 
     # Create the per-PI/RI backend file that includes Encode/Decode functions
     global g_BackendFile
-    g_BackendFile = open(outputDir + '%s_backend.py' % CleanSP, 'w')
+    g_BackendFile = OutputFile(outputDir + '%s_backend.py' % CleanSP)
     g_BackendFile.write('''#!/usr/bin/python
 
 import sys
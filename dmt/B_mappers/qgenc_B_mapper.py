@@ -66,6 +66,8 @@ def IsElementMappedToPrimitive(node: AsnSequenceOrSetOf, names: AST_Lookup) -> b
 
 # pylint: disable=no-self-use
 class FromQGenCToASN1SCC(RecursiveMapper):
+    memoize = True
+
     def MapInteger(self, srcQGenC: str, destVar: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = (asn1SccSint) %s;\n" % (destVar, srcQGenC)]
 
@@ -149,6 +151,8 @@ class FromQGenCToASN1SCC(RecursiveMapper):
 
 # pylint: disable=no-self-use
 class FromASN1SCCtoQGenC(RecursiveMapper):
+    memoize = True
+
     def MapInteger(self, srcVar: str, dstQGenC: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = %s;\n" % (dstQGenC, srcVar)]
 
@@ -231,6 +235,8 @@ class FromASN1SCCtoQGenC(RecursiveMapper):
 
 # pylint: disable=no-self-use
 class FromQGenCToOSS(RecursiveMapper):
+    memoize = True
+
     def MapInteger(self, srcQGenC: str, destVar: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = %s;\n" % (destVar, srcQGenC)]
 
@@ -312,6 +318,8 @@ class FromQGenCToOSS(RecursiveMapper):
 
 # pylint: disable=no-self-use
 class FromOSStoQGenC(RecursiveMapper):
+    memoize = True
+
     def MapInteger(self, srcVar: str, dstQGenC: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = %s;\n" % (dstQGenC, srcVar)]
 
@@ -53,6 +53,8 @@ def Version() -> None:
 # noinspection PyListCreation
 # pylint: disable=no-self-use
 class FromRTDSToASN1SCC(RecursiveMapper):
+    memoize = True
+
     def __init__(self) -> None:
         self.uniqueID = 0
 
@@ -63,6 +65,9 @@ class FromRTDSToASN1SCC(RecursiveMapper):
     def DecreaseUniqueID(self) -> None:
         self.uniqueID -= 1
 
+    def MemoState(self) -> int:
+        return self.uniqueID
+
     def MapInteger(self, srcSDLVariable: str, destVar: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = (asn1SccSint) %s;\n" % (destVar, srcSDLVariable)]
 
@@ -150,6 +155,8 @@ class FromRTDSToASN1SCC(RecursiveMapper):
 # noinspection PyListCreation
 # pylint: disable=no-self-use
 class FromRTDSToOSS(RecursiveMapper):
+    memoize = True
+
     def __init__(self) -> None:
         self.uniqueID = 0
 
@@ -160,6 +167,9 @@ class FromRTDSToOSS(RecursiveMapper):
     def DecreaseUniqueID(self) -> None:
         self.uniqueID -= 1
 
+    def MemoState(self) -> int:
+        return self.uniqueID
+
     def MapInteger(self, srcSDLVariable: str, destVar: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = %s;\n" % (destVar, srcSDLVariable)]
 
@@ -254,6 +264,8 @@ class FromRTDSToOSS(RecursiveMapper):
 # noinspection PyListCreation
 # pylint: disable=no-self-use
 class FromASN1SCCtoRTDS(RecursiveMapper):
+    memoize = True
+
     def __init__(self) -> None:
         self.uniqueID = 0
 
@@ -264,6 +276,9 @@ class FromASN1SCCtoRTDS(RecursiveMapper):
     def DecreaseUniqueID(self) -> None:
         self.uniqueID -= 1
 
+    def MemoState(self) -> int:
+        return self.uniqueID
+
     def MapInteger(self, srcVar: str, dstSDLVariable: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = %s;\n" % (dstSDLVariable, srcVar)]
 
@@ -356,6 +371,8 @@ class FromASN1SCCtoRTDS(RecursiveMapper):
 # noinspection PyListCreation
 # pylint: disable=no-self-use
 class FromOSStoRTDS(RecursiveMapper):
+    memoize = True
+
     def __init__(self) -> None:
         self.uniqueID = 0
 
@@ -366,6 +383,9 @@ class FromOSStoRTDS(RecursiveMapper):
     def DecreaseUniqueID(self) -> None:
         self.uniqueID -= 1
 
+    def MemoState(self) -> int:
+        return self.uniqueID
+
     def MapInteger(self, srcVar: str, dstSDLVariable: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = %s;\n" % (dstSDLVariable, srcVar)]
 
@@ -111,6 +111,8 @@ def Version() -> None:
 # noinspection PyListCreation
 # pylint: disable=no-self-use
 class FromObjectGeodeToASN1SCC(RecursiveMapper):
+    memoize = True
+
     def __init__(self) -> None:
         self.uniqueID = 0
 
@@ -121,6 +123,9 @@ class FromObjectGeodeToASN1SCC(RecursiveMapper):
     def DecreaseUniqueID(self) -> None:
         self.uniqueID -= 1
 
+    def MemoState(self) -> int:
+        return self.uniqueID
+
     def MapInteger(self, srcSDLVariable: str, destVar: str, _: AsnNode, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = (asn1SccSint) %s;\n" % (destVar, srcSDLVariable)]
 
@@ -217,6 +222,8 @@ class FromObjectGeodeToASN1SCC(RecursiveMapper):
 # noinspection PyListCreation
 # pylint: disable=no-self-use
 class FromObjectGeodeToOSS(RecursiveMapper):
+    memoize = True
+
     def __init__(self) -> None:
         self.uniqueID = 0
 
@@ -227,6 +234,9 @@ class FromObjectGeodeToOSS(RecursiveMapper):
     def DecreaseUniqueID(self) -> None:
         self.uniqueID -= 1
 
+    def MemoState(self) -> int:
+        return self.uniqueID
+
     def MapInteger(self, srcSDLVariable: str, destVar: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = %s;\n" % (destVar, srcSDLVariable)]
 
@@ -321,6 +331,8 @@ class FromObjectGeodeToOSS(RecursiveMapper):
 # noinspection PyListCreation
 # pylint: disable=no-self-use
 class FromASN1SCCtoObjectGeode(RecursiveMapper):
+    memoize = True
+
     def __init__(self) -> None:
         self.uniqueID = 0
 
@@ -331,6 +343,9 @@ class FromASN1SCCtoObjectGeode(RecursiveMapper):
     def DecreaseUniqueID(self) -> None:
         self.uniqueID -= 1
 
+    def MemoState(self) -> int:
+        return self.uniqueID
+
     def MapInteger(self, srcVar: str, dstSDLVariable: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = %s;\n" % (dstSDLVariable, srcVar)]
 
@@ -440,6 +455,8 @@ class FromASN1SCCtoObjectGeode(RecursiveMapper):
 # noinspection PyListCreation
 # pylint: disable=no-self-use
 class FromOSStoObjectGeode(RecursiveMapper):
+    memoize = True
+
     def __init__(self) -> None:
         self.uniqueID = 0
 
@@ -450,6 +467,9 @@ class FromOSStoObjectGeode(RecursiveMapper):
     def DecreaseUniqueID(self) -> None:
         self.uniqueID -= 1
 
+    def MemoState(self) -> int:
+        return self.uniqueID
+
     def MapInteger(self, srcVar: str, dstSDLVariable: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = %s;\n" % (dstSDLVariable, srcVar)]
 
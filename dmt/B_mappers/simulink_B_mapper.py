@@ -35,7 +35,7 @@ parameters, which have C callable interfaces. The necessary
 stubs (to allow calling from the VM side) are also generated.
 '''
 
-from typing import List
+from typing import List, Optional, Tuple  # NOQA pylint: disable=unused-import
 
 from ..commonPy.utility import panicWithCallStack
 from ..commonPy.asnAST import (
@@ -64,6 +64,12 @@ def IsElementMappedToPrimitive(node: AsnSequenceOrSetOf, names: AST_Lookup) -> b
 
 # pylint: disable=no-self-use
 class FromSimulinkToASN1SCC(RecursiveMapper):
+    memoize = True
+
+    def HelperTypes(self, typename: str) -> Optional[Tuple[str, str]]:
+        # Simulink names its bus types as the ASN.1 types
+        return self.CleanName(typename), "asn1Scc" + self.CleanName(typename)
+
     def MapInteger(self, srcSimulink: str, destVar: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = (asn1SccSint) %s;\n" % (destVar, srcSimulink)]
 
@@ -147,6 +153,11 @@ class FromSimulinkToASN1SCC(RecursiveMapper):
 
 # pylint: disable=no-self-use
 class FromASN1SCCtoSimulink(RecursiveMapper):
+    memoize = True
+
+    def HelperTypes(self, typename: str) -> Optional[Tuple[str, str]]:
+        return "asn1Scc" + self.CleanName(typename), self.CleanName(typename)
+
     def MapInteger(self, srcVar: str, dstSimulink: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = %s;\n" % (dstSimulink, srcVar)]
 
@@ -229,6 +240,8 @@ class FromASN1SCCtoSimulink(RecursiveMapper):
 
 # pylint: disable=no-self-use
 class FromSimulinkToOSS(RecursiveMapper):
+    memoize = True
+
     def MapInteger(self, srcSimulink: str, destVar: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = %s;\n" % (destVar, srcSimulink)]
 
@@ -310,6 +323,8 @@ class FromSimulinkToOSS(RecursiveMapper):
 
 # pylint: disable=no-self-use
 class FromOSStoSimulink(RecursiveMapper):
+    memoize = True
+
     def MapInteger(self, srcVar: str, dstSimulink: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = %s;\n" % (dstSimulink, srcVar)]
 
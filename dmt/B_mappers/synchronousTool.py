@@ -24,11 +24,13 @@ Base class for all synchronous tools
 import re
 import os
 
-from typing import IO, Any, Generic, TypeVar  # NOQA pylint: disable=unused-import
+from typing import IO, Any, Generic, TypeVar, List, Optional  # NOQA pylint: disable=unused-import
 
 from ..commonPy.utility import panic, inform, panicWithCallStack
+from ..commonPy.outputFile import OutputFile
 from ..commonPy.aadlAST import InParam, OutParam, InOutParam, ApLevelContainer, Param
-from ..commonPy.recursiveMapper import RecursiveMapperGeneric
+from ..commonPy.recursiveMapper import RecursiveMapperGeneric, HelperFunctions
+from ..commonPy import configMT
 from ..commonPy.asnAST import AsnNode
 from ..commonPy.asnParser import AST_Lookup, AST_Leaftypes
 
@@ -96,6 +98,8 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
         self.supportedEncodings = ['native', 'uper', 'acn']
         self.dir = None  # type: str
         self.useOSS = None  # type: bool
+        # The helper functions of the C file (with -helpers)
+        self.helpers = None  # type: Optional[HelperFunctions]
 
     def OnStartup(self,
                   modelingLanguage: str,
@@ -115,10 +119,10 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
             outputADAheaderFilename = outputADAheaderFilename.lower()
 
             inform(str(self.__class__) + ": Creating file '%s'...", outputADAheaderFilename)
-            self.ADA_HeaderFile = open(outputDir + outputADAheaderFilename, 'w')
+            self.ADA_HeaderFile = OutputFile(outputDir + outputADAheaderFilename)
 
             inform(str(self.__class__) + ": Creating file '%s'...", outputADAsourceFilename)
-            self.ADA_SourceFile = open(outputDir + outputADAsourceFilename, 'w')
+            self.ADA_SourceFile = OutputFile(outputDir + outputADAsourceFilename)
 
             self.asn_name = os.path.basename(os.path.splitext(asnFile)[0])
 
@@ -139,6 +143,7 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
         else:
             self.dir = outputDir
             self.useOSS = useOSS
+            self.helpers = HelperFunctions() if configMT.g_bHelperFunctions else None
 
             outputCheaderFilename = \
                 self.CleanNameAsToolWants(subProgram._id + "_" + subProgramImplementation) + "." + self.CleanNameAsToolWants(modelingLanguage) + ".h"
@@ -150,16 +155,16 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
             outputADAheaderFilename = outputADAheaderFilename.lower()
 
             inform(str(self.__class__) + ": Creating file '%s'...", outputCheaderFilename)
-            self.C_HeaderFile = open(outputDir + outputCheaderFilename, 'w')
+            self.C_HeaderFile = OutputFile(outputDir + outputCheaderFilename)
 
             inform(str(self.__class__) + ": Creating file '%s'...", outputCsourceFilename)
-            self.C_SourceFile = open(outputDir + outputCsourceFilename, 'w')
+            self.C_SourceFile = OutputFile(outputDir + outputCsourceFilename)
 
             inform(str(self.__class__) + ": Creating file '%s'...", outputADAheaderFilename)
-            self.ADA_HeaderFile = open(outputDir + outputADAheaderFilename, 'w')
+            self.ADA_HeaderFile = OutputFile(outputDir + outputADAheaderFilename)
 
             inform(str(self.__class__) + ": Creating file '%s'...", outputADAsourceFilename)
-            self.ADA_SourceFile = open(outputDir + outputADAsourceFilename, 'w')
+            self.ADA_SourceFile = OutputFile(outputDir + outputADAsourceFilename)
 
             self.asn_name = os.path.basename(os.path.splitext(asnFile)[0])
 
@@ -173,7 +178,8 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
             self.C_HeaderFile.write("\n")
 
             self.C_SourceFile.write("#include <stdio.h>\n")
-            self.C_SourceFile.write("#include <string.h>\n\n")
+            self.C_SourceFile.write("#include <string.h>\n")
+            self.C_SourceFile.write("#include <stdint.h>\n\n")
             self.C_SourceFile.write("#include <assert.h>\n\n")
 
             self.C_SourceFile.write("#include \"%s\"\n" % outputCheaderFilename)
@@ -192,6 +198,36 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
                 'package body %s is\n\n' %
                 self.CleanNameAsADAWants(subProgram._id + "_" + subProgramImplementation))
 
+    def MapToC(self,
+               mapper: RecursiveMapperGeneric,
+               srcVar: Any,
+               destVar: Any,
+               nodeTypename: str,
+               node: AsnNode,
+               leafTypeDict: AST_Leaftypes,
+               names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+        '''Map, and write the helper functions it made to the C file.
+
+The returned lines must be written after this call - i.e. inside a
+function whose header is written after this call.'''
+        if not mapper:
+            return []
+        if self.helpers is None:
+            return mapper.Map(srcVar, destVar, node, leafTypeDict, names)
+        mapper.helpers = self.helpers
+        lines = mapper.Map(srcVar, destVar, nodeTypename, leafTypeDict, names)
+        self.C_SourceFile.write(self.helpers.Flush())
+        return lines
+
+    def AsnVar(self, nodeTypename: str, encoding: str) -> str:
+        '''The ASN1SCC variable that the C glue maps to/from.
+
+With the native encoding, it is the buffer itself when it is aligned
+for the type (or else a local copy of it).'''
+        if encoding.lower() == "native":
+            return "(*pVar_" + self.CleanNameAsToolWants(nodeTypename) + ")"
+        return "var_" + self.CleanNameAsToolWants(nodeTypename)
+
     def Encoder(self,
                 nodeTypename: str,
                 encoding: str,
@@ -236,6 +272,20 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
             self.ADA_SourceFile.write(
                 "    end Ada_%s;\n\n" % tmpSpName)
         else:
+            # Write the mapping code for the message
+            if self.useOSS and encoding.lower() == "uper":
+                toolToAsn1 = self.FromToolToOSS()
+            else:
+                toolToAsn1 = self.FromToolToASN1SCC()
+            lines = self.MapToC(
+                toolToAsn1,
+                srcVar,
+                self.AsnVar(nodeTypename, encoding),
+                nodeTypename,
+                node,
+                leafTypeDict,
+                names)
+
             self.C_HeaderFile.write(
                 "int %s(void *pBuffer, size_t iMaxBufferSize);\n" % tmpSpName)
             self.ADA_HeaderFile.write(
@@ -258,6 +308,22 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
                 self.C_SourceFile.write(
                     "    STATIC OSS_%s var_%s;\n" %
                     (self.CleanNameAsToolWants(nodeTypename), self.CleanNameAsToolWants(nodeTypename)))
+            elif encoding.lower() == "native":
+                # The buffer of the caller is written in place if it is aligned
+                # for the ASN1SCC type, or else through a local copy
+                self.C_SourceFile.write(
+                    "    asn1Scc%s var_%s;\n" %
+                    (self.CleanNameAsToolWants(nodeTypename), self.CleanNameAsToolWants(nodeTypename)))
+                self.C_SourceFile.write(
+                    "    asn1Scc%s *pVar_%s = &var_%s;\n\n" %
+                    (self.CleanNameAsToolWants(nodeTypename), self.CleanNameAsToolWants(nodeTypename), self.CleanNameAsToolWants(nodeTypename)))
+                self.C_SourceFile.write(
+                    "    assert(iMaxBufferSize >= sizeof(asn1Scc%s));\n" % self.CleanNameAsToolWants(nodeTypename))
+                self.C_SourceFile.write(
+                    "    if (((uintptr_t)pBuffer %% _Alignof(asn1Scc%s)) == 0)\n" % self.CleanNameAsToolWants(nodeTypename))
+                self.C_SourceFile.write(
+                    "        pVar_%s = (asn1Scc%s *) pBuffer;\n" %
+                    (self.CleanNameAsToolWants(nodeTypename), self.CleanNameAsToolWants(nodeTypename)))
             else:
                 self.C_SourceFile.write(
                     "    STATIC asn1Scc%s var_%s;\n" %
@@ -272,18 +338,6 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
                     # setup the asn1c encoder
                     self.C_SourceFile.write("    BitStream_Init(&strm, pBuffer, iMaxBufferSize);\n")
 
-            # Write the mapping code for the message
-            if self.useOSS and encoding.lower() == "uper":
-                toolToAsn1 = self.FromToolToOSS()
-            else:
-                toolToAsn1 = self.FromToolToASN1SCC()
-            lines = toolToAsn1.Map(
-                srcVar,
-                "var_" + self.CleanNameAsToolWants(nodeTypename),
-                node,
-                leafTypeDict,
-                names) if toolToAsn1 else []
-
             lines = ["    " + x for x in lines]
             self.C_SourceFile.write("".join(lines))
 
@@ -319,7 +373,10 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
                 self.C_SourceFile.write("}\n\n")
             elif encoding.lower() == "native":
                 self.C_SourceFile.write(
-                    "    memcpy(pBuffer, &var_%s, sizeof(asn1Scc%s) );\n" %
+                    "    if (pVar_%s == &var_%s)\n" %
+                    (self.CleanNameAsToolWants(nodeTypename), self.CleanNameAsToolWants(nodeTypename)))
+                self.C_SourceFile.write(
+                    "        memcpy(pBuffer, &var_%s, sizeof(asn1Scc%s) );\n" %
                     (self.CleanNameAsToolWants(nodeTypename), self.CleanNameAsToolWants(nodeTypename)))
                 self.C_SourceFile.write("    return sizeof(asn1Scc%s);\n" % self.CleanNameAsToolWants(nodeTypename))
                 self.C_SourceFile.write("}\n\n")
@@ -368,6 +425,25 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
                 panic(str(self.__class__) + ": in (%s), encoding can be one of %s (not '%s')" %  # pragma: no cover
                       (subProgram._id + "." + subProgramImplementation, self.supportedEncodings, encoding))  # pragma: no cover
 
+            if self.useOSS and encoding.lower() == "uper":
+                lines = self.MapToC(
+                    self.FromOSStoTool(),
+                    "(*pVar_" + self.CleanNameAsToolWants(nodeTypename) + ")",
+                    targetVar,
+                    nodeTypename,
+                    node,
+                    leafTypeDict,
+                    names)
+            else:
+                lines = self.MapToC(
+                    self.FromASN1SCCtoTool(),
+                    self.AsnVar(nodeTypename, encoding),
+                    targetVar,
+                    nodeTypename,
+                    node,
+                    leafTypeDict,
+                    names)
+
             self.C_HeaderFile.write(
                 "int %s(void *pBuffer, size_t iBufferSize);\n" % tmpSpName)
 
@@ -398,6 +474,23 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
                 self.C_SourceFile.write("    if (0 == ossDecode(g_world, &pdutype, &strm, (void**)&pVar_%s)) {\n" %
                                         self.CleanNameAsToolWants(nodeTypename))
                 self.C_SourceFile.write("        /* Decoding succeeded */\n")
+            elif encoding.lower() == "native":
+                # The buffer of the caller is read in place if it is aligned
+                # for the ASN1SCC type, or else from a local copy
+                self.C_SourceFile.write("    asn1Scc%s var_%s;\n" %
+                                        (self.CleanNameAsToolWants(nodeTypename), self.CleanNameAsToolWants(nodeTypename)))
+                self.C_SourceFile.write("    const asn1Scc%s *pVar_%s = &var_%s;\n\n" %
+                                        (self.CleanNameAsToolWants(nodeTypename),
+                                         self.CleanNameAsToolWants(nodeTypename),
+                                         self.CleanNameAsToolWants(nodeTypename)))
+                self.C_SourceFile.write("    assert(iBufferSize >= sizeof(asn1Scc%s));\n" % self.CleanNameAsToolWants(nodeTypename))
+                self.C_SourceFile.write("    if (((uintptr_t)pBuffer %% _Alignof(asn1Scc%s)) == 0)\n" % self.CleanNameAsToolWants(nodeTypename))
+                self.C_SourceFile.write("        pVar_%s = (const asn1Scc%s *) pBuffer;\n" %
+                                        (self.CleanNameAsToolWants(nodeTypename), self.CleanNameAsToolWants(nodeTypename)))
+                self.C_SourceFile.write("    else\n")
+                self.C_SourceFile.write("        memcpy(&var_%s, pBuffer, sizeof(asn1Scc%s) );\n    {\n" %
+                                        (self.CleanNameAsToolWants(nodeTypename),
+                                         self.CleanNameAsToolWants(nodeTypename)))
             else:
                 self.C_SourceFile.write("    STATIC asn1Scc%s var_%s;\n" %
                                         (self.CleanNameAsToolWants(nodeTypename), self.CleanNameAsToolWants(nodeTypename)))
@@ -410,27 +503,7 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
                                              "ACN_" if encoding.lower() == "acn" else "",
                                              self.CleanNameAsToolWants(nodeTypename)))
                     self.C_SourceFile.write("        /* Decoding succeeded */\n")
-                elif encoding.lower() == "native":
-                    self.C_SourceFile.write("    var_%s = *(asn1Scc%s *) pBuffer;\n    {\n" %
-                                            (self.CleanNameAsToolWants(nodeTypename),
-                                             self.CleanNameAsToolWants(nodeTypename)))
 
-            if self.useOSS and encoding.lower() == "uper":
-                asn1ToTool = self.FromOSStoTool()
-                lines = asn1ToTool.Map(
-                    "(*pVar_" + self.CleanNameAsToolWants(nodeTypename) + ")",
-                    targetVar,
-                    node,
-                    leafTypeDict,
-                    names) if asn1ToTool else []
-            else:
-                asn1ToTool = self.FromASN1SCCtoTool()
-                lines = asn1ToTool.Map(
-                    "var_" + self.CleanNameAsToolWants(nodeTypename),
-                    targetVar,
-                    node,
-                    leafTypeDict,
-                    names) if asn1ToTool else []
             lines = ["        " + x for x in lines]
             self.C_SourceFile.write("".join(lines))
 
@@ -48,6 +48,8 @@ def Version() -> None:
 # noinspection PyListCreation
 # pylint: disable=no-self-use
 class FromVDMToASN1SCC(RecursiveMapper):
+    memoize = True
+
     def __init__(self) -> None:
         self.uniqueID = 0
 
@@ -58,6 +60,9 @@ class FromVDMToASN1SCC(RecursiveMapper):
     def DecreaseUniqueID(self) -> None:
         self.uniqueID -= 1
 
+    def MemoState(self) -> int:
+        return self.uniqueID
+
     def MapInteger(self, srcVDMVariable: str, destVar: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = (asn1SccSint)(%s)->value.intVal;\n" % (destVar, srcVDMVariable)]
 
@@ -167,6 +172,8 @@ class FromVDMToASN1SCC(RecursiveMapper):
 # noinspection PyListCreation
 # pylint: disable=no-self-use
 class FromASN1SCCtoVDM(RecursiveMapper):
+    memoize = True
+
     def __init__(self) -> None:
         self.uniqueID = 0
 
@@ -177,6 +184,9 @@ class FromASN1SCCtoVDM(RecursiveMapper):
     def DecreaseUniqueID(self) -> None:
         self.uniqueID -= 1
 
+    def MemoState(self) -> int:
+        return self.uniqueID
+
     def MapInteger(self, srcVar: str, dstVDMVariable: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return ["%s = newInt(%s);\n" % (dstVDMVariable, srcVar)]
 
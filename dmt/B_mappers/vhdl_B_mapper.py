@@ -44,6 +44,7 @@ import math
 from typing import cast, Union, List, Tuple, IO, Any  # NOQA pylint: disable=unused-import
 
 from ..commonPy.utility import panic, panicWithCallStack
+from ..commonPy.outputFile import OutputFile
 from ..commonPy.asnAST import (
     AsnBasicNode, AsnInt, AsnSequence, AsnSet, AsnChoice, AsnSequenceOf,
     AsnSetOf, AsnEnumerated, AsnMetaMember, isSequenceVariable,
@@ -1031,14 +1032,14 @@ def OnFinal() -> None:
     outputs = []
     completions = []
 
-    systemcHeader = open(vhdlBackend.dir + 'circuit.h', 'w')
+    systemcHeader = OutputFile(vhdlBackend.dir + 'circuit.h')
     systemcHeader.write('#ifndef CIRCUIT_H\n')
     systemcHeader.write('#define CIRCUIT_H\n\n')
     systemcHeader.write('#ifndef SC_SYNTHESIS\n')
     systemcHeader.write('#include "systemc.h"\n')
     systemcHeader.write('#endif\n\n')
 
-    systemcBody = open(vhdlBackend.dir + 'circuit.cpp', 'w')
+    systemcBody = OutputFile(vhdlBackend.dir + 'circuit.cpp')
     systemcBody.write('#include "circuit.h"\n\n')
 
     if len(VHDL_Circuit.allCircuits) > 1:
@@ -1207,23 +1208,23 @@ def OnFinal() -> None:
     apbWrapper.write(vhdlTemplate.apbwrapper % g_placeholders)
     apbWrapper.close()
 
-    apbwrapper_declaration = open(vhdlBackend.dir + 'VHDL/APB wrapper/apbwrapper_declaration.vhd', 'w')
+    apbwrapper_declaration = OutputFile(vhdlBackend.dir + 'VHDL/APB wrapper/apbwrapper_declaration.vhd')
     apbwrapper_declaration.write(vhdlTemplate.apbwrapper_declaration % g_placeholders)
     apbwrapper_declaration.close()
 
-    architecture_top = open(vhdlBackend.dir + 'VHDL/Top architecture/architecture_top.vhd', 'w')
+    architecture_top = OutputFile(vhdlBackend.dir + 'VHDL/Top architecture/architecture_top.vhd')
     architecture_top.write(vhdlTemplate.architecture_top % g_placeholders)
     architecture_top.close()
 
-    architecture_config = open(vhdlBackend.dir + 'VHDL/Top architecture/architecture_config.vhd', 'w')
+    architecture_config = OutputFile(vhdlBackend.dir + 'VHDL/Top architecture/architecture_config.vhd')
     architecture_config.write(vhdlTemplate.architecture_config % g_placeholders)
     architecture_config.close()
 
-    customip2 = open(vhdlBackend.dir + 'VHDL/Custom IP/customip2.vhd', 'w')
+    customip2 = OutputFile(vhdlBackend.dir + 'VHDL/Custom IP/customip2.vhd')
     customip2.write(vhdlTemplate.customip2 % g_placeholders)
     customip2.close()
 
-    esaHeader = open(vhdlBackend.dir + 'ESA_FPGA.h', 'w')
+    esaHeader = OutputFile(vhdlBackend.dir + 'ESA_FPGA.h')
     esaHeader.write('''#ifndef __ESA_FPGA_H__
 #define __ESA_FPGA_H__
 
@@ -84,22 +84,19 @@ import copy
 import distutils.spawn as spawn
 from importlib import import_module
 
-from typing import Dict, List, Tuple, Any  # NOQA pylint: disable=unused-import
+from typing import Dict, List, Set, Tuple, Any  # NOQA pylint: disable=unused-import
 
 from . import commonPy
 
 from .commonPy.utility import panic, inform
-from .commonPy import verify
+from .commonPy.jobPool import JobPool
+from .commonPy import verify, profiling, buildManifest
 from .commonPy.asnParser import Filename, Typename, AST_Lookup, AST_TypesOfFile, AST_Leaftypes  # NOQA pylint: disable=unused-import
 from .commonPy.asnAST import AsnNode  # NOQA pylint: disable=unused-import
 from .commonPy.aadlAST import ApLevelContainer  # NOQA pylint: disable=unused-import
 
 from . import B_mappers  # NOQA pylint: disable=unused-import
-
-# To unpickle the Py2/ANTLR2-generated pickle file...
-#    http://stackoverflow.com/questions/2121874/python-pickling-after-changing-a-modules-directory
-from . import commonPy2
-sys.modules['commonPy2'] = commonPy2
+from .B_mappers import asynchronousTool
 
 g_mappedName = {
     'SEQUENCE': 'OnSequence',
@@ -112,60 +109,9 @@ g_mappedName = {
 
 
 def ParseAADLfilesAndResolveSignals() -> None:
-    '''Invokes the ANTLR generated AADL parser, and resolves
-all references to AAADL Data types into the param._signal member
-of each SUBPROGRAM param.'''
-    import tempfile
-    f = tempfile.NamedTemporaryFile(delete=False)
-    astFile = f.name
-    f.close()
-    os.unlink(astFile)
-    parserUtility = os.path.join(os.path.abspath(os.path.dirname(__file__)), "parse_aadl.py")
-    cmd = "python2 " + parserUtility + " -o " + astFile + ' ' + ' '.join(sys.argv[1:])
-    if os.system(cmd) != 0:
-        if os.path.exists(astFile):
-            os.unlink(astFile)
-        panic("AADL parsing failed. Aborting...")
-
-    def FixMetaClasses(sp: ApLevelContainer) -> None:
-        def patchMe(o: Any) -> None:
-            try:
-                python2className = str(o.__class__).split("'")[1]
-                if 'commonPy2' in python2className:
-                    klass = commonPy
-                    for step in python2className.split('.')[1:]:
-                        klass = getattr(klass, step)
-                    o.__class__ = klass
-            except Exception as _:
-                pass
-
-        patchMe(sp)
-        for param in sp._params:
-            patchMe(param)
-            patchMe(param._signal)
-            patchMe(param._sourceElement)
-        # for c in sp._calls:
-        #     patchMe(c)
-        for cn in sp._connections:
-            patchMe(cn)
-    try:
-        import pickle
-        astInfo = pickle.load(open(astFile, 'rb'), fix_imports=False)
-        for k in ['g_processImplementations', 'g_apLevelContainers',
-                  'g_signals', 'g_systems', 'g_subProgramImplementations',
-                  'g_threadImplementations']:
-            setattr(commonPy.aadlAST, k, astInfo[k])
-        for k in ['g_processImplementations',
-                  'g_subProgramImplementations', 'g_threadImplementations']:
-            for si in astInfo[k]:
-                # sp, sp_impl, modelingLanguage, maybeFVname = si[0], si[1], si[2], si[3]
-                sp = si[0]
-                sp = commonPy.aadlAST.g_apLevelContainers[sp]
-                FixMetaClasses(sp)
-    except Exception as e:
-        if os.path.exists(astFile):
-            os.unlink(astFile)
-        panic(str(e))
+    '''Parses the AADL input files, and resolves all references to
+AADL Data types into the param._signal member of each SUBPROGRAM param.'''
+    commonPy.aadlParser.ParseAADLfiles(sys.argv[1:])
 
 
 def SpecialCodes(unused_SystemsAndImplementations: List[Tuple[str, str, str, str]],
@@ -184,6 +130,91 @@ types). This used to cover Dumpable C/Ada Types and OG headers.'''
                   .format(asn1SccPath, outputDir, '" "'.join(asnFiles)))
 
 
+def GlueForParams(backend: Any, backendFilename: str, sp: ApLevelContainer, sp_impl: str, badTypes: Set[str]) -> None:
+    '''Invoke the backend's OnBasic/OnSequence/etc for the parameters of sp.'''
+    for param in sp._params:
+        inform("Creating glue for param %s...", param._id)
+        asnFile = param._signal._asnFilename
+        names = commonPy.asnParser.g_names
+        leafTypeDict = commonPy.asnParser.g_leafTypeDict
+
+        inform("This param uses definitions from %s", asnFile)
+        for nodeTypename in names:
+            # Check if this type must be skipped
+            if nodeTypename in badTypes:
+                continue
+
+            # Async backends need to collect all types and create Encode/Decode functions for them.
+            # So we allow async backends to pass thru this "if" - the collection of types
+            # is done in the typesToWorkOn dictionary *inside* the base class (asynchronousTool.py)
+            if (not backend.isAsynchronous) and nodeTypename != param._signal._asnNodename:
+                # For sync tools, only allow the typename we are using in this param to pass
+                continue
+            node = names[nodeTypename]
+            inform("ASN.1 node is %s", nodeTypename)
+
+            # First, make sure we know what leaf type this node is
+            if node._isArtificial:
+                continue  # artificially created (inner) type
+
+            leafType = leafTypeDict[nodeTypename]
+            # If it is a base type,
+            if leafType in ['BOOLEAN', 'INTEGER', 'REAL', 'OCTET STRING']:
+                # make sure we have mapping instructions for BASE elements
+                if 'OnBasic' not in dir(backend):
+                    panic("ASN.1 grammar contains literal(%s) but no BASE section found in the mapping grammar (%s)" % (nodeTypename, backendFilename))  # pragma: no cover
+                with profiling.Phase("OnBasic"):
+                    if not backend.isAsynchronous:
+                        backend.OnBasic(nodeTypename, node, sp, sp_impl, param, leafTypeDict, names)
+                    else:
+                        backend.OnBasic(nodeTypename, node, leafTypeDict, names)
+            # if it is a complex type
+            elif leafType in ['SEQUENCE', 'SET', 'CHOICE', 'SEQUENCEOF', 'SETOF', 'ENUMERATED']:
+                # make sure we have mapping instructions for the element
+                if g_mappedName[leafType] not in dir(backend):
+                    panic("ASN.1 grammar contains %s but no %s section found in the mapping grammar (%s)" % (nodeTypename, g_mappedName[leafType], backendFilename))  # pragma: no cover
+                processor = backend.__dict__[g_mappedName[leafType]]
+                with profiling.Phase(g_mappedName[leafType]):
+                    if not backend.isAsynchronous:
+                        processor(nodeTypename, node, sp, sp_impl, param, leafTypeDict, names)
+                    else:
+                        processor(nodeTypename, node, leafTypeDict, names)
+            # what type is it?
+            else:  # pragma: no cover
+                panic("Unexpected type of element: %s" % leafTypeDict[nodeTypename])  # pragma: no cover
+
+
+def DescribeParams(sp: ApLevelContainer) -> List[Tuple[str, ...]]:  # pylint: disable=invalid-sequence-index
+    '''What the glue of a SystemsAndImplementation depends on, in its AADL definition.'''
+    return [
+        (param.__class__.__name__, param._id, param._signal._asnFilename, param._signal._asnNodename,
+         str(param._signal._asnSize), param._sourceElement._encoding)
+        for param in sp._params]
+
+
+def SynchronousGlue(
+        backend: Any,
+        backendFilename: str,
+        modelingLanguage: str,
+        asnFile: str,
+        sp: ApLevelContainer,
+        sp_impl: str,
+        maybeFVname: str,
+        useOSS: bool,
+        badTypes: Set[str]) -> None:
+    '''Create the glue of a synchronous backend for one SystemsAndImplementation.'''
+    with profiling.Phase("backend " + backendFilename[1:-3]):
+        # In synchronous tools, always call OnStartup and OnShutdown for each SystemsAndImplementation
+        if 'OnStartup' in dir(backend):
+            with profiling.Phase("OnStartup"):
+                backend.OnStartup(modelingLanguage, asnFile, sp, sp_impl, commonPy.configMT.outputDir, maybeFVname, useOSS)
+        GlueForParams(backend, backendFilename, sp, sp_impl, badTypes)
+        # ...and OnShutdown is given the ASN.1 file of the last parameter.
+        if 'OnShutdown' in dir(backend):
+            with profiling.Phase("OnShutdown"):
+                backend.OnShutdown(modelingLanguage, sp._params[-1]._signal._asnFilename, sp, sp_impl, maybeFVname)
+
+
 def main() -> None:
     if "-v" in sys.argv:
         import pkg_resources  # pragma: no cover
@@ -196,7 +227,7 @@ def main() -> None:
         try:
             commonPy.configMT.outputDir = os.path.normpath(sys.argv[idx + 1]) + os.sep
         except:  # pragma: no cover
-            panic('Usage: %s [-v] [-verbose] [-useOSS] [-o dirname] input1.aadl [input2.aadl] ...\n' % sys.argv[0])  # pragma: no cover
+            panic('Usage: %s [-v] [-verbose] [-useOSS] [-helpers] [-allEncodings] [-noCache] [-clearCache] [-force] [-o dirname] [-jobs N] [--profile report.json] input1.aadl [input2.aadl] ...\n' % sys.argv[0])  # pragma: no cover
         del sys.argv[idx]
         del sys.argv[idx]
         if not os.path.isdir(commonPy.configMT.outputDir):
@@ -207,19 +238,58 @@ def main() -> None:
     if "-verbose" in sys.argv:
         commonPy.configMT.verbose = True
         sys.argv.remove("-verbose")
+    if "-noCache" in sys.argv:
+        commonPy.configMT.useAsnCache = False
+        sys.argv.remove("-noCache")
+    if "-clearCache" in sys.argv:
+        commonPy.asnCache.Clear()
+        sys.argv.remove("-clearCache")
+    maxJobs = 1
+    if sys.argv.count("-jobs") != 0:
+        idx = sys.argv.index("-jobs")
+        try:
+            maxJobs = int(sys.argv[idx + 1])
+        except:  # pragma: no cover
+            panic('Usage: %s [-v] [-verbose] [-useOSS] [-helpers] [-allEncodings] [-noCache] [-clearCache] [-force] [-o dirname] [-jobs N] [--profile report.json] input1.aadl [input2.aadl] ...\n' % sys.argv[0])  # pragma: no cover
+        del sys.argv[idx]
+        del sys.argv[idx]
+        if maxJobs < 1:
+            panic("-jobs expects a positive number, not %d\n" % maxJobs)  # pragma: no cover
+    profiling.HandleCommandLine("aadl2glueC")
     useOSS = "-useOSS" in sys.argv
     if useOSS:
         sys.argv.remove("-useOSS")
+    force = "-force" in sys.argv
+    if force:
+        sys.argv.remove("-force")
+    if "-helpers" in sys.argv:
+        commonPy.configMT.g_bHelperFunctions = True
+        sys.argv.remove("-helpers")
+    if "-allEncodings" in sys.argv:
+        commonPy.configMT.g_bAllEncodings = True
+        sys.argv.remove("-allEncodings")
 
     # No other options must remain in the cmd line...
     if len(sys.argv) < 2:
-        panic('Usage: %s [-v] [-verbose] [-useOSS] [-o dirname] input1.aadl [input2.aadl] ...\n' % sys.argv[0])  # pragma: no cover
+        panic('Usage: %s [-v] [-verbose] [-useOSS] [-helpers] [-allEncodings] [-noCache] [-clearCache] [-force] [-o dirname] [-jobs N] [--profile report.json] input1.aadl [input2.aadl] ...\n' % sys.argv[0])  # pragma: no cover
     commonPy.configMT.showCode = True
     for f in sys.argv[1:]:
         if not os.path.isfile(f):
             panic("'%s' is not a file!\n" % f)  # pragma: no cover
 
-    ParseAADLfilesAndResolveSignals()
+    # Nothing to do if neither the AADL files nor the ASN.1 files they
+    # referred to in the last run have changed
+    aadlFiles = sys.argv[1:]
+    options = (useOSS, commonPy.configMT.g_bOnlySubprograms, commonPy.configMT.g_bHelperFunctions,
+               commonPy.configMT.g_bAllEncodings)
+    with profiling.Phase("Manifest"):
+        manifest = buildManifest.Manifest("aadl2glueC", enabled=not force)
+        if manifest.UpToDate("all", manifest.Key(aadlFiles + manifest.Dependencies("all"), options)):
+            inform("All outputs are up to date.")
+            return
+
+    with profiling.Phase("ParseAADL"):
+        ParseAADLfilesAndResolveSignals()
 
     uniqueDataFiles = {}  # type: Dict[Filename, Dict[str, List[ApLevelContainer]]]
     for sp in list(commonPy.aadlAST.g_apLevelContainers.values()):
@@ -232,6 +302,7 @@ def main() -> None:
     if len(list(uniqueDataFiles.keys())) != 0:
         commonPy.asnParser.ParseAsnFileList(list(uniqueDataFiles.keys()))
 
+    verifiedTypes = set()  # type: Set[str]
     for asnFile in uniqueDataFiles:
         tmpNames = {}  # type: AST_Lookup
         for name in commonPy.asnParser.g_typesOfFile[asnFile]:
@@ -243,8 +314,13 @@ def main() -> None:
             copy.copy(commonPy.asnParser.g_leafTypeDict))   # map from Typename to leafType
 
         inform("Checking that all base nodes have mandatory ranges set in %s..." % asnFile)
-        for node in list(tmpNames.values()):
-            verify.VerifyRanges(node, commonPy.asnParser.g_names)
+        with profiling.Phase("VerifyRanges"):
+            for nodeTypename in tmpNames:
+                verify.VerifyRanges(nodeTypename, commonPy.asnParser.g_names, verifiedTypes)
+
+    asnFiles = list(uniqueDataFiles.keys())
+    for f in asnFiles:
+        manifest.SetTypes(f, list(commonPy.asnParser.g_typesOfFile[f]))
 
     loadedBackends = set()  # type: Set[str]
 
@@ -253,28 +329,29 @@ def main() -> None:
     SystemsAndImplementations.extend(commonPy.aadlAST.g_processImplementations[:])
 
     # Update ASN.1 nodes to carry size info (only for Signal params)
+    symbols = commonPy.symbolTable.GetSymbolTable()
     for si in SystemsAndImplementations:
         spName, sp_impl, modelingLanguage = si[0], si[1], si[2]
         sp = commonPy.aadlAST.g_apLevelContainers[spName]
         for param in sp._params:
             asnFile = param._signal._asnFilename
-            names = uniqueASNfiles[asnFile][0]
-            leafTypeDict = uniqueASNfiles[asnFile][2]
-            for nodeTypename in names:
-                if nodeTypename != param._signal._asnNodename:
-                    continue
-                node = names[nodeTypename]
-                if node._leafType == "AsciiString":
-                    panic("You cannot use IA5String as a parameter - use OCTET STRING instead\n(%s)" % node.Location())  # pragma: no cover
-                # (typo?) node._asnSize = param._signal._asnSize
+            nodeTypename = param._signal._asnNodename
+            if nodeTypename not in uniqueASNfiles[asnFile][0]:
+                continue
+            node = symbols.TypeByName(nodeTypename)
+            if node._leafType == "AsciiString":
+                panic("You cannot use IA5String as a parameter - use OCTET STRING instead\n(%s)" % node.Location())  # pragma: no cover
+            # (typo?) node._asnSize = param._signal._asnSize
 
     # If some AST nodes must be skipped (for any reason), go learn about them
     badTypes = commonPy.cleanupNodes.DiscoverBadTypes()
 
     if {"ada", "qgenada"} & {y[2].lower() for y in SystemsAndImplementations}:
-        SpecialCodes(SystemsAndImplementations, uniqueDataFiles, uniqueASNfiles, useOSS)
+        with profiling.Phase("SpecialCodes"):
+            SpecialCodes(SystemsAndImplementations, uniqueDataFiles, uniqueASNfiles, useOSS)
 
     asynchronousBackends = []  # type: List[Any]  # No idea how to say list of module
+    pool = JobPool(maxJobs)
 
     for si in SystemsAndImplementations:
         spName, sp_impl, modelingLanguage, maybeFVname = si[0], si[1], si[2], si[3]
@@ -324,70 +401,39 @@ def main() -> None:
                 if 'OnStartup' in dir(backend):
                     # Also notice, no SP or SPIMPL are passed. We are asynchronous, so
                     # we only generate "generic" encoders and decoders, not SP-specific ones.
-                    backend.OnStartup(modelingLanguage, asnFile, commonPy.configMT.outputDir, maybeFVname, useOSS)
+                    with profiling.Phase("backend " + backendFilename[1:-3] + "/OnStartup"):
+                        backend.OnStartup(modelingLanguage, asnFile, commonPy.configMT.outputDir, maybeFVname, useOSS)
+            # Only the encodings used by the parameters get encoders and decoders
+            for param in sp._params:
+                asynchronousTool.UseEncoding(param._signal._asnNodename, param._sourceElement._encoding)
+            with profiling.Phase("backend " + backendFilename[1:-3]):
+                GlueForParams(backend, backendFilename, sp, sp_impl, badTypes)
         else:
-            # In synchronous tools, always call OnStartup and OnShutdown for each SystemsAndImplementation
-            if 'OnStartup' in dir(backend):
-                backend.OnStartup(modelingLanguage, asnFile, sp, sp_impl, commonPy.configMT.outputDir, maybeFVname, useOSS)
-
-        for param in sp._params:
-            inform("Creating glue for param %s...", param._id)
-            asnFile = param._signal._asnFilename
-            names = commonPy.asnParser.g_names
-            leafTypeDict = commonPy.asnParser.g_leafTypeDict
-
-            inform("This param uses definitions from %s", asnFile)
-            for nodeTypename in names:
-                # Check if this type must be skipped
-                if nodeTypename in badTypes:
-                    continue
-
-                # Async backends need to collect all types and create Encode/Decode functions for them.
-                # So we allow async backends to pass thru this "if" - the collection of types
-                # is done in the typesToWorkOn dictionary *inside* the base class (asynchronousTool.py)
-                if (not backend.isAsynchronous) and nodeTypename != param._signal._asnNodename:
-                    # For sync tools, only allow the typename we are using in this param to pass
-                    continue
-                node = names[nodeTypename]
-                inform("ASN.1 node is %s", nodeTypename)
-
-                # First, make sure we know what leaf type this node is
-                if node._isArtificial:
-                    continue  # artificially created (inner) type
-
-                leafType = leafTypeDict[nodeTypename]
-                # If it is a base type,
-                if leafType in ['BOOLEAN', 'INTEGER', 'REAL', 'OCTET STRING']:
-                    # make sure we have mapping instructions for BASE elements
-                    if 'OnBasic' not in dir(backend):
-                        panic("ASN.1 grammar contains literal(%s) but no BASE section found in the mapping grammar (%s)" % (nodeTypename, backendFilename))  # pragma: no cover
-                    if not backend.isAsynchronous:
-                        backend.OnBasic(nodeTypename, node, sp, sp_impl, param, leafTypeDict, names)
-                    else:
-                        backend.OnBasic(nodeTypename, node, leafTypeDict, names)
-                # if it is a complex type
-                elif leafType in ['SEQUENCE', 'SET', 'CHOICE', 'SEQUENCEOF', 'SETOF', 'ENUMERATED']:
-                    # make sure we have mapping instructions for the element
-                    if g_mappedName[leafType] not in dir(backend):
-                        panic("ASN.1 grammar contains %s but no %s section found in the mapping grammar (%s)" % (nodeTypename, g_mappedName[leafType], backendFilename))  # pragma: no cover
-                    processor = backend.__dict__[g_mappedName[leafType]]
-                    if not backend.isAsynchronous:
-                        processor(nodeTypename, node, sp, sp_impl, param, leafTypeDict, names)
-                    else:
-                        processor(nodeTypename, node, leafTypeDict, names)
-                # what type is it?
-                else:  # pragma: no cover
-                    panic("Unexpected type of element: %s" % leafTypeDict[nodeTypename])  # pragma: no cover
-
-        # For synchronous backend, call OnShutdown once per each sp_impl
-        if not backend.isAsynchronous:
-            if 'OnShutdown' in dir(backend):
-                backend.OnShutdown(modelingLanguage, asnFile, sp, sp_impl, maybeFVname)
+            # Synchronous tools work on files of their own for each SystemsAndImplementation,
+            # so with -jobs they run in parallel (only the ones writing the same files don't),
+            # and they are only re-run when the SystemsAndImplementation or its types change.
+            unit = sp._id + "." + sp_impl
+            key = manifest.Key(
+                asnFiles, options, modelingLanguage, asnFile, sp_impl, maybeFVname, DescribeParams(sp))
+            if manifest.UpToDate(unit, key):
+                inform("Glue of %s is up to date.", unit)
+            else:
+                pool.Spawn(
+                    (sp._id + "_" + sp_impl).lower(), unit, SynchronousGlue,
+                    backend, backendFilename, modelingLanguage, asnFile, sp, sp_impl, maybeFVname, useOSS, badTypes)
+            manifest.Record(unit, key)
+
+        # The next iterations (and the code after the loop) are given the ASN.1 file
+        # of the last parameter processed.
+        asnFile = sp._params[-1]._signal._asnFilename
+
+    pool.Join()
 
     # SystemsAndImplementation loop completed - time to call OnShutdown ONCE for each async backend that we loaded
     for asyncBackend in asynchronousBackends:
         if 'OnShutdown' in dir(backend):
-            asyncBackend.OnShutdown(modelingLanguage, asnFile, maybeFVname)
+            with profiling.Phase("backend " + asyncBackend.__name__.split('.')[-1] + "/OnShutdown"):
+                asyncBackend.OnShutdown(modelingLanguage, asnFile, maybeFVname)
 
     # The code generators for GUIs, Python mappers and VHDL mappers are different: they need access to
     # both ASN.1 types and SP params.
@@ -418,38 +464,45 @@ def main() -> None:
         if lang.lower() == "vhdl":
             workedOnVHDL = True  # pragma: no cover
         inform("Creating %s for %s.%s", lang.upper(), sp._id, sp_impl)
-        for b in mappers(lang):
-            b.OnStartup(lang, asnFile, sp, sp_impl, commonPy.configMT.outputDir, maybeFVname, useOSS)
-        for param in sp._params:
-            inform("Processing param %s...", param._id)
-            asnFile = param._signal._asnFilename
-            names = commonPy.asnParser.g_names
-            leafTypeDict = commonPy.asnParser.g_leafTypeDict
-            nodeTypename = param._signal._asnNodename
-            node = names[nodeTypename]
-            inform("ASN.1 node is %s", nodeTypename)
-            # if node._isArtificial:
-            #     continue # artificially created (inner) type pragma: no cover
-            leafType = leafTypeDict[nodeTypename]
-            if leafType in ['BOOLEAN', 'INTEGER', 'REAL', 'OCTET STRING']:
-                for b in mappers(lang):
-                    b.OnBasic(nodeTypename, node, sp, sp_impl, param, leafTypeDict, names)
-            elif leafType in ['SEQUENCE', 'SET', 'CHOICE', 'SEQUENCEOF', 'SETOF', 'ENUMERATED']:
-                for b in mappers(lang):
-                    processor = b.__dict__[g_mappedName[leafType]]
-                    processor(nodeTypename, node, sp, sp_impl, param, leafTypeDict, names)
-            else:  # pragma: no cover
-                panic("Unexpected type of element: %s" % leafTypeDict[nodeTypename])  # pragma: no cover
-        for b in mappers(lang):
-            b.OnShutdown(lang, asnFile, sp, sp_impl, maybeFVname)
+        with profiling.Phase(lang.upper()):
+            for b in mappers(lang):
+                b.OnStartup(lang, asnFile, sp, sp_impl, commonPy.configMT.outputDir, maybeFVname, useOSS)
+            for param in sp._params:
+                inform("Processing param %s...", param._id)
+                asnFile = param._signal._asnFilename
+                names = commonPy.asnParser.g_names
+                leafTypeDict = commonPy.asnParser.g_leafTypeDict
+                nodeTypename = param._signal._asnNodename
+                node = names[nodeTypename]
+                inform("ASN.1 node is %s", nodeTypename)
+                # if node._isArtificial:
+                #     continue # artificially created (inner) type pragma: no cover
+                leafType = leafTypeDict[nodeTypename]
+                if leafType in ['BOOLEAN', 'INTEGER', 'REAL', 'OCTET STRING']:
+                    for b in mappers(lang):
+                        b.OnBasic(nodeTypename, node, sp, sp_impl, param, leafTypeDict, names)
+                elif leafType in ['SEQUENCE', 'SET', 'CHOICE', 'SEQUENCEOF', 'SETOF', 'ENUMERATED']:
+                    for b in mappers(lang):
+                        processor = b.__dict__[g_mappedName[leafType]]
+                        processor(nodeTypename, node, sp, sp_impl, param, leafTypeDict, names)
+                else:  # pragma: no cover
+                    panic("Unexpected type of element: %s" % leafTypeDict[nodeTypename])  # pragma: no cover
+            for b in mappers(lang):
+                b.OnShutdown(lang, asnFile, sp, sp_impl, maybeFVname)
     # if we processed any GUI subprogram, add footers and close files
     if workedOnGUIs:
         for b in mappers('gui_ri'):
-            b.OnFinal()
+            with profiling.Phase("GUI/OnFinal"):
+                b.OnFinal()
     # if we processed any VHDL subprogram, add footers and close files
     if workedOnVHDL:
         for b in mappers('vhdl'):  # pragma: no cover
-            b.OnFinal()  # pragma: no cover
+            with profiling.Phase("VHDL/OnFinal"):  # pragma: no cover
+                b.OnFinal()  # pragma: no cover
+
+    with profiling.Phase("Manifest"):
+        manifest.Record("all", manifest.Key(aadlFiles + asnFiles, options), asnFiles)
+        manifest.Save()
 
 if __name__ == "__main__":
     if "-pdb" in sys.argv:
@@ -19,6 +19,8 @@ import distutils.spawn as spawn
 
 from .commonPy import configMT
 from .commonPy import asnParser
+from .commonPy import asnCache
+from .commonPy import profiling
 from .commonPy import __version__
 
 from .commonPy.asnAST import (
@@ -28,6 +30,7 @@ from .commonPy.asnAST import (
 
 
 from .commonPy.utility import inform, panic, mysystem
+from .commonPy.outputFile import OutputFile
 
 g_keepFiles = False
 g_privateHeapSize = -1
@@ -209,6 +212,9 @@ Where <files> is a list of ASN.1 and ACN files, and options can be:
     -v, --version   Show version number
     -d, --debug	    Enable debug output
     -p, --platform  Comma seperated list of platform compilers (default: gcc)
+    --noCache       Do not use (or update) the cache of parsed ASN.1 ASTs
+    --clearCache    Invalidate the cache of parsed ASN.1 ASTs
+    --profile file  Write the time and memory used per phase in file (JSON)
     -h, --help	    This help message""")
 
 
@@ -230,9 +236,13 @@ def main():
     if "-aadlv2" in sys.argv:
         ofs = sys.argv.index("-aadlv2")
         sys.argv[ofs] = '--aadlv2'
+    for opt in ["-noCache", "-clearCache"]:
+        if opt in sys.argv:
+            ofs = sys.argv.index(opt)
+            sys.argv[ofs] = '-' + opt
 
     try:
-        optlist, args = getopt.gnu_getopt(sys.argv[1:], "hvkadt:", ['help', 'version', 'keep', 'aadlv2', 'debug', 'platform=', 'test='])
+        optlist, args = getopt.gnu_getopt(sys.argv[1:], "hvkadt:", ['help', 'version', 'keep', 'aadlv2', 'debug', 'platform=', 'test=', 'noCache', 'clearCache', 'profile='])
     except:
         usage()
 
@@ -255,6 +265,12 @@ def main():
             g_keepFiles = True
         elif opt in ("-t", "--test"):
             g_privateHeapSize = int(arg)
+        elif opt == "--noCache":
+            configMT.useAsnCache = False
+        elif opt == "--clearCache":
+            asnCache.Clear()
+        elif opt == "--profile":
+            profiling.Enable("asn2aadlPlus", arg)
 
     if len(args) < 2:
         usage()
@@ -297,7 +313,8 @@ def main():
     # CHOICEs, however, changed the picture...  what to put in?
     # Time to use the maximum of Native (SIZ2) and UPER (SIZE) and ACN (SIZ3)...
 
-    messageSizes = calculateForNativeAndASN1SCC(absASN1SCCpath, autosrc, asnParser.g_names, inputFiles)
+    with profiling.Phase("messageSizes"):
+        messageSizes = calculateForNativeAndASN1SCC(absASN1SCCpath, autosrc, asnParser.g_names, inputFiles)
     for nodeTypename in list(messageSizes.keys()):
         messageSizes[nodeTypename] = [messageSizes[nodeTypename], (8 * (int((messageSizes[nodeTypename] - 1) / 8)) + 8)]
 
@@ -305,20 +322,21 @@ def main():
     base = re.sub(r'\..*$', '', base)
 
     # AADL creation
-    o = open(absPathOfAADLfile, 'w')
-    o.write('--------------------------------------------------------\n')
-    o.write('--! File generated by asn2aadl v%s: DO NOT EDIT !\n' % __version__)
-    o.write('--------------------------------------------------------\n\n')
-    o.write('package DataView\n\npublic\n\n')
-    if bAADLv2:
-        o.write('  with Data_Model;\n')
-        o.write('  with Taste;\n')
-        o.write('  with Base_Types;\n')
-        o.write('  with Deployment;\n')
-    o.write('-- No more private heap required (we use the space certified compiler)\n')
-    o.write('-- Memory_Required: 0\n\n')
-    if bAADLv2:
-        o.write('''
+    with profiling.Phase("writeAADL"):
+        o = OutputFile(absPathOfAADLfile)
+        o.write('--------------------------------------------------------\n')
+        o.write('--! File generated by asn2aadl v%s: DO NOT EDIT !\n' % __version__)
+        o.write('--------------------------------------------------------\n\n')
+        o.write('package DataView\n\npublic\n\n')
+        if bAADLv2:
+            o.write('  with Data_Model;\n')
+            o.write('  with Taste;\n')
+            o.write('  with Base_Types;\n')
+            o.write('  with Deployment;\n')
+        o.write('-- No more private heap required (we use the space certified compiler)\n')
+        o.write('-- Memory_Required: 0\n\n')
+        if bAADLv2:
+            o.write('''
 DATA Simulink_Tunable_Parameter
 PROPERTIES
    TASTE::Ada_Package_Name => "TASTE-Directives";
@@ -341,113 +359,113 @@ PROPERTIES
 END TASTE_Directive;
 
 ''')
-        o.write('''
+            o.write('''
 data Stream_Element_Buffer
     -- Root type for buffer elements
 properties
     Data_Model::Data_Representation => Character;
 end Stream_Element_Buffer;
 ''')
-    for asnTypename in list(asnParser.g_names.keys()):
-        node = asnParser.g_names[asnTypename]
-        if node._isArtificial:
-            continue
-        cleanName = cleanNameAsAADLWants(asnTypename)
-        o.write('DATA ' + cleanName + '\n')
-        o.write('PROPERTIES\n')
-        o.write('    -- name of the ASN.1 source file:\n')
-        # o.write('    Source_Text => ("%s");\n' % os.path.basename(asnParser.g_names[asnTypename]._asnFilename))
-        o.write('    Source_Text => ("%s");\n' % asnParser.g_names[asnTypename]._asnFilename)
-        prefix = bAADLv2 and "TASTE::" or ""
-        possibleACN = ASNtoACN(asnParser.g_names[asnTypename]._asnFilename)
-        if bAADLv2 and os.path.exists(possibleACN):
-            prefix2 = bAADLv2 and "TASTE::" or "assert_properties::"
-            base = os.path.splitext(os.path.basename(possibleACN))[0]
-            fname = base.replace("-", "_")
-            o.write('    %sEncodingDefinitionFile => classifier(DataView::ACN_%s);\n' % (prefix2, fname))
-        o.write('    %sAda_Package_Name => "%s";\n' % (prefix, g_AdaPackageNameOfType[asnTypename]))
-        if bAADLv2:
-            o.write('    Deployment::ASN1_Module_Name => "%s";\n' % g_AdaPackageNameOfType[asnTypename].replace('_', '-'))
-        if os.getenv('UPD') is None:
-            o.write('    Source_Language => ASN1;\n')
-        o.write('    -- Size of a buffer to cover all forms of message representation:\n')
-        le_size = 0 if asnTypename not in messageSizes else messageSizes[asnTypename][0]
-        o.write('    -- Real message size is %d; suggested aligned message buffer is...\n' % le_size)
-        le_size_rounded = 0 if asnTypename not in messageSizes else messageSizes[asnTypename][1]
-        o.write('    Source_Data_Size => %d B%s;\n' % (le_size_rounded, bAADLv2 and "ytes" or ""))
-        o.write('    -- name of the corresponding data type in the source file:\n')
-        o.write('    Type_Source_Name => "%s";\n' % asnTypename)
-        o.write('    -- what kind of type is this?\n')
-        prefix = bAADLv2 and "TASTE" or "assert_properties"
-        o.write('    %s::ASN1_Basic_Type =>' % prefix)
-        if isinstance(node, AsnBool):
-            o.write('aBOOLEAN;\n')
-        elif isinstance(node, AsnInt):
-            o.write('aINTEGER;\n')
-        elif isinstance(node, AsnReal):
-            o.write('aREAL;\n')
-        elif isinstance(node, AsnEnumerated):
-            o.write('aENUMERATED;\n')
-        elif isinstance(node, AsnString):
-            o.write('aSTRING;\n')
-        elif isinstance(node, AsnChoice):
-            o.write('aCHOICE;\n')
-        elif isinstance(node, AsnSequence):
-            o.write('aSEQUENCE;\n')
-        elif isinstance(node, AsnSequenceOf):
-            o.write('aSEQUENCEOF;\n')
-        elif isinstance(node, AsnSet):
-            o.write('aSET;\n')
-        elif isinstance(node, AsnSetOf):
-            o.write('aSETOF;\n')
-        else:
-            panic("Unsupported ASN.1 type: %s" % node._leafType)
-        o.write('END ' + cleanName + ';\n\n')
-        if os.getenv('UPD') is None:
-            o.write('DATA ' + cleanName + '_Buffer_Max\n')
-            o.write('END ' + cleanName + '_Buffer_Max;\n\n')
-
-            o.write('DATA IMPLEMENTATION ' + cleanName + '_Buffer_Max.impl\n')
-            o.write('    -- Buffer to hold a marshalled data of type ' + cleanName + "\n")
+        for asnTypename in list(asnParser.g_names.keys()):
+            node = asnParser.g_names[asnTypename]
+            if node._isArtificial:
+                continue
+            cleanName = cleanNameAsAADLWants(asnTypename)
+            o.write('DATA ' + cleanName + '\n')
             o.write('PROPERTIES\n')
-            o.write('    Data_Model::Data_Representation => array;\n')
-            o.write('    Data_Model::Dimension => (%d); -- Size of the buffer\n' % le_size_rounded)
+            o.write('    -- name of the ASN.1 source file:\n')
+            # o.write('    Source_Text => ("%s");\n' % os.path.basename(asnParser.g_names[asnTypename]._asnFilename))
+            o.write('    Source_Text => ("%s");\n' % asnParser.g_names[asnTypename]._asnFilename)
+            prefix = bAADLv2 and "TASTE::" or ""
+            possibleACN = ASNtoACN(asnParser.g_names[asnTypename]._asnFilename)
+            if bAADLv2 and os.path.exists(possibleACN):
+                prefix2 = bAADLv2 and "TASTE::" or "assert_properties::"
+                base = os.path.splitext(os.path.basename(possibleACN))[0]
+                fname = base.replace("-", "_")
+                o.write('    %sEncodingDefinitionFile => classifier(DataView::ACN_%s);\n' % (prefix2, fname))
+            o.write('    %sAda_Package_Name => "%s";\n' % (prefix, g_AdaPackageNameOfType[asnTypename]))
             if bAADLv2:
-                o.write('    Data_Model::Base_Type => (classifier (DataView::Stream_Element_Buffer));\n')
+                o.write('    Deployment::ASN1_Module_Name => "%s";\n' % g_AdaPackageNameOfType[asnTypename].replace('_', '-'))
+            if os.getenv('UPD') is None:
+                o.write('    Source_Language => ASN1;\n')
+            o.write('    -- Size of a buffer to cover all forms of message representation:\n')
+            le_size = 0 if asnTypename not in messageSizes else messageSizes[asnTypename][0]
+            o.write('    -- Real message size is %d; suggested aligned message buffer is...\n' % le_size)
+            le_size_rounded = 0 if asnTypename not in messageSizes else messageSizes[asnTypename][1]
+            o.write('    Source_Data_Size => %d B%s;\n' % (le_size_rounded, bAADLv2 and "ytes" or ""))
+            o.write('    -- name of the corresponding data type in the source file:\n')
+            o.write('    Type_Source_Name => "%s";\n' % asnTypename)
+            o.write('    -- what kind of type is this?\n')
+            prefix = bAADLv2 and "TASTE" or "assert_properties"
+            o.write('    %s::ASN1_Basic_Type =>' % prefix)
+            if isinstance(node, AsnBool):
+                o.write('aBOOLEAN;\n')
+            elif isinstance(node, AsnInt):
+                o.write('aINTEGER;\n')
+            elif isinstance(node, AsnReal):
+                o.write('aREAL;\n')
+            elif isinstance(node, AsnEnumerated):
+                o.write('aENUMERATED;\n')
+            elif isinstance(node, AsnString):
+                o.write('aSTRING;\n')
+            elif isinstance(node, AsnChoice):
+                o.write('aCHOICE;\n')
+            elif isinstance(node, AsnSequence):
+                o.write('aSEQUENCE;\n')
+            elif isinstance(node, AsnSequenceOf):
+                o.write('aSEQUENCEOF;\n')
+            elif isinstance(node, AsnSet):
+                o.write('aSET;\n')
+            elif isinstance(node, AsnSetOf):
+                o.write('aSETOF;\n')
             else:
-                o.write('    Data_Model::Base_Type => (data ASSERT_Types::Stream_Element);\n')
-            o.write('END ' + cleanName + '_Buffer_Max.impl;\n\n')
-
-            o.write('DATA ' + cleanName + '_Buffer\n')
-            o.write('END ' + cleanName + '_Buffer;\n\n')
-
-            o.write('DATA IMPLEMENTATION ' + cleanName + '_Buffer.impl\n')
-            o.write('    -- Buffer to hold a marshalled data of type ' + cleanName + "\n")
-            o.write('SUBCOMPONENTS\n')
-            o.write('    Buffer : data ' + cleanName + '_Buffer_Max.impl;\n')
-            o.write('    Length : data Base_Types::%s;\n' % (bAADLv2 and "Unsigned_16" or "uint16"))
-            o.write('PROPERTIES\n')
-            o.write('    Data_Model::Data_Representation => Struct;\n')
-            o.write('END ' + cleanName + '_Buffer.impl;\n\n')
-
-    listOfAsn1Files = {}
-    for asnTypename in list(asnParser.g_names.keys()):
-        listOfAsn1Files[asnParser.g_names[asnTypename]._asnFilename] = 1
-
-    if bAADLv2:
-        for asnFilename in list(listOfAsn1Files.keys()):
-            base = os.path.splitext(os.path.basename(asnFilename))[0]
-            possibleACN = ASNtoACN(asnFilename)
-            if os.path.exists(possibleACN):
-                fname = base.replace("-", "_")
-                o.write('DATA ACN_' + fname + '\n')
+                panic("Unsupported ASN.1 type: %s" % node._leafType)
+            o.write('END ' + cleanName + ';\n\n')
+            if os.getenv('UPD') is None:
+                o.write('DATA ' + cleanName + '_Buffer_Max\n')
+                o.write('END ' + cleanName + '_Buffer_Max;\n\n')
+
+                o.write('DATA IMPLEMENTATION ' + cleanName + '_Buffer_Max.impl\n')
+                o.write('    -- Buffer to hold a marshalled data of type ' + cleanName + "\n")
                 o.write('PROPERTIES\n')
-                o.write('    Source_Text => ("' + possibleACN + '");\n')
-                o.write('    Source_Language => ACN;\n')
-                o.write('END ACN_' + fname + ';\n\n')
+                o.write('    Data_Model::Data_Representation => array;\n')
+                o.write('    Data_Model::Dimension => (%d); -- Size of the buffer\n' % le_size_rounded)
+                if bAADLv2:
+                    o.write('    Data_Model::Base_Type => (classifier (DataView::Stream_Element_Buffer));\n')
+                else:
+                    o.write('    Data_Model::Base_Type => (data ASSERT_Types::Stream_Element);\n')
+                o.write('END ' + cleanName + '_Buffer_Max.impl;\n\n')
+
+                o.write('DATA ' + cleanName + '_Buffer\n')
+                o.write('END ' + cleanName + '_Buffer;\n\n')
+
+                o.write('DATA IMPLEMENTATION ' + cleanName + '_Buffer.impl\n')
+                o.write('    -- Buffer to hold a marshalled data of type ' + cleanName + "\n")
+                o.write('SUBCOMPONENTS\n')
+                o.write('    Buffer : data ' + cleanName + '_Buffer_Max.impl;\n')
+                o.write('    Length : data Base_Types::%s;\n' % (bAADLv2 and "Unsigned_16" or "uint16"))
+                o.write('PROPERTIES\n')
+                o.write('    Data_Model::Data_Representation => Struct;\n')
+                o.write('END ' + cleanName + '_Buffer.impl;\n\n')
+
+        listOfAsn1Files = {}
+        for asnTypename in list(asnParser.g_names.keys()):
+            listOfAsn1Files[asnParser.g_names[asnTypename]._asnFilename] = 1
 
-    o.write('end DataView;\n')
-    o.close()
+        if bAADLv2:
+            for asnFilename in list(listOfAsn1Files.keys()):
+                base = os.path.splitext(os.path.basename(asnFilename))[0]
+                possibleACN = ASNtoACN(asnFilename)
+                if os.path.exists(possibleACN):
+                    fname = base.replace("-", "_")
+                    o.write('DATA ACN_' + fname + '\n')
+                    o.write('PROPERTIES\n')
+                    o.write('    Source_Text => ("' + possibleACN + '");\n')
+                    o.write('    Source_Language => ACN;\n')
+                    o.write('END ACN_' + fname + ';\n\n')
+
+        o.write('end DataView;\n')
+        o.close()
 
     # Remove generated code
     if not g_keepFiles:
@@ -31,6 +31,7 @@ from .commonPy.asnAST import (
 
 
 from .commonPy.utility import inform, panic, mysystem
+from .commonPy.outputFile import OutputFile
 
 g_keepFiles = False
 g_privateHeapSize = -1
@@ -147,7 +148,7 @@ def main():
     base = re.sub(r'\..*$', '', base)
 
     # AADL creation
-    o = open(absPathOfAADLfile, 'w')
+    o = OutputFile(absPathOfAADLfile)
     o.write('--------------------------------------------------------\n')
     o.write('--! File generated by asn2aadlVDM v%s: DO NOT EDIT !\n' % __version__)
     o.write('--------------------------------------------------------\n\n')
@@ -39,26 +39,123 @@ import sys
 import copy
 from importlib import import_module
 
-from typing import Dict, Tuple, Any  # NOQA pylint: disable=unused-import
+from typing import List, Dict, Set, Tuple, Any  # NOQA pylint: disable=unused-import
 
-from .commonPy import configMT, asnParser, cleanupNodes, verify
+from .commonPy import configMT, asnParser, asnCache, cleanupNodes, verify, profiling, buildManifest
+from .commonPy.jobPool import JobPool
 from .commonPy.utility import inform, panic
 from .commonPy.asnParser import Filename, Typename, AST_Lookup, AST_TypesOfFile, AST_Leaftypes  # NOQA pylint: disable=unused-import
 from .commonPy.asnAST import AsnNode  # NOQA pylint: disable=unused-import
 
 from . import A_mappers  # NOQA pylint:disable=unused-import
 
+# These backends add pseudo-types to (or rewrite nodes of) the shared AST,
+# and the backends that run after them see these changes. With -jobs, they
+# still run in the main process, in their serial order.
+g_backendsModifyingAST = {'scade6', 'simulink', 'smp2', 'qgenc', 'qgenada', 'sql', 'sqlalchemy'}
+
+# Backends writing the same output files can't run at the same time
+# (e.g. both Ada backends invoke ASN1SCC on the same output folder).
+g_backendsSharingOutput = {'qgenada': 'ada'}
+
 
 def usage(argsToTools: Dict[str, str]) -> None:
     '''Print usage instructions.'''
     msg = 'Usage: %s <options> input1.asn1 [input2.asn1]...\nWhere options are:\n'
     msg += '\t-verbose\t\tDisplay more debug output\n'
-    msg += '\t-o dirname\t\tDirectory to place generated files\nAnd one of:\n'
+    msg += '\t-noCache\t\tDo not use (or update) the cache of parsed ASN.1 ASTs\n'
+    msg += '\t-clearCache\t\tInvalidate the cache of parsed ASN.1 ASTs\n'
+    msg += '\t-force\t\t\tRegenerate all outputs, even the up-to-date ones\n'
+    msg += '\t-o dirname\t\tDirectory to place generated files\n'
+    msg += '\t-jobs N\t\t\tRun up to N backends in parallel (default: 1)\n'
+    msg += '\t-pythonStructs\t\tWith -toPython, access the data via ctypes structs, not C getters/setters\n'
+    msg += '\t--profile report.json\tWrite the time and memory used per phase in report.json\nAnd one of:\n'
     for opt in sorted(argsToTools.keys()):
         msg += '\t-' + opt + ' (for ' + argsToTools[opt][0].upper() + argsToTools[opt][1:] + ')\n'
     panic(msg % sys.argv[0])
 
 
+def RunBackend(
+        backend: Any,
+        modelingLanguage: str,
+        backendFilename: str,
+        uniqueASNfiles: Dict[Filename, Tuple[AST_Lookup, List[AsnNode], AST_Leaftypes]],
+        badTypes: Set[str]) -> None:
+    '''Run one backend over all the ASN.1 files.'''
+    with profiling.Phase("backend " + modelingLanguage):
+        RunBackendCallbacks(backend, modelingLanguage, backendFilename, uniqueASNfiles, badTypes)
+
+
+def RunBackendCallbacks(
+        backend: Any,
+        modelingLanguage: str,
+        backendFilename: str,
+        uniqueASNfiles: Dict[Filename, Tuple[AST_Lookup, List[AsnNode], AST_Leaftypes]],
+        badTypes: Set[str]) -> None:
+    # Esp. for C, we want to pass the complete list of ASN.1 files to ASN1SCC,
+    # instead of working per type:
+    if modelingLanguage.lower() in ["c", "ada", "smp2", "qgenc", "qgenada"]:
+        if 'OnStartup' in dir(backend):
+            with profiling.Phase("OnStartup"):
+                backend.OnStartup(modelingLanguage, list(uniqueASNfiles.keys()), configMT.outputDir, badTypes)
+        if 'OnShutdown' in dir(backend):
+            with profiling.Phase("OnShutdown"):
+                backend.OnShutdown(badTypes)
+        return
+
+    # Work on each ASN.1 file's types
+    for asnFile in uniqueASNfiles:
+        if 'OnStartup' in dir(backend):
+            with profiling.Phase("OnStartup"):
+                backend.OnStartup(modelingLanguage, asnFile, configMT.outputDir, badTypes)
+
+        leafTypeDict = uniqueASNfiles[asnFile][2]
+
+        inform("Executing mappings for types inside %s...", asnFile)
+        names = uniqueASNfiles[asnFile][0]
+        for nodeTypename in sorted(names):
+            # Check if this type must be skipped
+            if nodeTypename in badTypes:
+                continue
+            node = names[nodeTypename]
+            inform("Processing %s (%s)...", nodeTypename, modelingLanguage)
+
+            # First, make sure we know what leaf type this node is
+            assert nodeTypename in leafTypeDict
+
+            leafType = leafTypeDict[nodeTypename]
+            # If it is a base type,
+            if leafType in ['BOOLEAN', 'INTEGER', 'REAL', 'OCTET STRING']:
+                # make sure we have mapping instructions for BASE elements
+                if 'OnBasic' not in dir(backend):
+                    panic("ASN.1 grammar contains literal(%s) but no BASE section found in the mapping grammar (%s)" % (nodeTypename, sys.argv[2]))  # pragma: no cover
+                with profiling.Phase("OnBasic"):
+                    backend.OnBasic(nodeTypename, node, leafTypeDict)
+            # if it is a complex type
+            elif leafType in ['SEQUENCE', 'SET', 'CHOICE', 'SEQUENCEOF', 'SETOF', 'ENUMERATED']:
+                # make sure we have mapping instructions for the element
+                mappedName = {
+                    'SEQUENCE': 'OnSequence',
+                    'SET': 'OnSet',
+                    'CHOICE': 'OnChoice',
+                    'SEQUENCEOF': 'OnSequenceOf',
+                    'SETOF': 'OnSetOf',
+                    'ENUMERATED': 'OnEnumerated'
+                }
+                if mappedName[leafType] not in dir(backend):
+                    panic("ASN.1 grammar contains %s but no %s section found in the mapping grammar (%s)" % (nodeTypename, mappedName[leafType], backendFilename))  # pragma: no cover
+                processor = backend.__dict__[mappedName[leafType]]
+                with profiling.Phase(mappedName[leafType]):
+                    processor(nodeTypename, node, leafTypeDict)
+            # what type is it?
+            else:  # pragma: no cover
+                panic("Unexpected type of element: %s" % leafTypeDict[nodeTypename])  # pragma: no cover
+
+        if 'OnShutdown' in dir(backend):
+            with profiling.Phase("OnShutdown"):
+                backend.OnShutdown(badTypes)
+
+
 def main() -> None:
     if "-v" in sys.argv:
         import pkg_resources  # pragma: no cover
@@ -102,9 +199,33 @@ def main() -> None:
         del sys.argv[idx]
         if not os.path.isdir(configMT.outputDir):
             panic("'%s' is not a directory!\n" % configMT.outputDir)  # pragma: no cover
+    profiling.HandleCommandLine("asn2dataModel")
+    maxJobs = 1
+    if sys.argv.count("-jobs") != 0:
+        idx = sys.argv.index("-jobs")
+        try:
+            maxJobs = int(sys.argv[idx + 1])
+        except:   # pragma: no cover
+            usage(argsToTools)  # pragma: no cover
+        del sys.argv[idx]
+        del sys.argv[idx]
+        if maxJobs < 1:
+            panic("-jobs expects a positive number, not %d\n" % maxJobs)  # pragma: no cover
     if "-verbose" in sys.argv:
         configMT.verbose = True
         sys.argv.remove("-verbose")
+    if "-noCache" in sys.argv:
+        configMT.useAsnCache = False
+        sys.argv.remove("-noCache")
+    if "-clearCache" in sys.argv:
+        asnCache.Clear()
+        sys.argv.remove("-clearCache")
+    force = "-force" in sys.argv
+    if force:
+        sys.argv.remove("-force")
+    if "-pythonStructs" in sys.argv:
+        configMT.g_bPythonStructs = True
+        sys.argv.remove("-pythonStructs")
     for i in argsToTools:
         if "-" + i in sys.argv:
             toolSelected[i] = True
@@ -121,23 +242,63 @@ def main() -> None:
         if not os.path.isfile(f):
             panic("'%s' is not a file!\n" % f)  # pragma: no cover
 
-    uniqueFilenames = list(set(sys.argv[1:]))
+    # The outputs of some backends are named after the first grammar - so
+    # keep the order of the command line, for the outputs to be reproducible.
+    uniqueFilenames = list(dict.fromkeys(sys.argv[1:]))
+
+    # Each backend depends on all the grammars - and on the pseudo-types that
+    # the backends before it add to the AST.
+    with profiling.Phase("Manifest"):
+        manifest = buildManifest.Manifest("asn2dataModel", enabled=not force)
+        selected = []  # type: List[Tuple[str, str, str, bool]]
+        modifiedBy = []  # type: List[str]
+        for arg, modelingLanguage in argsToTools.items():
+            if not toolSelected[arg]:
+                continue
+            lang = modelingLanguage.lower()
+            options = [configMT.g_bPythonStructs] if lang == 'python' else []
+            key = manifest.Key(uniqueFilenames, lang, modifiedBy, *options)
+            selected.append((arg, modelingLanguage, key, manifest.UpToDate(lang, key)))
+            if lang in g_backendsModifyingAST:
+                modifiedBy = modifiedBy + [lang]
+    if all(upToDate for _, _, _, upToDate in selected):
+        inform("All outputs are up to date.")
+        return
+
+    # A backend modifying the AST must also run if any backend after it does,
+    # and backends writing the same files run together.
+    mustRun = {arg for arg, _, _, upToDate in selected if not upToDate}
+    while True:
+        groups = {
+            g_backendsSharingOutput.get(lang.lower(), lang.lower())
+            for arg, lang, _, _ in selected if arg in mustRun}
+        needed = set()  # type: Set[str]
+        for arg, lang, _, _ in reversed(selected):
+            if arg in mustRun or g_backendsSharingOutput.get(lang.lower(), lang.lower()) in groups or (
+                    needed and lang.lower() in g_backendsModifyingAST):
+                needed.add(arg)
+        if needed == mustRun:
+            break
+        mustRun = needed
+
     asnParser.ParseAsnFileList(uniqueFilenames)
 
     uniqueASNfiles = {}  # type: Dict[Filename, Tuple[AST_Lookup, List[AsnNode], AST_Leaftypes]]
+    verifiedTypes = set()  # type: Set[str]
     for asnFile in uniqueFilenames:
         tmpNames = {}  # type: AST_Lookup
         for name in asnParser.g_typesOfFile[asnFile]:
             tmpNames[name] = asnParser.g_names[name]
 
         uniqueASNfiles[asnFile] = (
-            copy.copy(tmpNames),                            # map Typename to type definition class from asnAST
+            tmpNames,                                       # map Typename to type definition class from asnAST
             copy.copy(asnParser.g_astOfFile[asnFile]),    # list of nameless type definitions
             copy.copy(asnParser.g_leafTypeDict))   # map from Typename to leafType
 
         inform("Checking that all base nodes have mandatory ranges set in %s..." % asnFile)
-        for node in list(tmpNames.values()):
-            verify.VerifyRanges(node, asnParser.g_names)
+        with profiling.Phase("VerifyRanges"):
+            for nodeTypename in tmpNames:
+                verify.VerifyRanges(nodeTypename, asnParser.g_names, verifiedTypes)
 
     if configMT.debugParser:
         sys.exit(0)  # pragma: no cover
@@ -147,9 +308,12 @@ def main() -> None:
     # If some AST nodes must be skipped (for any reason), go learn about them
     badTypes = cleanupNodes.DiscoverBadTypes()
 
+    pool = JobPool(maxJobs)
+
     # For each ASN.1 grammar file referenced in the system level description
-    for arg, modelingLanguage in argsToTools.items():
-        if not toolSelected[arg]:
+    for arg, modelingLanguage, _, _ in selected:
+        if arg not in mustRun:
+            inform("Outputs of %s are up to date.", modelingLanguage)
             continue
         backendFilename = "." + modelingLanguage.lower() + "_A_mapper.py"
         inform("Parsing %s...", backendFilename)
@@ -162,62 +326,21 @@ def main() -> None:
         except ImportError as err:  # pragma: no cover
             panic("Failed to load backend (%s): %s" % (backendFilename, str(err)))  # pragma: no cover
 
-        # Esp. for C, we want to pass the complete list of ASN.1 files to ASN1SCC,
-        # instead of working per type:
-        if modelingLanguage.lower() in ["c", "ada", "smp2", "qgenc", "qgenada"]:
-            if 'OnStartup' in dir(backend):
-                backend.OnStartup(modelingLanguage, list(uniqueASNfiles.keys()), configMT.outputDir, badTypes)
-            if 'OnShutdown' in dir(backend):
-                backend.OnShutdown(badTypes)
-            continue  # bug in coverage.py...  # pragma: no cover
-
-        # Work on each ASN.1 file's types
-        for asnFile in uniqueASNfiles:
-            if 'OnStartup' in dir(backend):
-                backend.OnStartup(modelingLanguage, asnFile, configMT.outputDir, badTypes)
+        lang = modelingLanguage.lower()
+        group = g_backendsSharingOutput.get(lang, lang)
+        if lang in g_backendsModifyingAST:
+            pool.RunInline(group, arg, RunBackend, backend, modelingLanguage, backendFilename, uniqueASNfiles, badTypes)
+        else:
+            pool.Spawn(group, arg, RunBackend, backend, modelingLanguage, backendFilename, uniqueASNfiles, badTypes)
+    pool.Join()
 
-            leafTypeDict = uniqueASNfiles[asnFile][2]
-
-            inform("Executing mappings for types inside %s...", asnFile)
-            names = uniqueASNfiles[asnFile][0]
-            for nodeTypename in sorted(names):
-                # Check if this type must be skipped
-                if nodeTypename in badTypes:
-                    continue
-                node = names[nodeTypename]
-                inform("Processing %s (%s)...", nodeTypename, modelingLanguage)
-
-                # First, make sure we know what leaf type this node is
-                assert nodeTypename in leafTypeDict
-
-                leafType = leafTypeDict[nodeTypename]
-                # If it is a base type,
-                if leafType in ['BOOLEAN', 'INTEGER', 'REAL', 'OCTET STRING']:
-                    # make sure we have mapping instructions for BASE elements
-                    if 'OnBasic' not in dir(backend):
-                        panic("ASN.1 grammar contains literal(%s) but no BASE section found in the mapping grammar (%s)" % (nodeTypename, sys.argv[2]))  # pragma: no cover
-                    backend.OnBasic(nodeTypename, node, leafTypeDict)
-                # if it is a complex type
-                elif leafType in ['SEQUENCE', 'SET', 'CHOICE', 'SEQUENCEOF', 'SETOF', 'ENUMERATED']:
-                    # make sure we have mapping instructions for the element
-                    mappedName = {
-                        'SEQUENCE': 'OnSequence',
-                        'SET': 'OnSet',
-                        'CHOICE': 'OnChoice',
-                        'SEQUENCEOF': 'OnSequenceOf',
-                        'SETOF': 'OnSetOf',
-                        'ENUMERATED': 'OnEnumerated'
-                    }
-                    if mappedName[leafType] not in dir(backend):
-                        panic("ASN.1 grammar contains %s but no %s section found in the mapping grammar (%s)" % (nodeTypename, mappedName[leafType], backendFilename))  # pragma: no cover
-                    processor = backend.__dict__[mappedName[leafType]]
-                    processor(nodeTypename, node, leafTypeDict)
-                # what type is it?
-                else:  # pragma: no cover
-                    panic("Unexpected type of element: %s" % leafTypeDict[nodeTypename])  # pragma: no cover
+    with profiling.Phase("Manifest"):
+        for _, modelingLanguage, key, _ in selected:
+            manifest.Record(modelingLanguage.lower(), key)
+        for asnFile in uniqueFilenames:
+            manifest.SetTypes(asnFile, list(asnParser.g_typesOfFile[asnFile]))
+        manifest.Save()
 
-            if 'OnShutdown' in dir(backend):
-                backend.OnShutdown(badTypes)
 
 if __name__ == "__main__":
     if "-pdb" in sys.argv:
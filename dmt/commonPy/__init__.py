@@ -6,10 +6,17 @@ This module contains the shared API for parsing ASN.1 and AADL
 and performing code generation via AST traversals.
 """
 from . import configMT
+from . import asnCache
 from . import asnParser
+from . import symbolTable
 from . import asnAST
 from . import aadlAST
+from . import aadlParser
 from . import utility
+from . import profiling
+from . import jobPool
+from . import buildManifest
+from . import outputFile
 from . import createInternalTypes
 from . import verify
 from . import recursiveMapper
@@ -37,9 +37,11 @@
 #
 # Charge for Runtimes   None                    None
 
-from typing import Tuple, Union, Dict, Any  # NOQA pylint: disable=unused-import
+from typing import List, Tuple, Union, Dict, Any  # NOQA pylint: disable=unused-import
 
 g_apLevelContainers = {}  # type: Dict[str, ApLevelContainer]
+g_signals = {}  # type: Dict[str, Signal]
+g_systems = {}  # type: Dict[str, List[str]]
 
 g_subProgramImplementations = []  # type: List[Tuple[str,str,str,str]]
 g_processImplementations = []  # type: List[Tuple[str,str,str,str]]
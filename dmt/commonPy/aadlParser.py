@@ -0,0 +1,670 @@
+# (C) Semantix Information Technologies.
+#
+# Semantix Information Technologies is licensing the code of the
+# Data Modelling Tools (DMT) in the following dual-license mode:
+#
+# Commercial Developer License:
+#       The DMT Commercial Developer License is the appropriate version
+# to use for the development of proprietary and/or commercial software.
+# This version is for developers/companies who do not want to share
+# the source code they develop with others or otherwise comply with the
+# terms of the GNU Lesser General Public License version 3.
+#
+# GNU LGPL v. 2.1:
+#       This version of DMT is the one to use for the development of
+# non-commercial applications, when you are willing to comply
+# with the terms of the GNU Lesser General Public License version 3.
+#
+# The features of the two licenses are summarized below:
+#
+#                       Commercial
+#                       Developer               LGPL
+#                       License
+#
+# License cost          License fee charged     No license fee
+#
+# Must provide source
+# code changes to DMT   No, modifications can   Yes, all source code
+#                       be closed               must be provided back
+#
+# Can create            Yes, that is,           No, applications are subject
+# proprietary           no source code needs    to the LGPL and all source code
+# applications          to be disclosed         must be made available
+#
+# Support               Yes, 12 months of       No, but available separately
+#                       premium technical       for purchase
+#                       support
+#
+# Charge for Runtimes   None                    None
+#
+'''
+AADL Parser
+
+This module parses the AADL specifications given to aadl2glueC, and fills
+the structures of aadlAST (g_apLevelContainers, g_signals, and the lists
+of SUBPROGRAM/THREAD/PROCESS implementations) in the calling process.
+
+It accepts the AADL subset of the ANTLR2 grammar in commonPy2/aadl.g, and
+performs the same actions; the parts of the grammar that carry no
+information for the glue code (flows, modes, property sets, annexes,
+etc) are only checked for balanced nesting, and skipped.
+
+The generator daemon (dmtDaemon.py) keeps the parsed models in memory,
+keyed by the names, sizes and timestamps of the input files.
+'''
+import os
+import re
+import pickle
+import collections
+
+from typing import List, Dict, Tuple, Optional, Any  # NOQA pylint: disable=unused-import
+
+from . import aadlAST
+from .aadlAST import (
+    AadlParameter, AadlPort, AadlEventPort, AadlEventDataPort,
+    ApLevelContainer, Signal, InParam, OutParam, InOutParam, UniquePortIdentifier)
+from .utility import panic, inform
+
+
+# The keywords of the language (case insensitive - the token kind of a
+# keyword is its upper-case spelling)
+g_keywords = {
+    'access', 'and', 'all', 'annex', 'applies', 'binding', 'aadlboolean', 'bus',
+    'calls', 'classifier', 'reference', 'connections', 'constant', 'data', 'delta',
+    'device', 'end', 'enumeration', 'event', 'extends', 'false', 'features', 'flow',
+    'flows', 'group', 'implementation', 'in', 'inherit', 'initial', 'aadlinteger',
+    'inverse', 'is', 'list', 'memory', 'mode', 'modes', 'none', 'not', 'of', 'or',
+    'out', 'package', 'parameter', 'path', 'port', 'private', 'process', 'processor',
+    'properties', 'property', 'provides', 'public', 'range', 'aadlreal', 'refined',
+    'refines', 'requires', 'server', 'set', 'sink', 'source', 'aadlstring',
+    'subcomponents', 'subprogram', 'system', 'thread', 'to', 'transitions', 'true',
+    'type', 'units', 'value',
+}
+
+g_tokenizer = re.compile(r'''
+      (?P<skip>[ \t\r\n]+|--[^\n\r]*)
+    | (?P<ANNEX_TEXT>\{\*\*.*?\*\*\})
+    | (?P<STRING>"(?:\\.|[^"\\])*")
+    | (?P<NUMBER>[0-9]+(?:\#[0-9a-f_]+\#(?:e\+?[0-9]+)?
+                        |(?:_[0-9]+)*(?:\.[0-9]+(?:_[0-9]+)*(?:e[+-]?[0-9]+)?|e\+?[0-9]+)?))
+    | (?P<IDENT>[a-z](?:_?[a-z0-9])*)
+    | (?P<symbol>\+=>|->>|->|-\[|\]->|=>|::|\.\.|[(){}:+\-*;,.\#])
+''', re.VERBOSE | re.DOTALL | re.IGNORECASE)
+
+# Token: (kind, text, line)
+Token = Tuple[str, str, int]
+
+# The clauses that can follow the name of a component type or implementation
+g_sectionKeywords = {
+    'EXTENDS', 'FEATURES', 'FLOWS', 'PROPERTIES', 'ANNEX', 'REFINES', 'SUBCOMPONENTS',
+    'CALLS', 'CONNECTIONS', 'MODES', 'END'}
+
+g_categories = {
+    'THREAD', 'SYSTEM', 'DATA', 'SUBPROGRAM', 'PROCESS', 'PROCESSOR', 'MEMORY',
+    'BUS', 'DEVICE'}
+
+# Parsed models kept in memory (by the daemon), most recently used last
+g_memory = collections.OrderedDict()  # type: collections.OrderedDict
+g_memoryLimit = 8
+
+# When set (by the daemon), ParseAADLfiles leaves the (key, pickled state)
+# of what it parsed here
+g_keepParsed = False
+g_lastParsed = None  # type: Optional[Tuple[Any, bytes]]
+
+# The package of the declarations being parsed. As in the ANTLR parser,
+# it carries over from one input file to the next.
+g_currentPackage = ""
+
+
+def Tokenize(filename: str, text: str) -> List[Token]:  # pylint: disable=invalid-sequence-index
+    tokens = []  # type: List[Token]
+    line = 1
+    pos = 0
+    end = len(text)
+    match = g_tokenizer.match
+    while pos < end:
+        m = match(text, pos)
+        if m is None:
+            panic("%s:%d: Unexpected character '%s'" % (filename, line, text[pos]))
+        kind = m.lastgroup
+        value = m.group()
+        if kind == 'IDENT':
+            lowered = value.lower()
+            if lowered in g_keywords:
+                kind = lowered.upper()
+        elif kind == 'symbol':
+            kind = value
+        if kind != 'skip':
+            tokens.append((kind, value, line))
+        if kind in ('skip', 'ANNEX_TEXT', 'STRING'):
+            line += value.count('\n')
+        pos = m.end()
+    tokens.append(('EOF', '', line))
+    return tokens
+
+
+class Parser:
+    '''Recursive descent parser over the tokens of one AADL file.'''
+    def __init__(self, filename: str, tokens: List[Token]) -> None:  # pylint: disable=invalid-sequence-index
+        self._filename = filename
+        self._tokens = tokens
+        self._pos = 0
+
+    # Token stream helpers
+
+    def Kind(self, offset: int = 0) -> str:
+        return self._tokens[min(self._pos + offset, len(self._tokens) - 1)][0]
+
+    def Next(self) -> Token:
+        token = self._tokens[self._pos]
+        if token[0] != 'EOF':
+            self._pos += 1
+        return token
+
+    def Accept(self, kind: str) -> bool:
+        if self.Kind() == kind:
+            self._pos += 1
+            return True
+        return False
+
+    def Expect(self, kind: str) -> Token:
+        if self.Kind() != kind:
+            self.Error("expected %s" % kind)
+        return self.Next()
+
+    def Error(self, msg: str, token: Optional[Token] = None) -> None:
+        if token is None:
+            token = self._tokens[self._pos]
+        found = "end of file" if token[0] == 'EOF' else "'%s'" % token[1]
+        panic("Error in file '%s', line %d: %s (found %s)" % (self._filename, token[2], msg, found))
+
+    # Top level
+
+    def Specification(self) -> None:
+        if self.Kind() == 'EOF':
+            self.Error("empty AADL specification")
+        while self.Kind() != 'EOF':
+            self.Declaration()
+
+    def Declaration(self) -> None:
+        global g_currentPackage
+        kind = self.Kind()
+        if kind == 'PACKAGE':
+            self.Next()
+            g_currentPackage = self.PackageName()
+            if self.Kind() not in ('PUBLIC', 'PRIVATE'):
+                self.Error("expected PUBLIC or PRIVATE")
+            while self.Accept('PUBLIC') or self.Accept('PRIVATE'):
+                while self.Kind() not in ('PUBLIC', 'PRIVATE', 'PROPERTIES', 'END', 'EOF'):
+                    self.PackageItem()
+                if self.Accept('PROPERTIES'):
+                    self.Entries()
+            self.Expect('END')
+            self.PackageName()
+            self.Expect(';')
+        elif kind == 'PROPERTY' and self.Kind(1) == 'SET':
+            # Property sets carry nothing for the glue - skip to "END name;"
+            self.Next()
+            self.Next()
+            name = self.Expect('IDENT')[1].lower()
+            self.Expect('IS')
+            while not (self.Kind() == 'END' and self.Kind(1) == 'IDENT' and
+                       self._tokens[self._pos + 1][1].lower() == name and self.Kind(2) == ';'):
+                if self.Kind() == 'EOF':
+                    self.Error("missing END of property set %s" % name)
+                self.Next()
+            self._pos += 3
+        else:
+            self.PackageItem()
+
+    def PackageName(self) -> str:
+        name = self.Expect('IDENT')[1]
+        while self.Accept('::'):
+            name += "::" + self.Expect('IDENT')[1]
+        return name
+
+    def PackageItem(self) -> None:
+        kind = self.Kind()
+        if kind == 'ANNEX':
+            self.Annex()
+        elif kind == 'PORT' and self.Kind(1) == 'GROUP':
+            self.Next()
+            self.Next()
+            self.Expect('IDENT')
+            self.Sections()
+            self.End(1)
+        elif kind in g_categories:
+            self.Component()
+        else:
+            self.Error("expected a component declaration")
+
+    def Annex(self) -> None:
+        self.Expect('ANNEX')
+        self.Expect('IDENT')
+        self.Expect('ANNEX_TEXT')
+        self.Expect(';')
+
+    def End(self, parts: int) -> None:
+        '''Matches "END name;" (or "END type.impl;") - as in the ANTLR
+grammar, the name is not checked against the declared one.'''
+        self.Expect('END')
+        self.Expect('IDENT')
+        for _ in range(parts - 1):
+            self.Expect('.')
+            self.Expect('IDENT')
+        self.Expect(';')
+
+    # Components: the clauses are split into their entries (the tokens up
+    # to each top-level ';') and then interpreted per category
+
+    def Sections(self) -> Dict[str, List[List[Token]]]:  # pylint: disable=invalid-sequence-index
+        sections = {}  # type: Dict[str, List[List[Token]]]
+        while True:
+            kind = self.Kind()
+            if kind == 'END':
+                return sections
+            if kind == 'EXTENDS':
+                self.Next()
+                self.PackageName()
+                if self.Accept('.'):
+                    self.Expect('IDENT')
+            elif kind == 'ANNEX':
+                self.Annex()
+            elif kind == 'REFINES':
+                self.Next()
+                self.Expect('TYPE')
+                self.Entries()
+            elif kind in g_sectionKeywords:
+                self.Next()
+                sections.setdefault(kind, []).extend(self.Entries())
+            else:
+                self.Error("unexpected clause")
+
+    def Entries(self) -> List[List[Token]]:  # pylint: disable=invalid-sequence-index
+        entries = []  # type: List[List[Token]]
+        tokens = self._tokens
+        if self.Kind() == 'NONE' and self.Kind(1) == ';':
+            self._pos += 2
+            return entries
+        while self.Kind() not in g_sectionKeywords or self.Kind() == 'ANNEX':
+            if self.Kind() == 'ANNEX':
+                # Annexes inside a clause belong to the component
+                return entries
+            start = self._pos
+            depth = 0
+            while True:
+                kind = tokens[self._pos][0]
+                if kind in ('(', '{'):
+                    depth += 1
+                elif kind in (')', '}'):
+                    depth -= 1
+                elif kind == ';' and depth == 0:
+                    break
+                elif kind == 'EOF':
+                    self.Error("missing ';'", tokens[start])
+                self._pos += 1
+            entries.append(tokens[start:self._pos])
+            self._pos += 1
+        return entries
+
+    def Component(self) -> None:
+        category = self.Next()[0]
+        if category == 'THREAD' and self.Kind() == 'GROUP':
+            self.Next()
+            category = 'THREAD GROUP'
+        if self.Accept('IMPLEMENTATION'):
+            typeid = self.Expect('IDENT')
+            self.Expect('.')
+            defid = self.Expect('IDENT')
+            sections = self.Sections()
+            self.End(2)
+            ComponentImplementation(self, category, typeid, defid[1], sections)
+        else:
+            name = self.Expect('IDENT')
+            sections = self.Sections()
+            self.End(1)
+            ComponentType(self, category, name, sections)
+
+
+def ClassifierReference(tokens: List[Token], i: int) -> Tuple[str, int]:  # pylint: disable=invalid-sequence-index
+    '''Parses "(pkg ::)* name (. impl)?" at tokens[i] - and returns the
+classifier (as "pkg::name", where pkg is the last package part or the
+current package) and the index after it.'''
+    package = None
+    name = tokens[i][1]
+    i += 1
+    while i + 1 < len(tokens) and tokens[i][0] == '::':
+        package = name
+        name = tokens[i + 1][1]
+        i += 2
+    if i + 1 < len(tokens) and tokens[i][0] == '.' and tokens[i + 1][0] == 'IDENT':
+        i += 2
+    if package is None:
+        package = g_currentPackage
+    return package + "::" + name, i
+
+
+def PropertyValue(tokens: List[Token]) -> Any:  # pylint: disable=invalid-sequence-index
+    '''The value of a property association, as the ANTLR parser returns it:
+the text of a string (with its quotes), of an enumeration literal or of
+a number (without its sign and unit), or a classifier. Lists of more than
+one element, references and boolean expressions give None.'''
+    if not tokens:
+        return None
+    if tokens[0][0] == '(':
+        depth = 0
+        commas = 0
+        for t in tokens:
+            if t[0] in ('(', '{'):
+                depth += 1
+            elif t[0] in (')', '}'):
+                depth -= 1
+            elif t[0] == ',' and depth == 1:
+                commas += 1
+        if commas:
+            return None
+        tokens = tokens[1:]
+    kind = tokens[0][0]
+    if kind in ('STRING', 'IDENT'):
+        return tokens[0][1]
+    if kind in ('+', '-'):
+        tokens = tokens[1:]
+        kind = tokens[0][0] if tokens else ''
+    if kind == 'NUMBER':
+        return tokens[0][1]
+    if kind in g_categories and len(tokens) > 1 and tokens[1][0] == 'IDENT':
+        return ClassifierReference(tokens, 1)[0]
+    return None
+
+
+def PropertyAssociations(parser: Parser, entries: List[List[Token]]) -> List[Tuple[str, Any]]:  # pylint: disable=invalid-sequence-index
+    '''Interprets "name => value [applies to ...] [in binding/modes ...]"
+entries into (name, value) pairs (the name without its property set).'''
+    result = []  # type: List[Tuple[str, Any]]
+    for entry in entries:
+        i = 0
+        if len(entry) > 2 and entry[1][0] == '::':
+            i = 2
+        if len(entry) < i + 2 or entry[i][0] != 'IDENT' or entry[i + 1][0] not in ('=>', '+=>'):
+            parser.Error("malformed property association", entry[0] if entry else None)
+        name = entry[i][1]
+        i += 2
+        while i < len(entry) and entry[i][0] in ('CONSTANT', 'ACCESS'):
+            i += 1
+        end = i
+        depth = 0
+        while end < len(entry):
+            kind = entry[end][0]
+            if kind in ('(', '{'):
+                depth += 1
+            elif kind in (')', '}'):
+                depth -= 1
+            elif depth == 0 and (kind == 'APPLIES' or (kind == 'IN' and end + 1 < len(entry) and
+                                                       entry[end + 1][0] in ('BINDING', 'MODES'))):
+                break
+            end += 1
+        result.append((name, PropertyValue(entry[i:end])))
+    return result
+
+
+def CurlyProperties(parser: Parser, tokens: List[Token], i: int) -> List[Tuple[str, Any]]:  # pylint: disable=invalid-sequence-index
+    '''The property associations of a "{ ... }" block starting at tokens[i].'''
+    if i >= len(tokens) or tokens[i][0] != '{':
+        return []
+    entries = []  # type: List[List[Token]]
+    start = i + 1
+    depth = 0
+    for j in range(i, len(tokens)):
+        kind = tokens[j][0]
+        if kind in ('(', '{'):
+            depth += 1
+        elif kind in (')', '}'):
+            depth -= 1
+            if depth == 0:
+                break
+        elif kind == ';' and depth == 1:
+            entries.append(tokens[start:j])
+            start = j + 1
+    return PropertyAssociations(parser, entries)
+
+
+def Direction(entry: List[Token], i: int) -> Tuple[Optional[str], int]:  # pylint: disable=invalid-sequence-index
+    if i < len(entry) and entry[i][0] == 'IN':
+        if i + 1 < len(entry) and entry[i + 1][0] == 'OUT':
+            return "INOUT", i + 2
+        return "IN", i + 1
+    if i < len(entry) and entry[i][0] == 'OUT':
+        return "OUT", i + 1
+    return None, i
+
+
+def Feature(parser: Parser, entry: List[Token], subprogram: bool) -> Tuple[str, Any]:  # pylint: disable=invalid-sequence-index
+    '''Interprets a FEATURES entry - returns its name, and an AadlParameter
+(for SUBPROGRAMs) or port (for the other components), or None for the
+features that the glue does not care about.'''
+    if len(entry) < 2 or entry[0][0] != 'IDENT' or entry[1][0] != ':':
+        parser.Error("malformed feature", entry[0] if entry else None)
+    name = entry[0][1]
+    i = 2
+    if i < len(entry) and entry[i][0] == 'REFINED':
+        i += 2
+    direction, i = Direction(entry, i)
+    if direction is None:
+        return name, None
+    kinds = [t[0] for t in entry[i:i + 3]]
+    if kinds[:1] == ['PARAMETER']:
+        i += 1
+        feature = None  # type: Any
+        if i < len(entry) and entry[i][0] == 'IDENT':
+            classifier, i = ClassifierReference(entry, i)
+            feature = AadlParameter(direction, classifier)
+            feature._encoding = "UPER"
+        properties = CurlyProperties(parser, entry, i)
+    elif subprogram:
+        return name, None
+    else:
+        if kinds == ['EVENT', 'DATA', 'PORT']:
+            i += 3
+            klass = AadlEventDataPort
+        elif kinds[:2] == ['DATA', 'PORT']:
+            i += 2
+            klass = AadlPort
+        elif kinds[:2] == ['EVENT', 'PORT']:
+            i += 2
+            klass = None
+        else:
+            return name, None
+        if klass is None:
+            feature = AadlEventPort(direction, None)
+        elif i < len(entry) and entry[i][0] == 'IDENT':
+            classifier, i = ClassifierReference(entry, i)
+            feature = klass(direction, classifier)
+        else:
+            return name, None
+        feature._encoding = "UPER"
+        properties = CurlyProperties(parser, entry, i)
+        calledSubprograms = [v for n, v in properties if n.lower() == "rcmoperation"]
+        if len(calledSubprograms) == 1 and isinstance(feature, AadlEventPort) and calledSubprograms[0]:
+            feature._sp = calledSubprograms[0][2:]
+    if feature is not None:
+        encodings = [v for n, v in properties if n.lower()[-8:] == "encoding"]
+        if len(encodings) == 1 and encodings[0]:
+            feature._encoding = encodings[0].capitalize()
+    return name, feature
+
+
+def ComponentType(parser: Parser, category: str, nameToken: Token, sections: Dict[str, List[List[Token]]]) -> None:  # pylint: disable=invalid-sequence-index
+    name = nameToken[1]
+    features = [Feature(parser, entry, category == 'SUBPROGRAM') for entry in sections.get('FEATURES', [])]
+    if category == 'DATA':
+        if 'PROPERTIES' not in sections:
+            return
+        asnFilename = ""
+        asnNodename = ""
+        asnSize = -1
+        for propName, value in PropertyAssociations(parser, sections['PROPERTIES']):
+            lowered = propName.lower()
+            if lowered == "source_text" and value:
+                asnFilename = value[1:-1]
+            elif lowered == "type_source_name" and value:
+                asnNodename = value[1:-1]
+            elif lowered == "source_data_size":
+                try:
+                    asnSize = int(value)
+                except (TypeError, ValueError):
+                    panic("Line %d: DATA (%s) must have source_data_size be declared as [0-9]B (not '%s')" % (
+                        nameToken[2], name, value))
+        if asnFilename != "" and asnNodename != "" and asnSize != -1:
+            s = Signal(asnFilename, asnNodename, asnSize)
+            aadlAST.g_signals[name] = s
+            aadlAST.g_signals[g_currentPackage + "::" + name] = s
+        else:
+            panic("Line %d: DATA (%s) must have Source_Text, Type_Source_Name and Source_Data_Size" % (
+                nameToken[2], name))
+    elif category == 'SYSTEM':
+        aadlAST.g_systems[name] = [
+            f._sp for _, f in features
+            if isinstance(f, AadlEventPort) and f._direction == "OUT"]
+    elif category in ('SUBPROGRAM', 'THREAD', 'PROCESS'):
+        sp = ApLevelContainer(name)
+        aadlAST.g_apLevelContainers[name] = sp
+        for featureName, feature in features:
+            # Event ports carry no data
+            if feature is None or isinstance(feature, AadlEventPort):
+                continue
+            paramClass = {"IN": InParam, "OUT": OutParam, "INOUT": InOutParam}[feature._direction]
+            # The data type is resolved once all the files are parsed
+            sp.AddParam(paramClass(name, featureName, feature._type, feature))
+        for propName, value in PropertyAssociations(parser, sections.get('PROPERTIES', [])):
+            if propName[-15:].lower() == "source_language" and value:
+                sp.SetLanguage(value.replace("\"", ""))
+
+
+def Connections(parser: Parser, entries: List[List[Token]]) -> List[Tuple[UniquePortIdentifier, UniquePortIdentifier]]:  # pylint: disable=invalid-sequence-index
+    '''The (source, destination) ports of the CONNECTIONS entries (the
+refinements of connections are not supported, and ignored).'''
+    def Port(i: int) -> Tuple[UniquePortIdentifier, int]:
+        if entry[i][0] != 'IDENT':
+            parser.Error("expected a port identifier", entry[i])
+        if i + 2 < len(entry) and entry[i + 1][0] == '.' and entry[i + 2][0] == 'IDENT':
+            return UniquePortIdentifier(entry[i][1], entry[i + 2][1]), i + 3
+        return UniquePortIdentifier(None, entry[i][1]), i + 1
+
+    result = []
+    for entry in entries:
+        i = 0
+        if len(entry) > 1 and entry[0][0] == 'IDENT' and entry[1][0] == ':':
+            i = 2
+            if len(entry) > 2 and entry[2][0] == 'REFINED':
+                continue
+        while i < len(entry) and entry[i][0] in ('DATA', 'EVENT', 'PORT', 'GROUP', 'PARAMETER', 'BUS', 'ACCESS'):
+            i += 1
+        if i >= len(entry):
+            parser.Error("malformed connection", entry[0] if entry else None)
+        source, i = Port(i)
+        if i >= len(entry) or entry[i][0] not in ('->', '->>'):
+            parser.Error("expected '->'", entry[min(i, len(entry) - 1)])
+        destination, i = Port(i + 1)
+        result.append((source, destination))
+    return result
+
+
+def ComponentImplementation(parser: Parser, category: str, typeToken: Token, defid: str, sections: Dict[str, List[List[Token]]]) -> None:  # pylint: disable=invalid-sequence-index
+    implementations = {
+        'SUBPROGRAM': aadlAST.g_subProgramImplementations,
+        'THREAD': aadlAST.g_threadImplementations,
+        'PROCESS': aadlAST.g_processImplementations,
+    }.get(category)
+    if implementations is None:
+        return
+    typeid = typeToken[1]
+    if typeid not in aadlAST.g_apLevelContainers:
+        panic("Line %d: %s (%s) must first be declared before it is implemented" % (
+            typeToken[2], category, typeid))
+    sp = aadlAST.g_apLevelContainers[typeid]
+    implementation = [typeid, defid, sp._language, ""]
+    implementations.append(implementation)
+    for source, destination in Connections(parser, sections.get('CONNECTIONS', [])):
+        sp.AddConnection(source, destination)
+    for propName, value in PropertyAssociations(parser, sections.get('PROPERTIES', [])):
+        if value is None:
+            continue
+        if propName[-15:].lower() == "source_language":
+            implementation[2] = value.replace("\"", "")
+        if propName[-15:].lower() == "fv_name":
+            implementation[3] = value.replace("\"", "")
+
+
+def ParseAADLfiles(listOfFilenames: List[str]) -> None:  # pylint: disable=invalid-sequence-index
+    '''Parses the AADL files, and resolves all references to AADL Data
+types into the param._signal member of each SUBPROGRAM/THREAD/PROCESS
+param.'''
+    global g_currentPackage, g_lastParsed
+    key = tuple(
+        (os.path.abspath(f), os.stat(f).st_size, os.stat(f).st_mtime_ns) if os.path.isfile(f) else (f, -1, -1)
+        for f in listOfFilenames)
+    if key in g_memory:
+        g_memory.move_to_end(key)
+        inform("Reusing in-memory AADL model")
+        SetParsedState(g_memory[key])
+        return
+    g_currentPackage = ""
+    SetParsedState({
+        'g_apLevelContainers': {}, 'g_signals': {}, 'g_systems': {},
+        'g_subProgramImplementations': [], 'g_processImplementations': [],
+        'g_threadImplementations': []})
+    for aadlFilename in listOfFilenames:
+        inform("Parsing %s...", aadlFilename)
+        try:
+            with open(aadlFilename, 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read()
+        except IOError as e:
+            panic("Failed to read '%s': %s" % (aadlFilename, str(e)))
+        Parser(aadlFilename, Tokenize(aadlFilename, text)).Specification()
+
+    for subProgramName, subProgram in aadlAST.g_apLevelContainers.items():
+        inform("Resolving data definitions in subprogram %s...", subProgramName)
+        for param in subProgram._params:
+            if not isinstance(param._signal, Signal):
+                if param._signal not in aadlAST.g_signals:
+                    panic("Unknown data type %s in the definition of %s!\n" % (
+                        param._signal, subProgramName))
+                param._signal = aadlAST.g_signals[param._signal]
+    if g_keepParsed:
+        g_lastParsed = (key, pickle.dumps(GetParsedState(), pickle.HIGHEST_PROTOCOL))
+
+
+def GetParsedState() -> Dict[str, Any]:
+    '''Everything that ParseAADLfiles leaves behind in aadlAST.'''
+    return {
+        'g_apLevelContainers': aadlAST.g_apLevelContainers,
+        'g_signals': aadlAST.g_signals,
+        'g_systems': aadlAST.g_systems,
+        'g_subProgramImplementations': aadlAST.g_subProgramImplementations,
+        'g_processImplementations': aadlAST.g_processImplementations,
+        'g_threadImplementations': aadlAST.g_threadImplementations,
+    }
+
+
+def SetParsedState(state: Dict[str, Any]) -> None:
+    '''Reinstate the outcome of an earlier ParseAADLfiles (see GetParsedState).'''
+    # These are imported by name in other modules, so update them in place
+    for name, value in state.items():
+        container = getattr(aadlAST, name)
+        if isinstance(container, dict):
+            container.clear()
+            container.update(value)
+        else:
+            container[:] = value
+
+
+def Remember(key: Any, pickledState: bytes) -> None:
+    '''Keep a parsed model in memory (evicting the least recently used
+models beyond g_memoryLimit).'''
+    g_memory[key] = pickle.loads(pickledState)
+    g_memory.move_to_end(key)
+    while len(g_memory) > g_memoryLimit:
+        g_memory.popitem(last=False)
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -75,16 +75,22 @@
 #                     |        AsnMetaMember        |
 #                     +-----------------------------+
 
-from typing import List, Union, Dict, Any  # NOQA pylint: disable=unused-import
+from typing import List, Union, Dict, Tuple, Any  # NOQA pylint: disable=unused-import
 
 from . import utility
 
 Lookup = Dict[str, 'AsnNode']
+# AsASN1 results, keyed by the id of each node (see CommonAsASN1)
+ASN1TextCache = Dict[int, str]
 AsnSequenceOrSet = Union['AsnSequence', 'AsnSet']
 AsnSequenceOrSetOf = Union['AsnSequenceOf', 'AsnSetOf']
 
 
 class AsnNode(object):
+    # Grammars with tens of thousands of types create hundreds of thousands
+    # of nodes, so every class in this module declares __slots__; a new
+    # member must be added to the __slots__ of the class that sets it.
+    __slots__ = ('_leafType', '_asnFilename', '_lineno', '_isArtificial', '_name')
 
     def __init__(self, asnFilename: str) -> None:
         self._leafType = "unknown"
@@ -98,18 +104,16 @@ class AsnNode(object):
     def IdenticalPerSMP2(self, _: 'AsnNode', __: Lookup, ___: Lookup) -> bool:  # pylint: disable=no-self-use
         utility.panic("internal error: Must be defined in derived class...")
 
-    def AsASN1(self, _: Lookup) -> str:  # pylint: disable=no-self-use
+    def AsASN1(self, _: Lookup, __: ASN1TextCache=None) -> str:  # pylint: disable=no-self-use
         utility.panic("internal error: Must be defined in derived class...")
 
 
 class AsnBasicNode(AsnNode):
-    def __init__(self, asnFilename: str) -> None:
-        AsnNode.__init__(self, asnFilename)
+    __slots__ = ()
 
 
 class AsnComplexNode(AsnNode):
-    def __init__(self, asnFilename: str) -> None:
-        AsnNode.__init__(self, asnFilename)
+    __slots__ = ()
 
 #########################################################
 # Basic nodes: Bool, Int, Real, UTF8String, OctetString #
@@ -137,7 +141,8 @@ Members:
     _name : the name of the type (or var)
     _bDefaultValue : one of True,False,None.
 '''
-    validOptions = ['bDefaultValue', 'lineno', 'asnFilename']
+    __slots__ = ('_bDefaultValue',)
+    validOptions = frozenset(['bDefaultValue', 'lineno', 'asnFilename'])
 
     def __init__(self, **args: Any) -> None:
         AsnBasicNode.__init__(self, args.get('asnFilename', ''))
@@ -145,8 +150,7 @@ Members:
         self._leafType = "BOOLEAN"
         self._lineno = args.get('lineno', None)
         self._bDefaultValue = args.get('bDefaultValue', None)
-        for i in args.keys():
-            assert i in AsnBool.validOptions
+        assert args.keys() <= AsnBool.validOptions, args.keys() - AsnBool.validOptions
 
     def __repr__(self) -> str:
         result = self._leafType
@@ -157,7 +161,7 @@ Members:
     def IdenticalPerSMP2(self, other: AsnNode, _: Lookup, __: Lookup) -> bool:
         return isinstance(other, AsnBool)
 
-    def AsASN1(self, _: Lookup) -> str:
+    def AsASN1(self, _: Lookup, __: ASN1TextCache=None) -> str:
         return 'BOOLEAN'
 
 
@@ -169,7 +173,8 @@ Members:
     _range : a tuple containing the valid range for the integer or []
     _iDefaultValue : either None, or the default value for this integer
 '''
-    validOptions = ['range', 'iDefaultValue', 'lineno', 'asnFilename']
+    __slots__ = ('_range', '_iDefaultValue')
+    validOptions = frozenset(['range', 'iDefaultValue', 'lineno', 'asnFilename'])
 
     def __init__(self, **args: Any) -> None:
         AsnBasicNode.__init__(self, args.get('asnFilename', ''))
@@ -178,8 +183,7 @@ Members:
         self._lineno = args.get('lineno', None)
         self._range = args.get('range', [])
         self._iDefaultValue = args.get('iDefaultValue', None)
-        for i in args.keys():
-            assert i in AsnInt.validOptions
+        assert args.keys() <= AsnInt.validOptions, args.keys() - AsnInt.validOptions
 
     def __repr__(self) -> str:
         result = self._leafType
@@ -192,7 +196,7 @@ Members:
     def IdenticalPerSMP2(self, other: AsnNode, _: Lookup, __: Lookup) -> bool:
         return isinstance(other, AsnInt) and CommonIdenticalRangePerSMP2(self._range, other._range)
 
-    def AsASN1(self, _: Lookup) -> str:
+    def AsASN1(self, _: Lookup, __: ASN1TextCache=None) -> str:
         ret = 'INTEGER'
         if self._range:
             ret += ' (' + str(self._range[0]) + ' .. ' + str(self._range[1]) + ')'
@@ -212,7 +216,8 @@ Members:
                       Or [].
     _dbDefaultValue : either None, or the default value for this real
 '''
-    validOptions = ['range', 'mantissa', 'base', 'exponent', 'defaultValue', 'lineno', 'asnFilename']
+    __slots__ = ('_range', '_mantissaRange', '_baseRange', '_exponentRange', '_dbDefaultValue')
+    validOptions = frozenset(['range', 'mantissa', 'base', 'exponent', 'defaultValue', 'lineno', 'asnFilename'])
 
     def __init__(self, **args: Any) -> None:
         AsnBasicNode.__init__(self, args.get('asnFilename', ''))
@@ -224,8 +229,7 @@ Members:
         self._baseRange = args.get('base', None)
         self._exponentRange = args.get('exponent', None)
         self._dbDefaultValue = args.get('defaultValue', None)
-        for i in args.keys():
-            assert i in AsnReal.validOptions
+        assert args.keys() <= AsnReal.validOptions, args.keys() - AsnReal.validOptions
 
     def __repr__(self) -> str:
         result = self._leafType
@@ -249,7 +253,7 @@ Members:
     def IdenticalPerSMP2(self, other: AsnNode, _: Lookup, __: Lookup) -> bool:
         return isinstance(other, AsnReal) and CommonIdenticalRangePerSMP2(self._range, other._range)
 
-    def AsASN1(self, _: Lookup) -> str:
+    def AsASN1(self, _: Lookup, __: ASN1TextCache=None) -> str:
         ret = 'REAL'
         if self._range:
             ret += ' (' + ("%f" % self._range[0]) + ' .. ' + ("%f" % self._range[1]) + ')'
@@ -263,7 +267,8 @@ Members:
     _name : the name of the type (or var)
     _range : a tuple containing the allowed string size or []
 '''
-    validOptions = ['range', 'lineno', 'asnFilename']
+    __slots__ = ('_range', '_pseudoname')
+    validOptions = frozenset(['range', 'lineno', 'asnFilename'])
 
     def __init__(self, **args: Any) -> None:
         AsnBasicNode.__init__(self, args.get('asnFilename', ''))
@@ -274,8 +279,7 @@ Members:
         # nameless string types can't be used, so a unique pseudo-type name
         # is created from the fieldname + "_type"
         self._pseudoname = None  # type: Union[None, str]
-        for i in args.keys():
-            assert i in AsnString.validOptions
+        assert args.keys() <= AsnString.validOptions, args.keys() - AsnString.validOptions
 
     def __repr__(self) -> str:
         result = self._leafType
@@ -287,7 +291,7 @@ Members:
     def IdenticalPerSMP2(self, other: AsnNode, _: Lookup, __: Lookup) -> bool:
         return isinstance(other, AsnString) and CommonIdenticalRangePerSMP2(self._range, other._range)
 
-    def AsASN1(self, _: Lookup) -> str:
+    def AsASN1(self, _: Lookup, __: ASN1TextCache=None) -> str:
         ret = 'OCTET STRING'
         if self._range:
             if len(self._range) > 1 and self._range[0] != self._range[1]:
@@ -299,6 +303,7 @@ Members:
 
 class AsnOctetString(AsnString):
     '''This class stores the semantic content of an ASN.1 OCTET STRING.'''
+    __slots__ = ()
 
     def __init__(self, **args: Any) -> None:
         AsnString.__init__(self, **args)
@@ -315,6 +320,7 @@ class AsnOctetString(AsnString):
 
 class AsnUTF8String(AsnString):
     '''This class stores the semantic content of an ASN.1 UTF8String.'''
+    __slots__ = ()
 
     def __init__(self, **args: Any) -> None:
         AsnString.__init__(self, **args)  # pragma: no cover
@@ -324,6 +330,7 @@ class AsnUTF8String(AsnString):
 
 class AsnAsciiString(AsnString):
     '''This class stores the semantic content of an ASN.1 AsciiString.'''
+    __slots__ = ()
 
     def __init__(self, **args: Any) -> None:
         AsnString.__init__(self, **args)  # pragma: no cover
@@ -333,6 +340,7 @@ class AsnAsciiString(AsnString):
 
 class AsnNumberString(AsnString):
     '''This class stores the semantic content of an ASN.1 NumberString.'''
+    __slots__ = ()
 
     def __init__(self, **args: Any) -> None:
         AsnString.__init__(self, **args)  # pragma: no cover
@@ -342,6 +350,7 @@ class AsnNumberString(AsnString):
 
 class AsnVisibleString(AsnString):
     '''This class stores the semantic content of an ASN.1 VisibleString.'''
+    __slots__ = ()
 
     def __init__(self, **args: Any) -> None:
         AsnString.__init__(self, **args)  # pragma: no cover
@@ -351,6 +360,7 @@ class AsnVisibleString(AsnString):
 
 class AsnPrintableString(AsnString):
     '''This class stores the semantic content of an ASN.1 PrintableString.'''
+    __slots__ = ()
 
     def __init__(self, **args: Any) -> None:
         AsnString.__init__(self, **args)  # pragma: no cover
@@ -374,7 +384,8 @@ Members:
     _default : if one of the values of the enumeration is the default,
                it is contained in this member
 '''
-    validOptions = ['members', 'default', 'lineno', 'asnFilename']
+    __slots__ = ('_members', '_default', '_pseudoname')
+    validOptions = frozenset(['members', 'default', 'lineno', 'asnFilename'])
 
     def __init__(self, **args: Any) -> None:
         AsnComplexNode.__init__(self, args.get('asnFilename', ''))
@@ -387,8 +398,7 @@ Members:
         # nameless string types can't be used, so a unique pseudo-type name
         # is created from the fieldname + "_type"
         self._pseudoname = None  # type: Union[None, str]
-        for i in args.keys():
-            assert i in AsnEnumerated.validOptions
+        assert args.keys() <= AsnEnumerated.validOptions, args.keys() - AsnEnumerated.validOptions
         existing = {}  # type: Dict[str, int]
         for elem in self._members:
             if elem[0] in existing:
@@ -410,7 +420,7 @@ Members:
     def IdenticalPerSMP2(self, other: AsnNode, _: Lookup, __: Lookup) -> bool:
         return isinstance(other, AsnEnumerated) and sorted(self._members) == sorted(other._members)
 
-    def AsASN1(self, _: Lookup) -> str:
+    def AsASN1(self, _: Lookup, __: ASN1TextCache=None) -> str:
         ret = []
         for m in self._members:
             ret.append(m[0] + '(' + m[1] + ')')
@@ -441,7 +451,12 @@ def CommonIdenticalCheck(me: TypeWithMembers, other: TypeWithMembers, mynames: L
     return all(x.IdenticalPerSMP2(y, mynames, othernames) for x, y in zip(myMembers, otherMembers))
 
 
-def CommonAsASN1(kind: str, node: TypeWithMembers, typeDict: Lookup) -> str:
+def CommonAsASN1(kind: str, node: TypeWithMembers, typeDict: Lookup, cache: ASN1TextCache=None) -> str:
+    # The text of a type includes that of all the types it references;
+    # when emitting many types, the caller can pass a cache (used for as
+    # long as the AST doesn't change) to only build it once per node.
+    if cache is not None and id(node) in cache:
+        return cache[id(node)]
     ret = []
     for m in node._members:
         child = m[1]
@@ -451,8 +466,11 @@ def CommonAsASN1(kind: str, node: TypeWithMembers, typeDict: Lookup) -> str:
                 if child not in typeDict:
                     utility.panic("There's no such type in typename dictionary: '%s'" % child)
                 child = typeDict[child]
-        ret.append(m[0] + ' ' + child.AsASN1(typeDict))
-    return kind + ' {' + ", ".join(ret) + "}"
+        ret.append(m[0] + ' ' + child.AsASN1(typeDict, cache))
+    text = kind + ' {' + ", ".join(ret) + "}"
+    if cache is not None:
+        cache[id(node)] = text
+    return text
 
 
 class AsnSequence(AsnComplexNode):
@@ -463,8 +481,11 @@ Members:
     _members    : a tuple of all child elements. Each tuple contains
                   two elements: the name of the variable and the
                   type itself (as an AsnInt, AsnReal, ... or an AsnMetaMember).
+                  The members read from ASN1SCC's XML AST also have the
+                  EnumID and whether the member is OPTIONAL (see isOptional).
 '''
-    validOptions = ['members', 'lineno', 'asnFilename']
+    __slots__ = ('_members',)
+    validOptions = frozenset(['members', 'lineno', 'asnFilename'])
 
     def __init__(self, **args: Any) -> None:
         AsnComplexNode.__init__(self, args.get('asnFilename', ''))
@@ -472,8 +493,7 @@ Members:
         self._leafType = "SEQUENCE"
         self._members = args.get('members', [])
         self._lineno = args.get('lineno', None)
-        for i in args.keys():
-            assert i in AsnSequence.validOptions
+        assert args.keys() <= AsnSequence.validOptions, args.keys() - AsnSequence.validOptions
         existing = {}  # type: Dict[str, int]
         for elem in self._members:
             if elem[0] in existing:
@@ -499,13 +519,14 @@ Members:
             isinstance(other, (AsnSet, AsnSequence, AsnChoice)) and \
             CommonIdenticalCheck(self, other, mynames, othernames)
 
-    def AsASN1(self, typeDict: Lookup=None) -> str:
+    def AsASN1(self, typeDict: Lookup=None, cache: ASN1TextCache=None) -> str:
         if typeDict is None:
             typeDict = {}
-        return CommonAsASN1('SEQUENCE', self, typeDict)
+        return CommonAsASN1('SEQUENCE', self, typeDict, cache)
 
 
 class AsnSet(AsnComplexNode):
+    __slots__ = ('_members',)
 
     def __init__(self, **args: Any) -> None:
         AsnComplexNode.__init__(self, args.get('asnFilename', ''))
@@ -513,8 +534,7 @@ class AsnSet(AsnComplexNode):
         self._leafType = "SET"
         self._members = args.get('members', [])
         self._lineno = args.get('lineno', None)
-        for i in args.keys():
-            assert i in AsnSequence.validOptions
+        assert args.keys() <= AsnSequence.validOptions, args.keys() - AsnSequence.validOptions
         existing = {}  # type: Dict[str, int]
         for elem in self._members:
             if elem[0] in existing:
@@ -540,10 +560,10 @@ class AsnSet(AsnComplexNode):
             isinstance(other, (AsnSet, AsnSequence, AsnChoice)) and \
             CommonIdenticalCheck(self, other, mynames, othernames)
 
-    def AsASN1(self, typeDict: Lookup=None) -> str:
+    def AsASN1(self, typeDict: Lookup=None, cache: ASN1TextCache=None) -> str:
         if typeDict is None:
             typeDict = {}
-        return CommonAsASN1('SET', self, typeDict)
+        return CommonAsASN1('SET', self, typeDict, cache)
 
 
 class AsnChoice(AsnComplexNode):
@@ -555,7 +575,8 @@ Members:
                   two elements: the name of the variable and the
                   type itself (as an AsnInt, AsnReal, ... or an AsnMetaMember).
 '''
-    validOptions = ['members', 'lineno', 'asnFilename']
+    __slots__ = ('_members',)
+    validOptions = frozenset(['members', 'lineno', 'asnFilename'])
 
     def __init__(self, **args: Any) -> None:
         AsnComplexNode.__init__(self, args.get('asnFilename', ''))
@@ -563,8 +584,7 @@ Members:
         self._leafType = "CHOICE"
         self._members = args.get('members', [])
         self._lineno = args.get('lineno', None)
-        for i in args.keys():
-            assert i in AsnChoice.validOptions
+        assert args.keys() <= AsnChoice.validOptions, args.keys() - AsnChoice.validOptions
         existing = {}  # type: Dict[str, int]
         for elem in self._members:
             if elem[0] in existing:
@@ -586,10 +606,10 @@ Members:
     def IdenticalPerSMP2(self, other: AsnNode, mynames: Lookup, othernames: Lookup) -> bool:
         return isinstance(other, AsnChoice) and CommonIdenticalCheck(self, other, mynames, othernames)
 
-    def AsASN1(self, typeDict: Lookup=None) -> str:
+    def AsASN1(self, typeDict: Lookup=None, cache: ASN1TextCache=None) -> str:
         if typeDict is None:
             typeDict = {}
-        return CommonAsASN1('CHOICE', self, typeDict)
+        return CommonAsASN1('CHOICE', self, typeDict, cache)
 
 
 TypeWithRange = Union['AsnSequenceOf', 'AsnSetOf']
@@ -609,7 +629,9 @@ def CommonIdenticalArrayCheck(me: TypeWithRange, other: TypeWithRange, mynames:
     return cont[0][0].IdenticalPerSMP2(cont[1][0], mynames, othernames)
 
 
-def CommonAsASN1array(kind: str, node: TypeWithRange, typeDict: Lookup) -> str:
+def CommonAsASN1array(kind: str, node: TypeWithRange, typeDict: Lookup, cache: ASN1TextCache=None) -> str:
+    if cache is not None and id(node) in cache:
+        return cache[id(node)]
     contained = node._containedType
     while isinstance(contained, str):
         if contained not in typeDict:
@@ -622,7 +644,10 @@ def CommonAsASN1array(kind: str, node: TypeWithRange, typeDict: Lookup) -> str:
             span = ' (SIZE(' + str(node._range[0]) + ')) OF '
     else:
         span = ' OF '
-    return kind + span + contained.AsASN1(typeDict)
+    text = kind + span + contained.AsASN1(typeDict, cache)
+    if cache is not None:
+        cache[id(node)] = text
+    return text
 
 
 class AsnSequenceOf(AsnComplexNode):
@@ -633,7 +658,8 @@ Members:
     _containedType : the contained element (either a string or AsnNode)
     _range : [] or a tuple with the allowed size range.
 '''
-    validOptions = ['range', 'containedType', 'lineno', 'asnFilename']
+    __slots__ = ('_range', '_containedType')
+    validOptions = frozenset(['range', 'containedType', 'lineno', 'asnFilename'])
 
     def __init__(self, **args: Any) -> None:
         AsnComplexNode.__init__(self, args.get('asnFilename', ''))
@@ -642,8 +668,7 @@ Members:
         self._lineno = args.get('lineno', None)
         self._name = "unnamed"  # default in case of SEQUENCE_OF SEQUENCE_OF
         self._leafType = "SEQUENCEOF"
-        for i in args.keys():
-            assert i in AsnSequenceOf.validOptions
+        assert args.keys() <= AsnSequenceOf.validOptions, args.keys() - AsnSequenceOf.validOptions
 
     def __repr__(self) -> str:
         result = self._leafType
@@ -660,13 +685,14 @@ Members:
             isinstance(other, (AsnSequenceOf, AsnSetOf)) and \
             CommonIdenticalArrayCheck(self, other, mynames, othernames)
 
-    def AsASN1(self, typeDict: Lookup=None) -> str:
+    def AsASN1(self, typeDict: Lookup=None, cache: ASN1TextCache=None) -> str:
         if typeDict is None:
             typeDict = {}
-        return CommonAsASN1array('SEQUENCE', self, typeDict)
+        return CommonAsASN1array('SEQUENCE', self, typeDict, cache)
 
 
 class AsnSetOf(AsnComplexNode):
+    __slots__ = ('_range', '_containedType')
 
     def __init__(self, **args: Any) -> None:
         AsnComplexNode.__init__(self, args.get('asnFilename', ''))
@@ -675,8 +701,7 @@ class AsnSetOf(AsnComplexNode):
         self._lineno = args.get('lineno', None)
         self._name = "unnamed"  # default in case of SEQUENCE_OF SEQUENCE_OF
         self._leafType = "SETOF"
-        for i in args.keys():
-            assert i in AsnSequenceOf.validOptions
+        assert args.keys() <= AsnSequenceOf.validOptions, args.keys() - AsnSequenceOf.validOptions
 
     def __repr__(self) -> str:
         result = self._leafType
@@ -693,10 +718,10 @@ class AsnSetOf(AsnComplexNode):
             isinstance(other, (AsnSequenceOf, AsnSetOf)) and \
             CommonIdenticalArrayCheck(self, other, mynames, othernames)
 
-    def AsASN1(self, typeDict: Lookup=None) -> str:
+    def AsASN1(self, typeDict: Lookup=None, cache: ASN1TextCache=None) -> str:
         if typeDict is None:
             typeDict = {}
-        return CommonAsASN1array('SET', self, typeDict)
+        return CommonAsASN1array('SET', self, typeDict, cache)
 
 
 class AsnMetaMember(AsnNode):
@@ -706,7 +731,8 @@ CHOICE or SEQUENCE.
 Members:
     _containedType : the contained element as a string (type name)
 '''
-    validOptions = ['containedType', 'Min', 'Max', 'lineno', 'asnFilename']
+    __slots__ = ('_containedType', '_Min', '_Max')
+    validOptions = frozenset(['containedType', 'Min', 'Max', 'lineno', 'asnFilename'])
 
     def __init__(self, **args: Any) -> None:
         AsnNode.__init__(self, args.get('asnFilename', ''))
@@ -715,8 +741,7 @@ Members:
         self._lineno = args.get('lineno', None)
         self._Min = args.get('Min', None)
         self._Max = args.get('Max', None)
-        for i in args.keys():
-            assert i in AsnMetaMember.validOptions
+        assert args.keys() <= AsnMetaMember.validOptions, args.keys() - AsnMetaMember.validOptions
 
     def __repr__(self) -> str:
         result = self._leafType
@@ -738,7 +763,8 @@ e.g.:
     _name contains 'MyNewType'
     _containedType contains 'MyOldType'
 '''
-    validOptions = ['containedType', 'Min', 'Max', 'lineno', 'asnFilename']
+    __slots__ = ('_containedType', '_Min', '_Max')
+    validOptions = frozenset(['containedType', 'Min', 'Max', 'lineno', 'asnFilename'])
 
     def __init__(self, **args: Any) -> None:
         AsnNode.__init__(self, args.get('asnFilename', ''))
@@ -747,8 +773,7 @@ e.g.:
         self._lineno = args.get('lineno', None)
         self._Min = args.get('Min', None)
         self._Max = args.get('Max', None)
-        for i in args.keys():
-            assert i in AsnMetaType.validOptions
+        assert args.keys() <= AsnMetaType.validOptions, args.keys() - AsnMetaType.validOptions
 
     def __repr__(self) -> str:
         result = "typedefed to " + self._leafType  # pragma: no cover
@@ -759,6 +784,88 @@ e.g.:
         assert self._leafType is not None   # pragma: no cover
         return result  # pragma: no cover
 
+
+class CanonicalFormsPerSMP2(object):
+    '''
+Hashable summaries of types, for use as index keys: two types that are
+identical per IdenticalPerSMP2 always have the same canonical form. Only the
+(few) types that share a canonical form need to be compared with
+IdenticalPerSMP2, instead of all of them.
+
+Each canonical form is a small integer: distinct forms are numbered as they
+are first met, and the form of a complex type refers to the numbers of its
+components - so no matter how deep a type is, its form is hashed and
+compared in constant time. The form of each node is computed only once
+(nodes are tracked by id), so the AST must not change while in use - and
+each node must always be looked up with the same typename dictionary.
+
+Some types are identical to types of many forms: e.g. CommonIdenticalCheck
+only compares the members up to the shorter list of the two, so a SEQUENCE
+without members is identical to all the SEQUENCEs. These (and the types
+containing them) get the form Wildcard, and must be compared with all the
+types.
+'''
+    Wildcard = -1
+
+    def __init__(self) -> None:
+        self._formOfNode = {}  # type: Dict[int, int]
+        self._numbers = {}  # type: Dict[Tuple[Any, ...], int]
+
+    @staticmethod
+    def Span(r: List[Any]) -> Tuple[Any, ...]:  # pylint: disable=invalid-sequence-index
+        # See CommonIdenticalRangePerSMP2: only the upper limits are compared
+        if len(r) == 2 and r[0] == r[1]:
+            r = [r[0]]
+        return (len(r), r[-1] if r else None)
+
+    def Get(self, node: AsnNode, names: Lookup) -> int:
+        if id(node) in self._formOfNode:
+            return self._formOfNode[id(node)]
+
+        def formOfComponent(n: Union[str, AsnNode]) -> int:
+            while not isinstance(n, AsnNode) or isinstance(n, AsnMetaMember):
+                if isinstance(n, AsnMetaMember):
+                    n = n._containedType
+                elif n in names:
+                    n = names[n]
+                else:
+                    # Unknown type - let IdenticalPerSMP2 complain about it
+                    return CanonicalFormsPerSMP2.Wildcard
+            return self.Get(n, names)
+
+        components = []  # type: List[int]
+        if isinstance(node, AsnBool):
+            form = ('BOOLEAN',)  # type: Tuple[Any, ...]
+        elif isinstance(node, AsnInt):
+            form = ('INTEGER',) + self.Span(node._range)
+        elif isinstance(node, AsnReal):
+            form = ('REAL',) + self.Span(node._range)
+        elif isinstance(node, AsnString):
+            form = ('STRING',) + self.Span(node._range)
+        elif isinstance(node, AsnEnumerated):
+            form = ('ENUMERATED',) + tuple(sorted(x[0] for x in node._members))
+        elif isinstance(node, (AsnSequence, AsnSet, AsnChoice)):
+            # SEQUENCEs, SETs and CHOICEs share forms, since a SEQUENCE
+            # can be identical to all three (see AsnSequence.IdenticalPerSMP2).
+            # Only the first member (in the order of CommonIdenticalCheck)
+            # counts, since a type is identical to the ones it is a prefix of.
+            components = [
+                formOfComponent(min(node._members, key=lambda x: x[0])[1])
+                if node._members else CanonicalFormsPerSMP2.Wildcard]
+            form = ('RECORD',) + tuple(components)
+        elif isinstance(node, (AsnSequenceOf, AsnSetOf)):
+            components = [formOfComponent(node._containedType)]
+            form = ('ARRAY',) + self.Span(node._range) + tuple(components)
+        else:
+            # Never identical to anything - give it a form of its own
+            form = ('NODE', id(node))
+        if CanonicalFormsPerSMP2.Wildcard in components:
+            number = CanonicalFormsPerSMP2.Wildcard
+        else:
+            number = self._numbers.setdefault(form, len(self._numbers))
+        self._formOfNode[id(node)] = number
+        return number
+
 # Helper functions
 
 
@@ -773,4 +880,9 @@ def sourceSequenceLimit(node: Union[AsnString, AsnSequenceOf, AsnSetOf], srcCVar
 def targetSequenceLimit(node: Union[AsnString, AsnSequenceOf, AsnSetOf], dstCVariable: str) -> str:
     return str(node._range[-1]) if not isSequenceVariable(node) else "%s.nCount" % dstCVariable
 
+
+def isOptional(member: List[Any]) -> bool:  # pylint: disable=invalid-sequence-index
+    '''Whether a member of a SEQUENCE/SET (an element of its _members) is OPTIONAL'''
+    return len(member) > 3 and bool(member[3])
+
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
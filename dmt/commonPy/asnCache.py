@@ -0,0 +1,176 @@
+# (C) Semantix Information Technologies.
+#
+# Semantix Information Technologies is licensing the code of the
+# Data Modelling Tools (DMT) in the following dual-license mode:
+#
+# Commercial Developer License:
+#       The DMT Commercial Developer License is the appropriate version
+# to use for the development of proprietary and/or commercial software.
+# This version is for developers/companies who do not want to share
+# the source code they develop with others or otherwise comply with the
+# terms of the GNU Lesser General Public License version 3.
+#
+# GNU LGPL v. 2.1:
+#       This version of DMT is the one to use for the development of
+# non-commercial applications, when you are willing to comply
+# with the terms of the GNU Lesser General Public License version 3.
+#
+# The features of the two licenses are summarized below:
+#
+#                       Commercial
+#                       Developer               LGPL
+#                       License
+#
+# License cost          License fee charged     No license fee
+#
+# Must provide source
+# code changes to DMT   No, modifications can   Yes, all source code
+#                       be closed               must be provided back
+#
+# Can create            Yes, that is,           No, applications are subject
+# proprietary           no source code needs    to the LGPL and all source code
+# applications          to be disclosed         must be made available
+#
+# Support               Yes, 12 months of       No, but available separately
+#                       premium technical       for purchase
+#                       support
+#
+# Charge for Runtimes   None                    None
+#
+'''
+On-disk cache of parsed ASN.1 ASTs
+
+Spawning mono/ASN1SCC and parsing the XML AST it generates is the most
+expensive part of every code generation step. The outcome of that work
+(i.e. the contents of the asnParser globals) is therefore pickled under
+a key made from the contents of the input grammars and of the ASN1SCC
+installation, and re-used by subsequent runs on the same inputs.
+
+The generator daemon (dmtDaemon.py) also keeps the entries it has seen
+in memory, so the tool runs it forks don't even have to unpickle them.
+'''
+import os
+import pickle
+import shutil
+import hashlib
+import tempfile
+import collections
+
+from typing import List, Dict, Tuple, Any, Optional  # NOQA pylint: disable=unused-import
+
+from . import configMT
+from .utility import inform, warn
+
+# Bump this whenever the layout of the cached state changes
+g_cacheFormat = 1
+
+# Entries kept in memory (by the daemon), most recently used last
+g_memory = collections.OrderedDict()  # type: collections.OrderedDict
+g_memoryLimit = 8
+
+# The cache files that this process loaded or stored
+g_used = []  # type: List[str]
+
+# The digests of the files in the keys, per (name, size, mtime in ns) -
+# ASN1SCC alone is several MB, and the daemon hashes it for every run
+g_digests = {}  # type: Dict[Tuple[str, int, int], bytes]
+
+
+def CacheFolder() -> str:
+    return os.path.join(configMT.asnCacheDir, "asn1")
+
+
+def CacheKey(asn1SccPath: str, listOfFilenames: List[str]) -> str:  # pylint: disable=invalid-sequence-index
+    '''Hash everything that influences the parsed AST: the input grammars
+(names and contents), the ASN1SCC binary and its XML template, and the
+parser code that transforms the XML into asnAST nodes.'''
+    h = hashlib.sha256()
+    h.update(("DMT AST cache v%d" % g_cacheFormat).encode('utf-8'))
+    asn1SccDir = os.path.dirname(os.path.abspath(asn1SccPath))
+    here = os.path.dirname(os.path.abspath(__file__))
+    dependencies = [
+        asn1SccPath,
+        os.path.join(asn1SccDir, "xml.stg"),
+        os.path.join(here, "asnParser.py"),
+        os.path.join(here, "asnAST.py")]
+    for f in dependencies + listOfFilenames:
+        h.update(f.encode('utf-8') + b'\0')
+        if os.path.isfile(f):
+            h.update(FileDigest(f))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def FileDigest(filename: str) -> bytes:
+    st = os.stat(filename)
+    stamp = (os.path.abspath(filename), st.st_size, st.st_mtime_ns)
+    digest = g_digests.get(stamp)
+    if digest is None:
+        with open(filename, 'rb') as data:
+            digest = hashlib.sha256(data.read()).digest()
+        g_digests[stamp] = digest
+    return digest
+
+
+def Load(key: str) -> Optional[Dict[str, Any]]:
+    '''Return the cached parser state for this key, or None on a miss.'''
+    if key in g_memory:
+        g_memory.move_to_end(key)
+        inform("Reusing in-memory ASN.1 AST %s", key)
+        g_used.append(os.path.join(CacheFolder(), key + ".pickle"))
+        return g_memory[key]
+    cacheFile = os.path.join(CacheFolder(), key + ".pickle")
+    if not os.path.isfile(cacheFile):
+        return None
+    try:
+        with open(cacheFile, 'rb') as f:
+            state = pickle.load(f)
+    except Exception as e:  # pylint: disable=broad-except
+        warn("Ignoring unreadable AST cache entry %s (%s)", cacheFile, str(e))
+        os.unlink(cacheFile)
+        return None
+    inform("Reusing cached ASN.1 AST from %s", cacheFile)
+    g_used.append(cacheFile)
+    return state
+
+
+def Remember(cacheFile: str) -> None:
+    '''Keep the entry stored in cacheFile in memory (evicting the least
+recently used entries beyond g_memoryLimit).'''
+    key = os.path.basename(cacheFile)[:-len(".pickle")]
+    if key in g_memory:
+        g_memory.move_to_end(key)
+        return
+    try:
+        with open(cacheFile, 'rb') as f:
+            g_memory[key] = pickle.load(f)
+    except Exception as e:  # pylint: disable=broad-except
+        warn("Failed to load AST cache entry %s (%s)", cacheFile, str(e))
+        return
+    while len(g_memory) > g_memoryLimit:
+        g_memory.popitem(last=False)
+
+
+def Store(key: str, state: Dict[str, Any]) -> None:
+    '''Atomically store the parser state; failing to do so is not an error.'''
+    folder = CacheFolder()
+    try:
+        os.makedirs(folder, exist_ok=True)
+        (fd, tmpName) = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(state, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpName, os.path.join(folder, key + ".pickle"))
+        g_used.append(os.path.join(folder, key + ".pickle"))
+    except Exception as e:  # pylint: disable=broad-except
+        warn("Failed to store ASN.1 AST in cache folder %s (%s)", folder, str(e))
+
+
+def Clear() -> None:
+    '''Invalidate all cached ASTs.'''
+    g_memory.clear()
+    folder = CacheFolder()
+    if os.path.isdir(folder):
+        inform("Clearing ASN.1 AST cache in %s", folder)
+        shutil.rmtree(folder)
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
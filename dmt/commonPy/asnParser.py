@@ -45,23 +45,28 @@ ASN.1 Parser
 This module parses ASN.1 grammars and creates an abstract syntax tree (AST)
 inside configMT.inputCodeAST, for use with the code generators.
 '''
+import io
 import os
 import sys
+import atexit
 import copy
+import itertools
 import tempfile
 import re
 import distutils.spawn as spawn
 
 import xml.sax  # type: ignore
-from typing import IO, TypeVar, Type, Optional, Callable, Union, List, Dict, Tuple, Any  # NOQA pylint: disable=W0611
+from typing import IO, TypeVar, Type, Optional, Callable, Union, List, Dict, Set, Tuple, Any  # NOQA pylint: disable=W0611
 
 from . import configMT
 from . import utility
+from . import profiling
+from . import asnCache
 
 from .asnAST import (
     AsnBasicNode, AsnEnumerated, AsnSequence, AsnChoice, AsnSequenceOf,
     AsnSet, AsnSetOf, AsnMetaMember, AsnMetaType, AsnInt, AsnReal, AsnNode,
-    AsnComplexNode, AsnBool, AsnOctetString, AsnAsciiString
+    AsnBool, AsnOctetString, AsnAsciiString
 )
 
 g_asnFilename = ""
@@ -78,7 +83,59 @@ AST_TypesOfFile = Dict[Filename, List[AsnNode]]  # pylint: disable=invalid-seque
 AST_Leaftypes = Dict[Typename, str]
 AST_Modules = Dict[str, List[Typename]]  # pylint: disable=invalid-sequence-index
 
-g_names = {}         # type: AST_Lookup
+
+class TypeNames(Dict[Typename, AsnNode]):
+    '''
+The map from type name to AST node of g_names, that the mappers keep
+adding pseudo-types to. Every change gives it a new version (unique
+across all the instances), so what is derived from it (e.g. the
+SymbolTable) can tell if it is still up to date.
+'''
+    _versions = itertools.count(1)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.version = next(TypeNames._versions)
+
+    def Changed(self) -> None:
+        self.version = next(TypeNames._versions)
+
+    def __setitem__(self, key: Typename, value: AsnNode) -> None:
+        super().__setitem__(key, value)
+        self.Changed()
+
+    def __delitem__(self, key: Typename) -> None:
+        super().__delitem__(key)
+        self.Changed()
+
+    def setdefault(self, key: Typename, default: Any = None) -> AsnNode:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, *args: Any) -> Any:
+        self.Changed()
+        return super().pop(*args)
+
+    def popitem(self) -> Tuple[Typename, AsnNode]:
+        self.Changed()
+        return super().popitem()
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self.Changed()
+
+    def clear(self) -> None:
+        super().clear()
+        self.Changed()
+
+    def __reduce__(self) -> Any:
+        # The versions are only unique within a process: a pickled copy
+        # (e.g. in the AST cache) gets a new one when it is loaded
+        return (TypeNames, (dict(self),))
+
+
+g_names = TypeNames()  # type: TypeNames
 g_typesOfFile = {}   # type: AST_TypenamesOfFile
 g_leafTypeDict = {}  # type: AST_Leaftypes
 g_astOfFile = {}     # type: AST_TypesOfFile
@@ -115,7 +172,12 @@ reserved = {
 }
 
 
-def KnownType(node: AsnNode, names: AST_Lookup) -> bool:
+def KnownType(node: AsnNode, names: AST_Lookup, checked: Set[int]=None) -> bool:
+    if checked is None:
+        checked = set()
+    if id(node) in checked:
+        return True
+    checked.add(id(node))
     retVal = True
     if isinstance(node, str):
         utility.panic("Referenced type (%s) does not exist!\n" % node)
@@ -123,17 +185,17 @@ def KnownType(node: AsnNode, names: AST_Lookup) -> bool:
         pass
     elif isinstance(node, (AsnSequence, AsnChoice, AsnSet)):
         for x in node._members:
-            if not KnownType(x[1], names):
+            if not KnownType(x[1], names, checked):
                 return False
     elif isinstance(node, AsnMetaMember):
-        retVal = KnownType(names.get(node._containedType, node._containedType), names)
+        retVal = KnownType(names.get(node._containedType, node._containedType), names, checked)
     elif isinstance(node, (AsnSequenceOf, AsnSetOf)):
         containedType = node._containedType
         while isinstance(containedType, str):
             containedType = names[containedType]
-        retVal = KnownType(containedType, names)
+        retVal = KnownType(containedType, names, checked)
     elif isinstance(node, AsnMetaType):
-        retVal = KnownType(names.get(node._containedType, node._containedType), names)
+        retVal = KnownType(names.get(node._containedType, node._containedType), names, checked)
     else:
         utility.panic("Unknown node type (%s)!\n" % str(node))
     return retVal
@@ -143,100 +205,64 @@ def CleanNameForAST(name: str) -> str:
     return re.sub(r'[^a-zA-Z0-9_]', '_', name)
 
 
+def ReferencedTypenames(node: AsnNode) -> List[str]:  # pylint: disable=invalid-sequence-index
+    '''The names of the types that must be known for this (top-level) node
+to be known, too.'''
+    if isinstance(node, AsnMetaType):
+        return [node._containedType]
+    elif isinstance(node, (AsnSequence, AsnChoice, AsnSet)):
+        return [x[1]._containedType for x in node._members if isinstance(x[1], AsnMetaMember)]
+    elif isinstance(node, (AsnSequenceOf, AsnSetOf)) and isinstance(node._containedType, str):
+        return [node._containedType]
+    return []
+
+
 def VerifyAndFixAST() -> Dict[str, str]:
     '''Check that all types are defined and are not missing.
     It returns a map providing the leafType of each type.
     '''
-    unknownTypes = {}  # type: Dict[str, int]
-    knownTypes = {}    # type: Dict[str, str]
-    equivalents = {}   # type: Dict[str, List[str]]
-    while True:  # pylint: disable=too-many-nested-blocks
-        lastUnknownTypes = copy.copy(unknownTypes)
-        lastKnownTypes = copy.copy(knownTypes)
-        lastEquivalents = copy.copy(equivalents)
-        for nodeTypename in list(g_names.keys()):
-
-            node = g_names[nodeTypename]  # type: AsnNode
-
-            # AsnMetaMembers can only appear inside SEQUENCEs and CHOICEs,
-            # not at the top level!
-            assert not isinstance(node, AsnMetaMember)
-
-            # Type level typedefs are stored in the equivalents dictionary
-            if isinstance(node, AsnMetaType):
-                # A ::= B
-                # A and B are nodeTypename  and  node._containedType
-                equivalents.setdefault(node._containedType, [])
-                # Add A to the list of types that are equivalent to B
-                equivalents[node._containedType].append(nodeTypename)
-                # and if we know B's leafType, then we also know A's
-                if node._containedType in knownTypes:
-                    knownTypes[nodeTypename] = node._containedType
-                else:
-                    unknownTypes[nodeTypename] = 1
-            # AsnBasicNode type assignments are also equivalents
-            elif isinstance(node, AsnBasicNode):
-                # node._leafType is one of BOOLEAN, OCTET STRING, INTEGER, etc
-                equivalents.setdefault(node._leafType, [])
-                equivalents[node._leafType].append(nodeTypename)
-                knownTypes[nodeTypename] = node._leafType
-            # AsnEnumerated types are known types - they don't have external refs
-            elif isinstance(node, AsnEnumerated):
-                # node._leafType is ENUMERATED
-                knownTypes[nodeTypename] = node._leafType
-            # SEQUENCEs and CHOICEs: check their children for unknown AsnMetaMembers
-            elif isinstance(node, (AsnSequence, AsnChoice, AsnSet)):
-                bFoundUnknown = False
-                for x in node._members:
-                    if isinstance(x[1], AsnMetaMember) and x[1]._containedType not in knownTypes:
-                        bFoundUnknown = True
-                        break
-                if bFoundUnknown:
-                    unknownTypes[nodeTypename] = 1
-                else:
-                    # node._leafType is SEQUENCE or CHOICE
-                    knownTypes[nodeTypename] = node._leafType
-            # SEQUENCE OFs: check their contained type
-            elif isinstance(node, (AsnSequenceOf, AsnSetOf)):
-                if node._containedType in knownTypes or isinstance(node._containedType, AsnBasicNode):
-                    knownTypes[nodeTypename] = node._leafType
-                elif isinstance(node._containedType, AsnComplexNode):
-                    knownTypes[nodeTypename] = node._leafType
-                else:
-                    unknownTypes[nodeTypename] = 1
-
-        # We have completed a sweep over all AST entries.
-        # now check the knownTypes and unknownTypes information
-        # to see if we have figured out (leafType wise) all nodes
-        for known in list(knownTypes.keys()):
-            # for each of the nodes we know (leafType wise)
-
-            # remove it from the unknownTypes dictionary
-            if known in unknownTypes:
-                del unknownTypes[known]
-
-            # remove all it's equivalents, too (from the unknownTypes)
-            if known in equivalents:
-                for alsoKnown in equivalents[known]:
-                    if alsoKnown in unknownTypes:
-                        del unknownTypes[alsoKnown]
-
-                    # Additionally, follow the chain to the last knownType
-                    seed = known
-                    while seed in knownTypes:
-                        if seed != knownTypes[seed]:
-                            seed = knownTypes[seed]
-                        else:
-                            break
-                    # and update knownTypes dictionary to contain leafType
-                    knownTypes[alsoKnown] = seed
-
-        # If this pass has not changed the knownTypes and the unknownTypes and the equivalents, we are done
-        if lastEquivalents == equivalents and lastKnownTypes == knownTypes and lastUnknownTypes == unknownTypes:
-            break
-
+    # A type is known when all the types it references are known.
+    # Walk the reference graph depth-first (iteratively, since reference
+    # chains can be arbitrarily deep): types that are part of a reference
+    # cycle, or that depend on a missing type, remain unknown.
+    bKnown = {}  # type: Dict[str, bool]
+    for rootTypename in g_names:
+        if rootTypename in bKnown:
+            continue
+        onPath = {rootTypename}
+        stack = [(rootTypename, iter(ReferencedTypenames(g_names[rootTypename])))]
+        while stack:
+            nodeTypename, pending = stack[-1]
+            for ref in pending:
+                if ref in g_names and ref not in bKnown and ref not in onPath:
+                    onPath.add(ref)
+                    stack.append((ref, iter(ReferencedTypenames(g_names[ref]))))
+                    break
+            else:
+                stack.pop()
+                onPath.remove(nodeTypename)
+                # AsnMetaMembers can only appear inside SEQUENCEs and CHOICEs,
+                # not at the top level!
+                assert not isinstance(g_names[nodeTypename], AsnMetaMember)
+                bKnown[nodeTypename] = all(
+                    bKnown.get(ref, False)
+                    for ref in ReferencedTypenames(g_names[nodeTypename]))
+
+    unknownTypes = [x for x in g_names if not bKnown[x]]
     if len(unknownTypes) != 0:
-        utility.panic('AsnParser: Types remain unknown after symbol fixup:\n%s\n' % list(unknownTypes.keys()))
+        utility.panic('AsnParser: Types remain unknown after symbol fixup:\n%s\n' % unknownTypes)
+
+    # The leafType of "A ::= B" is the leafType of B
+    knownTypes = {}  # type: Dict[str, str]
+    for nodeTypename in g_names:
+        chain = []  # type: List[str]
+        seed = nodeTypename
+        while seed not in knownTypes and isinstance(g_names[seed], AsnMetaType):
+            chain.append(seed)
+            seed = g_names[seed]._containedType
+        leafType = knownTypes[seed] if seed in knownTypes else g_names[seed]._leafType
+        for typename in chain + [seed]:
+            knownTypes[typename] = leafType
 
     # Remove all AsnMetaTypes from the ast
     # by using the g_names lookup on their _containedType
@@ -269,8 +295,9 @@ def VerifyAndFixAST() -> Dict[str, str]:
             target = node
         g_names[nodeTypename] = target
 
+    checked = set()  # type: Set[int]
     for name, node in list(g_names.items()):
-        if not KnownType(node, g_names):
+        if not KnownType(node, g_names, checked):
             utility.panic("Node %s not resolvable (%s)!\n" % (name, node.Location()))
         for i in ["_Min", "_Max"]:
             cast = float if isinstance(node, AsnReal) else int
@@ -291,10 +318,9 @@ def VerifyAndFixAST() -> Dict[str, str]:
     # and if the contained type is not one of AsnBasicNode, AsnEnumerated, AsnMetaMember,
     # define a name and use it... (for SEQUENCEOFs/SETOFs, allow also 'str')
     internalNo = 1
-    addedNewPseudoType = True
-    while addedNewPseudoType:  # pylint: disable=too-many-nested-blocks
-        addedNewPseudoType = False
-        listOfTypenames = sorted(g_names.keys())
+    listOfTypenames = sorted(g_names.keys())
+    while listOfTypenames:  # pylint: disable=too-many-nested-blocks
+        newTypenames = []  # type: List[str]
         for nodeTypename in listOfTypenames:
             node = g_names[nodeTypename]
             if isinstance(node, (AsnChoice, AsnSequence, AsnSet)):
@@ -312,7 +338,7 @@ def VerifyAndFixAST() -> Dict[str, str]:
                         child[1]._isArtificial = True
                         g_leafTypeDict[internalName] = child[1]._leafType
                         child[1] = AsnMetaMember(asnFilename=child[1]._asnFilename, containedType=internalName)
-                        addedNewPseudoType = True
+                        newTypenames.append(internalName)
             elif isinstance(node, (AsnSequenceOf, AsnSetOf)):
                 if not isinstance(node._containedType, str) and \
                         not isinstance(node._containedType, AsnBasicNode) and \
@@ -325,7 +351,9 @@ def VerifyAndFixAST() -> Dict[str, str]:
                     node._containedType._isArtificial = True
                     g_leafTypeDict[internalName] = node._containedType._leafType
                     node._containedType = internalName
-                    addedNewPseudoType = True
+                    newTypenames.append(internalName)
+        # Only the types created in this pass may still contain nameless types
+        listOfTypenames = sorted(newTypenames)
 
     # return the leafType dictionary
     return knownTypes
@@ -378,49 +406,135 @@ def CheckForInvalidKeywords(node_or_str: Union[str, AsnNode]) -> None:
                 CheckForInvalidKeywords(g_names[node._containedType])
 
 
+def GetParsedState() -> Dict[str, Any]:
+    '''Everything that ParseAsnFileList leaves behind for the code generators.'''
+    return {
+        'g_names': g_names,
+        'g_leafTypeDict': g_leafTypeDict,
+        'g_typesOfFile': g_typesOfFile,
+        'g_astOfFile': g_astOfFile,
+        'g_modules': g_modules,
+        'g_metatypes': g_metatypes,
+        'g_checkedSoFarForKeywords': g_checkedSoFarForKeywords,
+    }
+
+
+def SetParsedState(state: Dict[str, Any]) -> None:
+    '''Reinstate the outcome of an earlier ParseAsnFileList (see GetParsedState).'''
+    global g_names
+    g_names = state['g_names']
+    global g_leafTypeDict
+    g_leafTypeDict = state['g_leafTypeDict']
+    global g_checkedSoFarForKeywords
+    g_checkedSoFarForKeywords = state['g_checkedSoFarForKeywords']
+    global g_xmlASTrootNode
+    g_xmlASTrootNode = None
+    # These are imported by name in other modules, so update them in place
+    g_typesOfFile.update(state['g_typesOfFile'])
+    g_astOfFile.update(state['g_astOfFile'])
+    g_modules.update(state['g_modules'])
+    g_metatypes.update(state['g_metatypes'])
+
+
+def InvokeASN1SCC(asn1SccPath: str, astVersion: int, xmlAST: str, listOfFilenames: List[str]) -> int:  # pylint: disable=invalid-sequence-index
+    '''Spawn ASN1SCC to dump the XML AST (of the given version) of the input grammars.'''
+    asn1SccDir = os.path.dirname(os.path.abspath(asn1SccPath))
+    mono = "mono " if sys.argv[0].endswith('.py') and sys.platform.startswith('linux') else ""
+    return os.system(
+        mono + "\"" + asn1SccPath + "\" -customStg \"" + asn1SccDir + "/xml.stg:" + xmlAST +
+        "\" -customStgAstVerion " + str(astVersion) + " \"" + "\" \"".join(listOfFilenames) + "\"")
+
+
 def ParseAsnFileList(listOfFilenames: List[str]) -> None:  # pylint: disable=invalid-sequence-index
     asn1SccPath = spawn.find_executable('asn1.exe')
     if asn1SccPath is None:
         utility.panic("ASN1SCC seems not installed on your system (asn1.exe not found in PATH).\n")
     else:
-        (dummy, xmlAST) = tempfile.mkstemp()
-        os.fdopen(dummy).close()
-        # spawnResult = os.system("mono \""+asn1SccPath+"\" -ast \""+xmlAST+"\" \"" + "\" \"".join(listOfFilenames) + "\"")
-        asn1SccDir = os.path.dirname(os.path.abspath(asn1SccPath))
-        mono = "mono " if sys.argv[0].endswith('.py') and sys.platform.startswith('linux') else ""
-        spawnResult = os.system(mono + "\"" + asn1SccPath + "\" -customStg \"" + asn1SccDir + "/xml.stg:" + xmlAST + "\" -customStgAstVerion 4 \"" + "\" \"".join(listOfFilenames) + "\"")
-        if spawnResult != 0:
-            errCode = spawnResult / 256
-            if errCode == 1:
-                utility.panic("ASN1SCC reported syntax errors. Aborting...")
-            elif errCode == 2:
-                utility.panic("ASN1SCC reported semantic errors (or mono failed). Aborting...")
-            elif errCode == 3:
-                utility.panic("ASN1SCC reported internal error. Contact Semantix with this input. Aborting...")
-            elif errCode == 4:
-                utility.panic("ASN1SCC reported usage error. Aborting...")
-            else:
-                utility.panic("ASN1SCC generic error. Contact Semantix with this input. Aborting...")
-        ParseASN1SCC_AST(xmlAST)
-        os.unlink(xmlAST)
-        g_names.update(g_names)
-        g_leafTypeDict.update(g_leafTypeDict)
-        g_checkedSoFarForKeywords.update(g_checkedSoFarForKeywords)
-        g_typesOfFile.update(g_typesOfFile)
-
-        # We also need to mark the artificial types -
-        # So spawn the custom type output at level 1 (unfiltered)
-        # and mark any types not inside it as artificial.
-        os.system(mono + "\"" + asn1SccPath + "\" -customStg \"" + asn1SccDir + "/xml.stg:" + xmlAST + "2\" -customStgAstVerion 1 \"" + "\" \"".join(listOfFilenames) + "\"")
+        with profiling.Phase("ParseAsnFileList"):
+            ParseAsnFileListWith(asn1SccPath, listOfFilenames)
+
+
+def ParseAsnFileListWith(asn1SccPath: str, listOfFilenames: List[str]) -> None:  # pylint: disable=invalid-sequence-index
+    cacheKey = None
+    if configMT.useAsnCache:
+        with profiling.Phase("cacheLoad"):
+            cacheKey = asnCache.CacheKey(asn1SccPath, listOfFilenames)
+            state = asnCache.Load(cacheKey)
+        if state is not None:
+            SetParsedState(state)
+            # No XML AST: PrintGrammarFromAST will ask ASN1SCC for it again
+            KeepXMLAST('', (asn1SccPath, listOfFilenames))
+            return
+    xmlAST = DumpXMLAST(asn1SccPath, listOfFilenames)
+    bArtificialTypesKnown = ParseASN1SCC_AST(xmlAST)
+    KeepXMLAST(xmlAST, (asn1SccPath, listOfFilenames))
+
+    # We also need to mark the artificial types. Recent ASN1SCC releases
+    # tag them (AddedType attribute) in the AST we just parsed; for older
+    # ones, spawn the custom type output at level 1 (unfiltered)
+    # and mark any types not inside it as artificial.
+    if not bArtificialTypesKnown:
+        with profiling.Phase("asn1scc"):
+            InvokeASN1SCC(asn1SccPath, 1, xmlAST + "2", listOfFilenames)
         realTypes = {}
-        for line in os.popen("grep  'ExportedType\>' \"" + xmlAST + "2\"").readlines():  # pylint: disable=anomalous-backslash-in-string
-            line = re.sub(r'^.*Name="', '', line.strip())
-            line = re.sub(r'" />$', '', line)
-            realTypes[line] = 1
+        with open(xmlAST + "2", "r") as f:
+            for typeName in re.findall(r'<ExportedType\s+Name="([^"]*)"', f.read()):
+                realTypes[typeName] = 1
         os.unlink(xmlAST + "2")
         for nodeTypename in list(g_names.keys()):
             if nodeTypename not in realTypes:
                 g_names[nodeTypename]._isArtificial = True
+    if cacheKey is not None:
+        with profiling.Phase("cacheStore"):
+            asnCache.Store(cacheKey, GetParsedState())
+
+
+def DumpXMLAST(asn1SccPath: str, listOfFilenames: List[str]) -> str:  # pylint: disable=invalid-sequence-index
+    '''Has ASN1SCC dump the XML AST of the grammars in a temporary file,
+and returns its name.'''
+    (dummy, xmlAST) = tempfile.mkstemp()
+    os.fdopen(dummy).close()
+    with profiling.Phase("asn1scc"):
+        spawnResult = InvokeASN1SCC(asn1SccPath, 4, xmlAST, listOfFilenames)
+    if spawnResult != 0:
+        os.unlink(xmlAST)
+        errCode = spawnResult / 256
+        if errCode == 1:
+            utility.panic("ASN1SCC reported syntax errors. Aborting...")
+        elif errCode == 2:
+            utility.panic("ASN1SCC reported semantic errors (or mono failed). Aborting...")
+        elif errCode == 3:
+            utility.panic("ASN1SCC reported internal error. Contact Semantix with this input. Aborting...")
+        elif errCode == 4:
+            utility.panic("ASN1SCC reported usage error. Aborting...")
+        else:
+            utility.panic("ASN1SCC generic error. Contact Semantix with this input. Aborting...")
+    return xmlAST
+
+
+def KeepXMLAST(xmlAST: str, sources: Tuple[str, List[str]]) -> None:  # pylint: disable=invalid-sequence-index
+    '''Keeps the name of the XML AST file of the current AST (only the file:
+its text is not kept in memory, nor cached), and how to dump it again.
+The file is removed at exit, or when another AST is parsed.'''
+    ForgetXMLAST()
+    global g_xmlASTfilename
+    g_xmlASTfilename = xmlAST
+    global g_xmlASTsources
+    g_xmlASTsources = sources
+
+
+def ForgetXMLAST() -> None:
+    '''Removes the XML AST file kept by KeepXMLAST, if any.'''
+    global g_xmlASTfilename
+    if g_xmlASTfilename and g_xmlASTsources is not None:
+        try:
+            os.unlink(g_xmlASTfilename)
+        except OSError:
+            pass
+    g_xmlASTfilename = ''
+
+
+atexit.register(ForgetXMLAST)
 
 
 def Dump() -> None:
@@ -448,7 +562,12 @@ def test_asn1() -> None:
     Dump()
 
 
-g_xmlASTrootNode = None
+# The file of the XML AST dumped by ASN1SCC, and its Element tree (built
+# on demand). With sources, the file is ours to remove - and can be dumped
+# again by ASN1SCC (from the asn1.exe path and the grammars in sources)
+g_xmlASTfilename = ''
+g_xmlASTsources = None  # type: Optional[Tuple[str, List[str]]]
+g_xmlASTrootNode = None  # type: Element
 
 g_lineno = -1
 
@@ -497,19 +616,19 @@ Action = Callable[[Element], Any]
 
 def VisitAll(node: Element, expectedType: str, action: Action) -> List[Any]:  # pylint: disable=invalid-sequence-index
     results = []  # type: List[Any]
-    if node is not None:
+
+    def Visit(node: Element) -> None:
         if node._name == expectedType:
-            results = [action(node)]
+            results.append(action(node))
         for child in node._children:
-            results += VisitAll(child, expectedType, action)
+            Visit(child)
+    if node is not None:
+        Visit(node)
     return results
 
 
 def GetAttr(node: Element, attrName: str) -> Optional[Any]:
-    if attrName not in list(node._attrs.keys()):
-        return None
-    else:
-        return node._attrs[attrName]
+    return node._attrs.get(attrName, None)
 
 
 def GetChild(node: Element, childName: str) -> Optional[Element]:
@@ -540,6 +659,8 @@ class Module(Pretty):
     _importedModules = None    # type: List[Tuple[str, List[str], List[str]]]
     # (tuples of Typename, AsnNode)
     _typeAssignments = None    # type: List[Tuple[str, AsnNode]]
+    # Typename -> True if the type was added by ASN1SCC (AddedType attribute)
+    _addedTypes = None         # type: Dict[str, bool]
 
 
 # def CreateBoolean(newModule, lineNo, xmlBooleanNode):
@@ -702,6 +823,8 @@ def CommonSeqSetChoice(
             enumID = GetAttr(x, "EnumID")
             myMembers.append([GetAttr(x, "VarName"), GenericFactory(newModule, GetChild(x, "Type"))])
             myMembers[-1].append(enumID)
+            if classToCreate != AsnChoice:
+                myMembers[-1].append(opti == "True")
     for tup in myMembers:
         if isinstance(tup[1], AsnMetaType):
             asnMetaMember = AsnMetaMember(
@@ -771,15 +894,18 @@ def VisitTypeAssignment(newModule: Module, xmlTypeAssignment: Element) -> Tuple[
     xmlType = GetChild(xmlTypeAssignment, "Type")
     if xmlType is None:
         utility.panic("VisitTypeAssignment: No child under TypeAssignment")  # pragma: no cover
-    return (
-        GetAttr(xmlTypeAssignment, "Name"),
-        GenericFactory(newModule, xmlType))
+    typeName = GetAttr(xmlTypeAssignment, "Name")
+    addedType = GetAttr(xmlTypeAssignment, "AddedType")
+    if addedType is not None:
+        newModule._addedTypes[typeName] = addedType == "True"
+    return (typeName, GenericFactory(newModule, xmlType))
 
 
 def VisitAsn1Module(xmlAsn1File: Element, xmlModule: Element, modules: List[Module]) -> None:  # pylint: disable=invalid-sequence-index
     newModule = Module()
     newModule._id = GetAttr(xmlModule, "ID")
     newModule._asnFilename = GetAttr(xmlAsn1File, "FileName")
+    newModule._addedTypes = {}
     newModule._exportedTypes = VisitAll(
         GetChild(xmlModule, "ExportedTypes"), "ExportedType",
         lambda x: GetAttr(x, "Name"))
@@ -814,12 +940,241 @@ def VisitAsn1Module(xmlAsn1File: Element, xmlModule: Element, modules: List[Modu
     modules.append(newModule)
 
 
-def ParseASN1SCC_AST(filename: str) -> None:
+class StreamingASTBuilder(xml.sax.ContentHandler):
+    '''
+Creates the Modules (and their AsnNodes) straight from the SAX events,
+instead of first building an Element tree for the whole XML AST
+(which is what InputFormatXMLHandler does).
+
+Only the currently open elements are kept (as childless Elements);
+whatever is created when an element closes, is appended - together
+with the element name - to the results of its parent.
+'''
+    def __init__(self) -> None:
+        xml.sax.ContentHandler.__init__(self)
+        self._stack = [Element('root', {})]  # type: List[Element]
+        self._results = [[]]  # type: List[List[Tuple[str, Any]]]
+        self._asnFilename = None  # type: str
+        self._module = None  # type: Module
+        self._modules = []  # type: List[Module]
+        self._onEnd = {
+            "BooleanType": self.OnSimpleType,
+            "IntegerType": self.OnSimpleType,
+            "RealType": self.OnSimpleType,
+            "BitStringType": self.OnSimpleType,
+            "OctetStringType": self.OnSimpleType,
+            "IA5StringType": self.OnSimpleType,
+            "NumericStringType": self.OnSimpleType,
+            "ReferenceType": self.OnSimpleType,
+            "EnumeratedType": self.OnEnumerated,
+            "EnumValues": self.OnEnumValues,
+            "EnumValue": lambda x, _: [GetAttr(x, "StringValue"), GetAttr(x, "IntValue")],
+            "SequenceOfType": self.OnSequenceOrSetOf,
+            "SetOfType": self.OnSequenceOrSetOf,
+            "SequenceType": self.OnSequenceSetOrChoice,
+            "SetType": self.OnSequenceSetOrChoice,
+            "ChoiceType": self.OnSequenceSetOrChoice,
+            "SequenceOrSetChild": self.OnChild,
+            "ChoiceChild": self.OnChild,
+            "Type": self.OnType,
+            "TypeAssignment": self.OnTypeAssignment,
+            "ExportedType": self.OnExported,
+            "ExportedVariable": self.OnExported,
+            "ImportedTypes": lambda _, r: [value for name, value in r if name == "ImportedType"],
+            "ImportedType": lambda x, _: GetAttr(x, "Name"),
+            "ImportedVariables": lambda _, r: [value for name, value in r if name == "ImportedVariable"],
+            "ImportedVariable": lambda x, _: GetAttr(x, "Name"),
+            "ImportedModule": self.OnImportedModule,
+            "Asn1Module": self.OnAsn1Module,
+        }  # type: Dict[str, Callable[[Element, List[Tuple[str, Any]]], Any]]
+
+    # The factories for the simple types need the line number of the
+    # enclosing Type, and the factories for the complex ones, their children
+    simpleFactories = {
+        "BooleanType": CreateBoolean,
+        "IntegerType": CreateInteger,
+        "RealType": CreateReal,
+        "BitStringType": CreateBitString,
+        "OctetStringType": CreateOctetString,
+        "IA5StringType": CreateIA5String,
+        "NumericStringType": CreateNumericString,
+        "ReferenceType": CreateReference,
+    }  # type: Dict[str, Callable[[Module, int, Element], AsnNode]]
+
+    typeNodes = [
+        "BooleanType", "IntegerType", "RealType", "EnumeratedType",
+        "BitStringType", "OctetStringType", "IA5StringType",
+        "NumericStringType", "ReferenceType", "SequenceOfType",
+        "SetOfType", "SequenceType", "SetType", "ChoiceType"]
+
+    def startElement(self, name: str, attrs: Dict[str, Any]) -> None:
+        newElement = Element(name, attrs)
+        if name == "Asn1File":
+            self._asnFilename = GetAttr(newElement, "FileName")
+        elif name == "Asn1Module":
+            self._module = Module()
+            self._module._id = GetAttr(newElement, "ID")
+            self._module._asnFilename = self._asnFilename
+            self._module._addedTypes = {}
+            self._module._exportedTypes = []
+            self._module._exportedVariables = []
+            self._module._importedModules = []
+            self._module._typeAssignments = []
+        elif name == "Type":
+            global g_lineno
+            g_lineno = GetAttr(newElement, "Line")
+        elif name in ["SequenceOrSetChild", "ChoiceChild"]:
+            # stack is [..., Type, SequenceType/SetType/ChoiceType]
+            if GetAttr(newElement, "Optional") == "True":
+                utility.warn("OPTIONAL attribute ignored (for field contained in %s,%s)" % (
+                    self._module._asnFilename, self.LineNo(-2)))
+        self._stack.append(newElement)
+        self._results.append([])
+
+    def endElement(self, name: str) -> None:
+        element = self._stack.pop()
+        results = self._results.pop()
+        action = self._onEnd.get(name, None)
+        self._results[-1].append((name, action(element, results) if action else None))
+
+    def LineNo(self, idx: int=-1) -> int:
+        '''The line number of the enclosing Type'''
+        return GetAttr(self._stack[idx], "Line")
+
+    @staticmethod
+    def ContainedType(xmlType: Tuple[str, Any], where: str, lineNo: int, asnFilename: str) -> Tuple[str, AsnNode]:
+        '''The (element name, AsnNode) of the single child of a Type'''
+        if xmlType is None:
+            utility.panic("%s: No child under %s (%s, %s)" %  # pragma: no cover
+                          (where, where, asnFilename, lineNo))  # pragma: no cover
+        if xmlType[1] is None:
+            utility.panic("%s: No children for Type (%s, %s)" %  # pragma: no cover
+                          (where, asnFilename, lineNo))  # pragma: no cover
+        return xmlType[1]
+
+    def OnType(self, xmlType: Element, results: List[Tuple[str, Any]]) -> Optional[Tuple[str, AsnNode]]:
+        if not results:
+            return None
+        if results[0][0] not in StreamingASTBuilder.typeNodes:
+            utility.panic("Unsupported XML type node: '%s' (%s, %s)" %  # pragma: no cover
+                          (results[0][0], self._module._asnFilename, GetAttr(xmlType, "Line")))  # pragma: no cover
+        return results[0]
+
+    def OnSimpleType(self, xmlNode: Element, _: List[Tuple[str, Any]]) -> AsnNode:
+        maker = StreamingASTBuilder.simpleFactories[xmlNode._name]
+        return maker(self._module, self.LineNo(), xmlNode)
+
+    @staticmethod
+    def OnEnumValues(_: Element, results: List[Tuple[str, Any]]) -> List[List[str]]:
+        return [value for name, value in results if name == "EnumValue"]
+
+    def OnEnumerated(self, _: Element, results: List[Tuple[str, Any]]) -> AsnEnumerated:
+        members = []
+        for name, value in results:
+            if name == "EnumValue":
+                members.append(value)
+            elif name == "EnumValues":
+                members.extend(value)
+        return AsnEnumerated(
+            asnFilename=self._module._asnFilename,
+            lineno=self.LineNo(),
+            members=members)
+
+    def OnSequenceOrSetOf(self, xmlNode: Element, results: List[Tuple[str, Any]]) -> AsnNode:
+        lineNo = self.LineNo()
+        xmlType = next((x for x in results if x[0] == "Type"), None)
+        kind, containedNode = StreamingASTBuilder.ContainedType(
+            xmlType, "CommonSetSeqOf", lineNo, self._module._asnFilename)
+        if kind == "ReferenceType":
+            contained = containedNode._containedType
+        else:
+            contained = containedNode
+        classToCreate = AsnSequenceOf if xmlNode._name == "SequenceOfType" else AsnSetOf
+        return classToCreate(
+            asnFilename=self._module._asnFilename,
+            lineno=lineNo,
+            range=GetRange(self._module, lineNo, xmlNode, int),
+            containedType=contained)
+
+    def OnChild(self, xmlNode: Element, results: List[Tuple[str, Any]]) -> List[Any]:
+        xmlType = next((x for x in results if x[0] == "Type"), None)
+        _, node = StreamingASTBuilder.ContainedType(
+            xmlType, "GenericFactory", GetAttr(xmlNode, "Line"), self._module._asnFilename)
+        member = [GetAttr(xmlNode, "VarName"), node, GetAttr(xmlNode, "EnumID")]
+        if xmlNode._name == "SequenceOrSetChild":
+            member.append(GetAttr(xmlNode, "Optional") == "True")
+        return member
+
+    def OnSequenceSetOrChoice(self, xmlNode: Element, results: List[Tuple[str, Any]]) -> AsnNode:
+        classToCreate, childTypeName = {
+            "SequenceType": (AsnSequence, "SequenceOrSetChild"),
+            "SetType": (AsnSet, "SequenceOrSetChild"),
+            "ChoiceType": (AsnChoice, "ChoiceChild"),
+        }[xmlNode._name]
+        myMembers = [value for name, value in results if name == childTypeName]
+        for tup in myMembers:
+            if isinstance(tup[1], AsnMetaType):
+                tup[1] = AsnMetaMember(
+                    asnFilename=tup[1]._asnFilename,
+                    containedType=tup[1]._containedType,
+                    lineno=tup[1]._lineno,
+                    Min=tup[1]._Min,
+                    Max=tup[1]._Max)
+        return classToCreate(
+            asnFilename=self._module._asnFilename,
+            lineno=self.LineNo(),
+            members=myMembers)
+
+    def OnTypeAssignment(self, xmlTypeAssignment: Element, results: List[Tuple[str, Any]]) -> None:
+        xmlType = next((x for x in results if x[0] == "Type"), None)
+        if xmlType is None:
+            utility.panic("VisitTypeAssignment: No child under TypeAssignment")  # pragma: no cover
+        _, node = StreamingASTBuilder.ContainedType(
+            xmlType, "GenericFactory", GetAttr(xmlTypeAssignment, "Line"), self._module._asnFilename)
+        typeName = GetAttr(xmlTypeAssignment, "Name")
+        addedType = GetAttr(xmlTypeAssignment, "AddedType")
+        if addedType is not None:
+            self._module._addedTypes[typeName] = addedType == "True"
+        self._module._typeAssignments.append((typeName, node))
+
+    def OnExported(self, xmlNode: Element, _: List[Tuple[str, Any]]) -> None:
+        if xmlNode._name == "ExportedType":
+            self._module._exportedTypes.append(GetAttr(xmlNode, "Name"))
+        else:
+            self._module._exportedVariables.append(GetAttr(xmlNode, "Name"))
+
+    def OnImportedModule(self, xmlNode: Element, results: List[Tuple[str, Any]]) -> None:
+        importedTypes = []  # type: List[str]
+        importedVariables = []  # type: List[str]
+        for name, value in results:
+            if name == "ImportedTypes":
+                importedTypes.extend(value)
+            elif name == "ImportedVariables":
+                importedVariables.extend(value)
+        self._module._importedModules.append(
+            (GetAttr(xmlNode, "ID"), importedTypes, importedVariables))
+
+    def OnAsn1Module(self, _: Element, __: List[Tuple[str, Any]]) -> None:
+        newModule = self._module
+        g_typesOfFile.setdefault(newModule._asnFilename, [])
+        g_typesOfFile[newModule._asnFilename].extend(
+            [x for x, _ in newModule._typeAssignments])
+
+        g_astOfFile.setdefault(newModule._asnFilename, [])
+        g_astOfFile[newModule._asnFilename].extend(
+            [y for _, y in newModule._typeAssignments])
+
+        self._modules.append(newModule)
+
+
+def BuildModulesFromXMLTree(xmlAST: bytes) -> List[Module]:  # pylint: disable=invalid-sequence-index
+    '''The original two-step approach: build the Element tree of the
+whole XML AST, then walk it to create the Modules.'''
     parser = xml.sax.make_parser()
     handler = InputFormatXMLHandler()
     parser.setContentHandler(handler)
     # parser.setFeature("http://xml.org/sax/features/validation", True)
-    parser.parse(filename)
+    parser.parse(io.BytesIO(xmlAST))
 
     if len(handler._root._children) != 1 or handler._root._children[0]._name != "ASN1AST":
         utility.panic("You must use an XML file that contains one ASN1AST node")  # pragma: no cover
@@ -833,9 +1188,61 @@ def ParseASN1SCC_AST(filename: str) -> None:
 
     global g_xmlASTrootNode
     g_xmlASTrootNode = handler._root
+    return modules
+
+
+def BuildModulesFromXMLStream(xmlAST: bytes) -> List[Module]:  # pylint: disable=invalid-sequence-index
+    parser = xml.sax.make_parser()
+    handler = StreamingASTBuilder()
+    parser.setContentHandler(handler)
+    parser.parse(io.BytesIO(xmlAST))
+
+    if len(handler._results[0]) != 1 or handler._results[0][0][0] != "ASN1AST":
+        utility.panic("You must use an XML file that contains one ASN1AST node")  # pragma: no cover
+    return handler._modules
+
+
+def GetXMLASTrootNode() -> Element:
+    '''The Element tree of the XML AST is only needed by PrintGrammarFromAST;
+so it is built on demand, from the XML AST file - that ASN1SCC dumps
+again if needed (when the AST came from the cache).'''
+    global g_xmlASTrootNode
+    if g_xmlASTrootNode is None:
+        if not os.path.isfile(g_xmlASTfilename):
+            if g_xmlASTsources is None:
+                utility.panic("The XML AST is gone: parse the grammars again.")  # pragma: no cover
+            asn1SccPath, listOfFilenames = g_xmlASTsources
+            KeepXMLAST(DumpXMLAST(asn1SccPath, listOfFilenames), g_xmlASTsources)
+        parser = xml.sax.make_parser()
+        handler = InputFormatXMLHandler()
+        parser.setContentHandler(handler)
+        parser.parse(g_xmlASTfilename)
+        g_xmlASTrootNode = handler._root
+    return g_xmlASTrootNode
+
+
+def ParseASN1SCC_AST(filename: str, bStreaming: bool=True) -> bool:
+    '''Parse the XML AST dumped by ASN1SCC into the g_* globals.
+Returns True if the AST also identified the types that ASN1SCC
+added on its own (which are then marked as artificial).'''
+    ForgetXMLAST()
+    global g_xmlASTfilename
+    g_xmlASTfilename = filename
+    global g_xmlASTsources
+    g_xmlASTsources = None
+    global g_xmlASTrootNode
+    g_xmlASTrootNode = None
+    with open(filename, 'rb') as f:
+        xmlAST = f.read()
+    with profiling.Phase("xml"):
+        if bStreaming:
+            modules = BuildModulesFromXMLStream(xmlAST)
+        else:
+            modules = BuildModulesFromXMLTree(xmlAST)
+    del xmlAST
 
     global g_names
-    g_names = {}
+    g_names = TypeNames()
     global g_checkedSoFarForKeywords
     g_checkedSoFarForKeywords = {}
     global g_leafTypeDict
@@ -847,13 +1254,23 @@ def ParseASN1SCC_AST(filename: str) -> None:
             # print "Type:", typeName
             g_names[typeName] = typeData
             g_modules.setdefault(m._id, []).append(typeName)
-    g_leafTypeDict.update(VerifyAndFixAST())
+    with profiling.Phase("VerifyAndFixAST"):
+        g_leafTypeDict.update(VerifyAndFixAST())
 
     for nodeTypename in list(g_names.keys()):
         if nodeTypename not in g_checkedSoFarForKeywords:
             g_checkedSoFarForKeywords[nodeTypename] = 1
             CheckForInvalidKeywords(nodeTypename)
 
+    bArtificialTypesKnown = True
+    for m in modules:
+        for typeName, _ in m._typeAssignments:
+            if typeName not in m._addedTypes:
+                bArtificialTypesKnown = False
+            elif m._addedTypes[typeName]:
+                g_names[typeName]._isArtificial = True
+    return bArtificialTypesKnown
+
 
 def SimpleCleaner(x: str) -> str:
     return re.sub(r'[^a-zA-Z0-9_]', '_', x)
@@ -960,7 +1377,7 @@ def PrintType(f: IO[Any], xmlType: Element, indent: str, nameCleaner: Callable[[
 def PrintGrammarFromAST(f: IO[Any], nameCleaner: Callable[[str], str]=SimpleCleaner) -> None:
     ourtypeAssignments = []
     VisitAll(
-        g_xmlASTrootNode._children[0], "Asn1File",
+        GetXMLASTrootNode()._children[0], "Asn1File",
         lambda x: VisitAll(x, "TypeAssignment",
                            lambda y: ourtypeAssignments.append((x, y))))
 
@@ -989,6 +1406,7 @@ def test_xml() -> None:
     print("\nRe-created grammar:\n\n")
     PrintGrammarFromASTtoStdOut()
 
+
 if __name__ == "__main__":
     if "-testXML" in sys.argv:
         sys.argv.remove("-testXML")
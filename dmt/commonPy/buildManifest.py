@@ -0,0 +1,275 @@
+# (C) Semantix Information Technologies.
+#
+# Semantix Information Technologies is licensing the code of the
+# Data Modelling Tools (DMT) in the following dual-license mode:
+#
+# Commercial Developer License:
+#       The DMT Commercial Developer License is the appropriate version
+# to use for the development of proprietary and/or commercial software.
+# This version is for developers/companies who do not want to share
+# the source code they develop with others or otherwise comply with the
+# terms of the GNU Lesser General Public License version 3.
+#
+# GNU LGPL v. 2.1:
+#       This version of DMT is the one to use for the development of
+# non-commercial applications, when you are willing to comply
+# with the terms of the GNU Lesser General Public License version 3.
+#
+# The features of the two licenses are summarized below:
+#
+#                       Commercial
+#                       Developer               LGPL
+#                       License
+#
+# License cost          License fee charged     No license fee
+#
+# Must provide source
+# code changes to DMT   No, modifications can   Yes, all source code
+#                       be closed               must be provided back
+#
+# Can create            Yes, that is,           No, applications are subject
+# proprietary           no source code needs    to the LGPL and all source code
+# applications          to be disclosed         must be made available
+#
+# Support               Yes, 12 months of       No, but available separately
+#                       premium technical       for purchase
+#                       support
+#
+# Charge for Runtimes   None                    None
+#
+'''
+Build manifest of the generated files
+
+asn2dataModel and aadl2glueC regenerate their outputs in units (a
+backend, the glue of a SUBPROGRAM implementation, etc). The manifest,
+stored in the output folder, remembers for each unit a key made from
+everything it depends on (the contents of the input files, the options,
+the DMT code and ASN1SCC), plus the hash, size and timestamp of every
+output of the tool: the files it created with OutputFile, and those that
+changed in the output folder while it ran (e.g. written by ASN1SCC, or by
+a backend running in a child process). The other files in the output
+folder (object files, the products of Makefile.python, the outputs of
+other tools) are not its business.
+
+On the next run, a unit whose key is unchanged is skipped - as long as
+none of the recorded outputs was modified or deleted in the meantime, in
+which case everything is regenerated. Generated files whose contents end
+up identical to what was there before get their old timestamps back, so
+that make and friends don't recompile them.
+'''
+import os
+import json
+import hashlib
+import tempfile
+
+from typing import List, Dict, Tuple, Any, Optional  # NOQA pylint: disable=unused-import
+
+from . import configMT
+from . import outputFile
+from .jobPool import OpenFiles
+from .utility import inform, warn
+
+# Bump this whenever the layout of the manifest changes
+g_manifestFormat = 2
+
+# Map from path of output file (relative to the output folder) to (size, mtime in ns)
+Snapshot = Dict[str, Tuple[int, int]]
+
+
+def HashFile(filename: str) -> str:
+    h = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def CodeSignature(searchPath: Optional[str] = None) -> str:
+    '''Identifies the code generators: the size and timestamp of the DMT
+sources, and of the ASN1SCC binary in searchPath (by default, the PATH) -
+stat-ing them is enough to catch an update, and much cheaper than hashing
+them.'''
+    h = hashlib.sha256()
+    dmtDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    files = []  # type: List[str]
+    for root, dirs, names in os.walk(dmtDir):
+        dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+        files.extend(os.path.join(root, n) for n in sorted(names) if not n.endswith('.pyc'))
+    if searchPath is None:
+        searchPath = os.environ.get('PATH', '')
+    for path in searchPath.split(os.pathsep):
+        candidate = os.path.join(path, 'asn1.exe')
+        if os.path.isfile(candidate):
+            files.append(candidate)
+            break
+    for f in files:
+        st = os.stat(f)
+        h.update(("%s\0%d\0%d\0" % (f, st.st_size, st.st_mtime_ns)).encode('utf-8'))
+    return h.hexdigest()
+
+
+class Manifest(object):
+    '''
+Members:
+    _filename  : the manifest file, in the output folder
+    _enabled   : False under -force (no unit is up to date - but the
+                 unchanged outputs still keep their timestamps)
+    _units     : map from unit name to {'key': ..., 'dependencies': [...]}
+    _outputs   : map from output file (of the last run) to [sha256, size,
+                 mtime in ns]
+    _inputs    : map from input file to its sha256, as used in the keys
+    _types     : map from ASN.1 file to the names of its types
+    _before    : the output folder before the generation started (the
+                 manifest must be created before generating anything)
+    _code      : the signature of the code generators
+'''
+
+    def __init__(self, tool: str, enabled: bool = True) -> None:
+        self._filename = os.path.join(configMT.outputDir, "." + tool + ".manifest")
+        self._enabled = enabled
+        self._units = {}  # type: Dict[str, Dict[str, Any]]
+        self._outputs = {}  # type: Dict[str, List[Any]]
+        self._inputs = {}  # type: Dict[str, str]
+        self._types = {}  # type: Dict[str, List[str]]
+        self._code = CodeSignature()
+        self._before = self.TakeSnapshot()
+        # The outputs of this run are the files created from now on
+        outputFile.g_outputFiles.clear()
+        self.Load()
+
+    def Load(self) -> None:
+        if not os.path.isfile(self._filename):
+            return
+        try:
+            with open(self._filename, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('format') != g_manifestFormat:
+                return
+            units, outputs = manifest['units'], manifest['outputs']
+            self._types = manifest.get('types', {})
+        except (IOError, ValueError, KeyError) as e:
+            warn("Ignoring unreadable build manifest %s (%s)", self._filename, str(e))
+            return
+        self._outputs = outputs
+        for output, (_, size, mtime) in outputs.items():
+            if self._before.get(output) != (size, mtime):
+                inform("%s was modified (or removed) since the last run - regenerating everything", output)
+                return
+        self._units = units
+
+    def TakeSnapshot(self) -> Snapshot:
+        result = {}  # type: Snapshot
+        outputDir = configMT.outputDir
+        for root, dirs, names in os.walk(outputDir):
+            dirs.sort()
+            for n in names:
+                path = os.path.join(root, n)
+                if path == self._filename or n.endswith('.manifest.tmp'):
+                    continue
+                try:
+                    st = os.stat(path)
+                except OSError:  # pragma: no cover
+                    continue
+                result[os.path.relpath(path, outputDir)] = (st.st_size, st.st_mtime_ns)
+        return result
+
+    def Key(self, inputFiles: List[str], *parts: Any) -> str:  # pylint: disable=invalid-sequence-index
+        '''Hash the code generators, the given input files (names and contents)
+and the rest of the parameters (options, AADL descriptions, etc).'''
+        h = hashlib.sha256()
+        h.update(("DMT manifest v%d\0%s\0" % (g_manifestFormat, self._code)).encode('utf-8'))
+        for f in inputFiles:
+            if f not in self._inputs:
+                self._inputs[f] = HashFile(f) if os.path.isfile(f) else ""
+            h.update(("%s\0%s\0" % (f, self._inputs[f])).encode('utf-8'))
+        h.update(repr(parts).encode('utf-8'))
+        return h.hexdigest()
+
+    def Dependencies(self, unit: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        '''The additional input files the unit depended on in the last run.'''
+        return list(self._units.get(unit, {}).get('dependencies', []))
+
+    def UpToDate(self, unit: str, key: str) -> bool:
+        return self._enabled and self._units.get(unit, {}).get('key') == key
+
+    def SetTypes(self, asnFile: str, typeNames: List[str]) -> None:  # pylint: disable=invalid-sequence-index
+        self._types[asnFile] = sorted(typeNames)
+
+    def Record(self, unit: str, key: str, dependencies: Optional[List[str]] = None) -> None:  # pylint: disable=invalid-sequence-index
+        '''Remember the key of a unit that was generated (or found up to date).'''
+        self._units[unit] = {'key': key, 'dependencies': dependencies or []}
+
+    def Save(self) -> None:
+        '''Call this once everything is generated: gives their old timestamps
+back to the outputs that were re-written with the same contents, and
+stores the manifest.'''
+        # Some backends leave their output files for the interpreter to close
+        # at exit - their contents must be on disk before we look at them.
+        for f in OpenFiles():
+            try:
+                if f.writable():
+                    f.flush()
+            except (IOError, OSError, ValueError):  # pragma: no cover
+                pass
+        after = self.TakeSnapshot()
+        created = set(os.path.relpath(f, configMT.outputDir) for f in outputFile.g_outputFiles)
+        outputs = {}  # type: Dict[str, List[Any]]
+        for output, (size, mtime) in sorted(after.items()):
+            old = self._outputs.get(output)
+            touched = self._before.get(output) != (size, mtime)
+            if not touched and old is not None and old[1:] == [size, mtime]:
+                # Untouched by this run (e.g. the output of an up-to-date unit)
+                outputs[output] = old
+                continue
+            if not touched and output not in created:
+                # Not an output of the tool
+                continue
+            path = os.path.join(configMT.outputDir, output)
+            digest = HashFile(path)
+            if old is not None and self._before.get(output) == (old[1], old[2]) and old[:2] == [digest, size]:
+                # Re-written, but with the same contents as before
+                os.utime(path, ns=(old[2], old[2]))
+                mtime = old[2]
+            outputs[output] = [digest, size, mtime]
+        manifest = {
+            'format': g_manifestFormat,
+            'code': self._code,
+            'units': self._units,
+            'inputs': self._inputs,
+            'types': self._types,
+            'outputs': outputs,
+        }
+        try:
+            (fd, tmpName) = tempfile.mkstemp(dir=configMT.outputDir, suffix=".manifest.tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump(manifest, f, indent=1, sort_keys=True)
+            os.replace(tmpName, self._filename)
+        except (IOError, OSError) as e:
+            warn("Failed to store the build manifest %s (%s)", self._filename, str(e))
+
+
+def Unchanged(filename: str, cwd: str, inputFiles: List[str], searchPath: str) -> bool:  # pylint: disable=invalid-sequence-index
+    '''True if nothing the manifest depends on changed since it was stored:
+the code generators (with the ASN1SCC in searchPath), the contents of all
+the input files it hashed (which must include inputFiles, relative to
+cwd) and the recorded outputs. A new run with the command line of the one
+that stored it would then generate nothing - which lets dmtDaemon skip it
+without forking.'''
+    try:
+        with open(filename, 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != g_manifestFormat or manifest.get('code') != CodeSignature(searchPath):
+            return False
+        inputs = {os.path.join(cwd, k): v for k, v in manifest['inputs'].items()}
+        if not all(os.path.join(cwd, f) in inputs for f in inputFiles):
+            return False
+        outputDir = os.path.dirname(filename)
+        for output, (_, size, mtime) in manifest['outputs'].items():
+            st = os.stat(os.path.join(outputDir, output))
+            if (st.st_size, st.st_mtime_ns) != (size, mtime):
+                return False
+        return all((HashFile(f) if os.path.isfile(f) else "") == digest for f, digest in inputs.items())
+    except (IOError, OSError, ValueError, KeyError, TypeError):
+        return False
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -41,12 +41,14 @@
 Rules to gather the list of types that must be skipped
 '''
 
-from typing import Set, Union
+from typing import Set
 
 from . import asnParser
+from . import profiling
+from .symbolTable import GetSymbolTable
 from .asnAST import (
     AsnAsciiString, AsnChoice, AsnSet, AsnSequenceOf, AsnSequence,
-    AsnMetaMember, AsnSetOf, AsnNode
+    AsnSetOf, AsnNode
 )
 
 SetOfBadTypenames = Set[str]
@@ -58,52 +60,23 @@ def DiscoverBadTypes() -> SetOfBadTypenames:
     pver during type mappings. For now, it includes IA5Strings
     and types whose descendants end up having such a field.
     '''
-    badTypes = set()  # type: SetOfBadTypenames
-    cache = {}  # type: Dict[AsnNode, bool]
-
     names = asnParser.g_names
 
-    def CheckNodeForIA5(node_or_str: Union[AsnNode, str]) -> bool:
-        if isinstance(node_or_str, str):
-            node = names[node_or_str]  # type: AsnNode
-        else:
-            node = node_or_str
-        if node in cache:
-            return cache[node]
+    def HasIA5(node: AsnNode) -> bool:
         if isinstance(node, AsnAsciiString):
-            cache[node] = True
             return True
         elif isinstance(node, (AsnChoice, AsnSequence, AsnSet)):
-            for child in node._members:
-                if isinstance(child[1], AsnAsciiString):
-                    cache[node] = True
-                    return cache[node]
-            cache[node] = any(
-                CheckNodeForIA5(names[child[1]._containedType])
-                for child in node._members
-                if isinstance(child[1], AsnMetaMember))
-            return cache[node]
+            return any(isinstance(child[1], AsnAsciiString) for child in node._members)
         elif isinstance(node, (AsnSequenceOf, AsnSetOf)):
-            if isinstance(node._containedType, AsnAsciiString):
-                cache[node] = True
-            else:
-                cache[node] = \
-                    isinstance(node._containedType, str) and \
-                    CheckNodeForIA5(names[node._containedType])
-            return cache[node]
-        cache[node] = False
-        return cache[node]
+            return isinstance(node._containedType, AsnAsciiString)
+        return False
 
     # Hack for IA5Strings (IA5s are used in TASTE's runtime configuration spec)
-    while True:
-        foundOne = False
-        for nodeTypename in names.keys():
-            nodeAST = names[nodeTypename]
-            if nodeTypename not in badTypes and CheckNodeForIA5(nodeAST):
-                badTypes.add(nodeTypename)
-                foundOne = True
-        if not foundOne:
-            break
+    # The types that (directly) contain IA5Strings are bad - and so is
+    # everything that uses them, at any depth.
+    with profiling.Phase("DiscoverBadTypes"):
+        badTypes = {nodeTypename for nodeTypename, nodeAST in names.items() if HasIA5(nodeAST)}
+        badTypes.update(GetSymbolTable().TransitiveDependents(*sorted(badTypes)))
     return badTypes
 
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -39,7 +39,14 @@
 #
 import os
 g_bOnlySubprograms = False
+g_bHelperFunctions = False
+g_bAllEncodings = False
+g_bPythonStructs = False
 debugParser = False
 verbose = False
 showCode = False
 outputDir = "." + os.sep
+# Parsed ASN.1 ASTs are cached here (see asnCache.py); -noCache bypasses it
+useAsnCache = True
+asnCacheDir = os.getenv(
+    "DMT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "dmt"))
@@ -19,7 +19,7 @@
 # generated code.
 #
 import re
-from typing import Any, Dict, List  # NOQA pylint: disable=unused-import
+from typing import Any, Dict, List, Optional, Tuple  # NOQA pylint: disable=unused-import
 
 from . import asnParser
 
@@ -34,6 +34,16 @@ from .utility import panic
 # Separate cache per ASN.1 AST dictionary (i.e. per 'names' parameter of ScanChildren)
 g_ScanChildrenCache = {}  # type: Dict[int, Dict[str, List[str]]]
 
+# Same, for the dependencies of the types reached from within ScanChildren
+# (so that types used from many places are only scanned once).
+# Only used when createInnerNodesInNames is not set: otherwise, each scan of
+# a type creates its own pseudo-types, and the mappers' output depends on that.
+# It is only kept for one 'names' dictionary - and version of it, when it is
+# an asnParser.TypeNames - i.e. until ScanChildren is used on another one,
+# or the types change.
+g_ScanChildrenInnerCache = {}  # type: Dict[str, List[str]]
+g_ScanChildrenInnerCacheOwner = None  # type: Optional[Tuple[Dict[str, AsnNode], Optional[int]]]
+
 
 def CleanName(name: str) -> str:
     return re.sub(r'[^a-zA-Z0-9_]', '_', name)
@@ -56,6 +66,32 @@ def CreatePseudoType(
     return pseudoType
 
 
+def ScanNamedChild(
+        nodeTypename: str,
+        names: Dict[str, AsnNode],
+        createInnerNodesInNames: bool) -> List[str]:  # pylint: disable=invalid-sequence-index
+    '''
+    The dependencies of a type referenced from the one that ScanChildren
+    is working on, i.e. the results of a recursive (non-root) ScanChildren.
+    '''
+    if createInnerNodesInNames:
+        resultsInner = []  # type: List[str]
+        ScanChildren(nodeTypename, names[nodeTypename], names, resultsInner, False, True)
+        return resultsInner
+    global g_ScanChildrenInnerCache, g_ScanChildrenInnerCacheOwner
+    version = getattr(names, 'version', None)
+    owner = g_ScanChildrenInnerCacheOwner
+    if owner is None or owner[0] is not names or owner[1] != version:
+        g_ScanChildrenInnerCache = {}
+        g_ScanChildrenInnerCacheOwner = (names, version)
+    cache = g_ScanChildrenInnerCache
+    if nodeTypename not in cache:
+        resultsInner = []
+        ScanChildren(nodeTypename, names[nodeTypename], names, resultsInner, False, False)
+        cache[nodeTypename] = resultsInner
+    return cache[nodeTypename]
+
+
 def ScanChildren(
         nodeTypename: str,
         node: AsnNode,
@@ -83,12 +119,20 @@ def ScanChildren(
         results.append(asnParser.g_metatypes[nodeTypename])
         return
 
+    # 'results' can grow large - use a set to check for duplicates
+    inResults = set(results)
+
+    def addUnique(typename: str) -> None:
+        if typename not in inResults:
+            inResults.add(typename)
+            results.append(typename)
+
     if isinstance(node, AsnString):
         # if we are here via a recursive call from a "parent" ScanChildren,
         # add the string's nodeTypename to the dependency list (e.g. the
         # original node was a SEQUENCE OF that contained a string type)
-        if (not isRoot) and nodeTypename not in results:
-            results.append(nodeTypename)
+        if not isRoot:
+            addUnique(nodeTypename)
         # else, is the original call is about a string, there's no dependency
         return
     elif isinstance(node, AsnBasicNode):
@@ -97,49 +141,40 @@ def ScanChildren(
     elif isinstance(node, (AsnSetOf, AsnSequenceOf)):
         # For arrays or sets of "stuff", if we are here via a recursive call
         # from a "parent" ScanChildren, add the nodeTypename to the dependency list.
-        if (not isRoot) and nodeTypename not in results:
-            results.append(nodeTypename)
+        if not isRoot:
+            addUnique(nodeTypename)
         if isinstance(node._containedType, str):
             # if the contained type is not nameless (e.g. like Seq Of SomeTypeName)
             # then add SomeTypeName to the dependency list (if it's not there already).
-            if node._containedType not in results:
-                results.append(node._containedType)
+            addUnique(node._containedType)
             # Also, find the dependency list of the contained type (SomeTypeName)
-            resultsInner = []  # type: List[str]
-            ScanChildren(node._containedType, names[node._containedType], names, resultsInner,
-                         False, createInnerNodesInNames)
             # ...and add its contents to this dependency list (uniquely)
-            for i in resultsInner:
-                if i not in results:
-                    results.append(i)
+            for i in ScanNamedChild(node._containedType, names, createInnerNodesInNames):
+                addUnique(i)
         else:
             if createInnerNodesInNames:
                 # the contained type is not a string, its an AST node.
                 # use a pseudo name...
                 pseudoType = "contained_in_" + CleanName(nodeTypename)
                 pseudoType = CreatePseudoType(pseudoType, node._containedType, names, results)
+                inResults.add(pseudoType)
                 # ... and change the AST, placing the string value (pseudoType)
                 # inside the _containedType member (i.e. remove the pointer to the AST node)
                 node._containedType = pseudoType
     elif isinstance(node, (AsnSet, AsnSequence, AsnChoice)):  # pylint: disable=too-many-nested-blocks
         # If we are here via a recursive call from a "parent" ScanChildren,
         # add the SET/SEQUENCE/CHOICE nodeTypename to the dependency list.
-        if (not isRoot) and nodeTypename not in results:
-            results.append(nodeTypename)
+        if not isRoot:
+            addUnique(nodeTypename)
         # Now check the contained fields...
         for child in node._members:
             if isinstance(child[1], AsnMetaMember):
                 # if the field is of type SomeTypeName, add SomeTypeName to the dependency list
-                if child[1]._containedType not in results:
-                    results.append(child[1]._containedType)
+                addUnique(child[1]._containedType)
                 # Also, find the dependencies of SomeTypeName...
-                resultsInner = []
-                ScanChildren(child[1]._containedType, names[child[1]._containedType], names, resultsInner,
-                             False, createInnerNodesInNames)
                 # ... and add them as well.
-                for i in resultsInner:
-                    if i not in results:
-                        results.append(i)
+                for i in ScanNamedChild(child[1]._containedType, names, createInnerNodesInNames):
+                    addUnique(i)
             elif isinstance(child[1], (AsnSequenceOf, AsnSetOf)):
                 # This code is not necessary (and is currently never called) because the
                 # asnParser uses VerifyAndFixAST to replace nameless types usage
@@ -157,6 +192,7 @@ def ScanChildren(
                     pseudoType = CleanName(child[0][:1].capitalize() + child[0][1:] + "_type")  # pragma: no cover
                     pseudoType = "TaStE_" + pseudoType                                # pragma: no cover
                     pseudoType = CreatePseudoType(pseudoType, child[1], names, results)         # pragma: no cover
+                    inResults.add(pseudoType)                                                   # pragma: no cover
                     # Also, find the dependencies of the pseudo-type...                         # pragma: no cover
                     resultsInner = []                                                           # pragma: no cover
                     if isinstance(child[1]._containedType, str):                                # pragma: no cover
@@ -167,8 +203,7 @@ def ScanChildren(
                                      False, createInnerNodesInNames)                            # pragma: no cover
                     # ...and add them as well.                                                  # pragma: no cover
                     for i in resultsInner:                                                      # pragma: no cover
-                        if i not in results:
-                            results.append(i)                                                   # pragma: no cover
+                        addUnique(i)                                                            # pragma: no cover
             elif isinstance(child[1], AsnString):
                 if createInnerNodesInNames:                                                     # pragma: no cover
                     # if the field is a string, create a unique pseudo-type name
@@ -176,6 +211,7 @@ def ScanChildren(
                     pseudoType = CleanName(child[0][:1].capitalize() + child[0][1:] + "_type")  # pragma: no cover
                     pseudoType = "TaStE_" + pseudoType                                          # pragma: no cover
                     pseudoType = CreatePseudoType(pseudoType, child[1], names, results)         # pragma: no cover
+                    inResults.add(pseudoType)                                                   # pragma: no cover
                     # store the string's pseudo type name in the _pseudoname attribute.
                     child[1]._pseudoname = pseudoType                                           # pragma: no cover
             elif isinstance(child[1], AsnEnumerated):
@@ -189,6 +225,7 @@ def ScanChildren(
                     pseudoType = CleanName(child[0][:1].capitalize() + child[0][1:] + "_type")  # pragma: no cover
                     pseudoType = "TaStE_" + pseudoType                                          # pragma: no cover
                     pseudoType = CreatePseudoType(pseudoType, child[1], names, results)         # pragma: no cover
+                    inResults.add(pseudoType)                                                   # pragma: no cover
                     # store the string's pseudo type name in the _pseudoname attribute.
                     child[1]._pseudoname = pseudoType                                           # pragma: no cover
     elif isinstance(node, AsnEnumerated):
@@ -0,0 +1,167 @@
+# (C) Semantix Information Technologies.
+#
+# Semantix Information Technologies is licensing the code of the
+# Data Modelling Tools (DMT) in the following dual-license mode:
+#
+# Commercial Developer License:
+#       The DMT Commercial Developer License is the appropriate version
+# to use for the development of proprietary and/or commercial software.
+# This version is for developers/companies who do not want to share
+# the source code they develop with others or otherwise comply with the
+# terms of the GNU Lesser General Public License version 3.
+#
+# GNU LGPL v. 2.1:
+#       This version of DMT is the one to use for the development of
+# non-commercial applications, when you are willing to comply
+# with the terms of the GNU Lesser General Public License version 3.
+#
+# The features of the two licenses are summarized below:
+#
+#                       Commercial
+#                       Developer               LGPL
+#                       License
+#
+# License cost          License fee charged     No license fee
+#
+# Must provide source
+# code changes to DMT   No, modifications can   Yes, all source code
+#                       be closed               must be provided back
+#
+# Can create            Yes, that is,           No, applications are subject
+# proprietary           no source code needs    to the LGPL and all source code
+# applications          to be disclosed         must be made available
+#
+# Support               Yes, 12 months of       No, but available separately
+#                       premium technical       for purchase
+#                       support
+#
+# Charge for Runtimes   None                    None
+#
+'''
+Bounded pool of forked worker processes
+
+The code generators keep their state in module globals, and several of
+them also add pseudo-types to (or rewrite nodes of) the shared AST - so
+they can't run in threads. A forked child instead gets a copy-on-write
+snapshot of the parent at the time of the fork, i.e. it sees exactly what
+it would have seen in a serial run at the same point.
+
+Each job belongs to a group; jobs of the same group never overlap (e.g.
+two runs of the same backend, or two backends writing the same files).
+With maxJobs of 1 (or without os.fork) everything runs inline, in order.
+'''
+import io
+import gc
+import os
+import sys
+import traceback
+
+from typing import Dict, List, Set, Callable, Any  # NOQA pylint: disable=unused-import
+
+from . import profiling
+from .utility import panic
+
+
+class JobPool(object):
+    '''
+Members:
+    _maxJobs : maximum number of concurrently running children
+    _running : map from the PID of each running child to (group, label)
+    _failed  : labels of the jobs that exited with an error
+'''
+
+    def __init__(self, maxJobs: int) -> None:
+        self._maxJobs = maxJobs if hasattr(os, 'fork') else 1
+        self._running = {}  # type: Dict[int, Any]
+        self._failed = []  # type: List[str]  # pylint: disable=invalid-sequence-index
+
+    def IsParallel(self) -> bool:
+        return self._maxJobs > 1
+
+    def RunInline(self, group: str, label: str, func: Callable[..., None], *args: Any) -> None:
+        '''Run func in this process, after the running jobs of its group are done.
+Use it for jobs whose side-effects the jobs after them must see.'''
+        self.WaitForGroup(group)
+        self._StopOnFailure()
+        func(*args)
+
+    def Spawn(self, group: str, label: str, func: Callable[..., None], *args: Any) -> None:
+        '''Run func in a forked child, as soon as a worker slot is free and
+the running jobs of its group are done.'''
+        if not self.IsParallel():
+            self.RunInline(group, label, func, *args)
+            return
+        self.WaitForGroup(group)
+        while len(self._running) >= self._maxJobs:
+            self._Reap(next(iter(self._running)))
+        self._StopOnFailure()
+        # Anything still buffered would otherwise be printed by both processes
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            inheritedFiles = set()  # type: Set[int]
+            exitCode = 0
+            try:
+                profiling.OnFork()
+                inheritedFiles = set(id(f) for f in OpenFiles())
+                func(*args)
+            except SystemExit as e:
+                if e.code is None:
+                    exitCode = 0
+                elif isinstance(e.code, int):
+                    exitCode = e.code
+                else:
+                    sys.stderr.write(str(e.code) + "\n")
+                    exitCode = 1
+            except BaseException:  # pylint: disable=broad-except
+                traceback.print_exc()
+                exitCode = 1
+            # Some backends leave their output files for the interpreter to
+            # close at exit - which os._exit skips. The inherited ones belong
+            # to the parent, and their buffers must not be written twice.
+            try:
+                for f in OpenFiles():
+                    if id(f) not in inheritedFiles and not f.closed:
+                        f.close()
+                profiling.SaveChildPhases()
+            except BaseException:  # pylint: disable=broad-except
+                traceback.print_exc()
+                exitCode = 1
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exitCode)  # pylint: disable=protected-access
+        self._running[pid] = (group, label)
+
+    def WaitForGroup(self, group: str) -> None:
+        for pid in [p for p, (g, _) in self._running.items() if g == group]:
+            self._Reap(pid)
+
+    def Join(self) -> None:
+        '''Wait for all children; panic if any of them failed.'''
+        for pid in list(self._running.keys()):
+            self._Reap(pid)
+        if self._failed:
+            panic("Failed to execute: %s" % ", ".join(self._failed))
+
+    def _Reap(self, pid: int) -> None:
+        _, status = os.waitpid(pid, 0)
+        _, label = self._running.pop(pid)
+        profiling.MergeChildPhases(pid)
+        if status != 0:
+            self._failed.append(label)
+
+    def _StopOnFailure(self) -> None:
+        # A serial run stops at the first error - so don't start anything new
+        if self._failed:
+            self.Join()
+
+
+def OpenFiles() -> List[io.IOBase]:  # pylint: disable=invalid-sequence-index
+    # Text wrappers come before the buffers below them, and these before the
+    # raw files: closing the outermost layer first flushes the inner ones.
+    openFiles = [f for f in gc.get_objects() if issubclass(type(f), io.IOBase) and not f.closed]
+    return sorted(openFiles, key=lambda f: (
+        0 if isinstance(f, io.TextIOBase) else 1 if isinstance(f, io.BufferedIOBase) else 2))
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
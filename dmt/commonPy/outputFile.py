@@ -0,0 +1,136 @@
+# (C) Semantix Information Technologies.
+#
+# Semantix Information Technologies is licensing the code of the
+# Data Modelling Tools (DMT) in the following dual-license mode:
+#
+# Commercial Developer License:
+#       The DMT Commercial Developer License is the appropriate version
+# to use for the development of proprietary and/or commercial software.
+# This version is for developers/companies who do not want to share
+# the source code they develop with others or otherwise comply with the
+# terms of the GNU Lesser General Public License version 3.
+#
+# GNU LGPL v. 2.1:
+#       This version of DMT is the one to use for the development of
+# non-commercial applications, when you are willing to comply
+# with the terms of the GNU Lesser General Public License version 3.
+#
+# The features of the two licenses are summarized below:
+#
+#                       Commercial
+#                       Developer               LGPL
+#                       License
+#
+# License cost          License fee charged     No license fee
+#
+# Must provide source
+# code changes to DMT   No, modifications can   Yes, all source code
+#                       be closed               must be provided back
+#
+# Can create            Yes, that is,           No, applications are subject
+# proprietary           no source code needs    to the LGPL and all source code
+# applications          to be disclosed         must be made available
+#
+# Support               Yes, 12 months of       No, but available separately
+#                       premium technical       for purchase
+#                       support
+#
+# Charge for Runtimes   None                    None
+#
+'''
+Buffered output files for the code generators
+
+The mappers emit their code as a long series of small write calls.
+OutputFile is a drop-in replacement for open(filename, 'w'): it gathers
+the text in memory and writes it to disk in one go. It also leaves the
+file untouched when the new contents are the same as what is already
+there, so its timestamp is preserved and make and friends don't
+recompile it.
+
+The text reaches the disk when the file is flushed or closed. A file the
+mapper never closes is closed when the object is collected, or at exit.
+'''
+import io
+import os
+import atexit
+import weakref
+
+from typing import List, Optional, Set, TextIO  # NOQA pylint: disable=unused-import
+
+# The files not yet closed (for the ones that are never closed explicitly)
+g_openFiles = weakref.WeakSet()  # type: weakref.WeakSet
+
+# The (absolute) names of all the files created so far - the outputs of
+# the tool, for the build manifest
+g_outputFiles = set()  # type: Set[str]
+
+
+class OutputFile(io.TextIOBase, TextIO):
+    '''
+Members:
+    _name    : the filename
+    _chunks  : the text written since the file was created
+    _onDisk  : the text we know is on disk (None if we don't know yet)
+'''
+
+    def __init__(self, filename: str) -> None:
+        super().__init__()
+        self._name = filename
+        self._chunks = []  # type: List[str]  # pylint: disable=invalid-sequence-index
+        self._onDisk = None  # type: Optional[str]
+        # Bypass the method call overhead for the (very) frequent writes
+        self.write = self._chunks.append  # type: ignore
+        # Like open(..., 'w') would, create (or truncate) the file right
+        # away - unless it is already there, since we may not change it
+        try:
+            with open(filename, 'r') as f:
+                self._onDisk = f.read()
+        except UnicodeDecodeError:
+            pass
+        except FileNotFoundError:
+            with open(filename, 'w'):
+                self._onDisk = ""
+        g_openFiles.add(self)
+        g_outputFiles.add(os.path.abspath(filename))
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def writable(self) -> bool:
+        return True
+
+    def getvalue(self) -> str:
+        text = "".join(self._chunks)
+        # Keep the joined text, so that the next calls don't redo the work
+        self._chunks[:] = [text]
+        return text
+
+    def flush(self) -> None:
+        if self.closed:
+            return
+        text = self.getvalue()
+        if text != self._onDisk:
+            with open(self._name, 'w') as f:
+                f.write(text)
+            self._onDisk = text
+
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                self.flush()
+            finally:
+                g_openFiles.discard(self)
+                # Writing from now on is an error, as with real files
+                del self.write
+                super().close()
+
+
+def CloseAll() -> None:
+    for f in list(g_openFiles):
+        f.close()
+
+
+atexit.register(CloseAll)
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,224 @@
+# (C) Semantix Information Technologies.
+#
+# Semantix Information Technologies is licensing the code of the
+# Data Modelling Tools (DMT) in the following dual-license mode:
+#
+# Commercial Developer License:
+#       The DMT Commercial Developer License is the appropriate version
+# to use for the development of proprietary and/or commercial software.
+# This version is for developers/companies who do not want to share
+# the source code they develop with others or otherwise comply with the
+# terms of the GNU Lesser General Public License version 3.
+#
+# GNU LGPL v. 2.1:
+#       This version of DMT is the one to use for the development of
+# non-commercial applications, when you are willing to comply
+# with the terms of the GNU Lesser General Public License version 3.
+#
+# The features of the two licenses are summarized below:
+#
+#                       Commercial
+#                       Developer               LGPL
+#                       License
+#
+# License cost          License fee charged     No license fee
+#
+# Must provide source
+# code changes to DMT   No, modifications can   Yes, all source code
+#                       be closed               must be provided back
+#
+# Can create            Yes, that is,           No, applications are subject
+# proprietary           no source code needs    to the LGPL and all source code
+# applications          to be disclosed         must be made available
+#
+# Support               Yes, 12 months of       No, but available separately
+#                       premium technical       for purchase
+#                       support
+#
+# Charge for Runtimes   None                    None
+#
+'''
+Per-phase timing and memory report (the --profile option of the tools)
+
+The tools wrap their phases (ASN1SCC invocation, XML parsing, AST checks,
+the mapper callbacks, etc) in
+
+    with profiling.Phase("name"):
+        ...
+
+Phases nest; each one is reported under the path of the phases that
+contain it (e.g. "parse/asn1scc"), with the number of times it was
+entered, and its accumulated wall and CPU time (the CPU time includes the
+subprocesses, e.g. ASN1SCC). Since the peak memory of a process only ever
+grows, the reported peak is the maximum RSS at the end of the phase.
+
+When profiling is not enabled, Phase returns a shared no-op context
+manager, so the instrumentation costs next to nothing.
+'''
+import os
+import sys
+import json
+import time
+import atexit
+import tempfile
+
+from typing import List, Dict, Optional, Any  # NOQA pylint: disable=unused-import
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+# The file the report is written into (None if profiling is disabled)
+g_reportFilename = None  # type: Optional[str]
+g_tool = ""
+g_argv = []  # type: List[str]  # pylint: disable=invalid-sequence-index
+
+# The paths of the phases we are currently in
+g_stack = []  # type: List[str]  # pylint: disable=invalid-sequence-index
+
+# Map from phase path to [calls, wall, cpu, maxRSS]
+g_phases = {}  # type: Dict[str, List[Any]]
+
+# Where forked workers (see jobPool.py) leave their phases for the parent
+g_childDir = None  # type: Optional[str]
+
+
+def CPUTime() -> float:
+    t = os.times()
+    return t[0] + t[1] + t[2] + t[3]
+
+
+def MaxRSS() -> Optional[int]:
+    '''Peak resident set size so far, in KB (None where unknown).'''
+    if resource is None:
+        return None  # pragma: no cover
+    maxRSS = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, the others KB
+    return maxRSS // 1024 if sys.platform == 'darwin' else maxRSS
+
+
+class _Phase(object):
+    __slots__ = ('_path', '_wall', '_cpu')
+
+    def __init__(self, name: str) -> None:
+        self._path = g_stack[-1] + "/" + name if g_stack else name
+        self._wall = 0.0
+        self._cpu = 0.0
+
+    def __enter__(self) -> None:
+        g_stack.append(self._path)
+        self._wall = time.perf_counter()
+        self._cpu = CPUTime()
+
+    def __exit__(self, *unused_args: Any) -> None:
+        wall = time.perf_counter() - self._wall
+        cpu = CPUTime() - self._cpu
+        g_stack.pop()
+        Record(self._path, 1, wall, cpu, MaxRSS())
+
+
+class _NoPhase(object):
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *unused_args: Any) -> None:
+        pass
+
+
+g_noPhase = _NoPhase()
+
+
+def Phase(name: str) -> Any:
+    '''Context manager measuring the code inside it (when profiling).'''
+    if g_reportFilename is None:
+        return g_noPhase
+    return _Phase(name)
+
+
+def Record(path: str, calls: int, wall: float, cpu: float, maxRSS: Optional[int]) -> None:
+    data = g_phases.get(path, None)
+    if data is None:
+        g_phases[path] = [calls, wall, cpu, maxRSS]
+    else:
+        data[0] += calls
+        data[1] += wall
+        data[2] += cpu
+        if maxRSS is not None and (data[3] is None or maxRSS > data[3]):
+            data[3] = maxRSS
+
+
+def HandleCommandLine(tool: str) -> None:
+    '''Remove "--profile report.json" from sys.argv, and enable profiling.
+The report is written when the tool exits.'''
+    if "--profile" not in sys.argv:
+        return
+    idx = sys.argv.index("--profile")
+    if idx + 1 >= len(sys.argv):
+        from .utility import panic
+        panic("--profile expects the filename of the JSON report")
+    Enable(tool, sys.argv[idx + 1])
+    del sys.argv[idx]
+    del sys.argv[idx]
+
+
+def Enable(tool: str, reportFilename: str) -> None:
+    global g_reportFilename, g_tool, g_argv, g_childDir
+    g_reportFilename = os.path.abspath(reportFilename)
+    g_tool = tool
+    g_argv = sys.argv[:]
+    g_childDir = tempfile.mkdtemp(prefix="dmt_profile_")
+    atexit.register(WriteReport, time.perf_counter(), CPUTime())
+
+
+def OnFork() -> None:
+    '''Called in a forked worker (see jobPool.py): it only reports its own phases.'''
+    g_phases.clear()
+
+
+def SaveChildPhases() -> None:
+    '''Called in a forked worker before it exits: store its phases for the parent.'''
+    if g_reportFilename is None:
+        return
+    with open(os.path.join(g_childDir, str(os.getpid())), 'w') as f:
+        json.dump(g_phases, f)
+
+
+def MergeChildPhases(pid: int) -> None:
+    '''Called in the parent, after the worker with this PID finished.'''
+    if g_reportFilename is None:
+        return
+    childFile = os.path.join(g_childDir, str(pid))
+    if not os.path.exists(childFile):
+        return
+    with open(childFile) as f:
+        childPhases = json.load(f)
+    os.unlink(childFile)
+    for path, (calls, wall, cpu, maxRSS) in childPhases.items():
+        Record(path, calls, wall, cpu, maxRSS)
+
+
+def WriteReport(startWall: float, startCPU: float) -> None:
+    if g_reportFilename is None:
+        return
+    wall = time.perf_counter() - startWall
+    cpu = CPUTime() - startCPU
+    report = {
+        'tool': g_tool,
+        'argv': g_argv,
+        'total': {'wall': wall, 'cpu': cpu, 'maxRSS_KB': MaxRSS()},
+        'phases': [
+            {'phase': path, 'calls': data[0], 'wall': data[1], 'cpu': data[2], 'maxRSS_KB': data[3]}
+            for path, data in sorted(g_phases.items())]
+    }
+    with open(g_reportFilename, 'w') as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    try:
+        os.rmdir(g_childDir)
+    except OSError:  # pragma: no cover
+        pass
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -19,7 +19,7 @@
 # generated code.
 #
 import re
-from typing import Union, List, Dict, TypeVar, Generic
+from typing import Union, List, Dict, Tuple, Optional, TypeVar, Generic, Any  # NOQA pylint: disable=unused-import
 
 from .utility import panicWithCallStack
 from .asnAST import (
@@ -31,9 +31,97 @@ from .asnParser import AST_Leaftypes, AST_Lookup
 TSrc = TypeVar('TSrc')
 TDest = TypeVar('TDest')
 
+# The Map method that handles each kind of node
+g_mapMethods = {
+    AsnInt: 'MapInteger',
+    AsnReal: 'MapReal',
+    AsnBool: 'MapBoolean',
+    AsnOctetString: 'MapOctetString',
+    AsnSequence: 'MapSequence',
+    AsnSet: 'MapSet',
+    AsnChoice: 'MapChoice',
+    AsnSequenceOf: 'MapSequenceOf',
+    AsnSetOf: 'MapSetOf',
+    AsnEnumerated: 'MapEnumerated',
+}  # type: Dict[type, str]
+
+# The same, for every node class met so far (including the subclasses
+# of the ones above) - None for the unsupported ones
+g_dispatch = {}  # type: Dict[type, Optional[str]]
+
+# The lines generated by the memoizing mappers for the placeholders below
+# (instead of the actual variables). The key is the mapper class, the
+# node, and the MemoState of the mapper.
+g_memo = {}  # type: Dict[Tuple[type, AsnNode, Any], List[str]]  # pylint: disable=invalid-sequence-index
+
+# The variables are then replaced in one pass each - so the placeholders
+# must not leak from one variable to the other (in which case Map does
+# the work without the memo).
+g_srcPlaceholder = '\x01'
+g_destPlaceholder = '\x02'
+
+# The types whose mapping code can be placed in a helper function
+g_helperClasses = (AsnSequence, AsnSet, AsnChoice, AsnSequenceOf, AsnSetOf, AsnOctetString)
+
+
+def MapMethod(nodeClass: type) -> Optional[str]:
+    try:
+        return g_dispatch[nodeClass]
+    except KeyError:
+        methodName = None
+        for cls in nodeClass.__mro__:
+            if cls in g_mapMethods:
+                methodName = g_mapMethods[cls]
+                break
+        g_dispatch[nodeClass] = methodName
+        return methodName
+
+
+class HelperFunctions(object):
+    '''
+The conversion functions of the named types, for an output file: instead
+of expanding the mapping code of a type at each place it is used, the
+mappers generate it once in a function of its own, and call that.
+
+Members:
+    functions   : the function of each (mapper class, typename) - or None
+                  if the mapper can't make one for the type
+    definitions : the code of the functions, not yet written to the file
+'''
+    def __init__(self) -> None:
+        self.functions = {}  # type: Dict[Tuple[type, str], Optional[str]]
+        self.definitions = []  # type: List[str]  # pylint: disable=invalid-sequence-index
+
+    def Flush(self) -> str:
+        '''Return the definitions made since the last call.
+
+The functions they call are defined before them, so the text can be
+written as is to the output file (before the code that uses them).'''
+        text = "".join(self.definitions)
+        self.definitions = []
+        return text
+
 
 # noinspection PyMethodMayBeStatic
 class RecursiveMapperGeneric(Generic[TSrc, TDest]):
+    # Set this in the mappers whose output for a node depends only on the
+    # MemoState and on the (string) variables - used as opaque strings, i.e.
+    # only pasted in the generated code. Map then generates the lines of each
+    # node once, and reuses them for all the variables it is mapped from/to.
+    memoize = False
+
+    # Set by the glue generators to the HelperFunctions of the file they
+    # write to, to have the named types mapped by calls to helper functions
+    # (for the types that HelperTypes knows about).
+    helpers = None  # type: Optional[HelperFunctions]
+
+    def HelperTypes(self, unused_typename: str) -> Optional[Tuple[str, str]]:  # pylint: disable=no-self-use
+        '''The C types of the source and the destination of typename (None if unknown).'''
+        return None
+
+    def MemoState(self) -> Any:  # pylint: disable=no-self-use
+        '''The part of the mapper's state that its output depends on.'''
+        return None
 
     def maybeElse(self, childNo: int) -> str:  # pylint: disable=no-self-use
         if childNo == 1:
@@ -83,36 +171,59 @@ class RecursiveMapperGeneric(Generic[TSrc, TDest]):
             node_or_str: Union[str, AsnNode],
             leafTypeDict: Dict[str, str],
             names: Dict[str, AsnNode]) -> List[str]:  # pylint: disable=invalid-sequence-index
+        # The name the type is used with (if any) - the one of its helper
+        typename = None  # type: Optional[str]
         if isinstance(node_or_str, str):
+            typename = node_or_str
             node = names[node_or_str]  # type: AsnNode
         else:
             node = node_or_str
-        lines = []  # type: List[str]
-        if isinstance(node, AsnInt):
-            lines.extend(self.MapInteger(srcVar, destVar, node, leafTypeDict, names))
-        elif isinstance(node, AsnReal):
-            lines.extend(self.MapReal(srcVar, destVar, node, leafTypeDict, names))
-        elif isinstance(node, AsnBool):
-            lines.extend(self.MapBoolean(srcVar, destVar, node, leafTypeDict, names))
-        elif isinstance(node, AsnOctetString):
-            lines.extend(self.MapOctetString(srcVar, destVar, node, leafTypeDict, names))
-        elif isinstance(node, AsnSequence):
-            lines.extend(self.MapSequence(srcVar, destVar, node, leafTypeDict, names))
-        elif isinstance(node, AsnSet):
-            lines.extend(self.MapSet(srcVar, destVar, node, leafTypeDict, names))
-        elif isinstance(node, AsnChoice):
-            lines.extend(self.MapChoice(srcVar, destVar, node, leafTypeDict, names))
-        elif isinstance(node, AsnSequenceOf):
-            lines.extend(self.MapSequenceOf(srcVar, destVar, node, leafTypeDict, names))
-        elif isinstance(node, AsnSetOf):
-            lines.extend(self.MapSetOf(srcVar, destVar, node, leafTypeDict, names))
-        elif isinstance(node, AsnEnumerated):
-            lines.extend(self.MapEnumerated(srcVar, destVar, node, leafTypeDict, names))
-        elif isinstance(node, AsnMetaMember):
-            lines.extend(self.Map(srcVar, destVar, names[node._containedType], leafTypeDict, names))
-        else:
+        while isinstance(node, AsnMetaMember):
+            typename = typename or node._containedType
+            node = names[node._containedType]
+        methodName = MapMethod(node.__class__)
+        if methodName is None:
             panicWithCallStack("unsupported %s (%s)" % (str(node.__class__), node.Location()))
-        return lines
+        if self.helpers is not None and typename is not None and isinstance(node, g_helperClasses) and \
+                isinstance(srcVar, str) and isinstance(destVar, str):
+            helper = self.Helper(typename, node, methodName, leafTypeDict, names)
+            if helper is not None:
+                return ["%s(&%s, &%s);\n" % (helper, srcVar, destVar)]
+        # (the memo is shared by all files, the helper functions are not)
+        if not self.memoize or self.helpers is not None or not isinstance(srcVar, str) or not isinstance(destVar, str) or \
+                g_destPlaceholder in srcVar or g_srcPlaceholder in destVar:
+            return list(getattr(self, methodName)(srcVar, destVar, node, leafTypeDict, names))
+        key = (self.__class__, node, self.MemoState())
+        templates = g_memo.get(key)
+        if templates is None:
+            templates = getattr(self, methodName)(g_srcPlaceholder, g_destPlaceholder, node, leafTypeDict, names)
+            g_memo[key] = templates
+        return [t.replace(g_srcPlaceholder, srcVar).replace(g_destPlaceholder, destVar) for t in templates]
+
+    def Helper(self,
+               typename: str,
+               node: AsnNode,
+               methodName: str,
+               leafTypeDict: AST_Leaftypes,
+               names: AST_Lookup) -> Optional[str]:
+        '''The helper function mapping typename, generated on first use.'''
+        key = (self.__class__, typename)
+        try:
+            return self.helpers.functions[key]
+        except KeyError:
+            pass
+        types = self.HelperTypes(typename)
+        if types is None:
+            self.helpers.functions[key] = None
+            return None
+        functionName = "%s_%s" % (self.__class__.__name__, self.CleanName(typename))
+        self.helpers.functions[key] = functionName
+        # The functions this one calls are added (and defined) before it
+        lines = getattr(self, methodName)("(*pSrc)", "(*pDst)", node, leafTypeDict, names)
+        self.helpers.definitions.append(
+            "static void %s(const %s *pSrc, %s *pDst)\n{\n%s}\n\n" % (
+                functionName, types[0], types[1], "".join("    " + x for x in lines)))
+        return functionName
 
 
 # pylint: disable=no-self-use
@@ -0,0 +1,159 @@
+# (C) Semantix Information Technologies.
+#
+# Semantix Information Technologies is licensing the code of the
+# Data Modelling Tools (DMT) in the following dual-license mode:
+#
+# Commercial Developer License:
+#       The DMT Commercial Developer License is the appropriate version
+# to use for the development of proprietary and/or commercial software.
+# This version is for developers/companies who do not want to share
+# the source code they develop with others or otherwise comply with the
+# terms of the GNU Lesser General Public License version 3.
+#
+# GNU LGPL v. 2.1:
+#       This version of DMT is the one to use for the development of
+# non-commercial applications, when you are willing to comply
+# with the terms of the GNU Lesser General Public License version 3.
+#
+# The features of the two licenses are summarized below:
+#
+#                       Commercial
+#                       Developer               LGPL
+#                       License
+#
+# License cost          License fee charged     No license fee
+#
+# Must provide source
+# code changes to DMT   No, modifications can   Yes, all source code
+#                       be closed               must be provided back
+#
+# Can create            Yes, that is,           No, applications are subject
+# proprietary           no source code needs    to the LGPL and all source code
+# applications          to be disclosed         must be made available
+#
+# Support               Yes, 12 months of       No, but available separately
+#                       premium technical       for purchase
+#                       support
+#
+# Charge for Runtimes   None                    None
+#
+'''
+Indexed view of the parsed ASN.1 types
+
+The asnParser globals map type names to AST nodes; questions like "which
+types does this one depend on" or "which types use this one" would
+otherwise need a walk over all of g_names per query. The SymbolTable
+indexes the (direct) references between the named types once, and
+answers all these queries in constant time or in time linear to the
+size of the answer.
+'''
+from typing import List, Dict, Set, Iterable, Optional  # NOQA pylint: disable=unused-import
+
+from . import asnParser
+from .asnAST import AsnNode  # NOQA pylint: disable=unused-import
+
+
+class SymbolTable(object):
+    '''
+The type lookups and the dependency graph of a parsed set of ASN.1 grammars.
+Members:
+    _names        : map from type name to AST node (e.g. asnParser.g_names)
+    _version      : the version of _names (if it is an asnParser.TypeNames)
+                    that the table was built from
+    _typesOfFile  : map from ASN.1 filename to the type names defined in it
+    _fileOfType   : reverse of _typesOfFile
+    _dependencies : map from type name to the names of the types it references
+    _dependents   : map from type name to the names of the types referencing it
+'''
+
+    def __init__(self, names: Dict[str, AsnNode], typesOfFile: Dict[str, List[str]]) -> None:  # pylint: disable=invalid-sequence-index
+        self._names = names
+        self._version = getattr(names, 'version', None)  # type: Optional[int]
+        self._typesOfFile = typesOfFile
+        self._fileOfType = {}  # type: Dict[str, str]
+        for asnFile, typenames in typesOfFile.items():
+            for typename in typenames:
+                self._fileOfType.setdefault(typename, asnFile)
+        self._dependencies = {}  # type: Dict[str, List[str]]
+        self._dependents = {}  # type: Dict[str, List[str]]
+        for typename in names:
+            self._dependents.setdefault(typename, [])
+        for typename, node in names.items():
+            uniqueDeps = []  # type: List[str]
+            seen = set()  # type: Set[str]
+            for dep in asnParser.ReferencedTypenames(node):
+                if dep not in seen:
+                    seen.add(dep)
+                    uniqueDeps.append(dep)
+                    self._dependents.setdefault(dep, []).append(typename)
+            self._dependencies[typename] = uniqueDeps
+
+    def IsUpToDate(self) -> bool:
+        '''Mappers add pseudo-types to g_names after parsing; a table built
+before any change to it must be rebuilt.'''
+        return self._names is asnParser.g_names and self._version == asnParser.g_names.version
+
+    def TypeByName(self, typename: str) -> Optional[AsnNode]:
+        '''The AST node of this type, or None if there's no such type.'''
+        return self._names.get(typename, None)
+
+    def TypesOfFile(self, asnFile: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return self._typesOfFile.get(asnFile, [])
+
+    def FileOfType(self, typename: str) -> Optional[str]:
+        '''The ASN.1 file defining this type, or None for types created
+after parsing (e.g. the pseudo-types of the mappers).'''
+        return self._fileOfType.get(typename, None)
+
+    def Dependencies(self, typename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        '''The types directly referenced by this one.'''
+        return self._dependencies.get(typename, [])
+
+    def Dependents(self, typename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        '''The types that directly reference this one.'''
+        return self._dependents.get(typename, [])
+
+    def TransitiveDependencies(self, *typenames: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        '''All the types that the given ones depend on, directly or not.
+Each type comes after the types it depends on.'''
+        return self._Closure(typenames, self._dependencies)
+
+    def TransitiveDependents(self, *typenames: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        '''All the types that use the given ones, directly or not.
+Each type comes after the types that use it.'''
+        return self._Closure(typenames, self._dependents)
+
+    @staticmethod
+    def _Closure(roots: Iterable[str], edges: Dict[str, List[str]]) -> List[str]:  # pylint: disable=invalid-sequence-index
+        # Iterative post-order DFS; reference chains can be very deep.
+        result = []  # type: List[str]
+        rootSet = set(roots)
+        visited = set(rootSet)
+        for root in roots:
+            stack = [(root, iter(edges.get(root, [])))]
+            while stack:
+                typename, it = stack[-1]
+                for nextTypename in it:
+                    if nextTypename not in visited:
+                        visited.add(nextTypename)
+                        stack.append((nextTypename, iter(edges.get(nextTypename, []))))
+                        break
+                else:
+                    stack.pop()
+                    if typename not in rootSet:
+                        result.append(typename)
+        return result
+
+
+g_symbolTable = None  # type: SymbolTable
+
+
+def GetSymbolTable() -> SymbolTable:
+    '''The SymbolTable of the types currently in asnParser.g_names;
+it is (re)built on demand, i.e. after every new parse.'''
+    global g_symbolTable
+    if g_symbolTable is None or not g_symbolTable.IsUpToDate():
+        g_symbolTable = SymbolTable(asnParser.g_names, asnParser.g_typesOfFile)
+    return g_symbolTable
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
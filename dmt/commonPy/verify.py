@@ -23,7 +23,7 @@ This module checks that all ASN.1 types are using the appropriate
 constraint (ASSERT-wise).
 '''
 
-from typing import Dict, Union  # NOQA
+from typing import Dict, Set, Union  # NOQA
 
 from .utility import panic
 
@@ -73,15 +73,28 @@ on the exact location of the offending type in the ASN.1 grammar.'''
             panic("ENUMERATED must have integer value for each enum! (%s)" % node.Location())
 
 
-def VerifyRanges(node_or_str: Union[str, AsnNode], names: Dict[str, AsnNode]) -> None:
+def VerifyRanges(
+        node_or_str: Union[str, AsnNode],
+        names: Dict[str, AsnNode],
+        verified: Set[str]=None) -> None:
     '''This function recursively traverses the AST,
-calling VerifyNodeRange for each Node.'''
+calling VerifyNodeRange for each Node. The names of the types already
+verified are kept in 'verified' (if given) and are not checked again;
+pass the same set across calls to verify each type only once.'''
+    if verified is None:
+        verified = set()
+    typename = None
     if isinstance(node_or_str, str):
-        node = names[node_or_str]  # type: AsnNode
+        typename = node_or_str
+    elif isinstance(node_or_str, asnAST.AsnMetaMember):
+        typename = node_or_str._containedType
+    if typename is not None:
+        if typename in verified:
+            return
+        verified.add(typename)
+        node = names[typename]  # type: AsnNode
     else:
         node = node_or_str
-    if isinstance(node, asnAST.AsnMetaMember):
-        node = names[node._containedType]
 
     if isinstance(node, asnAST.AsnBasicNode):
         VerifyNodeRange(node)
@@ -92,10 +105,10 @@ calling VerifyNodeRange for each Node.'''
         #         "Empty SEQUENCE/SETs are not allowed. Please add at least one field in (%s)\n"
         #         % node.Location())
         for child in node._members:
-            VerifyRanges(child[1], names)
+            VerifyRanges(child[1], names, verified)
     elif isinstance(node, (asnAST.AsnSequenceOf, asnAST.AsnSetOf)):
         VerifyNodeRange(node)
-        VerifyRanges(node._containedType, names)
+        VerifyRanges(node._containedType, names, verified)
     elif isinstance(node, asnAST.AsnEnumerated):
         VerifyNodeRange(node)
     else:
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+
+# (C) Semantix Information Technologies.
+#
+# Semantix Information Technologies is licensing the code of the
+# Data Modelling Tools (DMT) in the following dual-license mode:
+#
+# Commercial Developer License:
+#       The DMT Commercial Developer License is the suggested version
+# to use for the development of proprietary and/or commercial software.
+# This version is for developers/companies who do not want to comply
+# with the terms of the GNU Lesser General Public License version 2.1.
+#
+# GNU LGPL v. 2.1:
+#       This version of DMT is the one to use for the development of
+# applications, when you are willing to comply with the terms of the
+# GNU Lesser General Public License version 2.1.
+#
+# Note that in both cases, there are no charges (royalties) for the
+# generated code.
+#
+'''
+DMT generator daemon
+
+Every run of the DMT tools pays for the Python imports, and (unless the
+AST cache has it) for ASN1SCC and the parsing of the models, before it
+emits any code. In an edit-regenerate loop, this daemon pays for these
+once: it imports the tools and all their backends, and then serves the
+regeneration requests sent over a local (Unix) socket by
+
+    dmtDaemon run TOOL [options and inputs of TOOL]
+
+by running the tool in a forked child - which starts from a pristine,
+already initialized copy of the daemon (the tools and backends keep their
+state in module globals, so a fresh process image per run is a must).
+The children report the ASN.1 ASTs and AADL models they used back to the
+daemon, which keeps the most recent ones in memory for the next runs.
+
+    dmtDaemon watch TOOL [options and inputs of TOOL]
+
+also re-runs the tool whenever one of its inputs changes: the files on
+its command line, and (for asn2dataModel and aadl2glueC) the ones listed
+in the build manifest in its output folder - e.g. the ASN.1 grammars that
+the AADL files refer to. When the inputs were merely touched, and the
+build manifest shows that the tool would generate nothing, the daemon
+doesn't even fork.
+'''
+import os
+import gc
+import sys
+import json
+import time
+import atexit
+import pickle
+import select
+import socket
+import tempfile
+import traceback
+from importlib import import_module
+
+from typing import List, Dict, Tuple, Any, Optional  # NOQA pylint: disable=unused-import
+
+# The client side (run, watch, etc) only needs the standard library: the
+# DMT modules are imported by the daemon, for its client to start quickly.
+
+g_tools = ['asn2dataModel', 'aadl2glueC', 'msgPrinter', 'msgPrinterASN1', 'asn2aadlPlus', 'smp2asn']
+
+# The options of the tools that are followed by something that is not an input
+g_optionsWithValues = ['-o', '-jobs', '--profile', '--outAsn1']
+
+# The tools that keep a build manifest in their output folder - and the
+# options that make them do something even when it says they are up to date
+g_toolsWithManifest = ['asn2dataModel', 'aadl2glueC']
+g_optionsAlwaysRunning = ['-force', '--profile', '-clearCache']
+
+
+def usage() -> None:
+    from .commonPy.utility import panic
+    msg = 'Usage: %s [-socket path] <command>\nWhere command is one of:\n'
+    msg += '\tstart [-interval secs] [-verbose]\tStart the daemon (in the foreground)\n'
+    msg += '\trun TOOL [args...]\t\t\tRun TOOL (one of %s) in the daemon\n' % ", ".join(g_tools)
+    msg += '\twatch TOOL [args...]\t\t\tRun TOOL now, and whenever its inputs change\n'
+    msg += '\tunwatch\t\t\t\t\tForget all the watched runs\n'
+    msg += '\tstatus\t\t\t\t\tReport what the daemon keeps in memory\n'
+    msg += '\tstop\t\t\t\t\tStop the daemon\n'
+    panic(msg % os.path.basename(sys.argv[0]))
+
+
+def DefaultSocket() -> str:
+    return os.path.join(tempfile.gettempdir(), "dmt-daemon-%d.sock" % os.getuid())
+
+
+def ReadMessage(conn: socket.socket) -> Dict[str, Any]:
+    '''Messages are JSON objects, one per line.'''
+    data = b''
+    while not data.endswith(b'\n'):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return json.loads(data.decode('utf-8')) if data.strip() else {}
+
+
+def SendMessage(conn: socket.socket, message: Dict[str, Any]) -> None:
+    conn.sendall(json.dumps(message).encode('utf-8') + b'\n')
+
+
+def CommandLineFiles(cwd: str, argv: List[str]) -> Tuple[List[str], str]:  # pylint: disable=invalid-sequence-index
+    '''The files on the command line of a run, and its output folder.'''
+    files = []  # type: List[str]
+    outputDir = "."
+    skipNext = False
+    for i, arg in enumerate(argv):
+        if skipNext:
+            skipNext = False
+            continue
+        if arg in g_optionsWithValues:
+            skipNext = True
+            if arg == '-o' and i + 1 < len(argv):
+                outputDir = argv[i + 1]
+            continue
+        path = os.path.join(cwd, arg)
+        if os.path.isfile(path):
+            files.append(path)
+    return files, os.path.join(cwd, outputDir)
+
+
+def ManifestFile(tool: str, cwd: str, argv: List[str]) -> str:  # pylint: disable=invalid-sequence-index
+    return os.path.join(CommandLineFiles(cwd, argv)[1], "." + tool + ".manifest")
+
+
+def InputFiles(tool: str, cwd: str, argv: List[str]) -> List[str]:  # pylint: disable=invalid-sequence-index
+    '''The files a run depends on: the ones on its command line, plus the
+inputs recorded in the build manifest of its output folder.'''
+    files = CommandLineFiles(cwd, argv)[0]
+    manifest = ManifestFile(tool, cwd, argv)
+    if os.path.isfile(manifest):
+        try:
+            with open(manifest) as f:
+                files.extend(os.path.join(cwd, x) for x in json.load(f).get('inputs', {}))
+        except (IOError, ValueError):
+            pass
+    return sorted(set(files))
+
+
+def Stamps(files: List[str]) -> Dict[str, Optional[Tuple[int, int]]]:  # pylint: disable=invalid-sequence-index
+    stamps = {}  # type: Dict[str, Optional[Tuple[int, int]]]
+    for f in files:
+        try:
+            st = os.stat(f)
+            stamps[f] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            stamps[f] = None
+    return stamps
+
+
+def RunInChild(tool: str, argv: List[str], cwd: str, env: Dict[str, str], outputFd: int, reportFd: int) -> None:  # pylint: disable=invalid-sequence-index
+    '''Runs the tool in the (forked) child, and reports what it parsed.'''
+    from .commonPy import configMT, asnCache, aadlParser
+    from .commonPy.jobPool import OpenFiles
+    exitCode = 0
+    try:
+        os.dup2(outputFd, 1)
+        os.dup2(outputFd, 2)
+        os.chdir(cwd)
+        os.environ.clear()
+        os.environ.update(env)
+        configMT.asnCacheDir = os.getenv(
+            "DMT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "dmt"))
+        aadlParser.g_keepParsed = True
+        sys.argv = [tool] + argv
+        inheritedFiles = set(id(f) for f in OpenFiles())
+        try:
+            result = import_module('dmt.' + tool).main()
+            exitCode = result if isinstance(result, int) else 0
+        except SystemExit as e:
+            if e.code is None:
+                exitCode = 0
+            elif isinstance(e.code, int):
+                exitCode = e.code
+            else:
+                sys.stderr.write(str(e.code) + "\n")
+                exitCode = 1
+        # Among others, this writes the --profile report
+        atexit._run_exitfuncs()  # pylint: disable=protected-access
+        for f in OpenFiles():
+            if id(f) not in inheritedFiles and not f.closed:
+                f.close()
+    except BaseException:  # pylint: disable=broad-except
+        traceback.print_exc()
+        exitCode = 1
+    try:
+        report = {
+            'asnCache': asnCache.g_used,
+            'digests': asnCache.g_digests,
+            'aadl': aadlParser.g_lastParsed,
+        }
+        with os.fdopen(reportFd, 'wb') as f:
+            pickle.dump(report, f, pickle.HIGHEST_PROTOCOL)
+    except BaseException:  # pylint: disable=broad-except
+        traceback.print_exc()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(exitCode)  # pylint: disable=protected-access
+
+
+class Daemon(object):
+    '''
+Members:
+    _socketPath : where the requests come from
+    _interval   : how often (in seconds) the watched inputs are checked
+    _verbose    : report every run on stdout
+    _listener   : the listening socket
+    _watches    : the watched runs (tool, argv, cwd, env, the stamps of their
+                  inputs, and those of their build manifest after their last
+                  successful run - None if there is none)
+    _started    : when the daemon started
+    _runs       : how many runs it served
+    _skipped    : how many watched runs it found up to date without running
+'''
+
+    def __init__(self, socketPath: str, interval: float, verbose: bool) -> None:
+        self._socketPath = socketPath
+        self._interval = interval
+        self._verbose = verbose
+        self._listener = None  # type: Optional[socket.socket]
+        self._watches = []  # type: List[Dict[str, Any]]
+        self._started = time.time()
+        self._runs = 0
+        self._skipped = 0
+
+    def Preload(self) -> None:
+        '''Import the tools and all their backends, once and for all.'''
+        modules = ['dmt.' + tool for tool in g_tools]
+        dmtDir = os.path.dirname(os.path.abspath(__file__))
+        for package in ['A_mappers', 'B_mappers']:
+            modules.extend(
+                'dmt.' + package + '.' + f[:-3]
+                for f in sorted(os.listdir(os.path.join(dmtDir, package))) if f.endswith('_mapper.py'))
+        for module in modules:
+            try:
+                import_module(module)
+            except Exception as e:  # pylint: disable=broad-except
+                # The runs that need it will report the error
+                if self._verbose:
+                    print("Not preloading %s (%s)" % (module, str(e)))
+        # Keep the collector away from the preloaded objects: otherwise it
+        # touches (and so copies) their pages in every forked child.
+        gc.collect()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+
+    def Serve(self) -> None:
+        from .commonPy.utility import panic
+        if os.path.exists(self._socketPath):
+            try:
+                Request(self._socketPath, {'command': 'status'})
+                panic("A daemon is already listening on %s" % self._socketPath)
+            except OSError:
+                os.unlink(self._socketPath)
+        self.Preload()
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        oldMask = os.umask(0o077)
+        try:
+            self._listener.bind(self._socketPath)
+        finally:
+            os.umask(oldMask)
+        self._listener.listen(8)
+        print("DMT daemon (PID %d) listening on %s" % (os.getpid(), self._socketPath))
+        sys.stdout.flush()
+        try:
+            while True:
+                ready, _, _ = select.select([self._listener], [], [], self._interval)
+                if ready:
+                    conn, _ = self._listener.accept()
+                    with conn:
+                        if not self.Handle(conn):
+                            break
+                self.CheckWatches()
+        finally:
+            self._listener.close()
+            if os.path.exists(self._socketPath):
+                os.unlink(self._socketPath)
+
+    def Handle(self, conn: socket.socket) -> bool:
+        '''Serve one request; returns False when the daemon must stop.'''
+        request = ReadMessage(conn)
+        command = request.get('command')
+        if command in ('run', 'watch'):
+            if request.get('tool') not in g_tools:
+                SendMessage(conn, {'status': 1, 'output': "Unknown tool '%s'\n" % request.get('tool')})
+                return True
+            status, output, report = self.Run(request)
+            SendMessage(conn, {'status': status, 'output': output})
+            if command == 'watch':
+                self._watches = [w for w in self._watches if not SameRun(w, request)]
+                Restamp(request, status)
+                self._watches.append(request)
+            self.Remember(report)
+        elif command == 'unwatch':
+            SendMessage(conn, {'status': 0, 'output': "Stopped watching %d run(s)\n" % len(self._watches)})
+            self._watches = []
+        elif command == 'status':
+            from .commonPy import asnCache, aadlParser
+            lines = [
+                "PID %d, up for %d seconds, %d run(s) served, %d found up to date without running" % (
+                    os.getpid(), time.time() - self._started, self._runs, self._skipped),
+                "%d ASN.1 AST(s) and %d AADL model(s) in memory" % (len(asnCache.g_memory), len(aadlParser.g_memory))]
+            for w in self._watches:
+                lines.append("Watching %d input(s) of: %s %s (in %s)" % (
+                    len(w['stamps']), w['tool'], ' '.join(w['argv']), w['cwd']))
+            SendMessage(conn, {'status': 0, 'output': "\n".join(lines) + "\n"})
+        elif command == 'stop':
+            SendMessage(conn, {'status': 0, 'output': "DMT daemon stopped\n"})
+            return False
+        else:
+            SendMessage(conn, {'status': 1, 'output': "Unknown command '%s'\n" % command})
+        return True
+
+    def Run(self, request: Dict[str, Any]) -> Tuple[int, str, Dict[str, Any]]:
+        '''Run a tool in a forked child; returns its exit code, its output,
+and the report of what it parsed.'''
+        self._runs += 1
+        sys.stdout.flush()
+        sys.stderr.flush()
+        with tempfile.TemporaryFile() as output:
+            reportRead, reportWrite = os.pipe()
+            pid = os.fork()
+            if pid == 0:  # pragma: no cover
+                os.close(reportRead)
+                if self._listener is not None:
+                    self._listener.close()
+                RunInChild(
+                    request['tool'], request['argv'], request['cwd'], request['env'],
+                    output.fileno(), reportWrite)
+            os.close(reportWrite)
+            with os.fdopen(reportRead, 'rb') as f:
+                reportData = f.read()
+            _, status = os.waitpid(pid, 0)
+            output.seek(0)
+            text = output.read().decode('utf-8', errors='replace')
+        try:
+            report = pickle.loads(reportData) if reportData else {}
+        except Exception:  # pylint: disable=broad-except
+            report = {}
+        exitCode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else 1
+        if self._verbose:
+            print("%s %s (in %s): exit code %d" % (request['tool'], ' '.join(request['argv']), request['cwd'], exitCode))
+            sys.stdout.flush()
+        return exitCode, text, report
+
+    def Remember(self, report: Dict[str, Any]) -> None:
+        '''Keep what the child parsed in memory, for the next runs.'''
+        from .commonPy import asnCache, aadlParser
+        asnCache.g_digests.update(report.get('digests', {}))
+        for cacheFile in report.get('asnCache', []):
+            asnCache.Remember(cacheFile)
+        if report.get('aadl') is not None:
+            aadlParser.Remember(*report['aadl'])
+
+    def CheckWatches(self) -> None:
+        for w in self._watches:
+            changed = [f for f, stamp in Stamps(list(w['stamps'].keys())).items() if stamp != w['stamps'][f]]
+            if not changed:
+                continue
+            if self.UpToDate(w):
+                print("%s was touched - %s %s (in %s) is up to date" % (
+                    os.path.relpath(changed[0], w['cwd']), w['tool'], ' '.join(w['argv']), w['cwd']))
+                sys.stdout.flush()
+                self._skipped += 1
+                w['stamps'] = Stamps(list(w['stamps'].keys()))
+                continue
+            print("%s changed - running %s %s (in %s)" % (
+                os.path.relpath(changed[0], w['cwd']), w['tool'], ' '.join(w['argv']), w['cwd']))
+            status, output, report = self.Run(w)
+            sys.stdout.write(output)
+            if status != 0:
+                print("(exit code %d)" % status)
+            sys.stdout.flush()
+            # Only look at the inputs after the run: a tool may well write
+            # to a file on its command line (e.g. asn2aadlPlus)
+            Restamp(w, status)
+            self.Remember(report)
+
+    def UpToDate(self, w: Dict[str, Any]) -> bool:
+        '''Would the watched run generate nothing? That is, is the build
+manifest of its output folder still the one of its last successful run,
+and is everything the manifest depends on unchanged? Checking this here
+spares the fork and the start of the tool, for inputs merely touched
+(saved without changes, checked out again, etc).'''
+        from .commonPy import buildManifest
+        if w.get('manifest') is None or any(arg in w['argv'] for arg in g_optionsAlwaysRunning):
+            return False
+        manifest = ManifestFile(w['tool'], w['cwd'], w['argv'])
+        if Stamps([manifest])[manifest] != w['manifest']:
+            return False
+        return buildManifest.Unchanged(
+            manifest, w['cwd'], CommandLineFiles(w['cwd'], w['argv'])[0], w['env'].get('PATH', ''))
+
+
+def Restamp(w: Dict[str, Any], status: int) -> None:
+    '''Remember the stamps of the inputs of a watched run that just ran - and
+of its build manifest, if it has one and the run succeeded.'''
+    w['stamps'] = Stamps(InputFiles(w['tool'], w['cwd'], w['argv']))
+    manifest = ManifestFile(w['tool'], w['cwd'], w['argv'])
+    w['manifest'] = Stamps([manifest])[manifest] if status == 0 and w['tool'] in g_toolsWithManifest else None
+
+
+def SameRun(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    return (a['tool'], a['argv'], a['cwd']) == (b['tool'], b['argv'], b['cwd'])
+
+
+def Request(socketPath: str, request: Dict[str, Any]) -> Dict[str, Any]:
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with conn:
+        conn.connect(socketPath)
+        SendMessage(conn, request)
+        return ReadMessage(conn)
+
+
+def main() -> None:
+    if not hasattr(os, 'fork') or not hasattr(socket, 'AF_UNIX'):
+        from .commonPy.utility import panic
+        panic("The DMT daemon needs os.fork and Unix sockets")  # pragma: no cover
+    args = sys.argv[1:]
+    socketPath = DefaultSocket()
+    if args[:1] == ['-socket']:
+        if len(args) < 2:
+            usage()
+        socketPath = os.path.abspath(args[1])
+        args = args[2:]
+    if not args:
+        usage()
+    command, args = args[0], args[1:]
+    if command == 'start':
+        interval = 0.5
+        verbose = "-verbose" in args
+        if verbose:
+            args.remove("-verbose")
+        if args[:1] == ['-interval']:
+            try:
+                interval = float(args[1])
+            except (IndexError, ValueError):
+                usage()
+            args = args[2:]
+        if args or interval <= 0:
+            usage()
+        Daemon(socketPath, interval, verbose).Serve()
+        return
+    if command in ('run', 'watch'):
+        if not args:
+            usage()
+        request = {
+            'command': command, 'tool': args[0], 'argv': args[1:],
+            'cwd': os.getcwd(), 'env': dict(os.environ)}  # type: Dict[str, Any]
+    elif command in ('unwatch', 'status', 'stop') and not args:
+        request = {'command': command}
+    else:
+        usage()
+    try:
+        reply = Request(socketPath, request)
+    except OSError as e:
+        from .commonPy.utility import panic
+        panic("Failed to reach the DMT daemon at %s (%s) - start it with '%s start'" % (
+            socketPath, str(e), os.path.basename(sys.argv[0])))
+    sys.stdout.write(reply.get('output', ''))
+    sys.stdout.flush()
+    sys.exit(reply.get('status', 1))
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -31,7 +31,7 @@ import os
 import sys
 import copy
 
-from typing import Tuple, List
+from typing import Set, Tuple, List
 
 from .commonPy import configMT
 from .commonPy.asnAST import sourceSequenceLimit, AsnNode  # NOQA pylint: disable=unused-import
@@ -40,10 +40,12 @@ from .commonPy.asnParser import (  # NOQA pylint: disable=unused-import
     AST_Lookup, AST_Leaftypes,
     Typename, Filename, ParseAsnFileList)
 from .commonPy.utility import inform, panic
+from .commonPy.outputFile import OutputFile
 from .commonPy import cleanupNodes
 from .commonPy.recursiveMapper import RecursiveMapper
 
 from .commonPy import verify
+from .commonPy import profiling
 
 
 def usage():
@@ -51,6 +53,7 @@ def usage():
     msg = 'Usage: {} <options> input1.asn1 [input2.asn1]...\nWhere options are:\n'
     msg += '\t-o dirname\t\tDirectory to place generated files\nAnd one of:\n'
     msg += '\t-verbose\t\tDisplay more debug output\n'
+    msg += '\t--profile report.json\tWrite the time and memory used per phase in report.json\n'
     print(msg.format(sys.argv[0]))
     sys.exit(1)
 
@@ -185,6 +188,7 @@ def main():
     if "-verbose" in sys.argv:
         configMT.verbose = True
         sys.argv.remove("-verbose")
+    profiling.HandleCommandLine("msgPrinterASN1")
 
     if not sys.argv[1:]:
         usage()
@@ -200,6 +204,7 @@ def main():
     for grammar in sys.argv[1:]:
         uniqueASNfiles[grammar] = None
 
+    verifiedTypes = set()  # type: Set[str]
     for asnFile in uniqueASNfiles:
         tmpNames = {}  # Dict[Typename, AsnNode]
         for name in asnParser.g_typesOfFile[asnFile]:
@@ -212,20 +217,21 @@ def main():
         )
 
         inform("Checking that all base nodes have mandatory ranges set in %s..." % asnFile)
-        for node in list(tmpNames.values()):
-            verify.VerifyRanges(node, asnParser.g_names)
+        with profiling.Phase("VerifyRanges"):
+            for nodeTypename in tmpNames:
+                verify.VerifyRanges(nodeTypename, asnParser.g_names, verifiedTypes)
 
     # If some AST nodes must be skipped (for any reason), go learn about them
     badTypes = cleanupNodes.DiscoverBadTypes()
 
-    C_HeaderFile = open(configMT.outputDir + os.sep + "PrintTypesAsASN1.h", "w")
+    C_HeaderFile = OutputFile(configMT.outputDir + os.sep + "PrintTypesAsASN1.h")
     C_HeaderFile.write('#ifndef __PRINTTYPESASASN1_H__\n')
     C_HeaderFile.write('#define __PRINTTYPESASASN1_H__\n\n')
     C_HeaderFile.write('#ifdef __cplusplus\n')
     C_HeaderFile.write('extern "C" {\n')
     C_HeaderFile.write('#endif\n\n')
 
-    C_SourceFile = open(configMT.outputDir + os.sep + "PrintTypesAsASN1.c", "w")
+    C_SourceFile = OutputFile(configMT.outputDir + os.sep + "PrintTypesAsASN1.c")
     C_SourceFile.write('#include <stdio.h>\n\n')
     C_SourceFile.write('#include "PrintTypesAsASN1.h"\n\n')
     C_SourceFile.write('#ifdef __linux__\n')
@@ -265,7 +271,8 @@ def main():
             C_SourceFile.write('    //printf("%%s %s ::= ", paramName);\n' % nodeTypename)
             C_SourceFile.write('    printf("%s ", paramName);\n')
             # C_SourceFile.write('\n'.join(printer.Map('(*pData)', '', node, leafTypeDict, asnParser.g_names)))
-            lines = ["    " + x for x in printer.Map('(*pData)', '', node, leafTypeDict, asnParser.g_names)]
+            with profiling.Phase("Map"):
+                lines = ["    " + x for x in printer.Map('(*pData)', '', node, leafTypeDict, asnParser.g_names)]
             C_SourceFile.write("\n".join(lines))
             C_SourceFile.write('\n#ifdef __linux__\n')
             C_SourceFile.write('    pthread_mutex_unlock(&g_printing_mutex);\n')
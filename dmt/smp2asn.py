@@ -32,11 +32,13 @@ import os
 import sys
 import getopt
 
-from typing import Dict
+from typing import Dict, List  # NOQA pylint: disable=unused-import
 
-from .commonPy import asnParser
+from .commonPy import asnParser, profiling
+from .commonPy.asnAST import CanonicalFormsPerSMP2
 from .commonPy.createInternalTypes import ScanChildren
 from .commonPy.asnParser import AST_Lookup  # NOQA pylint: disable=unused-import
+from .commonPy.outputFile import OutputFile
 from .commonPy.commonSMP2 import (
     info, panic, green, white, red, setVerbosity,
     DashUnderscoreAgnosticDict, ConvertCatalogueToASN_AST)
@@ -53,6 +55,8 @@ def usage(coloredMsg: str="") -> None:
         '  -a, --asn1=asnGrammar.asn        an input ASN.1 grammar to merge with\n'\
         '  -p, --prune                      prune unnamed (inner) SMP2-translation types\n'\
         '  -v, --verbose                    Be more verbose (debugging)\n' \
+        '  --profile=report.json            Write the time and memory used per phase\n' \
+        '                                   in report.json\n' \
         '  -h, --help                       Show this help message\n'
     panic(usageMsg, coloredMsg)
 
@@ -64,6 +68,21 @@ def MergeASN1_AST(smp2AsnAST: AST_Lookup) -> Dict[str, str]:
     typesToAddVerbatim = []
     identicals = {}  # type: Dict[str, str]
     d = asnParser.g_names
+    # Index the existing types on their canonical form - an SMP2 type
+    # then only needs to be compared with the ones that share its form
+    # (and the wildcards), in their original order.
+    forms = CanonicalFormsPerSMP2()
+    existing = []  # type: List[str]
+    candidates = {}  # type: Dict[int, List[str]]
+    for k2, v2 in d.items():
+        if v2._isArtificial:
+            # Avoid mapping to artificially generated inner types
+            # (see last part of VerifyAndFixAST in asnParser)
+            continue
+        existing.append(k2)
+        candidates.setdefault(forms.Get(v2, d), []).append(k2)
+    wildcards = candidates.pop(CanonicalFormsPerSMP2.Wildcard, [])
+    position = {k2: i for i, k2 in enumerate(existing)} if wildcards else {}
     for k, v in smp2AsnAST.items():
         if k in d:
             # Type name exists in both trees - is it the same?
@@ -75,12 +94,15 @@ def MergeASN1_AST(smp2AsnAST: AST_Lookup) -> Dict[str, str]:
                 info(1, green, k, white, "exists and is semantically equivalent.")  # pragma: no cover
         else:
             # Find an identical type if possible
-            for k2, v2 in d.items():
-                if v2._isArtificial:
-                    # Avoid mapping to artificially generated inner types
-                    # (see last part of VerifyAndFixAST in asnParser)
-                    continue
-                if v2.IdenticalPerSMP2(v, d, smp2AsnAST):
+            form = forms.Get(v, smp2AsnAST)
+            if form == CanonicalFormsPerSMP2.Wildcard:
+                toCompare = existing
+            elif wildcards:
+                toCompare = sorted(candidates.get(form, []) + wildcards, key=position.__getitem__)
+            else:
+                toCompare = candidates.get(form, [])
+            for k2 in toCompare:
+                if d[k2].IdenticalPerSMP2(v, d, smp2AsnAST):
                     info(1, green, k, white, "is identical to", red, k2, white)
                     identicals[k] = k2
                     break
@@ -110,7 +132,8 @@ def SaveASN_AST(bPruneUnnamedInnerTASTEtypes: bool, outputAsn1Grammar: str, iden
     d = DashUnderscoreAgnosticDict()
     for k, v in asnParser.g_names.items():
         d[k] = v
-    with open(outputAsn1Grammar, 'w') as f:
+    cache = {}  # type: Dict[int, str]
+    with OutputFile(outputAsn1Grammar) as f:
         f.write('DATAVIEW DEFINITIONS AUTOMATIC TAGS ::= BEGIN\n\n')
         for k, v in d.items():
             if v._isArtificial:
@@ -126,7 +149,7 @@ def SaveASN_AST(bPruneUnnamedInnerTASTEtypes: bool, outputAsn1Grammar: str, iden
                 continue  # pragma: no cover
             f.write('-- From ' + v._asnFilename + ' line ' + str(v._lineno) + '\n')
             f.write(k + ' ::= ')
-            f.write(v.AsASN1(d) + "\n\n")
+            f.write(v.AsASN1(d, cache) + "\n\n")
         for k2, v2 in identicals.items():
             f.write(k2 + ' ::= ' + v2 + '\n\n')
         f.write('END\n')
@@ -136,7 +159,7 @@ def main() -> int:
     try:
         optlist, args = getopt.gnu_getopt(
             sys.argv[1:],
-            "hvpi:a:o:", ['help', 'verbose', 'prune', 'smp2=', 'asn1=', 'outAsn1='])
+            "hvpi:a:o:", ['help', 'verbose', 'prune', 'smp2=', 'asn1=', 'outAsn1=', 'profile='])
     except:
         usage("Invalid parameters passed...")
     inputSmp2Files = args
@@ -155,6 +178,8 @@ def main() -> int:
             bPrune = True
         elif opt in ("-v", "--verbose"):
             verboseLevel += 1
+        elif opt == "--profile":
+            profiling.Enable("smp2asn", arg)
     setVerbosity(verboseLevel)
 
     if not inputSmp2Files:
@@ -170,11 +195,14 @@ def main() -> int:
     if inputAsn1Grammar:
         CheckFileExists(inputAsn1Grammar)
 
-    smp2AsnAST, unused_idToTypeDict = ConvertCatalogueToASN_AST(inputSmp2Files)
+    with profiling.Phase("ConvertCatalogueToASN_AST"):
+        smp2AsnAST, unused_idToTypeDict = ConvertCatalogueToASN_AST(inputSmp2Files)
     if inputAsn1Grammar:
         asnParser.ParseAsnFileList([inputAsn1Grammar])
-    identicals = MergeASN1_AST(smp2AsnAST)
-    SaveASN_AST(bPrune, outputAsn1Grammar, identicals)
+    with profiling.Phase("MergeASN1_AST"):
+        identicals = MergeASN1_AST(smp2AsnAST)
+    with profiling.Phase("SaveASN_AST"):
+        SaveASN_AST(bPrune, outputAsn1Grammar, identicals)
     return 0
 
 
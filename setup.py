@@ -45,6 +45,7 @@ setup(
             'msgPrinter = dmt.msgPrinter:main',
             'msgPrinterASN1 = dmt.msgPrinterASN1:main',
             'smp2asn = dmt.smp2asn:main',
+            'dmtDaemon = dmt.dmtDaemon:main',
             'dmt = dmt.commonPy:print_version'
         ]
     }
@@ -0,0 +1,167 @@
+'''
+Helpers shared by the regression tests (see ../Makefile.Regressions)
+
+Most tests run the tools over the synthetic grammars of the benchmarks,
+with the ASN1SCC stand-in of ../../benchmarks/stand-in first in the
+PATH - so they need neither mono nor ASN1SCC. The tests of the Python
+mapping build it for real (asn2dataModel -toPython, Makefile.python),
+so they need ASN1SCC and gcc.
+'''
+import os
+import sys
+import json
+import atexit
+import shutil
+import tempfile
+import subprocess
+
+from typing import Any, Dict, List, Optional  # NOQA pylint: disable=unused-import
+
+g_testsDir = os.path.abspath(os.path.dirname(__file__))
+g_repoDir = os.path.dirname(os.path.dirname(g_testsDir))
+g_benchDir = os.path.join(g_repoDir, 'benchmarks')
+
+sys.path.insert(0, g_benchDir)
+import synthetic  # NOQA pylint: disable=wrong-import-position
+
+
+# A small grammar with a bit of everything (see WriteGrammar), for the
+# tests that run many backends - the synthetic scenarios are too large
+g_sampleTypes = [
+    ('Mode', ('ENUMERATED', ['idle', 'run', 'halt'])),
+    ('Pt', ('SEQUENCE', [('x', ('INTEGER', 0, 100)), ('ok', ('BOOLEAN',))])),
+    ('Cmd', ('CHOICE', [('go', ('REF', 'Pt')), ('speed', ('REAL', 0, 10)), ('m', ('REF', 'Mode'))])),
+    ('Label', ('OCTET STRING', 1, 10)),
+    ('Batch', ('SEQUENCE', [
+        ('md', ('REF', 'Mode')),
+        ('cmds', ('SEQUENCE OF', 1, 5, ('REF', 'Cmd'))),
+        ('lbl', ('REF', 'Label')),
+        ('flags', ('SEQUENCE OF', 3, 3, ('BOOLEAN',))),
+        ('inner', ('SEQUENCE', [('y', ('REAL', 0, 5)), ('pts', ('SEQUENCE OF', 0, 4, ('REF', 'Pt')))])),
+        ('vals', ('SEQUENCE OF', 0, 6, ('INTEGER', -5, 1000))),
+        ('ws', ('SEQUENCE OF', 2, 2, ('REAL', -1, 1)))])),
+    ('Report', ('SEQUENCE', [
+        ('id', ('INTEGER', 0, 9)),
+        ('pos', ('OPTIONAL', ('REF', 'Pt'))),
+        ('valid', ('OPTIONAL', ('BOOLEAN',)))])),
+]  # type: List[Any]
+
+
+def Check(condition: bool, message: str) -> None:
+    '''Fails the test (exit status 1) if the condition doesn't hold.'''
+    if not condition:
+        print('FAILED:', message)
+        sys.exit(1)
+
+
+def WorkDir(name: str) -> str:
+    '''A scratch folder for the test, removed when it ends.'''
+    workDir = tempfile.mkdtemp(prefix='dmt_test_' + name + '_')
+    atexit.register(shutil.rmtree, workDir, True)
+    return workDir
+
+
+def ToolEnv(workDir: str, standIn: bool = True) -> Dict[str, str]:
+    '''The environment of the tools: this tree first in the PYTHONPATH, the
+ASN1SCC stand-in first in the PATH (unless standIn is False), and a cache
+of parsed ASTs of its own.'''
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [g_repoDir] + [x for x in env.get('PYTHONPATH', '').split(os.pathsep) if x])
+    if standIn:
+        env['PATH'] = os.path.join(g_benchDir, 'stand-in') + os.pathsep + env.get('PATH', '')
+    env['DMT_CACHE_DIR'] = os.path.join(workDir, 'cache')
+    return env
+
+
+def InProcess(workDir: str) -> None:
+    '''Sets up this process like ToolEnv does for the tools, so that the
+test can import dmt and call it directly (call it before importing dmt).'''
+    os.environ.update(ToolEnv(workDir))
+    sys.path.insert(0, g_repoDir)
+
+
+def RunTool(workDir: str, module: str, args: List[str],  # pylint: disable=invalid-sequence-index
+            env: Optional[Dict[str, str]] = None, mustFail: bool = False) -> str:
+    '''Runs "python3 -m module args" in workDir, and returns its output. The
+output folder (-o) is created if needed. Fails the test if the tool fails
+(or, with mustFail, if it doesn't).'''
+    if '-o' in args:
+        os.makedirs(os.path.join(workDir, args[args.index('-o') + 1]), exist_ok=True)
+    cmd = [sys.executable, '-m', module] + args
+    proc = subprocess.Popen(
+        cmd, cwd=workDir, env=env or ToolEnv(workDir),
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = proc.communicate()[0].decode('utf-8', 'replace')
+    if (proc.returncode != 0) != mustFail:
+        print(output)
+        Check(False, '%s %s' % (' '.join(cmd), 'succeeded' if mustFail else 'failed'))
+    return output
+
+
+def Profile(workDir: str, reportFile: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+    '''The phases of a --profile report.'''
+    with open(os.path.join(workDir, reportFile)) as f:
+        return [phase['phase'] for phase in json.load(f)['phases']]
+
+
+def Synthetic(scenario: str, workDir: str) -> Dict[str, List[str]]:  # pylint: disable=invalid-sequence-index
+    '''Writes the grammars and AADL files of a benchmark scenario.'''
+    return synthetic.Generate(scenario, workDir)
+
+
+def WriteGrammar(folder: str, asnFile: str, module: str, types: List[Any]) -> None:  # pylint: disable=invalid-sequence-index
+    '''Writes an ASN.1 module (and the XML AST the stand-in returns for it),
+made of the given (name, type) assignments - see synthetic.Grammar for
+the description of the types.'''
+    params = dict(synthetic.g_defaults)
+    params['types'] = 0
+    grammar = synthetic.Grammar(synthetic.random.Random(0), params, 0)
+    grammar._module = module  # pylint: disable=protected-access
+    grammar._types = types  # pylint: disable=protected-access
+    os.makedirs(folder, exist_ok=True)
+    grammar.WriteASN(os.path.join(folder, asnFile))
+    grammar.WriteXML(os.path.join(folder, asnFile + '.xml'))
+
+
+def PythonMapping(workDir: str, folder: str, structs: bool = False) -> str:
+    '''Builds the Python mapping of g_sampleTypes (module SAMPLE, so the
+classes are in sample_asn.py) in workDir/folder, with the real ASN1SCC:
+asn2dataModel -toPython (-pythonStructs, if structs is set), then its
+Makefile.python. Returns the folder.'''
+    path = os.path.join(workDir, folder)
+    WriteGrammar(path, 'sample.asn', 'SAMPLE', g_sampleTypes)
+    env = ToolEnv(workDir, standIn=False)
+    RunTool(path, 'dmt.asn2dataModel',
+            ['-toPython'] + (['-pythonStructs'] if structs else []) + ['-o', '.', 'sample.asn'], env=env)
+    proc = subprocess.Popen(
+        ['make', '-f', 'Makefile.python'], cwd=path, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = proc.communicate()[0].decode('utf-8', 'replace')
+    Check(proc.returncode == 0, 'the Python mapping was not built:\n' + output)
+    return path
+
+
+def ReadTree(folder: str) -> Dict[str, bytes]:
+    '''The contents of all the files under folder (except the build
+manifests), per relative path.'''
+    contents = {}  # type: Dict[str, bytes]
+    for root, _, files in os.walk(folder):
+        for f in files:
+            if f.endswith('.manifest'):
+                continue
+            path = os.path.join(root, f)
+            with open(path, 'rb') as data:
+                contents[os.path.relpath(path, folder)] = data.read()
+    return contents
+
+
+def CheckSameTree(folderA: str, folderB: str) -> None:
+    treeA, treeB = ReadTree(folderA), ReadTree(folderB)
+    Check(sorted(treeA) == sorted(treeB),
+          'different files in %s and %s: %s' % (
+              folderA, folderB, sorted(set(treeA) ^ set(treeB))))
+    for f in sorted(treeA):
+        Check(treeA[f] == treeB[f], '%s differs in %s and %s' % (f, folderA, folderB))
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
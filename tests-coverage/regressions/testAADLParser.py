@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+'''
+The in-process AADL parser: it fills the aadlAST structures with the
+SUBPROGRAMs, parameters and implementations of a synthetic system, it
+parses the AADL files of tests-coverage, and it rejects unknown data
+types and syntax errors.
+'''
+import io
+import os
+import re
+import contextlib
+
+from typing import Any, Dict, List, Tuple  # NOQA pylint: disable=unused-import
+
+from harness import Check, WorkDir, InProcess, Synthetic
+
+
+def main() -> None:
+    workDir = WorkDir('aadl')
+    files = Synthetic('seqofs', workDir)
+    InProcess(workDir)
+    from dmt.commonPy import aadlParser, aadlAST  # pylint: disable=import-error
+
+    def Parse(folder: str, aadlFiles: List[str], mustFail: bool = False) -> None:  # pylint: disable=invalid-sequence-index
+        failed = False
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            try:
+                aadlParser.ParseAADLfiles([os.path.join(folder, f) for f in aadlFiles])
+            except SystemExit:
+                failed = True
+        Check(failed == mustFail, '%s %s: %s' % (
+            ' '.join(aadlFiles), 'was parsed' if mustFail else 'failed', stderr.getvalue()))
+
+    # What synthetic.py wrote in functions.aadl
+    with open(os.path.join(workDir, 'functions.aadl')) as f:
+        functions = f.read()
+    expected = {}  # type: Dict[str, List[Tuple[str, str, str, str]]]
+    for name, features in re.findall(r'SUBPROGRAM (\w+)\nFEATURES\n(.*?)END', functions, re.S):
+        expected[name] = re.findall(r'(\w+):(IN|OUT) PARAMETER DataView::(\w+) {encoding=>(\w+);}', features)
+    languages = dict(re.findall(r'SUBPROGRAM IMPLEMENTATION (\w+)\.(\w+)', functions))
+    Check(len(expected) == 20, 'the SUBPROGRAMs of functions.aadl were not found')
+
+    Parse(workDir, files['aadl'])
+    Check(sorted(aadlAST.g_apLevelContainers) == sorted(expected), 'wrong SUBPROGRAMs')
+    for name, params in expected.items():
+        sp = aadlAST.g_apLevelContainers[name]
+        Check([p._id for p in sp._params] == [p[0] for p in params], 'wrong parameters of ' + name)
+        for param, (_, direction, typeName, encoding) in zip(sp._params, params):
+            paramClass = aadlAST.InParam if direction == 'IN' else aadlAST.OutParam
+            Check(isinstance(param, paramClass), 'wrong direction of %s.%s' % (name, param._id))
+            Check(isinstance(param._signal, aadlAST.Signal), 'unresolved type of %s.%s' % (name, param._id))
+            signal = (param._signal._asnFilename, param._signal._asnNodename)
+            Check(signal == ('bench0.asn', typeName.replace('_', '-')), 'wrong type of %s.%s' % (name, param._id))
+            Check(param._sourceElement._encoding.upper() == encoding, 'wrong encoding of %s.%s' % (name, param._id))
+    implementations = sorted((name, language, language, name + '_fv') for name, language in languages.items())
+    Check(sorted(tuple(x) for x in aadlAST.g_subProgramImplementations) == implementations,
+          'wrong SUBPROGRAM implementations')
+
+    # The files of tests-coverage (a new parse starts from scratch)
+    testsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for aadlFiles, subprograms in [
+            (['mini_cv.aadl', 'DataView.aadl'], 34),
+            (['mini_cv_vhdl.aadl', 'DataViewVHDL.aadl'], 3),
+            (['model.aadl', 'DD_view.aadl'], 2),
+            (['D_view.aadl'], 0)]:
+        Parse(testsDir, aadlFiles)
+        Check(len(aadlAST.g_apLevelContainers) == subprograms, 'wrong SUBPROGRAMs in ' + aadlFiles[0])
+        Check(len(aadlAST.g_signals) > 0, 'no data types in ' + aadlFiles[-1])
+        for sp in aadlAST.g_apLevelContainers.values():
+            Check(all(isinstance(p._signal, aadlAST.Signal) for p in sp._params), 'unresolved types in ' + sp._id)
+
+    Parse(workDir, ['functions.aadl'], mustFail=True)
+    with open(os.path.join(workDir, 'broken.aadl'), 'w') as f:
+        f.write(functions[:functions.index('END bench_fn0;')])
+    Parse(workDir, ['broken.aadl', 'DataView.aadl'], mustFail=True)
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+'''
+The cache of parsed ASN.1 ASTs: a second run over the same grammar
+reuses the AST instead of invoking ASN1SCC, and generates the same
+code; -noCache, -clearCache and a changed grammar bypass the entry.
+The entries don't keep the XML AST: the OG mapper, that re-creates the
+grammar from it, has ASN1SCC dump it again.
+'''
+import os
+import pickle
+
+from harness import Check, WorkDir, RunTool, Profile, Synthetic, CheckSameTree
+
+
+def Run(workDir: str, output: str, *options: str) -> bool:
+    '''Generates the C mapping, and returns True if ASN1SCC was invoked.'''
+    RunTool(workDir, 'dmt.asn2dataModel',
+            ['-force', '-o', output, '-toC', '--profile', 'report.json'] + list(options) + ['bench0.asn'])
+    return 'ParseAsnFileList/asn1scc' in Profile(workDir, 'report.json')
+
+
+def main() -> None:
+    workDir = WorkDir('cache')
+    Synthetic('deep', workDir)
+    cacheDir = os.path.join(workDir, 'cache', 'asn1')
+
+    Check(Run(workDir, 'first'), 'the first run did not invoke ASN1SCC')
+    Check(len(os.listdir(cacheDir)) == 1, 'the first run did not store its AST')
+    Check(not Run(workDir, 'second'), 'the second run did not reuse the cached AST')
+    CheckSameTree(os.path.join(workDir, 'first'), os.path.join(workDir, 'second'))
+    for entry in os.listdir(cacheDir):
+        with open(os.path.join(cacheDir, entry), 'rb') as f:
+            state = pickle.load(f)
+        Check(not any(x.startswith('g_xmlAST') for x in state), 'the XML AST was stored: %s' % sorted(state))
+    RunTool(workDir, 'dmt.asn2dataModel', ['-o', 'og', '-toOG', 'bench0.asn'])
+    with open(os.path.join(workDir, 'og', 'DataView.pr')) as f:
+        Check('B0_T0 ::=' in f.read(), 'the grammar was not re-created from the cached AST')
+
+    Check(Run(workDir, 'uncached', '-noCache'), '-noCache reused the cached AST')
+    CheckSameTree(os.path.join(workDir, 'first'), os.path.join(workDir, 'uncached'))
+
+    Check(Run(workDir, 'cleared', '-clearCache'), '-clearCache reused the cached AST')
+    Check(not Run(workDir, 'cleared'), 'the AST was not stored again after -clearCache')
+
+    # The key is made from the contents of the grammar
+    with open(os.path.join(workDir, 'bench0.asn'), 'a') as f:
+        f.write('-- changed\n')
+    Check(Run(workDir, 'changed'), 'the AST of the old grammar was reused')
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+'''
+The access paths of the Python mapping (COMMON proxies): the tree of
+AccessPath nodes and their resolved bridge functions are shared by all
+the instances of a type, while the indexes stay with each access; the
+getters keep their result types, and the invalid paths are reported as
+the script wrote them, without breaking the next access.
+'''
+import sys
+
+from harness import Check, WorkDir, PythonMapping
+
+
+def main() -> None:
+    workDir = WorkDir('accessors')
+    sys.path.insert(0, PythonMapping(workDir, 'python'))
+    import DV  # pylint: disable=import-error
+    import Stubs  # pylint: disable=import-error
+    import sample_asn  # pylint: disable=import-error
+    # pylint: disable=protected-access
+
+    a, b = sample_asn.Batch(), sample_asn.Batch()
+    Check(a._root is b._root and a._root is Stubs.COMMON.roots['Batch'], 'the instances do not share their paths')
+    Check(sample_asn.Pt()._root is not a._root, 'two types share their paths')
+
+    # One node per path (the indexes are not part of it), with its C accessor
+    node = a.inner.pts[1].x._path
+    a.Reset()
+    Check(node._Caccessor == 'Batch__inner_pts_iDx_x', 'wrong C accessor: ' + node._Caccessor)
+    Check(b.inner.pts[3].x._path is node, 'the path was formed again')
+    b.Reset()
+
+    # ... and the indexes and values of each instance are its own
+    a.inner.pts.SetLength(2)
+    b.inner.pts.SetLength(2)
+    a.inner.pts[1].x.Set(7)
+    b.inner.pts[0].x.Set(3)
+    for instance, values in [(a, [0, 7]), (b, [3, 0])]:
+        Check([instance.inner.pts[i].x.Get() for i in range(2)] == values, 'wrong values of .inner.pts[].x')
+    Check(set(node._functions) == {'_Get', '_Set'}, 'the bridge functions were not kept: %s' % sorted(node._functions))
+    getter = node._functions['_Get']
+    Check(a.inner.pts[0].x.Get() == 0 and node._functions['_Get'] is getter, 'the getter was resolved again')
+
+    # The result types of the getters, in any order
+    a.ws[0].Set(0.5)
+    a.vals.SetLength(1)
+    a.vals[0].Set(999)
+    a.flags[2].Set(True)
+    for _ in range(2):
+        for value, expected in [
+                (a.ws[0].Get(), 0.5), (a.vals[0].Get(), 999), (a.flags[2].Get(), True), (a.inner.pts[1].x.Get(), 7)]:
+            Check(value == expected and type(value) is type(expected), 'got %r instead of %r' % (value, expected))
+
+    # Saved and restored access paths (as the generated GSER code uses them)
+    a.inner.pts[1]  # pylint: disable=pointless-statement
+    state = a.GetState()
+    a.Reset()
+    a.Reset(state)
+    Check(a.x.Get() == 7, 'the access path was not restored')
+    a.Reset(state)
+    Check(a.ok.Get() is False, 'the access path was not restored twice')
+
+    # Invalid paths: reported, and forgotten
+    for access, path in [
+            (lambda: a.inner.nope.Get(), '.inner.nope'),
+            (lambda: a.cmds[3].bogus[1].Set(2), '.cmds[3].bogus[1]'),
+            (lambda: a.md.SetLength(2), '.md')]:
+        try:
+            access()
+            Check(False, path + ' was accepted')
+        except Stubs.AsnCoderError as e:
+            Check('(%s)' % path in str(e), 'wrong error for %s: %s' % (path, e))
+        a.md.Set(DV.run)
+        Check(a.md.Get() == DV.run, 'the access path was not reset after the error')
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+'''
+The artificial types: when the XML AST tags every type assignment with
+AddedType, ASN1SCC is invoked once and the tagged types are artificial.
+Without the tags, the second (AST version 1) invocation is still made.
+'''
+import os
+import re
+import json
+
+from typing import Tuple  # NOQA pylint: disable=unused-import
+
+from harness import Check, WorkDir, RunTool, WriteGrammar
+
+g_types = [
+    ('My-Int', ('INTEGER', 0, 255)),
+    ('My-Seq', ('SEQUENCE', [('a', ('REF', 'My-Int')), ('b', ('BOOLEAN',))])),
+    ('My-Added', ('SEQUENCE OF', 1, 4, ('REF', 'My-Int'))),
+]
+
+
+def Parse(folder: str) -> Tuple[int, str]:  # pylint: disable=invalid-sequence-index
+    '''Returns the number of ASN1SCC invocations, and the dump of the
+(non-artificial) types.'''
+    RunTool(folder, 'dmt.asn2dataModel',
+            ['-o', 'out', '-toC', '-noCache', '--profile', 'report.json', 'types.asn'])
+    with open(os.path.join(folder, 'report.json')) as f:
+        calls = [
+            phase['calls'] for phase in json.load(f)['phases']
+            if phase['phase'] == 'ParseAsnFileList/asn1scc']
+    dump = RunTool(folder, 'dmt.commonPy.asnParser', ['-testASN1', 'types.asn'])
+    return sum(calls), dump
+
+
+def main() -> None:
+    workDir = WorkDir('artificial')
+
+    untagged = os.path.join(workDir, 'untagged')
+    WriteGrammar(untagged, 'types.asn', 'TYPES', g_types)
+    calls, dump = Parse(untagged)
+    Check(calls == 2, 'ASN1SCC invoked %d times without AddedType tags' % calls)
+    Check('My-Added' in dump, 'a type was marked artificial without AddedType tags')
+
+    tagged = os.path.join(workDir, 'tagged')
+    WriteGrammar(tagged, 'types.asn', 'TYPES', g_types)
+    xmlFile = os.path.join(tagged, 'types.asn.xml')
+    with open(xmlFile) as f:
+        xml = f.read()
+    xml = re.sub(
+        r'<TypeAssignment Name="([^"]*)"',
+        lambda m: '%s AddedType="%s"' % (m.group(0), m.group(1) == 'My-Added'),
+        xml)
+    with open(xmlFile, 'w') as f:
+        f.write(xml)
+    calls, dump = Parse(tagged)
+    Check(calls == 1, 'ASN1SCC invoked %d times with AddedType tags' % calls)
+    Check('My-Added' not in dump, 'the type tagged AddedType="True" is not artificial')
+    Check('My-Seq' in dump, 'a type tagged AddedType="False" is artificial')
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
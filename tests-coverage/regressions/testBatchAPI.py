@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+'''
+The batch API of the C glue (EncodeBatch_* / DecodeBatch_*): the glue of
+a synthetic system is compiled (with gcc) against a stand-in of the
+ASN1SCC types and runtime, and the batches of UPER and NATIVE messages
+must be the per-message encodings back to back (with their length in the
+size_t out-parameter), decode back to the messages (from unaligned
+buffers, too), and report the errors - including the batches that don't
+fit in the buffer.
+'''
+import os
+import re
+import shutil
+import subprocess
+
+from harness import Check, WorkDir, RunTool, Synthetic
+
+# The ASN1SCC runtime and types, as far as C_ASN1_Types.c is concerned:
+# every type is the same structure (with padding), encoded in 12 bytes
+g_runtime = '''
+#include <string.h>
+typedef int flag;
+#define TRUE 1
+#define FALSE 0
+#define STATIC static
+typedef struct { unsigned char *buf; size_t count, max; } BitStream;
+static void BitStream_Init(BitStream *s, void *b, size_t max) { s->buf = b; s->count = 0; s->max = max; }
+static void BitStream_AttachBuffer(BitStream *s, void *b, size_t max) { BitStream_Init(s, b, max); }
+static int BitStream_GetLength(BitStream *s) { return (int) s->count; }
+typedef struct { int id; char tag; double value; } Message;
+static flag EncodeMessage(const Message *p, BitStream *s, int *e)
+{
+    if (p->id < 0 || s->count + 12 > s->max) { *e = 1; return FALSE; }
+    memcpy(s->buf + s->count, &p->id, 4); memcpy(s->buf + s->count + 4, &p->value, 8);
+    s->count += 12;
+    return TRUE;
+}
+static flag DecodeMessage(Message *p, BitStream *s, int *e)
+{
+    if (s->count + 12 > s->max) { *e = 2; return FALSE; }
+    memset(p, 0, sizeof(*p));
+    memcpy(&p->id, s->buf + s->count, 4); memcpy(&p->value, s->buf + s->count + 4, 8);
+    s->count += 12;
+    return TRUE;
+}
+'''
+
+g_type = '''
+typedef Message asn1Scc%(t)s;
+static flag asn1Scc%(t)s_Encode(const asn1Scc%(t)s *p, BitStream *s, int *e, flag c) { (void) c; return EncodeMessage(p, s, e); }
+static flag asn1Scc%(t)s_Decode(asn1Scc%(t)s *p, BitStream *s, int *e) { return DecodeMessage(p, s, e); }
+'''
+
+g_test = '''
+#include <stdio.h>
+#include <stdlib.h>
+#include <stdint.h>
+#include "C_ASN1_Types.h"
+#define CHECK(x) if (!(x)) { printf("FAILED: line %%d: %%s\\n", __LINE__, #x); exit(1); }
+
+int main()
+{
+    asn1Scc%(u)s u[5], u2[5];
+    asn1Scc%(n)s n[5], n2[5];
+    unsigned char batch[1 + 5 * sizeof(asn1Scc%(n)s)], one[64], all[5 * 12];
+    size_t i, total = 0, length = 0;
+    memset(u, 0, sizeof(u)); memset(n, 0, sizeof(n));
+    for (i = 0; i < 5; i++) {
+        u[i].id = n[i].id = (int) i * 7;
+        u[i].value = n[i].value = i / 4.0;
+    }
+
+    /* UPER: the messages back to back */
+    for (i = 0; i < 5; i++) {
+        int size = (int) Encode_UPER_%(u)s(one, sizeof(one), &u[i]);
+        CHECK(size == 12);
+        memcpy(all + total, one, size);
+        total += size;
+    }
+    CHECK(EncodeBatch_UPER_%(u)s(batch, sizeof(batch), u, 5, &length) == 0);
+    CHECK(length == total);
+    CHECK(memcmp(batch, all, total) == 0);
+    CHECK(DecodeBatch_UPER_%(u)s(u2, batch, total, 5) == 0);
+    for (i = 0; i < 5; i++)
+        CHECK(u2[i].id == u[i].id && u2[i].value == u[i].value);
+    CHECK(EncodeBatch_UPER_%(u)s(batch, 4 * 12, u, 5, &length) == -1);
+    CHECK(DecodeBatch_UPER_%(u)s(u2, batch, total - 1, 5) == -1);
+    u[3].id = -1;
+    CHECK(EncodeBatch_UPER_%(u)s(batch, sizeof(batch), u, 5, &length) == -1);
+
+    /* NATIVE: the structures themselves, from any address */
+    CHECK(EncodeBatch_NATIVE_%(n)s(batch + 1, sizeof(batch) - 1, n, 5, &length) == 0);
+    CHECK(length == 5 * sizeof(asn1Scc%(n)s));
+    CHECK(memcmp(batch + 1, n, sizeof(n)) == 0);
+    CHECK(DecodeBatch_NATIVE_%(n)s(n2, batch + 1, sizeof(batch) - 1, 5) == 0);
+    CHECK(memcmp(n, n2, sizeof(n)) == 0);
+    CHECK(EncodeBatch_NATIVE_%(n)s(batch, sizeof(batch), n, 0, &length) == 0 && length == 0);
+
+    /* NATIVE batches that don't fit - even when count * size overflows */
+    length = 1;
+    CHECK(EncodeBatch_NATIVE_%(n)s(batch, 5 * sizeof(asn1Scc%(n)s) - 1, n, 5, &length) == -1);
+    CHECK(EncodeBatch_NATIVE_%(n)s(batch, sizeof(batch), n, SIZE_MAX / 2, &length) == -1);
+    CHECK(length == 1);
+    CHECK(DecodeBatch_NATIVE_%(n)s(n2, batch, 5 * sizeof(asn1Scc%(n)s) - 1, 5) == -1);
+    CHECK(DecodeBatch_NATIVE_%(n)s(n2, batch, sizeof(batch), SIZE_MAX / 2) == -1);
+    return 0;
+}
+'''
+
+
+def main() -> None:
+    compiler = shutil.which('gcc') or shutil.which('cc') or ''
+    Check(compiler != '', 'this test needs a C compiler')
+    workDir = WorkDir('batch')
+    files = Synthetic('seqofs', workDir)
+    RunTool(workDir, 'dmt.aadl2glueC', ['-o', 'glue/C/src'] + files['aadl'])
+    srcDir = os.path.join(workDir, 'glue', 'C', 'src')
+    with open(os.path.join(srcDir, 'C_ASN1_Types.h')) as f:
+        header = f.read()
+    needed = sorted(set(re.findall(r'#ifdef (__NEED_(\w+)_(UPER|NATIVE))\n', header)))
+    Check(any(e == 'UPER' for _, _, e in needed) and any(e == 'NATIVE' for _, _, e in needed),
+          'no UPER and NATIVE glue to test')
+    for function in ['EncodeBatch', 'DecodeBatch']:
+        for _, typename, encoding in needed:
+            Check('%s_%s_%s(' % (function, encoding, typename) in header,
+                  'no %s for %s (%s)' % (function, typename, encoding))
+
+    with open(os.path.join(srcDir, 'C_ASN1_Types.c')) as f:
+        source = f.read()
+    for name, body in re.findall(r'^int ((?:En|De)codeBatch_\w+)\(.*?\n\{\n(.*?)^\}\n', source, re.M | re.S):
+        Check('STATIC' not in body, '%s is not reentrant' % name)
+
+    # C_ASN1_Types.h includes bench0.h and ../../system_config.h
+    with open(os.path.join(workDir, 'glue', 'system_config.h'), 'w') as f:
+        f.write(''.join('#define %s\n' % macro for macro, _, _ in needed))
+    with open(os.path.join(srcDir, 'bench0.h'), 'w') as f:
+        f.write(g_runtime + ''.join(g_type % {'t': t} for t in sorted({t for _, t, _ in needed})))
+    with open(os.path.join(srcDir, 'test.c'), 'w') as f:
+        f.write(g_test % {
+            'u': [t for _, t, e in needed if e == 'UPER'][0],
+            'n': [t for _, t, e in needed if e == 'NATIVE'][0]})
+    cmd = [compiler, '-Wall', '-Werror', '-Wno-unused-function', '-o', 'test', 'test.c', 'C_ASN1_Types.c']
+    proc = subprocess.Popen(cmd, cwd=srcDir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = proc.communicate()[0].decode('utf-8', 'replace')
+    Check(proc.returncode == 0, 'the glue does not compile:\n' + output)
+    proc = subprocess.Popen(['./test'], cwd=srcDir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = proc.communicate()[0].decode('utf-8', 'replace')
+    Check(proc.returncode == 0, 'the batch API failed:\n' + output)
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
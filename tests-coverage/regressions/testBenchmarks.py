@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+'''
+The benchmarks (../../benchmarks): the same scenario and seed always
+generate the same grammars and AADL systems, all the tools run over them
+with the ASN1SCC stand-in, and the stored results compare against
+themselves.
+'''
+import io
+import os
+import json
+import contextlib
+
+from harness import Check, WorkDir, Synthetic, ReadTree, CheckSameTree
+
+import runBenchmarks  # NOQA pylint: disable=wrong-import-order
+import synthetic  # NOQA pylint: disable=wrong-import-order
+
+
+def main() -> None:
+    workDir = WorkDir('bench')
+    first, again, other = [os.path.join(workDir, x) for x in ['first', 'again', 'other']]
+    files = Synthetic('choices', first)
+    Synthetic('choices', again)
+    synthetic.Generate('choices', other, 1)
+    CheckSameTree(first, again)
+    Check(ReadTree(first) != ReadTree(other), 'another seed generated the same files')
+    Check(len(files['asn']) == 1 and len(files['aadl']) == 2, 'wrong files: %s' % files)
+    for asnFile in files['asn']:
+        Check(os.path.isfile(os.path.join(first, asnFile + '.xml')), 'no XML AST for the stand-in next to ' + asnFile)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = runBenchmarks.RunBenchmarks(['seqofs'], 1, 0, False)
+    Check(len(results['runs']) == len(runBenchmarks.g_runs), 'some tools were not run')
+    for run in results['runs']:
+        Check(run['scenario'] == 'seqofs' and run['total']['wall'] > 0, 'bad results of ' + run['tool'])
+        Check(any(p['phase'] == 'ParseAsnFileList' for p in run['phases']), 'no phases for ' + run['tool'])
+
+    resultsFile = os.path.join(workDir, 'results.json')
+    with open(resultsFile, 'w') as f:
+        json.dump(results, f)
+    comparison = io.StringIO()
+    with contextlib.redirect_stdout(comparison):
+        runBenchmarks.Compare(resultsFile, resultsFile)
+    totals = [line for line in comparison.getvalue().splitlines() if ' total wall ' in line]
+    Check(len(totals) == len(results['runs']), 'some runs were not compared')
+    Check(all(line.endswith('1.00x') for line in totals), 'the results differ from themselves')
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+'''
+The generator daemon (dmtDaemon): the runs it serves generate the same
+files as the tools run directly, it keeps the parsed ASTs and AADL models
+in memory, it reports the failures of the tools, it re-runs the watched
+runs when their inputs change (but not when they are merely touched and
+the outputs are up to date), and it stops on request.
+'''
+import os
+import sys
+import time
+import atexit
+import subprocess
+
+from typing import Callable
+
+from harness import Check, WorkDir, ToolEnv, RunTool, WriteGrammar, Synthetic, CheckSameTree, g_sampleTypes
+
+
+def WaitFor(condition: Callable[[], bool], message: str, timeout: float = 30) -> None:
+    deadline = time.time() + timeout
+    while not condition():
+        Check(time.time() < deadline, message)
+        time.sleep(0.1)
+
+
+def main() -> None:
+    workDir = WorkDir('daemon')
+    WriteGrammar(workDir, 'sample.asn', 'SAMPLE', g_sampleTypes)
+    files = Synthetic('seqofs', workDir)
+    socketPath = os.path.join(workDir, 'daemon.sock')
+    daemon = subprocess.Popen(
+        [sys.executable, '-m', 'dmt.dmtDaemon', '-socket', socketPath, 'start', '-interval', '0.2'],
+        cwd=workDir, env=ToolEnv(workDir), stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+    atexit.register(daemon.kill)
+    WaitFor(lambda: os.path.exists(socketPath), 'the daemon did not start')
+
+    def Daemon(*args: str, mustFail: bool = False) -> str:
+        return RunTool(workDir, 'dmt.dmtDaemon', ['-socket', socketPath] + list(args), mustFail=mustFail)
+
+    dataModel = ['-toC', '-toPython', '-toOG', 'sample.asn']
+    RunTool(workDir, 'dmt.asn2dataModel', ['-o', 'direct'] + dataModel)
+    Daemon('run', 'asn2dataModel', '-o', 'daemon1', *dataModel)
+    Daemon('run', 'asn2dataModel', '-o', 'daemon2', *dataModel)
+    for folder in ['daemon1', 'daemon2']:
+        CheckSameTree(os.path.join(workDir, 'direct'), os.path.join(workDir, folder))
+
+    RunTool(workDir, 'dmt.aadl2glueC', ['-o', 'glue'] + files['aadl'])
+    Daemon('run', 'aadl2glueC', '-o', 'daemonGlue1', *files['aadl'])
+    Daemon('run', 'aadl2glueC', '-o', 'daemonGlue2', *files['aadl'])
+    for folder in ['daemonGlue1', 'daemonGlue2']:
+        CheckSameTree(os.path.join(workDir, 'glue'), os.path.join(workDir, folder))
+
+    status = Daemon('status')
+    Check('4 run(s) served' in status, 'wrong number of runs: ' + status)
+    Check('2 ASN.1 AST(s) and 1 AADL model(s) in memory' in status, 'nothing kept in memory: ' + status)
+
+    output = Daemon('run', 'asn2dataModel', '-o', 'bad', '-toC', 'missing.asn', mustFail=True)
+    Check('missing.asn' in output, 'the error of the tool was not reported: ' + output)
+    Daemon('run', 'no-such-tool', mustFail=True)
+
+    # A watched run is repeated when its grammar changes
+    Daemon('watch', 'asn2dataModel', '-o', 'watched', '-toPython', 'sample.asn')
+    Check('Watching' in Daemon('status'), 'the run is not watched')
+    WriteGrammar(workDir, 'sample.asn', 'SAMPLE', g_sampleTypes + [('Extra', ('INTEGER', 0, 7))])
+
+    def Regenerated() -> bool:
+        with open(os.path.join(workDir, 'watched', 'sample_asn.py')) as f:
+            return 'Extra' in f.read()
+    WaitFor(Regenerated, 'the watched run was not repeated')
+
+    # ... but not when the grammar is merely touched
+    runs = Daemon('status').split(' run(s) served')[0].split()[-1]
+    stamp = time.time() + 5
+    os.utime(os.path.join(workDir, 'sample.asn'), (stamp, stamp))
+    WaitFor(lambda: '1 found up to date without running' in Daemon('status'), 'the touched grammar was not checked')
+    Check(' %s run(s) served' % runs in Daemon('status'), 'the up-to-date watched run was run')
+    os.unlink(os.path.join(workDir, 'watched', 'sample_asn.py'))
+    os.utime(os.path.join(workDir, 'sample.asn'))
+    WaitFor(lambda: os.path.exists(os.path.join(workDir, 'watched', 'sample_asn.py')),
+            'the deleted output was not regenerated')
+    Check('Stopped watching 1 run(s)' in Daemon('unwatch'), 'the watched run was not forgotten')
+
+    Check('stopped' in Daemon('stop'), 'the daemon did not acknowledge the stop')
+    Check(daemon.wait(30) == 0, 'the daemon failed')
+    Check(not os.path.exists(socketPath), 'the socket was left behind')
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
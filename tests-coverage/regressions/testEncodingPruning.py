@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+'''
+The encoders and decoders of the asynchronous glue (C_ASN1_Types.[ch],
+OG_ASN1_Types.h) exist only for the (type, encoding) pairs used by the
+parameters of the asynchronous subprograms; -allEncodings generates them
+for all the types and encodings, as before.
+'''
+import os
+import re
+
+from typing import Set, Tuple  # NOQA pylint: disable=unused-import
+
+from harness import Check, WorkDir, RunTool, Synthetic, ReadTree
+
+g_asynchronous = ['C', 'OG', 'Ada']
+
+
+def Pairs(header: bytes) -> Set[Tuple[str, str]]:  # pylint: disable=invalid-sequence-index
+    '''The (type, encoding) pairs of the codecs in C_ASN1_Types.h.'''
+    return set(re.findall(r'#ifdef __NEED_(\w+)_(UPER|ACN|NATIVE)\n', header.decode('utf-8')))
+
+
+def main() -> None:
+    workDir = WorkDir('pruning')
+    files = Synthetic('seqofs', workDir)
+    with open(os.path.join(workDir, 'functions.aadl')) as f:
+        functions = f.read()
+    languages = dict(re.findall(r'SUBPROGRAM IMPLEMENTATION (\w+)\.(\w+)', functions))
+    expected = set()  # type: Set[Tuple[str, str]]
+    for name, features in re.findall(r'SUBPROGRAM (\w+)\nFEATURES\n(.*?)END', functions, re.S):
+        if languages[name] in g_asynchronous:
+            expected |= set(re.findall(r'PARAMETER DataView::(\w+) {encoding=>(\w+);}', features))
+    Check(len(expected) > 1, 'no asynchronous parameters in functions.aadl')
+
+    RunTool(workDir, 'dmt.aadl2glueC', ['-o', 'pruned'] + files['aadl'])
+    RunTool(workDir, 'dmt.aadl2glueC', ['-o', 'all', '-allEncodings'] + files['aadl'])
+    pruned, complete = ReadTree(os.path.join(workDir, 'pruned')), ReadTree(os.path.join(workDir, 'all'))
+    Check(sorted(pruned) == sorted(complete), '-allEncodings generated other files')
+    Check(Pairs(pruned['C_ASN1_Types.h']) == expected, 'wrong encoders in C_ASN1_Types.h: %s' % (
+        sorted(Pairs(pruned['C_ASN1_Types.h']) ^ expected)[:5]))
+    allPairs = Pairs(complete['C_ASN1_Types.h'])
+    typenames = {t for t, _ in allPairs}
+    Check(allPairs == {(t, e) for t in typenames for e in ['UPER', 'ACN', 'NATIVE']},
+          '-allEncodings did not generate all the encodings')
+    Check(expected < allPairs, 'the encoders were not pruned')
+
+    # The rest of the asynchronous codecs shrink, too - the other files are the same
+    for filename in sorted(pruned):
+        if filename in ['C_ASN1_Types.c', 'C_ASN1_Types.h', 'OG_ASN1_Types.h']:
+            Check(len(pruned[filename]) < len(complete[filename]), '%s was not pruned' % filename)
+        else:
+            Check(pruned[filename] == complete[filename], '-allEncodings changed ' + filename)
+    Check('OG_ASN1_Types.h' in pruned, 'no OG glue')
+    og = pruned['OG_ASN1_Types.h'].decode('utf-8')
+    for typename, encoding in sorted(allPairs):
+        for macro in ['ENCODE_%s_%s(' % (encoding, typename), 'DECODE_%s_%s(' % (encoding, typename)]:
+            Check(('#define ' + macro in og) == ((typename, encoding) in expected), 'wrong %s in OG_ASN1_Types.h' % macro)
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
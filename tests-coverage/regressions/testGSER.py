@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+'''
+The GSER (ASN.1 value notation) of the Python mapping, with and without
+-pythonStructs: GSER() writes the normalised text of a value, SetFromGSER
+reads it back to the same value (and encoding), accepts the other
+notations (spacing, 'hex'H and 'bits'B strings, INTEGERs as REALs), and
+reports the invalid texts.
+'''
+import sys
+import subprocess
+
+from typing import Dict, List  # NOQA pylint: disable=unused-import
+
+from harness import Check, WorkDir, PythonMapping
+
+# Prints "label: result" lines - run with each mapping
+g_script = '''
+import sys
+sys.path.insert(0, sys.argv[1])
+import DV, Stubs, sample_asn
+
+def Encoded(value, size):
+    stream = sample_asn.DataStream(size)
+    value.Encode(stream)
+    return stream.GetPyString()
+
+b = sample_asn.Batch()
+b.md.Set(DV.halt)
+b.cmds.SetLength(3)
+b.cmds[0].kind.Set(DV.go_PRESENT)
+b.cmds[0].go.x.Set(42)
+b.cmds[0].go.ok.Set(True)
+b.cmds[1].kind.Set(DV.speed_PRESENT)
+b.cmds[1].speed.Set(9.75)
+b.cmds[2].kind.Set(DV.m_PRESENT)
+b.cmds[2].m.Set(DV.run)
+b.lbl.SetFromPyString('say "hi"')
+b.flags[0].Set(True)
+b.flags[2].Set(True)
+b.inner.y.Set(1.5)
+b.inner.pts.SetLength(2)
+b.inner.pts[1].x.Set(100)
+b.inner.pts[1].ok.Set(True)
+b.vals.SetFromArray([-5, 0, 1000, 7, 8, 9])
+b.ws.SetFromArray([-1.0, 0.25])
+text = b.GSER()
+print('write:', text)
+c = sample_asn.Batch()
+c.SetFromGSER(text)
+print('read:', c.GSER() == text)
+print('encoded:', Encoded(c, DV.Batch_REQUIRED_BYTES_FOR_ENCODING) == Encoded(b, DV.Batch_REQUIRED_BYTES_FOR_ENCODING))
+
+c.SetFromGSER(""" {md idle,cmds{go:{x 1,ok FALSE}},
+    lbl '48656c6C 6F'H, flags {TRUE,FALSE,TRUE}, inner { y 3, pts {} },
+    vals { }, ws { 1e0, -.5 } } """)
+print('notations:', c.GSER(), c.lbl.GetPyString())
+c.SetFromGSER("{ md run, cmds { m: halt, speed: 0 }, lbl '0100000101'B, flags { FALSE, FALSE, FALSE }, inner { y 0, pts { { x 3, ok TRUE } } }, vals { 3 }, ws { 1, -1 } }")
+print('bits:', c.GSER())
+
+m, p, cmd, label = sample_asn.Mode(), sample_asn.Pt(), sample_asn.Cmd(), sample_asn.Label()
+for value, text in [(m, 'run'), (p, '{ x 100, ok TRUE }'), (cmd, 'go: { x 5, ok FALSE }'), (label, '"abc"')]:
+    value.SetFromGSER(text)
+    print('type:', value.GSER())
+
+for text in [
+        '{ md idle }',
+        '{ md walk, ',
+        '{ md idle, cmds { }, lbl "x", flags { TRUE, TRUE, TRUE }, inner { y 0, pts { } }, vals { }, ws { 1, 1 } }',
+        '{ md idle, cmds { m: halt }, lbl "", flags { TRUE, TRUE, TRUE }, inner { y 0, pts { } }, vals { }, ws { 1, 1 } }',
+        '{ md idle, cmds { m: halt }, lbl "x", flags { TRUE, TRUE }, inner { y 0, pts { } }, vals { }, ws { 1, 1 } }',
+        '{ md idle, cmds { m: halt }, lbl "x", flags { TRUE, TRUE, TRUE }, inner { y 0, pts { } }, vals { 1, 2, 3, 4, 5, 6, 7 }, ws { 1, 1 } }',
+        '{ md idle, cmds { z: halt }, lbl "x", flags { TRUE, TRUE, TRUE }, inner { y 0, pts { } }, vals { }, ws { 1, 1 } }',
+        '{ md idle, cmds { m: halt }, lbl "x", flags { TRUE, TRUE, TRUE }, inner { y 0, pts { } }, vals { }, ws { 1, 1 } } x',
+        '{ md idle, cmds { m: halt }, lbl "x", flags { TRUE, 1, TRUE }, inner { y 0, pts { } }, vals { }, ws { 1, 1 } }',
+        '']:
+    try:
+        c.SetFromGSER(text)
+        print('error: accepted', text)
+    except Stubs.AsnCoderError as e:
+        print('error:', e)
+'''
+
+g_expected = {
+    'write': [
+        '{ md halt, cmds { go: { x 42, ok TRUE }, speed: 9.75, m: run }, lbl "say ""hi""", flags { TRUE, FALSE, TRUE }, '
+        'inner { y 1.5, pts { { x 0, ok FALSE }, { x 100, ok TRUE } } }, vals { -5, 0, 1000, 7, 8, 9 }, ws { -1.0, 0.25 } }'],
+    'read': ['True'],
+    'encoded': ['True'],
+    'notations': [
+        '{ md idle, cmds { go: { x 1, ok FALSE } }, lbl "Hello", flags { TRUE, FALSE, TRUE }, '
+        'inner { y 3.0, pts { } }, vals { }, ws { 1.0, -0.5 } } Hello'],
+    'bits': [
+        '{ md run, cmds { m: halt, speed: 0.0 }, lbl "A@", flags { FALSE, FALSE, FALSE }, '
+        'inner { y 0.0, pts { { x 3, ok TRUE } } }, vals { 3 }, ws { 1.0, -1.0 } }'],
+    'type': ['run', '{ x 100, ok TRUE }', 'go: { x 5, ok FALSE }', '"abc"'],
+    'error': [
+        "Invalid GSER value: expected ',', at '}' (token 4)",
+        "Invalid GSER value: unknown enumerant, at 'walk' (token 3)",
+        "Invalid GSER value: too few elements, at '}' (token 7)",
+        "Invalid GSER value: 0 bytes, instead of 1 to 10, at '\"\"' (token 13)",
+        "Invalid GSER value: too few elements, at '}' (token 20)",
+        "Invalid GSER value: more than 6 elements, at ',' (token 47)",
+        "Invalid GSER value: unknown alternative, at ':' (token 8)",
+        "Invalid GSER value: unexpected text after the value, at 'x' (token 45)",
+        "Invalid GSER value: expected TRUE or FALSE, at '1' (token 19)",
+        'Invalid GSER value: the text is incomplete, at the end of the text'],
+}  # type: Dict[str, List[str]]
+
+
+def main() -> None:
+    workDir = WorkDir('gser')
+    for folder, structs in [('common', False), ('structs', True)]:
+        path = PythonMapping(workDir, folder, structs)
+        proc = subprocess.Popen(
+            [sys.executable, '-c', g_script, path], cwd=path, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        output = proc.communicate()[0].decode('utf-8', 'replace')
+        Check(proc.returncode == 0, 'the script failed with the %s mapping:\n%s' % (folder, output))
+        results = {}  # type: Dict[str, List[str]]
+        for line in output.splitlines():
+            label, _, result = line.partition(': ')
+            results.setdefault(label, []).append(result)
+        for label in sorted(g_expected):
+            for result, expected in zip(results.get(label, []), g_expected[label]):
+                Check(result == expected, '%s mapping, %s:\n%s\ninstead of\n%s' % (folder, label, result, expected))
+            Check(len(results.get(label, [])) == len(g_expected[label]), '%s mapping, %s: %s' % (
+                folder, label, results.get(label)))
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
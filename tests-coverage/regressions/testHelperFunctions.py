@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+'''
+aadl2glueC -helpers: the glue that maps the named types through helper
+functions is smaller, each helper is defined once and before its calls,
+and replacing the calls by the bodies of the helpers gives back the glue
+generated without -helpers. The files without helpers are unchanged.
+'''
+import os
+import re
+
+from typing import Any, Dict, List, Tuple  # NOQA pylint: disable=unused-import
+
+from harness import Check, WorkDir, RunTool, Synthetic, ReadTree
+
+g_definition = re.compile(r'static void (\w+)\(const \w+ \*pSrc, \w+ \*pDst\)\n\{\n(.*?)\}\n\n', re.S)
+g_call = re.compile(r'^([ \t]*)(\w+)\(&(.*), &(.*)\);\n$')
+
+
+def Inline(text: str) -> Tuple[str, Dict[str, List[str]]]:  # pylint: disable=invalid-sequence-index
+    '''The text with the calls of the helpers replaced by their bodies -
+and the bodies of the helpers.'''
+    helpers = {}  # type: Dict[str, List[str]]
+    allNames = {name for name, _ in g_definition.findall(text)}
+
+    def Define(match: Any) -> str:
+        Check(match.group(1) not in helpers, match.group(1) + ' is defined twice')
+        body = match.group(2).splitlines(True)
+        for line in body:
+            for callee in re.findall(r'(\w+)\(&', line):
+                Check(callee in helpers or callee not in allNames, callee + ' is called before its definition')
+        helpers[match.group(1)] = [line[4:] for line in body]
+        return ''
+
+    def Expand(lines: List[str]) -> List[str]:  # pylint: disable=invalid-sequence-index
+        result = []  # type: List[str]
+        for line in lines:
+            match = g_call.match(line)
+            if match and match.group(2) in helpers:
+                indent, name, src, dest = match.groups()
+                body = [x.replace('(*pSrc)', src).replace('(*pDst)', dest) for x in helpers[name]]
+                result.extend(indent + x if x.strip() else x for x in Expand(body))
+            else:
+                result.append(line)
+        return result
+
+    text = g_definition.sub(Define, text)
+    return ''.join(Expand(text.splitlines(True))), helpers
+
+
+def main() -> None:
+    workDir = WorkDir('helpers')
+    files = Synthetic('deep', workDir)
+    RunTool(workDir, 'dmt.aadl2glueC', ['-o', 'plain'] + files['aadl'])
+    RunTool(workDir, 'dmt.aadl2glueC', ['-o', 'helpers', '-helpers'] + files['aadl'])
+    plain, helpers = ReadTree(os.path.join(workDir, 'plain')), ReadTree(os.path.join(workDir, 'helpers'))
+    Check(sorted(plain) == sorted(helpers), '-helpers generated other files')
+
+    withHelpers = 0
+    for f in sorted(plain):
+        if plain[f] == helpers[f]:
+            continue
+        Check(f.endswith('_Simulink.Simulink.c'), '-helpers changed ' + f)
+        Check(len(helpers[f]) < len(plain[f]), '-helpers made %s bigger' % f)
+        text, functions = Inline(helpers[f].decode('utf-8'))
+        Check(len(functions) > 0, 'no helpers in ' + f)
+        Check(text == plain[f].decode('utf-8'), 'the helpers of %s do not expand to the glue without them' % f)
+        withHelpers += 1
+    Check(withHelpers > 0, '-helpers changed nothing')
+
+    # The manifest knows about -helpers
+    RunTool(workDir, 'dmt.aadl2glueC', ['-o', 'plain', '-helpers'] + files['aadl'])
+    Check(ReadTree(os.path.join(workDir, 'plain')) == helpers, 'the glue was not regenerated for -helpers')
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+'''
+The build manifest: a second run with the same inputs generates nothing
+and touches nothing, a new backend or a changed grammar only re-runs what
+depends on it, a modified output or -force regenerates everything (but
+other files in the output folder, e.g. build products, don't), and the
+incremental outputs are always the same as those of a fresh run.
+'''
+import os
+import json
+
+from typing import Dict  # NOQA pylint: disable=unused-import
+
+from harness import Check, WorkDir, RunTool, WriteGrammar, Synthetic, Profile, CheckSameTree, g_sampleTypes
+
+
+def Timestamps(folder: str) -> Dict[str, int]:
+    result = {}  # type: Dict[str, int]
+    for root, _, files in os.walk(folder):
+        for f in files:
+            if not f.endswith('.manifest'):
+                path = os.path.join(root, f)
+                result[os.path.relpath(path, folder)] = os.stat(path).st_mtime_ns
+    return result
+
+
+def Backends(workDir: str, reportFile: str) -> set:
+    '''The backends that ran, according to a --profile report.'''
+    return {phase.split('/')[0] for phase in Profile(workDir, reportFile) if phase.startswith('backend ')}
+
+
+def main() -> None:
+    workDir = WorkDir('manifest')
+    WriteGrammar(workDir, 'sample.asn', 'SAMPLE', g_sampleTypes)
+    out = os.path.join(workDir, 'out')
+
+    def DataModel(report: str, *args: str) -> str:
+        return RunTool(workDir, 'dmt.asn2dataModel', ['-o', 'out', '--profile', report] + list(args) + ['sample.asn'])
+
+    DataModel('first.json', '-toC', '-toPython')
+    Check(Backends(workDir, 'first.json') == {'backend C', 'backend python'}, 'the backends did not run')
+    before = Timestamps(out)
+    output = DataModel('again.json', '-verbose', '-toC', '-toPython')
+    Check('All outputs are up to date' in output, 'the outputs are not up to date: ' + output)
+    Check(not Backends(workDir, 'again.json'), 'backends ran again for nothing')
+    Check('ParseAsnFileList' not in Profile(workDir, 'again.json'), 'the grammar was parsed for nothing')
+    Check(Timestamps(out) == before, 'outputs were touched for nothing')
+
+    # Only the new backend runs - and the build products (or the files of
+    # other tools) in the output folder are not taken for outputs
+    products = ['sample.o', os.path.join('build', 'libsample.so')]
+    os.mkdir(os.path.join(out, 'build'))
+    for product in products:
+        with open(os.path.join(out, product), 'w') as f:
+            f.write('built')
+    DataModel('og.json', '-toC', '-toPython', '-toOG')
+    Check(Backends(workDir, 'og.json') == {'backend OG'}, 'wrong backends: %s' % Backends(workDir, 'og.json'))
+    Check(all(Timestamps(out)[f] == t for f, t in before.items()), 'outputs of up-to-date backends were touched')
+    with open(os.path.join(out, '.asn2dataModel.manifest')) as f:
+        recorded = json.load(f)['outputs']
+    Check(all(f in recorded for f in before), 'outputs missing from the manifest')
+    Check(not any(product in recorded for product in products), 'build products in the manifest')
+    for product in products:
+        with open(os.path.join(out, product), 'w') as f:
+            f.write('rebuilt')
+    output = DataModel('products.json', '-verbose', '-toC', '-toPython', '-toOG')
+    Check('All outputs are up to date' in output, 'rebuilt products regenerated the outputs: ' + output)
+    for product in products:
+        os.unlink(os.path.join(out, product))
+    os.rmdir(os.path.join(out, 'build'))
+
+    # A modified output: everything is regenerated
+    modified = sorted(f for f in before if f.endswith('.c'))[0]
+    with open(os.path.join(out, modified), 'a') as f:
+        f.write('/* edited */\n')
+    DataModel('edited.json', '-toC', '-toPython', '-toOG')
+    Check(len(Backends(workDir, 'edited.json')) == 3, 'the edited output was not regenerated')
+    with open(os.path.join(out, modified)) as f:
+        Check('edited' not in f.read(), '%s was not regenerated' % modified)
+
+    # -force regenerates everything, but doesn't touch the unchanged outputs
+    before = Timestamps(out)
+    DataModel('force.json', '-force', '-toC', '-toPython', '-toOG')
+    Check(len(Backends(workDir, 'force.json')) == 3, '-force did not regenerate everything')
+    Check(Timestamps(out) == before, 'outputs regenerated with the same contents were touched')
+
+    # A changed grammar: the backends re-run, and the result is that of a fresh run
+    WriteGrammar(workDir, 'sample.asn', 'SAMPLE', g_sampleTypes + [('Extra', ('INTEGER', 0, 7))])
+    DataModel('changed.json', '-toC', '-toPython', '-toOG')
+    Check(len(Backends(workDir, 'changed.json')) == 3, 'the changed grammar was not regenerated')
+    RunTool(workDir, 'dmt.asn2dataModel', ['-o', 'fresh', '-toC', '-toPython', '-toOG', 'sample.asn'])
+    # (the Python backend never overwrites its copy of the grammar, manifest or not)
+    for folder in [out, os.path.join(workDir, 'fresh')]:
+        os.unlink(os.path.join(folder, 'sample.asn'))
+    CheckSameTree(out, os.path.join(workDir, 'fresh'))
+
+    # aadl2glueC: only the glue of the changed SUBPROGRAM is regenerated
+    glueDir = os.path.join(workDir, 'glue')
+    files = Synthetic('seqofs', glueDir)
+    RunTool(glueDir, 'dmt.aadl2glueC', ['-o', 'out'] + files['aadl'])
+    before = Timestamps(os.path.join(glueDir, 'out'))
+    output = RunTool(glueDir, 'dmt.aadl2glueC', ['-o', 'out', '-verbose', '--profile', 'again.json'] + files['aadl'])
+    Check('All outputs are up to date' in output, 'the glue is not up to date: ' + output)
+    Check('ParseAADL' not in Profile(glueDir, 'again.json'), 'the AADL files were parsed for nothing')
+
+    functions = os.path.join(glueDir, 'functions.aadl')
+    with open(functions) as f:
+        aadl = f.read()
+    with open(functions, 'w') as f:
+        f.write(aadl.replace('"bench_fn1_fv"', '"bench_fn1_other"'))
+    output = RunTool(glueDir, 'dmt.aadl2glueC', ['-o', 'out', '-verbose'] + files['aadl'])
+    Check('Glue of bench_fn7.Simulink is up to date' in output, 'the unchanged glue was regenerated')
+    after = Timestamps(os.path.join(glueDir, 'out'))
+    Check(any(after[f] != t for f, t in before.items() if f.startswith('bench_fn1_')),
+          'the glue of the changed SUBPROGRAM was not regenerated')
+    Check(all(after[f] == t for f, t in before.items() if f.startswith('bench_fn7_')),
+          'the glue of an unchanged SUBPROGRAM was touched')
+    RunTool(glueDir, 'dmt.aadl2glueC', ['-o', 'fresh'] + files['aadl'])
+    CheckSameTree(os.path.join(glueDir, 'out'), os.path.join(glueDir, 'fresh'))
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
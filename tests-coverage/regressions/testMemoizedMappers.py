@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+'''
+The dispatch and memoization of RecursiveMapper.Map: the node classes
+(and their subclasses) map to the right methods, and the glue generated
+with the memoizing mappers is the same as without the memo.
+'''
+import os
+import sys
+import subprocess
+
+from harness import Check, WorkDir, ToolEnv, InProcess, RunTool, Synthetic, CheckSameTree
+
+# Runs aadl2glueC with the memo of all the mappers disabled
+g_withoutMemo = '''
+import os, sys, runpy
+from importlib import import_module
+import dmt
+from dmt.commonPy import recursiveMapper
+for package in ['A_mappers', 'B_mappers']:
+    folder = os.path.join(os.path.dirname(dmt.__file__), package)
+    for f in sorted(os.listdir(folder)):
+        if f.endswith('_mapper.py'):
+            import_module('dmt.' + package + '.' + f[:-3])
+pending = [recursiveMapper.RecursiveMapperGeneric]
+while pending:
+    cls = pending.pop()
+    cls.memoize = False
+    pending.extend(cls.__subclasses__())
+sys.argv = ['aadl2glueC'] + sys.argv[1:]
+runpy.run_module('dmt.aadl2glueC', run_name='__main__')
+'''
+
+
+def main() -> None:
+    workDir = WorkDir('memo')
+    files = Synthetic('deep', workDir)
+    RunTool(workDir, 'dmt.aadl2glueC', ['-o', 'memo'] + files['aadl'])
+    os.makedirs(os.path.join(workDir, 'plain'))
+    status = subprocess.call(
+        [sys.executable, '-c', g_withoutMemo, '-o', 'plain'] + files['aadl'],
+        cwd=workDir, env=ToolEnv(workDir))
+    Check(status == 0, 'aadl2glueC failed without the memo')
+    CheckSameTree(os.path.join(workDir, 'memo'), os.path.join(workDir, 'plain'))
+
+    InProcess(workDir)
+    from dmt.commonPy import recursiveMapper, asnAST  # pylint: disable=import-error
+
+    class SubInt(asnAST.AsnInt):  # pylint: disable=too-few-public-methods
+        pass
+    for nodeClass, method in [
+            (asnAST.AsnInt, 'MapInteger'), (SubInt, 'MapInteger'), (asnAST.AsnSequenceOf, 'MapSequenceOf'),
+            (asnAST.AsnSetOf, 'MapSetOf'), (asnAST.AsnChoice, 'MapChoice'), (asnAST.AsnMetaMember, None)]:
+        Check(recursiveMapper.MapMethod(nodeClass) == method, 'wrong method for ' + nodeClass.__name__)
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
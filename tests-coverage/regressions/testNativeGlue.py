@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+'''
+The NATIVE-encoded parameters of the synchronous glue: the mapping works
+on the buffer of the caller when it is aligned for the ASN1SCC type, or
+else on a local (not STATIC) copy of it - copied from (decoders) or to
+(encoders) the buffer with memcpy. The size of the buffer is checked
+first.
+'''
+import os
+import re
+
+from typing import Set, Tuple  # NOQA pylint: disable=unused-import
+
+from harness import Check, WorkDir, RunTool, Synthetic, ReadTree
+
+g_function = re.compile(
+    r'^int (Convert_From_(\w+?)_To_(\w+?)_In_\w+)\(void \*pBuffer, size_t (\w+)\)\n\{\n(.*?)^\}\n', re.M | re.S)
+
+
+def main() -> None:
+    workDir = WorkDir('native')
+    files = Synthetic('seqofs', workDir)
+    RunTool(workDir, 'dmt.aadl2glueC', ['-o', 'glue'] + files['aadl'])
+    checked = set()  # type: Set[Tuple[str, bool]]
+    for f, contents in sorted(ReadTree(os.path.join(workDir, 'glue')).items()):
+        if not f.endswith('.c'):
+            continue
+        for name, source, destination, size, body in g_function.findall(contents.decode('utf-8')):
+            if 'native' not in (source, destination):
+                continue
+            typename = destination if source == 'native' else source
+            var, pointer = 'var_' + typename, 'pVar_' + typename
+            Check('STATIC' not in body, '%s has a STATIC variable in %s' % (name, f))
+            Check(var + '.' not in body, '%s maps the copy instead of the pointer in %s' % (name, f))
+            const = 'const ' if source == 'native' else ''
+            declarations = '    asn1Scc%s %s;\n    %sasn1Scc%s *%s = &%s;\n' % (typename, var, const, typename, pointer, var)
+            Check(body.startswith(declarations), '%s has no local copy in %s' % (name, f))
+            assertion = body.find('    assert(%s >= sizeof(asn1Scc%s));\n' % (size, typename))
+            aligned = body.find(
+                '    if (((uintptr_t)pBuffer %% _Alignof(asn1Scc%s)) == 0)\n'
+                '        %s = (%sasn1Scc%s *) pBuffer;\n' % (typename, pointer, const, typename))
+            mapping = body.find('(*%s).' % pointer)
+            Check(0 < assertion < aligned < mapping, '%s does not use the aligned buffer after a size check in %s' % (name, f))
+            if source == 'native':
+                copy = body.find('    else\n        memcpy(&%s, pBuffer, sizeof(asn1Scc%s) );\n' % (var, typename))
+                Check(aligned < copy < mapping, '%s does not copy the unaligned buffer first in %s' % (name, f))
+            else:
+                copy = body.find('    if (%s == &%s)\n        memcpy(pBuffer, &%s, sizeof(asn1Scc%s) );\n' % (pointer, var, var, typename))
+                Check(body.rfind('(*%s).' % pointer) < copy, '%s does not copy to the unaligned buffer last in %s' % (name, f))
+                Check('    return sizeof(asn1Scc%s);\n' % typename in body[copy:], '%s returns the wrong size in %s' % (name, f))
+            Check('#include <stdint.h>\n' in contents.decode('utf-8'), 'no uintptr_t in ' + f)
+            checked.add((f.split('.')[-2], source == 'native'))
+    for language in ['Simulink', 'QGenC', 'SCADE6']:
+        Check((language, True) in checked and (language, False) in checked, 'no NATIVE glue for ' + language)
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
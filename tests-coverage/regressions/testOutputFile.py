@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+'''
+OutputFile, the buffered output files of the code generators: the text
+reaches the disk on flush/close (or at exit), a file whose contents don't
+change keeps its timestamp, and - without any build manifest to help -
+the tools leave the unchanged outputs of an earlier run untouched.
+'''
+import os
+import shutil
+
+from typing import Dict  # NOQA pylint: disable=unused-import
+
+from harness import Check, WorkDir, InProcess, RunTool, WriteGrammar, Synthetic, g_sampleTypes
+
+g_old = 1000000000 * 10 ** 9  # 2001, in ns
+
+
+def Age(folder: str) -> Dict[str, int]:
+    '''Sets the timestamps of all the files under folder to g_old, and
+removes the build manifests.'''
+    result = {}  # type: Dict[str, int]
+    for root, _, files in os.walk(folder):
+        for f in files:
+            path = os.path.join(root, f)
+            if f.endswith('.manifest'):
+                os.unlink(path)
+            else:
+                os.utime(path, ns=(g_old, g_old))
+                result[os.path.relpath(path, folder)] = g_old
+    return result
+
+
+def main() -> None:
+    workDir = WorkDir('output')
+    InProcess(workDir)
+    from dmt.commonPy.outputFile import OutputFile, CloseAll  # pylint: disable=import-error
+
+    def Contents(filename: str) -> str:
+        with open(filename) as f:
+            return f.read()
+
+    # Created (empty) right away, written on close
+    name = os.path.join(workDir, 'a.txt')
+    f = OutputFile(name)
+    Check(os.path.isfile(name) and Contents(name) == '', 'the file was not created')
+    f.write('Hello ')
+    f.write('world\n')
+    Check(Contents(name) == '' and f.getvalue() == 'Hello world\n', 'the text was written too early')
+    f.close()
+    Check(Contents(name) == 'Hello world\n', 'the text was not written on close')
+    try:
+        f.write('more')
+        Check(False, 'a closed file was written into')
+    except ValueError:
+        pass
+
+    # Same contents: untouched; new contents: rewritten (on flush, too)
+    os.utime(name, ns=(g_old, g_old))
+    f = OutputFile(name)
+    print('Hello world', file=f)
+    f.close()
+    Check(os.stat(name).st_mtime_ns == g_old, 'a file with the same contents was touched')
+    f = OutputFile(name)
+    f.write('Hello')
+    Check(os.stat(name).st_mtime_ns == g_old, 'the file was touched before the first flush')
+    f.flush()
+    Check(Contents(name) == 'Hello' and os.stat(name).st_mtime_ns != g_old, 'the flush wrote nothing')
+    f.write(' again')
+    f.close()
+    Check(Contents(name) == 'Hello again', 'the text written after the flush was lost')
+
+    # A file that is not text is replaced
+    with open(name, 'wb') as binary:
+        binary.write(b'\xff\xfe\x00')
+    f = OutputFile(name)
+    f.write('text')
+    f.close()
+    Check(Contents(name) == 'text', 'a binary file was not replaced')
+
+    # The files never closed are written at exit
+    unclosed = OutputFile(os.path.join(workDir, 'b.txt'))
+    unclosed.write('at exit')
+    CloseAll()
+    Check(Contents(os.path.join(workDir, 'b.txt')) == 'at exit', 'an unclosed file was not written')
+
+    # The tools: the outputs of a run (without its build manifest) are
+    # left untouched by the same run
+    WriteGrammar(workDir, 'sample.asn', 'SAMPLE', g_sampleTypes)
+    files = Synthetic('seqofs', workDir)
+    for module, args in [
+            ('dmt.asn2dataModel', ['-toOG', '-toRTDS', '-toSIMULINK', 'sample.asn']),
+            ('dmt.aadl2glueC', files['aadl'])]:
+        RunTool(workDir, module, ['-o', 'out'] + args)
+        before = Age(os.path.join(workDir, 'out'))
+        Check(len(before) >= 3, '%s generated nothing' % module)
+        RunTool(workDir, module, ['-o', 'out'] + args)
+        for output in sorted(before):
+            Check(os.stat(os.path.join(workDir, 'out', output)).st_mtime_ns == g_old, '%s touched %s' % (module, output))
+        shutil.rmtree(os.path.join(workDir, 'out'))
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+'''
+asn2dataModel -jobs: running the backends in parallel generates the same
+files as the serial run - including the backends that modify the AST
+(Simulink, QGenC), which still run in order in the main process.
+'''
+import os
+
+from harness import Check, WorkDir, RunTool, WriteGrammar, CheckSameTree, g_sampleTypes
+
+# SCADE6 is left out, since its OIDs are random; SMP2, SQL and SQLAlchemy
+# (serial or not) fail when combined with the backends that add types
+g_backends = [
+    '-toC', '-toOG', '-toPython', '-toRTDS', '-toSIMULINK', '-toVdm', '-toAda', '-toQGenAda', '-toQGenC']
+
+
+def main() -> None:
+    workDir = WorkDir('jobs')
+    WriteGrammar(workDir, 'sample.asn', 'SAMPLE', g_sampleTypes)
+    RunTool(workDir, 'dmt.asn2dataModel', ['-o', 'serial'] + g_backends + ['sample.asn'])
+    for jobs in ['2', '4']:
+        RunTool(workDir, 'dmt.asn2dataModel', ['-o', 'jobs' + jobs, '-jobs', jobs] + g_backends + ['sample.asn'])
+        CheckSameTree(os.path.join(workDir, 'serial'), os.path.join(workDir, 'jobs' + jobs))
+    Check(len(os.listdir(os.path.join(workDir, 'serial'))) > len(g_backends), 'the backends generated nothing')
+
+    output = RunTool(workDir, 'dmt.asn2dataModel', ['-o', 'bad', '-jobs', '0', '-toC', 'sample.asn'], mustFail=True)
+    Check('positive number' in output, '-jobs 0 was not reported: ' + output)
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
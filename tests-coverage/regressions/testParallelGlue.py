@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+'''
+aadl2glueC -jobs: generating the synchronous glue of the subprograms in
+parallel creates the same files as the serial run, for all the backends
+of the synthetic systems (Simulink, SCADE6, QGenC, C, OG and Ada).
+'''
+import os
+
+from harness import Check, WorkDir, RunTool, Synthetic, CheckSameTree
+
+
+def main() -> None:
+    workDir = WorkDir('glue_jobs')
+    files = Synthetic('seqofs', workDir)
+    RunTool(workDir, 'dmt.aadl2glueC', ['-o', 'serial'] + files['aadl'])
+    RunTool(workDir, 'dmt.aadl2glueC', ['-o', 'jobs', '-jobs', '4'] + files['aadl'])
+    CheckSameTree(os.path.join(workDir, 'serial'), os.path.join(workDir, 'jobs'))
+    generated = os.listdir(os.path.join(workDir, 'serial'))
+    for language in ['Simulink', 'SCADE6', 'QGenC']:
+        Check(any(language in f for f in generated), 'no %s glue was generated' % language)
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
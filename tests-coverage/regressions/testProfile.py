@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+'''
+The --profile report of the tools: its JSON structure, the phases of the
+parser and the backends, and (with -jobs) the phases of the workers that
+are merged into the report of the main process.
+'''
+import os
+import json
+
+from typing import Any, Dict  # NOQA pylint: disable=unused-import
+
+from harness import Check, WorkDir, RunTool, WriteGrammar, Synthetic, Profile, g_sampleTypes
+
+
+def CheckReport(workDir: str, reportFile: str, tool: str) -> Dict[str, Any]:
+    '''Checks the structure of a report, and returns its phases per name.'''
+    with open(os.path.join(workDir, reportFile)) as f:
+        report = json.load(f)
+    Check(report['tool'] == tool, 'wrong tool in the report: ' + report['tool'])
+    Check(report['total']['wall'] > 0, 'no total time in the report')
+    phases = {}  # type: Dict[str, Any]
+    for phase in report['phases']:
+        for field in ['calls', 'wall', 'cpu', 'maxRSS_KB']:
+            Check(field in phase, 'no %s in phase %s' % (field, phase['phase']))
+        Check(phase['calls'] > 0 and phase['wall'] >= 0, 'bad numbers in phase ' + phase['phase'])
+        phases[phase['phase']] = phase
+    Check(Profile(workDir, reportFile) == sorted(phases), 'the phases are not sorted')
+    Check('ParseAsnFileList' in phases, 'no parser phase in ' + reportFile)
+    return phases
+
+
+def main() -> None:
+    workDir = WorkDir('profile')
+    WriteGrammar(workDir, 'sample.asn', 'SAMPLE', g_sampleTypes)
+    backends = ['-toOG', '-toPython', '-toRTDS']
+    RunTool(workDir, 'dmt.asn2dataModel', ['-o', 'serial', '--profile', 'serial.json'] + backends + ['sample.asn'])
+    serial = CheckReport(workDir, 'serial.json', 'asn2dataModel')
+    for name in ['ParseAsnFileList/asn1scc', 'ParseAsnFileList/xml', 'ParseAsnFileList/cacheStore']:
+        Check(name in serial, 'no %s phase in the first run' % name)
+    for backend in ['OG', 'python', 'RTDS']:
+        for callback in ['', '/OnStartup', '/OnSequence', '/OnShutdown']:
+            Check('backend ' + backend + callback in serial, 'no phase for backend %s%s' % (backend, callback))
+
+    # The AST now comes from the cache; the backends run in the workers, but
+    # their phases are in the report all the same
+    RunTool(workDir, 'dmt.asn2dataModel',
+            ['-o', 'jobs', '-jobs', '2', '--profile', 'jobs.json'] + backends + ['sample.asn'])
+    jobs = CheckReport(workDir, 'jobs.json', 'asn2dataModel')
+    Check('ParseAsnFileList/cacheLoad' in jobs, 'no cacheLoad phase in the second run')
+    for name, phase in serial.items():
+        if name.startswith('backend '):
+            Check(name in jobs, 'the phase %s of the workers is missing' % name)
+            Check(jobs[name]['calls'] == phase['calls'], 'wrong number of calls of ' + name)
+
+    files = Synthetic('seqofs', workDir)
+    RunTool(workDir, 'dmt.aadl2glueC', ['-o', 'glue', '--profile', 'glue.json'] + files['aadl'])
+    glue = CheckReport(workDir, 'glue.json', 'aadl2glueC')
+    for name in ['ParseAADL', 'backend c_B_mapper', 'backend simulink_B_mapper/OnShutdown']:
+        Check(name in glue, 'no %s phase in the report of aadl2glueC' % name)
+
+    output = RunTool(workDir, 'dmt.asn2dataModel', ['-o', 'bad', '-toC', 'sample.asn', '--profile'], mustFail=True)
+    Check('JSON report' in output, 'the missing report filename was not reported: ' + output)
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
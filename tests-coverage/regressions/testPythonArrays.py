@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+'''
+GetArray and SetFromArray, the bulk access to the SEQUENCE OFs of
+BOOLEAN/INTEGER/REAL (and to the OCTET STRINGs) of the Python mapping:
+SetFromArray sets the length (when it is variable) and all the elements,
+GetArray is a view of the data themselves that outlives its proxy, and
+the other paths and the arrays that don't fit are reported.
+'''
+import gc
+import sys
+
+from typing import Any, List  # NOQA pylint: disable=unused-import
+
+from harness import Check, WorkDir, PythonMapping
+
+
+def Values(values: Any) -> List[Any]:  # pylint: disable=invalid-sequence-index
+    '''The elements of a NumPy array, or (without NumPy) of a ctypes array.'''
+    return list(values.tolist() if hasattr(values, 'tolist') else values)
+
+
+def main() -> None:
+    workDir = WorkDir('arrays')
+    sys.path.insert(0, PythonMapping(workDir, 'python'))
+    import Stubs  # pylint: disable=import-error
+    import sample_asn  # pylint: disable=import-error
+
+    b = sample_asn.Batch()
+
+    # Variable size: the length follows the values, from any sequence
+    for values in [[-5, 0, 1000], (1, 2), range(6), []]:
+        b.vals.SetFromArray(values)
+        Check(b.vals.GetLength() == len(values), 'wrong length after SetFromArray(%r)' % (values,))
+        Check([b.vals[i].Get() for i in range(len(values))] == list(values), 'wrong values after SetFromArray(%r)' % (values,))
+        Check(Values(b.vals.GetArray()) == list(values), 'wrong GetArray after SetFromArray(%r)' % (values,))
+
+    # Fixed size
+    b.ws.SetFromArray([-1.0, 0.25])
+    Check(b.ws.GetLength() == 2 and [b.ws[0].Get(), b.ws[1].Get()] == [-1.0, 0.25], 'wrong REALs')
+    b.flags.SetFromArray([True, False, True])
+    Check([b.flags[i].Get() for i in range(3)] == [True, False, True], 'wrong BOOLEANs')
+    Check([bool(x) for x in Values(b.flags.GetArray())] == [True, False, True], 'wrong GetArray of BOOLEANs')
+
+    # OCTET STRINGs
+    b.lbl.SetFromArray([0, 34, 255])
+    Check(b.lbl.GetPyString() == '\x00"\xff', 'wrong OCTET STRING after SetFromArray')
+    Check(Values(b.lbl.GetArray()) == [0, 34, 255], 'wrong GetArray of an OCTET STRING')
+
+    # GetArray is a view, in both directions
+    b.vals.SetFromArray([1, 2, 3])
+    view = b.vals.GetArray()
+    b.vals[1].Set(77)
+    Check(Values(view) == [1, 77, 3], 'GetArray copied the data')
+    view[0] = 9
+    Check(b.vals[0].Get() == 9, 'the view of GetArray is not the data')
+
+    # ... that keeps the data alive
+    owner = sample_asn.Batch()
+    owner.ws.SetFromArray([0.5, -0.5])
+    view = owner.ws.GetArray()
+    del owner
+    gc.collect()
+    sample_asn.Batch().ws.SetFromArray([0.75, 0.75])
+    Check(Values(view) == [0.5, -0.5], 'the data of the view were released')
+
+    # Errors: reported, nothing changed, the next access works
+    for access, error in [
+            (lambda: b.vals.SetFromArray(range(7)), "7 elements don't fit"),
+            (lambda: b.ws.SetFromArray([0.0] * 3), "3 elements don't fit"),
+            (lambda: b.cmds.GetArray(), 'not a SEQUENCE OF BOOLEAN/INTEGER/REAL/ENUMERATED'),
+            (lambda: b.inner.SetFromArray([1]), 'not a SEQUENCE OF BOOLEAN/INTEGER/REAL/ENUMERATED')]:
+        try:
+            access()
+            Check(False, 'no error: ' + error)
+        except Stubs.AsnCoderError as e:
+            Check(error in str(e), 'wrong error: %s instead of %s' % (e, error))
+        Check(Values(b.vals.GetArray()) == [9, 77, 3] and b.ws[0].Get() == -1.0, 'the arrays were changed: ' + error)
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
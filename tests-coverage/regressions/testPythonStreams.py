@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+'''
+The bulk copies of the Python mapping: DataStream.SetFromPyString and
+GetPyString, and the SetFromPyString/GetPyString of the OCTET STRINGs,
+copy whole buffers - all the byte values, given as str or bytes - and an
+encoded message comes back intact from the str of its stream.
+'''
+import sys
+import ctypes
+
+from harness import Check, WorkDir, PythonMapping
+
+
+def main() -> None:
+    workDir = WorkDir('pystreams')
+    sys.path.insert(0, PythonMapping(workDir, 'python'))
+    import DV  # pylint: disable=import-error
+    import Stubs  # pylint: disable=import-error
+    import sample_asn  # pylint: disable=import-error
+
+    allBytes = ''.join(chr(i) for i in range(256))
+
+    # The data of a DataStream land in its buffer, as str or as bytes
+    for data in [allBytes, allBytes[::-1].encode('latin-1')]:
+        stream = sample_asn.DataStream(512)
+        stream.SetFromPyString(data)
+        buffer = ctypes.string_at(Stubs.GetBitstreamBuffer(stream._bs), 256)  # pylint: disable=protected-access
+        Check(buffer == Stubs.AsBytes(data), 'DataStream.SetFromPyString did not copy the data')
+
+    # OCTET STRINGs, as types and as fields
+    label, batch = sample_asn.Label(), sample_asn.Batch()
+    for start in range(0, 256, 10):
+        chunk = allBytes[start:start + 10]
+        label.SetFromPyString(chunk)
+        Check(label.GetLength() == len(chunk) and label.GetPyString() == chunk, 'Label lost %r' % chunk)
+        batch.lbl.SetFromPyString(chunk.encode('latin-1'))
+        Check(batch.lbl.GetLength() == len(chunk) and batch.lbl.GetPyString() == chunk, 'Batch.lbl lost %r' % chunk)
+    batch.md.Set(DV.halt)
+    Check(batch.md.Get() == DV.halt, 'the access path was not reset after GetPyString')
+
+    # An encoded message, through the str of its stream
+    batch.cmds.SetLength(2)
+    batch.cmds[0].kind.Set(DV.go_PRESENT)
+    batch.cmds[0].go.x.Set(100)
+    batch.cmds[0].go.ok.Set(True)
+    batch.cmds[1].kind.Set(DV.speed_PRESENT)
+    batch.cmds[1].speed.Set(2.5)
+    batch.lbl.SetFromPyString('\x00"\xff')
+    batch.inner.y.Set(4.0)
+    batch.vals.SetLength(1)
+    batch.vals[0].Set(-5)
+    stream = sample_asn.DataStream(DV.Batch_REQUIRED_BYTES_FOR_ENCODING)
+    batch.Encode(stream)
+    encoded = stream.GetPyString()
+    length = Stubs.GetStreamCurrentLength(stream._bs)  # pylint: disable=protected-access
+    Check(0 < len(encoded) == length, 'DataStream.GetPyString returned %d bytes instead of %d' % (len(encoded), length))
+    Check(encoded.encode('latin-1') == ctypes.string_at(Stubs.GetBitstreamBuffer(stream._bs), length),  # pylint: disable=protected-access
+          'DataStream.GetPyString did not return the encoded data')
+    for data in [encoded, encoded.encode('latin-1')]:
+        copy = sample_asn.DataStream(DV.Batch_REQUIRED_BYTES_FOR_ENCODING)
+        copy.SetFromPyString(data)
+        decoded = sample_asn.Batch()
+        decoded.Decode(copy)
+        Check(decoded.GSER() == batch.GSER(), 'the message was not decoded back:\n%s\n%s' % (decoded.GSER(), batch.GSER()))
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+'''
+asn2dataModel -toPython -pythonStructs: the STRUCT proxies, that work on
+the ctypes layouts of DV_Layout.py, behave as the COMMON ones (that call
+the C getters and setters) - the same script gives the same results, the
+same encodings and the same GSER with both mappings. A layout that does
+not match its ASN1SCC struct is reported.
+'''
+import os
+import sys
+import subprocess
+
+from harness import Check, WorkDir, PythonMapping
+
+# Run with each mapping (they can't share a process: each Stubs.py loads
+# the _getset.so next to it); the transcript must be the same
+g_script = '''
+import sys
+sys.path.insert(0, sys.argv[1])
+import DV, Stubs, sample_asn
+
+def Values(values):
+    # A NumPy array, or (without NumPy) a ctypes array
+    return list(values.tolist() if hasattr(values, 'tolist') else values)
+
+def Try(label, action):
+    try:
+        print(label, repr(action()))
+    except Stubs.AsnCoderError:
+        print(label, 'AsnCoderError')
+
+b = sample_asn.Batch()
+b.md.Set(DV.halt)
+b.cmds.SetLength(3)
+b.cmds[0].kind.Set(DV.go_PRESENT)
+b.cmds[0].go.x.Set(42)
+b.cmds[0].go.ok.Set(True)
+b.cmds[1].kind.Set(DV.speed_PRESENT)
+b.cmds[1].speed.Set(9.75)
+b.cmds[2].kind.Set(DV.m_PRESENT)
+b.cmds[2].m.Set(DV.run)
+b.lbl.SetFromPyString('a"\\x00\\xff')
+b.flags[0].Set(True)
+b.flags[2].Set(1)
+b.inner.y.Set(1.5)
+b.inner.pts.SetLength(2)
+b.inner.pts[1].x.Set(100)
+b.inner.pts[1].ok.Set(True)
+b.vals.SetFromArray([-5, 0, 1000])
+b.ws.SetFromArray([-1.0, 0.25])
+for label, action in [
+        ('md', lambda: b.md.Get()),
+        ('cmds', lambda: b.cmds.GetLength()),
+        ('cmds[0]', lambda: (b.cmds[0].kind.Get(), b.cmds[0].go.x.Get(), b.cmds[0].go.ok.Get())),
+        ('cmds[1]', lambda: (b.cmds[1].kind.Get(), b.cmds[1].speed.Get())),
+        ('cmds[2]', lambda: (b.cmds[2].kind.Get(), b.cmds[2].m.Get())),
+        ('lbl', lambda: (b.lbl.GetLength(), b.lbl.GetPyString())),
+        ('flags', lambda: (b.flags.GetLength(), [b.flags[i].Get() for i in range(3)], Values(b.flags.GetArray()))),
+        ('inner', lambda: (b.inner.y.Get(), b.inner.pts.GetLength(), b.inner.pts[1].x.Get(), b.inner.pts[1].ok.Get())),
+        ('vals', lambda: (b.vals.GetLength(), b.vals[2].Get(), Values(b.vals.GetArray()))),
+        ('ws', lambda: (b.ws.GetLength(), Values(b.ws.GetArray()))),
+        ('GSER', lambda: b.GSER()),
+        ('nope', lambda: b.nope.Get()),
+        ('zz', lambda: b.cmds[0].go.zz.Set(1)),
+        ('array of CHOICEs', lambda: b.cmds.GetArray()),
+        ('too many', lambda: b.vals.SetFromArray(range(7))),
+        ('after the errors', lambda: (b.md.Get(), b.vals.GetLength()))]:
+    Try(label, action)
+
+# Saved and restored access paths
+b.inner.pts[1]
+state = b.GetState()
+b.Reset()
+b.Reset(state)
+print('state', b.x.Get())
+
+# The encoding, and back
+stream = sample_asn.DataStream(DV.Batch_REQUIRED_BYTES_FOR_ENCODING)
+b.Encode(stream)
+encoded = stream.GetPyString()
+print('encoded', encoded.encode('latin-1').hex())
+copy = sample_asn.DataStream(DV.Batch_REQUIRED_BYTES_FOR_ENCODING)
+copy.SetFromPyString(encoded)
+c = sample_asn.Batch()
+c.Decode(copy)
+print('decoded', c.GSER())
+
+# GSER, and the other types
+c.SetFromGSER('{ md idle, cmds { m: halt }, lbl \\'0A0b\\'H, flags { TRUE, TRUE, FALSE }, inner { y 0, pts { } }, vals { 3 }, ws { 1, -1 } }')
+print('SetFromGSER', c.GSER(), c.cmds[0].m.Get(), c.lbl.GetPyString(), c.inner.pts.GetLength())
+m, p, label, cmd = sample_asn.Mode(), sample_asn.Pt(), sample_asn.Label(), sample_asn.Cmd()
+m.Set(DV.run)
+p.x.Set(7)
+label.SetFromPyString(b'xyz')
+cmd.kind.Set(DV.speed_PRESENT)
+cmd.speed.Set(0.5)
+print('types', m.Get(), m.GSER(), p.x.Get(), p.GSER(), label.GetPyString(), label.GSER(), cmd.GSER())
+
+# The bits of the OPTIONAL fields that are present
+r = sample_asn.Report()
+r.id.Set(3)
+r.pos.x.Set(5)
+r.exist.pos.Set(1)
+print('exist', r.exist.pos.Get(), r.exist.valid.Get())
+r.exist.valid.Set(1)
+r.exist.pos.Set(0)
+print('exist', r.exist.pos.Get(), r.exist.valid.Get(), r.id.Get(), r.pos.x.Get())
+'''
+
+# Only for the STRUCT mapping: the check of the layouts
+g_layoutScript = '''
+import sys
+sys.path.insert(0, sys.argv[1])
+import DV_Layout, Stubs
+
+def Try(nodeTypeName, layout):
+    Stubs.STRUCT.checked.discard(nodeTypeName)
+    try:
+        Stubs.STRUCT(nodeTypeName, layout)
+        print(nodeTypeName, 'accepted')
+    except Stubs.AsnCoderError as e:
+        print(nodeTypeName, e)
+
+Try('Report', DV_Layout.Report)
+Try('Batch', DV_Layout.Pt)
+# The same size, but not the same offsets
+Try('Pt', Stubs.SEQUENCE(('ok', DV_Layout.flag), ('x', DV_Layout.asn1SccSint)))
+'''
+
+
+def Run(script: str, folder: str) -> str:
+    proc = subprocess.Popen(
+        [sys.executable, '-c', script, folder], cwd=folder, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = proc.communicate()[0].decode('utf-8', 'replace')
+    Check(proc.returncode == 0, 'the script failed in %s:\n%s' % (folder, output))
+    return output
+
+
+def main() -> None:
+    workDir = WorkDir('structs')
+    common = PythonMapping(workDir, 'common')
+    structs = PythonMapping(workDir, 'structs', structs=True)
+    Check(os.path.isfile(os.path.join(structs, 'DV_Layout.py')), 'no DV_Layout.py')
+    with open(os.path.join(structs, 'sample_getset.h')) as f:
+        Check('Batch__md_Get' not in f.read(), 'the STRUCT mapping has the C getters')
+
+    expected, actual = Run(g_script, common), Run(g_script, structs)
+    for lineA, lineB in zip(expected.splitlines(), actual.splitlines()):
+        Check(lineA == lineB, 'the mappings differ:\nCOMMON: %s\nSTRUCT: %s' % (lineA, lineB))
+    Check(expected == actual, 'the mappings differ:\nCOMMON:\n%s\nSTRUCT:\n%s' % (expected, actual))
+    Check(expected.count('AsnCoderError') == 4, 'wrong errors:\n' + expected)
+
+    with open(os.path.join(structs, 'DV_Layout.py')) as f:
+        Check('("exist", SEQUENCE(("pos", c_uint, 1), ("valid", c_uint, 1)))' in f.read(), 'no exist field in DV_Layout.py')
+    output = Run(g_layoutScript, structs)
+    Check('Report accepted' in output, 'the layout of Report was not accepted: ' + output)
+    for nodeTypeName in ['Batch', 'Pt']:
+        Check(nodeTypeName + ' The layout of' in output and output.count('does not match its ASN1SCC struct') == 2,
+              'the wrong layout of %s was not reported: %s' % (nodeTypeName, output))
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+'''
+The merge of SMP2 catalogues into the ASN.1 AST: on the synthetic types
+of benchmarks/smp2Merge.py, the canonical forms index finds the same
+identical types as the pairwise scan of all the types, and identical
+types share their canonical form - also for the records that are
+identical to the ones they are a prefix of, and for the ones without
+members, that are identical to all the records.
+'''
+from typing import Any, Dict  # NOQA pylint: disable=unused-import
+
+from harness import Check, WorkDir, InProcess
+
+
+def main() -> None:
+    InProcess(WorkDir('smp2'))
+    from dmt import smp2asn  # pylint: disable=import-error
+    from dmt.commonPy import asnParser, asnAST  # pylint: disable=import-error
+    import smp2Merge  # pylint: disable=import-error
+    wildcard = asnAST.CanonicalFormsPerSMP2.Wildcard
+
+    def Scan(smp2AsnAST: Dict[str, Any]) -> Dict[str, str]:
+        '''The identical types found by a pairwise scan of all the types.'''
+        names = asnParser.g_names
+        expected = {}  # type: Dict[str, str]
+        for k, v in smp2AsnAST.items():
+            for k2, v2 in names.items():
+                if v2.IdenticalPerSMP2(v, names, smp2AsnAST):
+                    expected[k] = k2
+                    break
+        return expected
+
+    for seed in [1, 2, 3]:
+        asnParser.g_names = {}
+        smp2Merge.SyntheticTypes('Asn', 400, seed, asnParser.g_names, False)
+        smp2AsnAST = {}  # type: Dict[str, Any]
+        smp2Merge.SyntheticTypes('Smp', 200, seed, smp2AsnAST, True)
+        moreTypes = {}  # type: Dict[str, Any]
+        smp2Merge.SyntheticTypes('Other', 200, seed + 10, moreTypes, True)
+        smp2AsnAST.update(moreTypes)
+
+        names = asnParser.g_names
+        forms = asnAST.CanonicalFormsPerSMP2()
+        expected = Scan(smp2AsnAST)
+        for k, k2 in expected.items():
+            Check(forms.Get(smp2AsnAST[k], smp2AsnAST) == forms.Get(names[k2], names),
+                  '%s and %s are identical, but have different canonical forms' % (k, k2))
+        Check(len(expected) >= 200, 'the SMP2 types made from the same seed are not identical')
+        Check(smp2asn.MergeASN1_AST(smp2AsnAST) == expected,
+              'the indexed merge and the pairwise scan disagree (seed %d)' % seed)
+
+    def Record(**members: Any) -> Any:
+        return asnAST.AsnSequence(members=sorted(members.items()))
+
+    # A record is identical to the ones it is a prefix of (its members are
+    # compared up to the shorter list), and one without members to all
+    short = Record(a=asnAST.AsnInt(range=[0, 10]))
+    longer = Record(a=asnAST.AsnInt(range=[0, 10]), b=asnAST.AsnBool())
+    Check(short.IdenticalPerSMP2(longer, {}, {}) and longer.IdenticalPerSMP2(short, {}, {}),
+          'a SEQUENCE is not identical to the ones it is a prefix of')
+    forms = asnAST.CanonicalFormsPerSMP2()
+    Check(forms.Get(short, {}) == forms.Get(longer, {}), 'a SEQUENCE and its prefix have different canonical forms')
+    Check(forms.Get(Record(), {}) == wildcard, 'a SEQUENCE without members is not a wildcard')
+
+    # ... so the first one of the grammar that is identical must be found
+    asnParser.g_names = {
+        'Flag': asnAST.AsnBool(),
+        'Longer': Record(a=asnAST.AsnInt(range=[0, 10]), b=asnAST.AsnBool()),
+        'Empty': Record(),
+        'Short': Record(a=asnAST.AsnInt(range=[0, 10])),
+        'Empties': asnAST.AsnSequenceOf(range=[1, 4], containedType='Empty')}
+    smp2Short = Record(a=asnAST.AsnInt(range=[0, 10]))
+    smp2AsnAST = {
+        'SmpShort': smp2Short,
+        'SmpOther': Record(x=asnAST.AsnReal(range=[0.0, 1.0])),
+        'SmpEmpty': Record(),
+        'SmpShorts': asnAST.AsnSequenceOf(range=[1, 4], containedType=smp2Short),
+        'SmpFlags': asnAST.AsnSequenceOf(range=[1, 4], containedType=asnAST.AsnBool())}
+    expected = Scan(smp2AsnAST)
+    Check(expected == {'SmpShort': 'Longer', 'SmpOther': 'Empty', 'SmpEmpty': 'Longer', 'SmpShorts': 'Empties'},
+          'unexpected results of the pairwise scan: %s' % expected)
+    identicals = smp2asn.MergeASN1_AST(smp2AsnAST)
+    Check(identicals == expected, 'the indexed merge found %s instead of %s' % (identicals, expected))
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+'''
+The __slots__ of the AST nodes: the nodes of a parsed grammar carry no
+per-instance __dict__, and survive the copies and pickling that the
+parser and the AST cache apply to them; members never set stay missing,
+and unknown constructor options are still rejected.
+'''
+import os
+import copy
+import pickle
+
+from typing import Any, List, Set  # NOQA pylint: disable=unused-import
+
+from harness import Check, WorkDir, InProcess, Synthetic
+
+
+def Nodes(node: Any, seen: Set[int], result: List[Any]) -> None:  # pylint: disable=invalid-sequence-index
+    if id(node) in seen:
+        return
+    seen.add(id(node))
+    result.append(node)
+    for member in getattr(node, '_members', []):
+        if not isinstance(member[1], (int, str)):
+            Nodes(member[1], seen, result)
+    contained = getattr(node, '_containedType', None)
+    if contained is not None and not isinstance(contained, str):
+        Nodes(contained, seen, result)
+
+
+def main() -> None:
+    workDir = WorkDir('slots')
+    Synthetic('deep', workDir)
+    InProcess(workDir)
+    from dmt.commonPy import asnParser, asnAST, configMT  # pylint: disable=import-error
+
+    configMT.useAsnCache = False
+    os.chdir(workDir)
+    asnParser.ParseAsnFileList(['bench0.asn'])
+
+    nodes = []  # type: List[Any]
+    seen = set()  # type: Set[int]
+    for node in asnParser.g_names.values():
+        Nodes(node, seen, nodes)
+    Check(len(nodes) > len(asnParser.g_names), 'the nested nodes were not visited')
+    for node in nodes:
+        Check(not hasattr(node, '__dict__'), '%s nodes have a __dict__' % node.__class__.__name__)
+        Check(repr(copy.copy(node)) == repr(node), 'a copy of a %s differs' % node.__class__.__name__)
+
+    state = pickle.loads(pickle.dumps(asnParser.GetParsedState(), pickle.HIGHEST_PROTOCOL))
+    Check(sorted(state['g_names']) == sorted(asnParser.g_names), 'pickling lost types')
+    for name, node in asnParser.g_names.items():
+        Check(repr(state['g_names'][name]) == repr(node), 'pickling changed ' + name)
+
+    node = asnAST.AsnInt(range=[0, 10], lineno=1, asnFilename='x.asn')
+    Check(not hasattr(node, '_Min'), 'an AsnInt has a _Min it never set')
+    try:
+        asnAST.AsnInt(rang=[0, 10])
+        Check(False, 'an unknown option was accepted')
+    except AssertionError:
+        pass
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+'''
+The streaming (SAX) builder of the ASN.1 AST: on the synthetic grammars,
+it builds the same AST as the Element tree builder (as compared by
+benchmarks/xmlAST.py), and the grammar can still be re-created from the
+XML AST (the tree is built on demand).
+'''
+import os
+import sys
+import subprocess
+
+from harness import Check, WorkDir, RunTool, Synthetic, g_benchDir
+
+
+def main() -> None:
+    for scenario in ['deep', 'wide', 'choices', 'seqofs']:
+        workDir = WorkDir('streaming_' + scenario)
+        Synthetic(scenario, workDir)
+        # The XML AST, as the stand-in assembles it for the tools
+        subprocess.check_call([
+            sys.executable, os.path.join(g_benchDir, 'stand-in', 'asn1.exe'),
+            '-customStg', 'xml.stg:ast.xml', 'bench0.asn'], cwd=workDir)
+        output = subprocess.check_output(
+            [sys.executable, os.path.join(g_benchDir, 'xmlAST.py'), 'ast.xml'], cwd=workDir).decode('utf-8')
+        digests = [line.split()[-1] for line in output.splitlines() if line.startswith(('Element tree', 'streaming'))]
+        Check(len(digests) == 2, 'unexpected xmlAST.py output: ' + output)
+        Check(digests[0] == digests[1], 'the two builders made different ASTs of scenario ' + scenario)
+
+        output = RunTool(workDir, 'dmt.commonPy.asnParser', ['-testXML', 'ast.xml'])
+        grammar = output.split('Re-created grammar:')[-1]
+        Check('B0_T0 ::=' in grammar, 'the grammar of scenario %s was not re-created' % scenario)
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
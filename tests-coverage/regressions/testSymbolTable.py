@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+'''
+The symbol table: its (transitive) dependencies and dependents match a
+brute-force walk of the references of a synthetic grammar, each type
+comes after the ones it depends on, and the table is rebuilt when the
+mappers add (or replace) types - as is the cache of the dependencies
+that ScanChildren reaches.
+'''
+import os
+
+from typing import Any, Dict, List, Set  # NOQA pylint: disable=unused-import
+
+from harness import Check, WorkDir, InProcess, Synthetic
+
+
+def main() -> None:
+    workDir = WorkDir('symbols')
+    Synthetic('manyfiles', workDir)
+    InProcess(workDir)
+    from dmt.commonPy import asnParser, asnAST, configMT, symbolTable, createInternalTypes  # pylint: disable=import-error
+
+    configMT.useAsnCache = False
+    os.chdir(workDir)
+    asnParser.ParseAsnFileList(sorted(f for f in os.listdir('.') if f.endswith('.asn')))
+    names = asnParser.g_names
+    table = symbolTable.GetSymbolTable()
+
+    direct = {}  # type: Dict[str, Set[str]]
+    for typename, node in names.items():
+        direct[typename] = set(asnParser.ReferencedTypenames(node))
+
+    def Reach(typename: str, edges: Dict[str, Set[str]]) -> Set[str]:
+        result = set()  # type: Set[str]
+        pending = list(edges.get(typename, ()))
+        while pending:
+            other = pending.pop()
+            if other not in result:
+                result.add(other)
+                pending.extend(edges.get(other, ()))
+        result.discard(typename)
+        return result
+
+    users = {}  # type: Dict[str, Set[str]]
+    for typename, deps in direct.items():
+        for dep in deps:
+            users.setdefault(dep, set()).add(typename)
+
+    fileOfType = {}  # type: Dict[str, str]
+    for asnFile, typenames in asnParser.g_typesOfFile.items():
+        for typename in typenames:
+            fileOfType[typename] = asnFile
+
+    for typename in names:
+        Check(table.TypeByName(typename) is names[typename], 'wrong node for ' + typename)
+        Check(table.FileOfType(typename) == fileOfType.get(typename), 'wrong file for ' + typename)
+        Check(set(table.Dependencies(typename)) == direct[typename], 'wrong dependencies of ' + typename)
+        Check(set(table.Dependents(typename)) == users.get(typename, set()), 'wrong dependents of ' + typename)
+        deps = table.TransitiveDependencies(typename)
+        Check(set(deps) == Reach(typename, direct), 'wrong transitive dependencies of ' + typename)
+        position = {dep: i for i, dep in enumerate(deps)}
+        for dep in deps:
+            Check(all(position[x] < position[dep] for x in direct[dep] if x != typename),
+                  '%s comes before its dependencies' % dep)
+        Check(set(table.TransitiveDependents(typename)) == Reach(typename, users),
+              'wrong transitive dependents of ' + typename)
+
+    Check(table.TypeByName('No-Such-Type') is None, 'a missing type was found')
+    Check(symbolTable.GetSymbolTable() is table, 'the table was rebuilt for nothing')
+    names['Pseudo-Type'] = asnAST.AsnInt(range=[0, 1])
+    Check(symbolTable.GetSymbolTable() is not table, 'the table was not rebuilt for a new type')
+    Check(symbolTable.GetSymbolTable().TypeByName('Pseudo-Type') is not None, 'the new type is missing')
+
+    # A replaced type, or one removed and another added, changes no count
+    used = next(x for x in names if table.Dependencies(x))
+    table = symbolTable.GetSymbolTable()
+    names[used] = asnAST.AsnInt(range=[0, 1])
+    Check(symbolTable.GetSymbolTable() is not table, 'the table was not rebuilt for a replaced type')
+    Check(symbolTable.GetSymbolTable().Dependencies(used) == [], 'the old dependencies of %s were kept' % used)
+    table = symbolTable.GetSymbolTable()
+    del names['Pseudo-Type']
+    names['Other-Pseudo-Type'] = asnAST.AsnInt(range=[0, 1])
+    Check(symbolTable.GetSymbolTable() is not table, 'the table was not rebuilt for a removed and an added type')
+
+    # The dependencies that ScanChildren reaches through a type are cached,
+    # but only until the types change
+    def Scan(typename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        names[typename] = asnAST.AsnSequence(members=[('field', asnAST.AsnMetaMember(containedType=user))])
+        results = []  # type: List[str]
+        createInternalTypes.ScanChildren(typename, names[typename], names, results, True, False)
+        return results
+
+    user = next(x for x in names if len(table.TransitiveDependencies(x)) > 1 and x != used)
+    Check(set(Scan('Holder')) == {user} | set(table.TransitiveDependencies(user)), 'wrong dependencies of Holder')
+    names[user] = asnAST.AsnInt(range=[0, 1])
+    Check(Scan('Other-Holder') == [user], 'the dependencies of the old %s were reused' % user)
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
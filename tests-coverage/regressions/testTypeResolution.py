@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+'''
+The resolution of the type references (VerifyAndFixAST): a long chain of
+references resolves to its leaf type in linear time, while references to
+missing types and reference cycles are still reported.
+'''
+import os
+import time
+
+from typing import Any, List  # NOQA pylint: disable=unused-import
+
+from harness import Check, WorkDir, RunTool, WriteGrammar
+
+# The quadratic fixed point took minutes on this chain
+g_chainLength = 2000
+
+
+def main() -> None:
+    workDir = WorkDir('resolution')
+
+    chain = os.path.join(workDir, 'chain')
+    types = [('Link-0', ('INTEGER', 0, 10))]  # type: List[Any]
+    types.extend(('Link-%d' % i, ('REF', 'Link-%d' % (i - 1))) for i in range(1, g_chainLength))
+    types.append(('Holder', ('SEQUENCE', [('tail', ('REF', 'Link-%d' % (g_chainLength - 1)))])))
+    WriteGrammar(chain, 'chain.asn', 'CHAIN', types)
+    start = time.time()
+    dump = RunTool(chain, 'dmt.commonPy.asnParser', ['-testASN1', 'chain.asn'])
+    elapsed = time.time() - start
+    Check(elapsed < 60, 'resolving a chain of %d references took %.1fs' % (g_chainLength, elapsed))
+    lines = dump.splitlines()
+    Check('Link-%d' % (g_chainLength - 1) in lines, 'the end of the chain is missing')
+    last = lines.index('Link-%d' % (g_chainLength - 1))
+    Check(lines[last + 1].endswith(' INTEGER'), 'the end of the chain is not an INTEGER: ' + lines[last + 1])
+
+    for name, badTypes in [
+            ('missing', [('Broken', ('SEQUENCE', [('x', ('REF', 'Missing'))]))]),
+            ('cycle', [
+                ('Ping', ('SEQUENCE', [('x', ('REF', 'Pong'))])),
+                ('Pong', ('SEQUENCE', [('y', ('REF', 'Ping'))]))])]:
+        folder = os.path.join(workDir, name)
+        WriteGrammar(folder, 'bad.asn', 'BAD', badTypes)
+        output = RunTool(folder, 'dmt.commonPy.asnParser', ['-testASN1', 'bad.asn'], mustFail=True)
+        Check('Types remain unknown' in output, 'the %s type was not reported: %s' % (name, output))
+
+
+if __name__ == "__main__":
+    main()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4